@@ -7,6 +7,12 @@ Inspired by DREAM architecture — context bubbles acting as traffic signals.
 Mathematical model:
 - Bubble: B = {content, metadata, micro_agents, traffic_signals}
 - Traffic signals: T = {pathway: weight} for routing decisions
+- Signal epoch: global counter bumped by every signal update, so routing
+  snapshots built from T can be validated in O(1)
+- Agent epoch: same, for micro-agent additions and removals
+- Feature index: query key -> agents whose constraints require it, so the
+  agents whose constraints all hold for a query are found without testing
+  every agent
 
 DEPENDENCIES:
 - loggers.system_logger: structured logging
@@ -16,7 +22,7 @@ DEPENDENCIES:
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
 
 from loggers.system_logger import SystemLogger
 from utilities.cot_logging import ChainOfThoughtLogger, LogLevel
@@ -29,9 +35,18 @@ class ContextBubble:
     """Atomic context unit with embedded micro-agents.
 
     Acts as a traffic signal in the context memory tree,
-    directing attention to relevant pathways.
+    directing attention to relevant pathways. Change signals through
+    set_traffic_signal / update_traffic_signals so signal_epoch advances,
+    and agents through add_micro_agent / remove_micro_agent so agent_epoch
+    advances and the feature index is rebuilt.
     """
 
+    # Incremented on every traffic-signal update of any bubble
+    signal_epoch: ClassVar[int] = 0
+
+    # Incremented on every micro-agent addition or removal of any bubble
+    agent_epoch: ClassVar[int] = 0
+
     bubble_id: str
     content: Any
     metadata: Dict[str, Any] = field(default_factory=dict)
@@ -42,6 +57,11 @@ class ContextBubble:
     access_count: int = 0
     last_accessed: Optional[datetime] = None
 
+    # feature -> agent positions, unconstrained positions, features per agent
+    _agent_index: Optional[Tuple[Dict[str, List[int]], List[int], List[int]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def __post_init__(self) -> None:
         """Auto-generate bubble_id if empty."""
         if not self.bubble_id:
@@ -55,6 +75,8 @@ class ContextBubble:
         """
         if agent not in self.micro_agents:
             self.micro_agents.append(agent)
+            self._agent_index = None
+            ContextBubble.agent_epoch += 1
             self.updated_at = datetime.now()
 
     def remove_micro_agent(self, agent_id: str) -> bool:
@@ -70,6 +92,8 @@ class ContextBubble:
         self.micro_agents = [a for a in self.micro_agents if a.agent_id != agent_id]
         removed = len(self.micro_agents) < original_count
         if removed:
+            self._agent_index = None
+            ContextBubble.agent_epoch += 1
             self.updated_at = datetime.now()
         return removed
 
@@ -95,6 +119,7 @@ class ContextBubble:
             weight: Weight value.
         """
         self.traffic_signals[pathway] = max(0.0, min(1.0, weight))
+        ContextBubble.signal_epoch += 1
         self.updated_at = datetime.now()
 
     def update_traffic_signals(self, usage_data: Dict[str, int]) -> None:
@@ -116,11 +141,57 @@ class ContextBubble:
 
         self.updated_at = datetime.now()
 
-    def process_with_agents(self, query: Dict[str, Any]) -> Dict[str, Any]:
+    def matching_agents(self, query: Dict[str, Any]) -> List[MicroAgent]:
+        """Return the agents whose ``has_`` constraints all hold for *query*.
+
+        Uses the feature index, so only agents constrained on the query's
+        own keys are looked at besides the unconstrained ones.
+
+        Args:
+            query: Query dictionary.
+
+        Returns:
+            Matching agents in registration order.
+        """
+        index = self._agent_index
+        if index is None or len(index[2]) != len(self.micro_agents):
+            index = self._build_agent_index()
+        by_feature, unconstrained, required = index
+
+        hits: Dict[int, int] = {}
+        for key in query:
+            for position in by_feature.get(key, ()):
+                hits[position] = hits.get(position, 0) + 1
+        positions = unconstrained + [p for p, n in hits.items() if n == required[p]]
+        positions.sort()
+        return [self.micro_agents[p] for p in positions]
+
+    def _build_agent_index(self) -> Tuple[Dict[str, List[int]], List[int], List[int]]:
+        by_feature: Dict[str, List[int]] = {}
+        unconstrained: List[int] = []
+        required: List[int] = []
+        for position, agent in enumerate(self.micro_agents):
+            features = set(agent.required_features())
+            required.append(len(features))
+            if not features:
+                unconstrained.append(position)
+            for feature in features:
+                by_feature.setdefault(feature, []).append(position)
+        self._agent_index = (by_feature, unconstrained, required)
+        return self._agent_index
+
+    def process_with_agents(
+        self,
+        query: Dict[str, Any],
+        matching_only: bool = False,
+    ) -> Dict[str, Any]:
         """Process *query* through embedded micro-agents.
 
         Args:
             query: Query dictionary.
+            matching_only: If True, invoke only the agents whose constraints
+                all hold (see matching_agents) instead of every agent;
+                failing agents would only contribute penalised pathways.
 
         Returns:
             Processed result with pathway suggestions.
@@ -134,7 +205,8 @@ class ContextBubble:
             "pathways": [],
         }
 
-        for agent in self.micro_agents:
+        agents = self.matching_agents(query) if matching_only else self.micro_agents
+        for agent in agents:
             agent_result = agent.process(query, self)
             if agent_result:
                 result["pathways"].append(agent_result)
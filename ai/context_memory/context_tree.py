@@ -7,6 +7,13 @@ Inspired by DREAM architecture — hierarchical context structure.
 Mathematical model:
 - Tree: T = (B, E) where B = bubbles, E = edges (pathways)
 - Hierarchy: Parent-child relationships for organisation
+- Version: incremented on every structural change, for snapshot caching
+- Euler tour: preorder entry/exit numbers tin(b) <= i < tout(b), so the
+  subtree of b is order[tin(b):tout(b)] and a in subtree(b) is a range test;
+  rebuilt iteratively (no recursion limit) at most once per version
+- Aggregates: tree-wide depth statistics updated on add_bubble; per-subtree
+  agent counts and traffic totals computed in one bottom-up pass per
+  (version, signal epoch, agent epoch) snapshot
 
 DEPENDENCIES:
 - loggers.system_logger: structured logging
@@ -16,7 +23,7 @@ DEPENDENCIES:
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from loggers.system_logger import SystemLogger
 from utilities.cot_logging import ChainOfThoughtLogger, LogLevel
@@ -41,7 +48,7 @@ class ContextTree:
     - Hierarchical organisation
     - Parent-child relationships
     - Depth tracking
-    - Tree traversal
+    - Tree traversal (Euler-tour indexed, iterative)
     """
 
     def __init__(self, root_bubble: Optional[ContextBubble] = None) -> None:
@@ -54,6 +61,22 @@ class ContextTree:
         self.nodes: Dict[str, TreeNode] = {}
         self.bubbles: Dict[str, ContextBubble] = {}
         self.root_id: Optional[str] = None
+        self.version = 0
+
+        # Bubbles not attached as anyone's child, in insertion order
+        self._roots: List[str] = []
+        self._depth_total = 0
+        self._max_depth = 0
+
+        # Euler tour snapshot, valid while _tour_version == version
+        self._tour_version = -1
+        self._order: List[str] = []
+        self._tin: Dict[str, int] = {}
+        self._tout: Dict[str, int] = {}
+
+        # bubble_id -> (num_bubbles, num_micro_agents, traffic_total, height)
+        self._aggregates: Dict[str, Tuple[int, int, float, int]] = {}
+        self._aggregates_key: Optional[Tuple[int, int, int]] = None
 
         if root_bubble:
             self.add_bubble(root_bubble, parent_id=None)
@@ -87,10 +110,15 @@ class ContextTree:
 
         self.nodes[bubble.bubble_id] = node
         self.bubbles[bubble.bubble_id] = bubble
+        self.version += 1
+        self._depth_total += depth
+        self._max_depth = max(self._max_depth, depth)
 
-        if parent_id and parent_id in self.nodes:
+        if parent_id and parent_id in self.nodes and parent_id != bubble.bubble_id:
             if bubble.bubble_id not in self.nodes[parent_id].children:
                 self.nodes[parent_id].children.append(bubble.bubble_id)
+        else:
+            self._roots.append(bubble.bubble_id)
 
         if parent_id is None and self.root_id is None:
             self.root_id = bubble.bubble_id
@@ -144,17 +172,11 @@ class ContextTree:
         if bubble_id is None or bubble_id not in self.nodes:
             return []
 
-        result: List[str] = []
-
-        def _dfs(current_id: str) -> None:
-            if current_id in self.bubbles:
-                result.append(current_id)
-                if callback:
-                    callback(current_id, self.bubbles[current_id])
-                for child_id in self.nodes[current_id].children:
-                    _dfs(child_id)
-
-        _dfs(bubble_id)
+        self._ensure_tour()
+        result = self._order[self._tin[bubble_id]:self._tout[bubble_id]]
+        if callback:
+            for current_id in result:
+                callback(current_id, self.bubbles[current_id])
         return result
 
     def get_subtree(self, bubble_id: str) -> List[ContextBubble]:
@@ -167,16 +189,100 @@ class ContextTree:
             List of bubbles in subtree.
         """
         bubble_ids = self.traverse_depth_first(bubble_id)
-        return [self.bubbles[bid] for bid in bubble_ids if bid in self.bubbles]
+        return [self.bubbles[bid] for bid in bubble_ids]
+
+    def is_in_subtree(self, bubble_id: str, root_id: str) -> bool:
+        """Return True if *bubble_id* is *root_id* or one of its descendants."""
+        if bubble_id not in self.nodes or root_id not in self.nodes:
+            return False
+        self._ensure_tour()
+        return self._tin[root_id] <= self._tin[bubble_id] < self._tout[root_id]
+
+    def get_subtree_statistics(self, bubble_id: str) -> Dict[str, Any]:
+        """Return aggregates over the subtree rooted at *bubble_id*.
+
+        Agent counts and traffic totals reflect changes made through
+        ContextBubble's agent and traffic-signal methods.
+
+        Args:
+            bubble_id: Root of subtree.
+
+        Returns:
+            Dict with num_bubbles, num_micro_agents, traffic_total and
+            height (0 for a leaf), or an empty dict for an unknown bubble.
+        """
+        if bubble_id not in self.nodes:
+            return {}
+        key = (self.version, ContextBubble.signal_epoch, ContextBubble.agent_epoch)
+        if self._aggregates_key != key:
+            self._aggregates = self._compute_aggregates()
+            self._aggregates_key = key
+        num_bubbles, num_agents, traffic_total, height = self._aggregates[bubble_id]
+        return {
+            "bubble_id": bubble_id,
+            "num_bubbles": num_bubbles,
+            "num_micro_agents": num_agents,
+            "traffic_total": traffic_total,
+            "height": height,
+        }
 
     def get_statistics(self) -> Dict[str, Any]:
         """Return tree statistics."""
-        depths = [node.depth for node in self.nodes.values()]
+        count = len(self.nodes)
 
         return {
             "num_bubbles": len(self.bubbles),
-            "num_nodes": len(self.nodes),
-            "max_depth": max(depths) if depths else 0,
-            "avg_depth": sum(depths) / len(depths) if depths else 0.0,
+            "num_nodes": count,
+            "max_depth": self._max_depth,
+            "avg_depth": self._depth_total / count if count else 0.0,
             "root_id": self.root_id,
         }
+
+    def _ensure_tour(self) -> None:
+        """Rebuild the Euler tour if the tree changed since the last one."""
+        if self._tour_version == self.version:
+            return
+
+        order: List[str] = []
+        tin: Dict[str, int] = {}
+        tout: Dict[str, int] = {}
+        for root_id in self._roots:
+            # (bubble_id, exiting) pairs; children pushed reversed to pop in order
+            stack: List[Tuple[str, bool]] = [(root_id, False)]
+            while stack:
+                current_id, exiting = stack.pop()
+                if exiting:
+                    tout[current_id] = len(order)
+                    continue
+                if current_id in tin:
+                    continue
+                tin[current_id] = len(order)
+                order.append(current_id)
+                stack.append((current_id, True))
+                for child_id in reversed(self.nodes[current_id].children):
+                    stack.append((child_id, False))
+
+        self._order, self._tin, self._tout = order, tin, tout
+        self._tour_version = self.version
+
+    def _compute_aggregates(self) -> Dict[str, Tuple[int, int, float, int]]:
+        """Fold bubble counts, agents, traffic and height up the tree."""
+        self._ensure_tour()
+        aggregates: Dict[str, Tuple[int, int, float, int]] = {}
+        # Reverse preorder visits every child before its parent
+        for current_id in reversed(self._order):
+            bubble = self.bubbles[current_id]
+            num_bubbles = 1
+            num_agents = len(bubble.micro_agents)
+            traffic_total = sum(bubble.traffic_signals.values())
+            height = 0
+            for child_id in self.nodes[current_id].children:
+                child = aggregates.get(child_id)
+                if child is None:
+                    continue
+                num_bubbles += child[0]
+                num_agents += child[1]
+                traffic_total += child[2]
+                height = max(height, child[3] + 1)
+            aggregates[current_id] = (num_bubbles, num_agents, traffic_total, height)
+        return aggregates
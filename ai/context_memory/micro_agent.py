@@ -137,6 +137,14 @@ class MicroAgent:
 
         return result
 
+    def required_features(self) -> List[str]:
+        """Return the query keys this agent's ``has_`` constraints require."""
+        return [
+            constraint[4:]
+            for constraint in self.blueprint.get("constraints", [])
+            if constraint.startswith("has_")
+        ]
+
     @staticmethod
     def _check_constraint(query: Dict[str, Any], constraint: str) -> bool:
         """Check if *query* satisfies *constraint*."""
@@ -44,6 +44,7 @@ class PathOptimizer:
         self._logger = SystemLogger()
         self.traffic_agent = traffic_agent
         self.optimization_history: List[Dict[str, Any]] = []
+        self._fallback_agent: Optional[TrafficAgent] = None
 
         self._logger.log("PathOptimizer initialized", level="INFO")
 
@@ -64,8 +65,10 @@ class PathOptimizer:
             Optimised path, or None.
         """
         if not self.traffic_agent:
-            temp_agent = TrafficAgent(context_tree)
-            path = temp_agent.find_path(start, target)
+            # Reuse one agent per tree so its routing snapshot stays warm
+            if self._fallback_agent is None or self._fallback_agent.context_tree is not context_tree:
+                self._fallback_agent = TrafficAgent(context_tree)
+            path = self._fallback_agent.find_path(start, target)
         else:
             path = self.traffic_agent.find_path(start, target)
 
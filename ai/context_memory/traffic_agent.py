@@ -6,17 +6,27 @@ Inspired by DREAM architecture — traffic-direction agents with micro-maps.
 
 Mathematical model:
 - Pathfinding: Find optimal route P = {bubble_1 -> bubble_2 -> ... -> bubble_n}
-- Traffic signals: Weight edges based on usage and relevance
-- Algorithm: Dijkstra with traffic signal weights
+  with at most max_depth hops
+- Traffic signals: Weight edges w(u, v) = 1 / (signal(u, v) + smoothing)
+- Algorithm: A* over a binary heap (lazy deletion) with the admissible,
+  consistent heuristic h(n) = w_min * ceil(|depth(n) - depth(t)| / delta),
+  where delta is the largest tree-depth change along any edge
+- Hop bound: a state (n, hops) is expanded only if no cheaper state of n
+  used fewer hops, so the bound is exact without enumerating paths
+- Snapshot: adjacency is rebuilt only when the tree version or the global
+  signal epoch changes; hot sources get cached shortest-path trees
 
 DEPENDENCIES:
 - loggers.system_logger: structured logging
 - utilities.cot_logging: chain-of-thought audit trail
 - context_bubble: atomic context units
 - context_tree: hierarchical structure
+- usage_tracker: hot pathway identification
 """
 
-from dataclasses import dataclass
+import heapq
+import math
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -25,9 +35,12 @@ from utilities.cot_logging import ChainOfThoughtLogger, LogLevel
 
 from .context_bubble import ContextBubble
 from .context_tree import ContextTree
+from .usage_tracker import UsageTracker
 
 _DEFAULT_TRAFFIC_SIGNAL = 0.1
 _WEIGHT_SMOOTHING = 0.1  # added to traffic signal to avoid division by zero
+_DEFAULT_HOT_SOURCES = 16
+_PATH_CACHE_SIZE = 1024
 
 
 @dataclass
@@ -46,22 +59,54 @@ class Pathway:
             self.metadata = {}
 
 
+@dataclass
+class RoutingGraph:
+    """Weighted adjacency snapshot of the context tree's traffic signals."""
+
+    version: Tuple[int, int]
+    ids: List[str]
+    index: Dict[str, int]
+    # adjacency[i] = [(j, weight), ...] for signals from ids[i] to bubbles
+    adjacency: List[List[Tuple[int, float]]]
+    depths: List[int]
+    min_weight: float
+    max_depth_step: int
+    # source index -> (distance, previous) arrays of a full shortest-path tree
+    trees: Dict[int, Tuple[List[float], List[int]]] = field(default_factory=dict)
+
+    def hop_bound(self, node: int, target: int) -> int:
+        """Lower bound on hops from node to target implied by tree depths."""
+        if self.max_depth_step == 0:
+            return 0
+        gap = abs(self.depths[node] - self.depths[target])
+        return -(-gap // self.max_depth_step)
+
+
 class TrafficAgent:
     """Traffic agent for intelligent pathfinding through the context tree.
 
     Manages pathways, tracks usage, and optimises routing.
     """
 
-    def __init__(self, context_tree: Optional[ContextTree] = None) -> None:
+    def __init__(
+        self,
+        context_tree: Optional[ContextTree] = None,
+        usage_tracker: Optional[UsageTracker] = None,
+    ) -> None:
         """Initialise traffic agent.
 
         Args:
             context_tree: Optional context tree instance.
+            usage_tracker: Optional tracker whose hot pathways get cached
+                shortest-path trees.
         """
         self._logger = SystemLogger()
         self.context_tree = context_tree
+        self.usage_tracker = usage_tracker
         self.pathways: Dict[Tuple[str, str], Pathway] = {}
         self.usage_stats: Dict[str, int] = {}
+        self._graph: Optional[RoutingGraph] = None
+        self._path_cache: Dict[Tuple[str, str, int], Optional[List[str]]] = {}
 
         self._logger.log("TrafficAgent initialized", level="INFO")
 
@@ -73,7 +118,7 @@ class TrafficAgent:
     ) -> Optional[List[str]]:
         """Find optimal path between bubbles.
 
-        Uses Dijkstra's algorithm with traffic signal weights.
+        Uses A* with traffic signal weights; paths have at most max_depth hops.
 
         Args:
             start_bubble_id: Starting bubble ID.
@@ -121,54 +166,189 @@ class TrafficAgent:
         target: str,
         max_depth: int,
     ) -> Optional[List[str]]:
-        """Dijkstra's algorithm with traffic signal weights.
+        """Shortest path with at most *max_depth* hops (A* with traffic signal weights).
 
         Args:
             start: Starting bubble ID.
             target: Target bubble ID.
-            max_depth: Maximum depth.
+            max_depth: Maximum number of hops.
 
         Returns:
             Path as list of bubble IDs.
         """
+        graph = self.routing_graph()
+        if graph is None or start not in graph.index or target not in graph.index:
+            return None
+
+        key = (start, target, max_depth)
+        if key in self._path_cache:
+            cached = self._path_cache[key]
+            return list(cached) if cached is not None else None
+
+        source, goal = graph.index[start], graph.index[target]
+        path = self._path_from_tree(graph, source, goal, max_depth)
+        if path is None:
+            path = self._bounded_astar(graph, source, goal, max_depth)
+
+        if len(self._path_cache) >= _PATH_CACHE_SIZE:
+            self._path_cache.clear()
+        self._path_cache[key] = path
+        return list(path) if path is not None else None
+
+    def routing_graph(self) -> Optional[RoutingGraph]:
+        """Current adjacency snapshot, rebuilt only when the tree or any signal changed."""
         if not self.context_tree:
             return None
 
-        bubbles = self.context_tree.get_all_bubbles()
-        if start not in bubbles or target not in bubbles:
+        version = (self.context_tree.version, ContextBubble.signal_epoch)
+        if self._graph is not None and self._graph.version == version:
+            return self._graph
+
+        bubbles = self.context_tree.bubbles
+        ids = list(bubbles)
+        index = {bid: i for i, bid in enumerate(ids)}
+        depths = [self.context_tree.nodes[bid].depth for bid in ids]
+        adjacency: List[List[Tuple[int, float]]] = []
+        min_weight = math.inf
+        max_step = 0
+        for i, bid in enumerate(ids):
+            edges = []
+            for neighbor, signal in bubbles[bid].traffic_signals.items():
+                j = index.get(neighbor)
+                if j is None or j == i:
+                    continue
+                weight = 1.0 / (signal + _WEIGHT_SMOOTHING)
+                edges.append((j, weight))
+                min_weight = min(min_weight, weight)
+                max_step = max(max_step, abs(depths[i] - depths[j]))
+            adjacency.append(edges)
+
+        self._graph = RoutingGraph(
+            version=version,
+            ids=ids,
+            index=index,
+            adjacency=adjacency,
+            depths=depths,
+            min_weight=min_weight if adjacency and min_weight < math.inf else 0.0,
+            max_depth_step=max_step,
+        )
+        self._path_cache.clear()
+        return self._graph
+
+    def warm_cache(self, limit: int = _DEFAULT_HOT_SOURCES) -> int:
+        """Build shortest-path trees for the sources of the hottest pathways.
+
+        Later queries from these bubbles are answered from the tree when its
+        path fits within max_depth.
+
+        Args:
+            limit: Number of hot pathways to consult.
+
+        Returns:
+            Number of cached source trees.
+        """
+        graph = self.routing_graph()
+        if graph is None or not self.usage_tracker:
+            return 0
+
+        for stats in self.usage_tracker.get_hot_pathways(limit):
+            source_id = stats["pathway"].split("->", 1)[0]
+            source = graph.index.get(source_id)
+            if source is not None and source not in graph.trees:
+                graph.trees[source] = self._shortest_path_tree(graph, source)
+        return len(graph.trees)
+
+    @staticmethod
+    def _shortest_path_tree(
+        graph: RoutingGraph, source: int
+    ) -> Tuple[List[float], List[int]]:
+        """Single-source Dijkstra over the whole snapshot (binary heap, lazy deletion)."""
+        n = len(graph.ids)
+        distances = [math.inf] * n
+        previous = [-1] * n
+        distances[source] = 0.0
+        heap = [(0.0, source)]
+        adjacency = graph.adjacency
+        while heap:
+            d, node = heapq.heappop(heap)
+            if d > distances[node]:
+                continue
+            for neighbor, weight in adjacency[node]:
+                alt = d + weight
+                if alt < distances[neighbor]:
+                    distances[neighbor] = alt
+                    previous[neighbor] = node
+                    heapq.heappush(heap, (alt, neighbor))
+        return distances, previous
+
+    @staticmethod
+    def _path_from_tree(
+        graph: RoutingGraph, source: int, goal: int, max_depth: int
+    ) -> Optional[List[str]]:
+        """Path from a cached source tree, if cached and within max_depth hops."""
+        tree = graph.trees.get(source)
+        if tree is None or math.isinf(tree[0][goal]):
+            return None
+        previous = tree[1]
+        path = [goal]
+        while path[-1] != source:
+            path.append(previous[path[-1]])
+            if len(path) > max_depth + 1:
+                return None
+        return [graph.ids[i] for i in reversed(path)]
+
+    @staticmethod
+    def _bounded_astar(
+        graph: RoutingGraph, source: int, goal: int, max_depth: int
+    ) -> Optional[List[str]]:
+        """A* over (node, hops) states with a hop limit.
+
+        States pop in order of f = g + h; since h depends only on the node,
+        states of the same node pop in order of g, so a later state of a node
+        is useful only if it used fewer hops than every earlier one.
+        """
+        if max_depth < 0 or graph.hop_bound(source, goal) > max_depth:
             return None
 
-        distances: Dict[str, float] = {bid: float("inf") for bid in bubbles}
-        distances[start] = 0.0
-        previous: Dict[str, Optional[str]] = {}
-        unvisited = set(bubbles)
-
-        while unvisited:
-            current = min(unvisited, key=lambda x: distances[x])
-
-            if current == target:
-                path: List[str] = []
-                node: Optional[str] = current
-                while node is not None:
-                    path.insert(0, node)
-                    node = previous.get(node)
-                return path
-
-            unvisited.remove(current)
-
-            neighbors = self._get_neighbors(current)
-            for neighbor in neighbors:
-                if neighbor in unvisited:
-                    bubble = bubbles[current]
-                    traffic_signal = bubble.get_traffic_signal(
-                        neighbor, default=_DEFAULT_TRAFFIC_SIGNAL
-                    )
-                    weight = 1.0 / (traffic_signal + _WEIGHT_SMOOTHING)
-
-                    alt_distance = distances[current] + weight
-                    if alt_distance < distances[neighbor]:
-                        distances[neighbor] = alt_distance
-                        previous[neighbor] = current
+        def heuristic(node: int) -> float:
+            return graph.min_weight * graph.hop_bound(node, goal)
+
+        best_hops: Dict[int, int] = {}
+        parent: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        g_score: Dict[Tuple[int, int], float] = {(source, 0): 0.0}
+        heap = [(heuristic(source), 0.0, source, 0)]
+        adjacency = graph.adjacency
+
+        while heap:
+            _, g, node, hops = heapq.heappop(heap)
+            if g > g_score[(node, hops)]:
+                continue
+            if hops >= best_hops.get(node, max_depth + 1):
+                continue
+            best_hops[node] = hops
+
+            if node == goal:
+                path = [node]
+                state = (node, hops)
+                while state in parent:
+                    state = parent[state]
+                    path.append(state[0])
+                return [graph.ids[i] for i in reversed(path)]
+
+            next_hops = hops + 1
+            if next_hops > max_depth:
+                continue
+            for neighbor, weight in adjacency[node]:
+                if next_hops >= best_hops.get(neighbor, max_depth + 1):
+                    continue
+                if next_hops + graph.hop_bound(neighbor, goal) > max_depth:
+                    continue
+                state = (neighbor, next_hops)
+                alt = g + weight
+                if alt < g_score.get(state, math.inf):
+                    g_score[state] = alt
+                    parent[state] = (node, hops)
+                    heapq.heappush(heap, (alt + heuristic(neighbor), alt, neighbor, next_hops))
 
         return None
 
@@ -6,22 +6,36 @@ Inspired by DREAM architecture — usage-based pathway weighting.
 
 Mathematical model:
 - Usage tracking: U = {pathway: count} over time
-- Statistics: mean, variance, trends
+- Rollups: per pathway, per-minute buckets for the last 24 hours and
+  per-hour buckets up to the retention horizon; retention drops whole
+  expired hour buckets
+- Inter-arrival: mean over retained uses = (t_last - t_first) / (n - 1);
+  lifetime variance via Welford's running update
+- Hot/cold: exact frequency buckets (count -> pathways, linked in count
+  order); counts grow by one, so recording is O(1) and top-k is O(k)
 
 DEPENDENCIES:
 - loggers.system_logger: structured logging
 - utilities.cot_logging: chain-of-thought audit trail
+- sqlite3 (standard library): optional rollup persistence
 """
 
-from collections import defaultdict
+import math
+import sqlite3
+import time
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
 
 from loggers.system_logger import SystemLogger
 from utilities.cot_logging import ChainOfThoughtLogger, LogLevel
 
 _RECENT_USAGE_HOURS = 24
+_MINUTE = 60
+_HOUR = 3600
+_DAY = 86400
+_DEFAULT_MAX_RECORDS = 10000
 
 
 @dataclass
@@ -33,26 +47,207 @@ class UsageRecord:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+class _PathwayUsage:
+    """Time-bucketed counters and running statistics for one pathway.
+
+    Buckets are [start, count, first_ts, last_ts] lists kept in time order.
+    """
+
+    __slots__ = (
+        "minutes", "hours", "minute_total", "hour_total",
+        "last_ts", "gap_count", "gap_mean", "gap_m2",
+    )
+
+    def __init__(self) -> None:
+        self.minutes: Deque[List[float]] = deque()
+        self.hours: Deque[List[float]] = deque()
+        self.minute_total = 0
+        self.hour_total = 0
+        self.last_ts: Optional[float] = None
+        # Welford accumulators over all inter-arrival gaps
+        self.gap_count = 0
+        self.gap_mean = 0.0
+        self.gap_m2 = 0.0
+
+    def add(self, now: float) -> Tuple[str, float]:
+        """Count one use at *now*; returns the (granularity, start) bucket touched."""
+        if self.last_ts is not None:
+            gap = now - self.last_ts
+            self.gap_count += 1
+            delta = gap - self.gap_mean
+            self.gap_mean += delta / self.gap_count
+            self.gap_m2 += delta * (gap - self.gap_mean)
+        self.last_ts = now
+
+        start = now - now % _MINUTE
+        if self.minutes and self.minutes[-1][0] == start:
+            bucket = self.minutes[-1]
+            bucket[1] += 1
+            bucket[3] = now
+        else:
+            self.minutes.append([start, 1, now, now])
+        self.minute_total += 1
+        return "minute", start
+
+    def advance(self, now: float, retention: float) -> List[Tuple[str, float]]:
+        """Roll minute buckets older than a day into hours and drop expired hours.
+
+        Returns:
+            Hour buckets whose counts changed.
+        """
+        changed = []
+        recent_cutoff = now - _RECENT_USAGE_HOURS * _HOUR
+        while self.minutes and self.minutes[0][0] + _MINUTE <= recent_cutoff:
+            start, count, first, last = self.minutes.popleft()
+            self.minute_total -= count
+            hour = start - start % _HOUR
+            if self.hours and self.hours[-1][0] == hour:
+                bucket = self.hours[-1]
+                bucket[1] += count
+                bucket[3] = last
+            else:
+                self.hours.append([hour, count, first, last])
+            self.hour_total += count
+            changed.append(("hour", hour))
+
+        retention_cutoff = now - retention
+        while self.hours and self.hours[0][0] + _HOUR <= retention_cutoff:
+            self.hour_total -= self.hours.popleft()[1]
+        return changed
+
+    @property
+    def retained(self) -> int:
+        return self.minute_total + self.hour_total
+
+    def first_retained(self) -> Optional[float]:
+        if self.hours:
+            return self.hours[0][2]
+        if self.minutes:
+            return self.minutes[0][2]
+        return None
+
+
+class _FrequencyIndex:
+    """Pathways grouped by count, with counts linked in ascending order.
+
+    Supports increment-by-one in O(1) and the k most/least used in O(k).
+    """
+
+    def __init__(self) -> None:
+        self.buckets: Dict[int, Dict[str, None]] = {}
+        self.next: Dict[int, int] = {}
+        self.prev: Dict[int, int] = {}
+        self.lowest: Optional[int] = None
+        self.highest: Optional[int] = None
+
+    def increment(self, key: str, count: int) -> None:
+        """Move *key* from bucket count - 1 to bucket count."""
+        old = count - 1
+        if count not in self.buckets:
+            self.buckets[count] = {}
+            self._link_after(old if old in self.buckets else None, count)
+        self.buckets[count][key] = None
+
+        if old in self.buckets:
+            bucket = self.buckets[old]
+            del bucket[key]
+            if not bucket:
+                self._unlink(old)
+
+    def most(self, limit: int) -> List[Tuple[str, int]]:
+        return self._walk(self.highest, self.prev, limit)
+
+    def least(self, limit: int) -> List[Tuple[str, int]]:
+        return self._walk(self.lowest, self.next, limit)
+
+    def _walk(
+        self, count: Optional[int], step: Dict[int, int], limit: int
+    ) -> List[Tuple[str, int]]:
+        result: List[Tuple[str, int]] = []
+        while count is not None and len(result) < limit:
+            for key in self.buckets[count]:
+                result.append((key, count))
+                if len(result) == limit:
+                    break
+            count = step.get(count)
+        return result
+
+    def _link_after(self, anchor: Optional[int], count: int) -> None:
+        # New counts are either 1 (new lowest) or right after count - 1
+        following = self.lowest if anchor is None else self.next.get(anchor)
+        if anchor is None:
+            self.lowest = count
+        else:
+            self.next[anchor] = count
+            self.prev[count] = anchor
+        if following is None:
+            self.highest = count
+        else:
+            self.next[count] = following
+            self.prev[following] = count
+
+    def _unlink(self, count: int) -> None:
+        before = self.prev.pop(count, None)
+        after = self.next.pop(count, None)
+        if before is None:
+            self.lowest = after
+        else:
+            if after is None:
+                del self.next[before]
+            else:
+                self.next[before] = after
+        if after is None:
+            self.highest = before
+        else:
+            if before is None:
+                del self.prev[after]
+            else:
+                self.prev[after] = before
+        del self.buckets[count]
+
+
 class UsageTracker:
     """Usage tracker for pathway statistics.
 
     Features:
-    - Usage recording
+    - Usage recording in O(1) amortized time
+    - Time-bucketed rollups with bucket-granular retention
     - Statistics computation
     - Trend analysis
-    - Hot/cold pathway identification
+    - Hot/cold pathway identification in O(k)
+    - Optional periodic rollup flush to SQLite
     """
 
-    def __init__(self, retention_days: int = 30) -> None:
+    def __init__(
+        self,
+        retention_days: int = 30,
+        max_records: int = _DEFAULT_MAX_RECORDS,
+        sqlite_path: Optional[str] = None,
+        flush_interval: float = 60.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
         """Initialise usage tracker.
 
         Args:
-            retention_days: Number of days to retain records.
+            retention_days: Number of days to retain usage counts.
+            max_records: Raw records kept in the ring buffer `records`.
+            sqlite_path: Optional SQLite file that rollups are flushed to.
+            flush_interval: Seconds between automatic flushes (with sqlite_path).
+            clock: Source of the current time as a UNIX timestamp.
         """
         self._logger = SystemLogger()
         self.retention_days = retention_days
-        self.records: List[UsageRecord] = []
+        self.records: Deque[UsageRecord] = deque(maxlen=max_records)
         self.pathway_counts: Dict[str, int] = defaultdict(int)
+        self.sqlite_path = sqlite_path
+        self.flush_interval = flush_interval
+
+        self._clock = clock
+        self._usage: Dict[str, _PathwayUsage] = {}
+        self._frequency = _FrequencyIndex()
+        self._total_usage = 0
+        self._dirty: Set[Tuple[str, str, float]] = set()
+        self._last_flush = clock()
 
         self._logger.log(
             f"UsageTracker initialized (retention={retention_days} days)", level="INFO"
@@ -69,34 +264,57 @@ class UsageTracker:
             pathway: Pathway identifier.
             metadata: Optional metadata.
         """
+        now = self._clock()
         record = UsageRecord(
             pathway=pathway,
-            timestamp=datetime.now(),
+            timestamp=datetime.fromtimestamp(now),
             metadata=metadata or {},
         )
-
         self.records.append(record)
+        self._clean_old_records(now)
+
+        usage = self._usage.get(pathway)
+        if usage is None:
+            usage = self._usage[pathway] = _PathwayUsage()
+        self._mark(pathway, usage.advance(now, self._retention_seconds))
+        self._mark(pathway, [usage.add(now)])
+
         self.pathway_counts[pathway] += 1
+        self._frequency.increment(pathway, self.pathway_counts[pathway])
+        self._total_usage += 1
 
-        self._clean_old_records()
+        if self.sqlite_path and now - self._last_flush >= self.flush_interval:
+            self.flush()
 
-    def _clean_old_records(self) -> None:
-        """Remove records older than the retention period."""
-        cutoff = datetime.now() - timedelta(days=self.retention_days)
-        self.records = [r for r in self.records if r.timestamp > cutoff]
+    @property
+    def _retention_seconds(self) -> float:
+        return self.retention_days * _DAY
+
+    def _clean_old_records(self, now: Optional[float] = None) -> None:
+        """Drop raw records older than the retention period from the ring buffer's head."""
+        if now is None:
+            now = self._clock()
+        cutoff = datetime.fromtimestamp(now - self._retention_seconds)
+        while self.records and self.records[0].timestamp <= cutoff:
+            self.records.popleft()
 
     def get_pathway_statistics(self, pathway: str) -> Dict[str, Any]:
         """Get statistics for a pathway.
 
+        Counts are exact within retention at bucket granularity: recent
+        usage to the minute, expiry to the hour.
+
         Args:
             pathway: Pathway identifier.
 
         Returns:
             Statistics dictionary.
         """
-        pathway_records = [r for r in self.records if r.pathway == pathway]
+        usage = self._usage.get(pathway)
+        if usage is not None:
+            self._mark(pathway, usage.advance(self._clock(), self._retention_seconds))
 
-        if not pathway_records:
+        if usage is None or usage.retained == 0:
             return {
                 "pathway": pathway,
                 "total_usage": 0,
@@ -104,24 +322,18 @@ class UsageTracker:
                 "avg_time_between_usage": 0.0,
             }
 
-        recent_cutoff = datetime.now() - timedelta(hours=_RECENT_USAGE_HOURS)
-        recent_records = [r for r in pathway_records if r.timestamp > recent_cutoff]
-
-        if len(pathway_records) > 1:
-            time_diffs = [
-                (pathway_records[i + 1].timestamp - pathway_records[i].timestamp).total_seconds()
-                for i in range(len(pathway_records) - 1)
-            ]
-            avg_time = sum(time_diffs) / len(time_diffs)
-        else:
-            avg_time = 0.0
+        total = usage.retained
+        first = usage.first_retained()
+        avg_time = (usage.last_ts - first) / (total - 1) if total > 1 and first is not None else 0.0
+        variance = usage.gap_m2 / (usage.gap_count - 1) if usage.gap_count > 1 else 0.0
 
         return {
             "pathway": pathway,
-            "total_usage": len(pathway_records),
-            "recent_usage": len(recent_records),
+            "total_usage": total,
+            "recent_usage": usage.minute_total,
             "avg_time_between_usage": avg_time,
-            "last_used": pathway_records[-1].timestamp.isoformat() if pathway_records else None,
+            "std_time_between_usage": math.sqrt(variance),
+            "last_used": datetime.fromtimestamp(usage.last_ts).isoformat(),
         }
 
     def get_hot_pathways(self, limit: int = 10) -> List[Dict[str, Any]]:
@@ -133,11 +345,10 @@ class UsageTracker:
         Returns:
             List of pathway statistics (descending usage).
         """
-        sorted_pathways = sorted(
-            self.pathway_counts.items(), key=lambda x: x[1], reverse=True
-        )[:limit]
-
-        return [self.get_pathway_statistics(pathway) for pathway, _ in sorted_pathways]
+        return [
+            self.get_pathway_statistics(pathway)
+            for pathway, _ in self._frequency.most(limit)
+        ]
 
     def get_cold_pathways(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get least frequently used pathways.
@@ -148,16 +359,15 @@ class UsageTracker:
         Returns:
             List of pathway statistics (ascending usage).
         """
-        sorted_pathways = sorted(
-            self.pathway_counts.items(), key=lambda x: x[1]
-        )[:limit]
-
-        return [self.get_pathway_statistics(pathway) for pathway, _ in sorted_pathways]
+        return [
+            self.get_pathway_statistics(pathway)
+            for pathway, _ in self._frequency.least(limit)
+        ]
 
     def get_all_statistics(self) -> Dict[str, Any]:
         """Return overall usage statistics."""
         total_pathways = len(self.pathway_counts)
-        total_usage = sum(self.pathway_counts.values())
+        total_usage = self._total_usage
 
         return {
             "total_pathways": total_pathways,
@@ -166,3 +376,76 @@ class UsageTracker:
             "num_records": len(self.records),
             "retention_days": self.retention_days,
         }
+
+    def flush(self, sqlite_path: Optional[str] = None) -> int:
+        """Write rollup buckets to SQLite.
+
+        Table usage_rollups(pathway, granularity, bucket_start, count) holds
+        the latest count of each minute and hour bucket. Flushing to the
+        configured sqlite_path writes only buckets changed since the last
+        flush; an explicit sqlite_path gets every retained bucket.
+
+        Args:
+            sqlite_path: Target file (default: the constructor's sqlite_path).
+
+        Returns:
+            Number of buckets written.
+        """
+        path = sqlite_path or self.sqlite_path
+        self._last_flush = self._clock()
+        if not path:
+            return 0
+
+        rows = []
+        if sqlite_path is not None:
+            for pathway, usage in self._usage.items():
+                for granularity, buckets in (("minute", usage.minutes), ("hour", usage.hours)):
+                    rows.extend((pathway, granularity, int(b[0]), int(b[1])) for b in buckets)
+        else:
+            for pathway, granularity, start in self._dirty:
+                usage = self._usage[pathway]
+                buckets = usage.minutes if granularity == "minute" else usage.hours
+                # Dirty buckets are recent, so the scan from the right is short
+                count = next((int(b[1]) for b in reversed(buckets) if b[0] == start), None)
+                if count is not None:
+                    rows.append((pathway, granularity, int(start), count))
+        if not rows:
+            self._dirty.clear()
+            return 0
+
+        cot = ChainOfThoughtLogger()
+        step_id = cot.start_step(
+            action="USAGE_TRACKER_FLUSH",
+            input_data={"path": path, "buckets": len(rows)},
+            level=LogLevel.DEBUG,
+        )
+        try:
+            conn = sqlite3.connect(path)
+            try:
+                with conn:
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS usage_rollups ("
+                        "pathway TEXT NOT NULL, granularity TEXT NOT NULL, "
+                        "bucket_start INTEGER NOT NULL, count INTEGER NOT NULL, "
+                        "PRIMARY KEY (pathway, granularity, bucket_start))"
+                    )
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO usage_rollups VALUES (?, ?, ?, ?)", rows
+                    )
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            cot.end_step(step_id, output_data={"error": str(e)}, validation_passed=False)
+            self._logger.log(f"Usage rollup flush failed: {e}", level="ERROR")
+            return 0
+
+        if sqlite_path is None:
+            self._dirty.clear()
+        cot.end_step(step_id, output_data={"written": len(rows)}, validation_passed=True)
+        return len(rows)
+
+    def _mark(self, pathway: str, buckets: List[Tuple[str, float]]) -> None:
+        # Changes are only tracked when periodic flushing is configured
+        if self.sqlite_path:
+            for granularity, start in buckets:
+                self._dirty.add((pathway, granularity, start))
@@ -0,0 +1,443 @@
+"""
+PATH: ai/nodal_vectorization/dependency_index.py
+PURPOSE: Incrementally maintained structure of the module dependency graph.
+
+Mathematical model:
+- Edge u -> v: module u depends on module v
+- Topological order: ord(v) < ord(u) for every edge u -> v (dependencies first),
+  kept current on edge insertion (Pearce-Kelly): only vertices ranked between
+  ord(v) and ord(u) are searched. Ranks are floats with gaps, and the two
+  searches run interleaved so only the side that finishes first is visited
+  fully and moved past the other endpoint (Bender-Fineman-Gilbert-Tarjan).
+  Adding a dependency after its dependents is therefore O(1), not O(chain)
+- Cycles: strongly connected components (iterative Tarjan), recomputed only
+  after an insertion closed a cycle; an acyclic graph answers in O(1)
+- Components: union-find over undirected edges (rebuilt lazily after deletions)
+- Transitive closures: D*(v) and its reverse as integer bitsets, memoized;
+  an edge change u -> v invalidates only D* of u and its dependents, and the
+  reverse closure of v and its dependencies
+
+DEPENDENCIES:
+- None (pure Python; no recursion, so deep import chains are safe)
+"""
+
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+class DependencyIndex:
+    """Dynamic topological order, cycles, components and closures of a digraph."""
+
+    def __init__(self) -> None:
+        """Initialise an empty index."""
+        self._deps: Dict[str, Set[str]] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+        self.version = 0
+
+        # Bitset slot per vertex (slots of removed vertices are reused)
+        self._bit: Dict[str, int] = {}
+        self._names: List[Optional[str]] = []
+        self._free_bits: List[int] = []
+
+        # Topological order: _ord[v] is v's rank; _ranks is sorted and
+        # _at[i] is the vertex ranked _ranks[i]
+        self._ord: Dict[str, float] = {}
+        self._ranks: List[float] = []
+        self._at: List[str] = []
+        self._order_valid = True
+
+        # Union-find
+        self._parent: Dict[str, str] = {}
+        self._components_valid = True
+
+        # Memoized closures (dependencies / dependents) as bitsets
+        self._dep_closure: Dict[str, int] = {}
+        self._dependent_closure: Dict[str, int] = {}
+
+        self._scc_cache: Tuple[int, List[List[str]]] = (-1, [])
+
+    def __contains__(self, vertex: str) -> bool:
+        return vertex in self._deps
+
+    # ------------------------------------------------------------------
+    # Mutation
+    # ------------------------------------------------------------------
+
+    def add_vertex(self, vertex: str) -> None:
+        """Add a vertex (no-op if present); it is ranked last."""
+        if vertex in self._deps:
+            return
+        self._deps[vertex] = set()
+        self._dependents[vertex] = set()
+        if self._free_bits:
+            bit = self._free_bits.pop()
+            self._names[bit] = vertex
+        else:
+            bit = len(self._names)
+            self._names.append(vertex)
+        self._bit[vertex] = bit
+        rank = self._ranks[-1] + 1.0 if self._ranks else 0.0
+        self._ord[vertex] = rank
+        self._ranks.append(rank)
+        self._at.append(vertex)
+        self._parent[vertex] = vertex
+        self.version += 1
+
+    def remove_vertex(self, vertex: str) -> None:
+        """Remove a vertex and its edges."""
+        if vertex not in self._deps:
+            return
+        for dep in list(self._deps[vertex]):
+            self.remove_edge(vertex, dep)
+        for dependent in list(self._dependents[vertex]):
+            self.remove_edge(dependent, vertex)
+        del self._deps[vertex]
+        del self._dependents[vertex]
+        self._dep_closure.pop(vertex, None)
+        self._dependent_closure.pop(vertex, None)
+        bit = self._bit.pop(vertex)
+        self._names[bit] = None
+        self._free_bits.append(bit)
+        position = bisect_left(self._ranks, self._ord.pop(vertex))
+        del self._ranks[position]
+        del self._at[position]
+        del self._parent[vertex]
+        self._components_valid = False
+        self.version += 1
+
+    def add_edge(self, from_id: str, to_id: str) -> bool:
+        """Add from_id -> to_id (from_id depends on to_id).
+
+        Returns:
+            False if the edge already existed.
+        """
+        self.add_vertex(from_id)
+        self.add_vertex(to_id)
+        if to_id in self._deps[from_id]:
+            return False
+
+        self._deps[from_id].add(to_id)
+        self._dependents[to_id].add(from_id)
+        self.version += 1
+
+        self._invalidate(from_id, self._dep_closure, self._dependents)
+        self._invalidate(to_id, self._dependent_closure, self._deps)
+        if self._components_valid:
+            self._union(from_id, to_id)
+        if self._order_valid:
+            self._order_valid = self._reorder(to_id, from_id)
+        return True
+
+    def remove_edge(self, from_id: str, to_id: str) -> bool:
+        """Remove from_id -> to_id; returns False if it did not exist.
+
+        Deleting an edge never invalidates a topological order.
+        """
+        if to_id not in self._deps.get(from_id, ()):
+            return False
+        self._deps[from_id].discard(to_id)
+        self._dependents[to_id].discard(from_id)
+        self.version += 1
+
+        self._invalidate(from_id, self._dep_closure, self._dependents)
+        self._invalidate(to_id, self._dependent_closure, self._deps)
+        self._components_valid = False
+        return True
+
+    # ------------------------------------------------------------------
+    # Topological order (Pearce-Kelly)
+    # ------------------------------------------------------------------
+
+    def _reorder(self, x: str, y: str) -> bool:
+        """Restore ord(x) < ord(y) after adding constraint x -> y.
+
+        Constraint successors are dependents. Returns False on a cycle.
+        """
+        lower, upper = self._ord[y], self._ord[x]
+        if lower > upper:
+            return True
+        if x == y:
+            return False
+
+        # Forward from y over dependents ranked below ord(x), backward from x
+        # over dependencies ranked above ord(y), one step of each at a time
+        forward, backward = [y], [x]
+        forward_stack, backward_stack = [y], [x]
+        forward_seen, backward_seen = {y}, {x}
+        while forward_stack and backward_stack:
+            for succ in self._dependents[forward_stack.pop()]:
+                if succ == x:
+                    return False
+                if succ not in forward_seen and self._ord[succ] < upper:
+                    forward_seen.add(succ)
+                    forward.append(succ)
+                    forward_stack.append(succ)
+            for pred in self._deps[backward_stack.pop()]:
+                if pred == y:
+                    return False
+                if pred not in backward_seen and self._ord[pred] > lower:
+                    backward_seen.add(pred)
+                    backward.append(pred)
+                    backward_stack.append(pred)
+
+        if not backward_stack:
+            # Everything x depends on in range: move it just below y
+            position = bisect_left(self._ranks, lower)
+            self._move(backward, self._at[position - 1] if position else None, y)
+        else:
+            # Everything depending on y in range: move it just above x
+            position = bisect_left(self._ranks, upper)
+            above = self._at[position + 1] if position + 1 < len(self._at) else None
+            self._move(forward, x, above)
+        return True
+
+    def _move(self, vertices: List[str], after: Optional[str], before: Optional[str]) -> None:
+        """Re-rank vertices, keeping their relative order, between two neighbours.
+
+        after / before are adjacent in the order (None = either end).
+        """
+        low = self._ord[after] if after is not None else self._ord[before] - 1.0
+        high = self._ord[before] if before is not None else self._ord[after] + 1.0
+        step = (high - low) / (len(vertices) + 1)
+        if low + step == low or high - step == high:
+            # Out of float precision between the neighbours: renumber
+            self._ranks = [float(i) for i in range(len(self._at))]
+            self._ord = {v: float(i) for i, v in enumerate(self._at)}
+            self._move(vertices, after, before)
+            return
+
+        vertices.sort(key=self._ord.__getitem__)
+        for vertex in vertices:
+            position = bisect_left(self._ranks, self._ord[vertex])
+            del self._ranks[position]
+            del self._at[position]
+        for i, vertex in enumerate(vertices, start=1):
+            rank = low + step * i
+            self._ord[vertex] = rank
+            position = bisect_left(self._ranks, rank)
+            self._ranks.insert(position, rank)
+            self._at.insert(position, vertex)
+
+    def order(self) -> List[str]:
+        """Vertices with dependencies before dependents.
+
+        Members of a cycle (which have no valid order) are kept together,
+        in insertion order, at the position of their component.
+        """
+        if not self._order_valid:
+            sccs = self.strongly_connected_components()
+            if all(len(scc) == 1 and scc[0] not in self._deps[scc[0]] for scc in sccs):
+                # The cycles are gone: adopt this order and resume maintaining it
+                self._at = [scc[0] for scc in sccs]
+                self._ranks = [float(i) for i in range(len(self._at))]
+                self._ord = {v: float(i) for i, v in enumerate(self._at)}
+                self._order_valid = True
+            else:
+                return [v for scc in sccs for v in scc]
+        return list(self._at)
+
+    @property
+    def acyclic(self) -> bool:
+        """Whether the graph has no cycle."""
+        return self._order_valid or not self.cycles()
+
+    # ------------------------------------------------------------------
+    # Cycles (iterative Tarjan)
+    # ------------------------------------------------------------------
+
+    def strongly_connected_components(self) -> List[List[str]]:
+        """SCCs, dependencies first; members in insertion order."""
+        version, cached = self._scc_cache
+        if version == self.version:
+            return cached
+        sccs = self._tarjan(self._deps, self._deps)
+        insertion = {v: i for i, v in enumerate(self._deps)}
+        for scc in sccs:
+            scc.sort(key=insertion.__getitem__)
+        self._scc_cache = (self.version, sccs)
+        return sccs
+
+    @staticmethod
+    def _tarjan(
+        adjacency: Dict[str, Set[str]],
+        roots: Iterable[str],
+        skip: Optional[Dict[str, int]] = None,
+    ) -> List[List[str]]:
+        """Iterative Tarjan over vertices reachable from roots.
+
+        Vertices in skip are treated as already finished. SCCs are emitted
+        after every SCC they reach, i.e. along adjacency targets first.
+        """
+        index: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        sccs: List[List[str]] = []
+        counter = 0
+
+        for root in roots:
+            if root in index or (skip is not None and root in skip):
+                continue
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(adjacency[root]))]
+            while work:
+                node, children = work[-1]
+                advanced = False
+                for child in children:
+                    if skip is not None and child in skip:
+                        continue
+                    if child not in index:
+                        index[child] = low[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(adjacency[child])))
+                        advanced = True
+                        break
+                    if child in on_stack:
+                        low[node] = min(low[node], index[child])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    scc = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        scc.append(member)
+                        if member == node:
+                            break
+                    sccs.append(scc)
+        return sccs
+
+    def cycles(self) -> List[List[str]]:
+        """One cycle per cyclic SCC, as [v, ..., v]."""
+        if self._order_valid:
+            return []
+        cycles: List[List[str]] = []
+        for scc in self.strongly_connected_components():
+            start = scc[0]
+            if len(scc) == 1:
+                if start in self._deps[start]:
+                    cycles.append([start, start])
+                continue
+            # Shortest path back to start inside the component
+            members = set(scc)
+            parent: Dict[str, str] = {}
+            frontier = [start]
+            found = False
+            while frontier and not found:
+                next_frontier = []
+                for node in frontier:
+                    for dep in self._deps[node]:
+                        if dep == start:
+                            parent[start] = node
+                            found = True
+                            break
+                        if dep in members and dep not in parent:
+                            parent[dep] = node
+                            next_frontier.append(dep)
+                    if found:
+                        break
+                frontier = next_frontier
+            path = [start]
+            node = parent[start]
+            while node != start:
+                path.append(node)
+                node = parent[node]
+            path.append(start)
+            path.reverse()
+            cycles.append(path)
+        return cycles
+
+    # ------------------------------------------------------------------
+    # Connected components (union-find)
+    # ------------------------------------------------------------------
+
+    def _find(self, vertex: str) -> str:
+        parent = self._parent
+        while parent[vertex] != vertex:
+            parent[vertex] = parent[parent[vertex]]
+            vertex = parent[vertex]
+        return vertex
+
+    def _union(self, a: str, b: str) -> None:
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a != root_b:
+            self._parent[root_b] = root_a
+
+    def components(self) -> List[Set[str]]:
+        """Weakly connected components, ordered by their first vertex."""
+        if not self._components_valid:
+            self._parent = {v: v for v in self._deps}
+            for vertex, deps in self._deps.items():
+                for dep in deps:
+                    self._union(vertex, dep)
+            self._components_valid = True
+
+        groups: Dict[str, Set[str]] = {}
+        for vertex in self._deps:
+            groups.setdefault(self._find(vertex), set()).add(vertex)
+        return list(groups.values())
+
+    # ------------------------------------------------------------------
+    # Transitive closures (memoized bitsets)
+    # ------------------------------------------------------------------
+
+    def dependencies_of(self, vertex: str) -> Set[str]:
+        """All transitive dependencies (includes vertex itself only if on a cycle)."""
+        if vertex not in self._deps:
+            return set()
+        return self._names_of(self._closure(vertex, self._dep_closure, self._deps))
+
+    def dependents_of(self, vertex: str) -> Set[str]:
+        """All transitive dependents (includes vertex itself only if on a cycle)."""
+        if vertex not in self._deps:
+            return set()
+        return self._names_of(self._closure(vertex, self._dependent_closure, self._dependents))
+
+    def _closure(self, vertex: str, memo: Dict[str, int], adjacency: Dict[str, Set[str]]) -> int:
+        bits = memo.get(vertex)
+        if bits is not None:
+            return bits
+        # Memoized vertices are closed under adjacency, so only the
+        # unmemoized reachable part is traversed
+        for scc in self._tarjan(adjacency, [vertex], skip=memo):
+            members = set(scc)
+            bits = 0
+            for member in scc:
+                for target in adjacency[member]:
+                    bits |= 1 << self._bit[target]
+                    if target not in members:
+                        bits |= memo[target]
+            for member in scc:
+                memo[member] = bits
+        return memo[vertex]
+
+    @staticmethod
+    def _invalidate(vertex: str, memo: Dict[str, int], reverse: Dict[str, Set[str]]) -> None:
+        """Drop memo entries that may include vertex's closure."""
+        if vertex not in memo:
+            return
+        del memo[vertex]
+        stack = [vertex]
+        while stack:
+            node = stack.pop()
+            for source in reverse[node]:
+                if source in memo:
+                    del memo[source]
+                    stack.append(source)
+
+    def _names_of(self, bits: int) -> Set[str]:
+        names: Set[str] = set()
+        while bits:
+            low = bits & -bits
+            names.add(self._names[low.bit_length() - 1])
+            bits ^= low
+        return names
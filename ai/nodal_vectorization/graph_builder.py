@@ -6,18 +6,22 @@ Mathematical model:
 - Graph: G = (V, E) where V = CodeNodes, E = dependencies
 - Adjacency: A[i][j] = 1 if node i depends on node j
 - Topological order: ordering where dependencies precede dependents
+- Structure queries are answered from an incrementally maintained
+  DependencyIndex instead of being recomputed per call
 
 DEPENDENCIES:
 - loggers.system_logger: structured logging
 - code_node: node data structures
+- dependency_index: incremental order, cycles, components, closures
 - vector_store: embedding storage
 """
 
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, Iterable, List, Optional, Set
 
 from loggers.system_logger import SystemLogger
 
 from ai.nodal_vectorization.code_node import CodeNode
+from ai.nodal_vectorization.dependency_index import DependencyIndex
 from ai.nodal_vectorization.vector_store import VectorStore
 
 
@@ -25,10 +29,11 @@ class GraphBuilder:
     """Builds and maintains the nodal graph structure.
 
     Supports:
-    - Incremental node/edge addition
-    - Topological sort (Kahn's algorithm)
-    - Cycle detection
-    - Connected component analysis
+    - Incremental node/edge addition and removal
+    - Topological order maintained across edits (Pearce-Kelly)
+    - Cycle detection (Tarjan SCC)
+    - Connected component analysis (union-find)
+    - Memoized transitive dependency / dependent queries
     """
 
     def __init__(self, vector_store: Optional[VectorStore] = None) -> None:
@@ -42,30 +47,78 @@ class GraphBuilder:
         self.edges: Dict[str, Set[str]] = {}
         self.reverse_edges: Dict[str, Set[str]] = {}
         self.vector_store = vector_store
+        self._index = DependencyIndex()
+        # Declared dependencies on nodes not added yet: dep_id -> dependents
+        self._pending: Dict[str, Set[str]] = {}
 
         self._logger.log("GraphBuilder initialized", level="INFO")
 
     def add_node(self, node: CodeNode) -> None:
-        """Add a node to the graph.
+        """Add or replace a node in the graph.
+
+        Edges are created for declared dependencies already in the graph, and
+        for earlier nodes that declared a dependency on this one. Replacing a
+        node drops edges to dependencies it no longer declares.
 
         Args:
             node: CodeNode to add.
         """
-        self.nodes[node.node_id] = node
+        node_id = node.node_id
+        previous = self.nodes.get(node_id)
+        self.nodes[node_id] = node
+
+        if node_id not in self.edges:
+            self.edges[node_id] = set()
+        if node_id not in self.reverse_edges:
+            self.reverse_edges[node_id] = set()
+        self._index.add_vertex(node_id)
 
-        if node.node_id not in self.edges:
-            self.edges[node.node_id] = set()
-        if node.node_id not in self.reverse_edges:
-            self.reverse_edges[node.node_id] = set()
+        if previous is not None:
+            for dep_id in set(previous.dependencies) - set(node.dependencies):
+                self.remove_edge(node_id, dep_id)
+                self._pending.get(dep_id, set()).discard(node_id)
 
         for dep_id in node.dependencies:
             if dep_id in self.nodes:
-                self.add_edge(node.node_id, dep_id)
+                self.add_edge(node_id, dep_id)
+            else:
+                self._pending.setdefault(dep_id, set()).add(node_id)
+
+        for dependent_id in self._pending.pop(node_id, ()):
+            if dependent_id in self.nodes:
+                self.add_edge(dependent_id, node_id)
 
         if self.vector_store:
             self.vector_store.add_node(node, node.embedding)
 
-        self._logger.log(f"Node added to graph: {node.node_id}", level="DEBUG")
+        self._logger.log(f"Node added to graph: {node_id}", level="DEBUG")
+
+    def remove_node(self, node_id: str) -> bool:
+        """Remove a node and all its edges.
+
+        Returns:
+            False if the node was not in the graph.
+        """
+        node = self.nodes.pop(node_id, None)
+        if node is None:
+            return False
+
+        for dep_id in list(self.edges.get(node_id, ())):
+            self.remove_edge(node_id, dep_id)
+        for dependent_id in list(self.reverse_edges.get(node_id, ())):
+            self.remove_edge(dependent_id, node_id)
+            # Reconnects if the node is added again
+            if dependent_id in self.nodes and node_id in self.nodes[dependent_id].dependencies:
+                self._pending.setdefault(node_id, set()).add(dependent_id)
+        for dep_id in node.dependencies:
+            self._pending.get(dep_id, set()).discard(node_id)
+
+        self.edges.pop(node_id, None)
+        self.reverse_edges.pop(node_id, None)
+        self._index.remove_vertex(node_id)
+
+        self._logger.log(f"Node removed from graph: {node_id}", level="DEBUG")
+        return True
 
     def add_edge(self, from_id: str, to_id: str) -> None:
         """Add a directed edge (dependency) from one node to another.
@@ -81,13 +134,30 @@ class GraphBuilder:
 
         self.edges[from_id].add(to_id)
         self.reverse_edges[to_id].add(from_id)
+        self._index.add_edge(from_id, to_id)
 
         self._logger.log(f"Edge added: {from_id} -> {to_id}", level="DEBUG")
 
+    def remove_edge(self, from_id: str, to_id: str) -> None:
+        """Remove a directed edge if present.
+
+        Args:
+            from_id: Dependent node ID.
+            to_id: Dependency node ID.
+        """
+        self.edges.get(from_id, set()).discard(to_id)
+        self.reverse_edges.get(to_id, set()).discard(from_id)
+        if self._index.remove_edge(from_id, to_id):
+            self._logger.log(f"Edge removed: {from_id} -> {to_id}", level="DEBUG")
+
     def get_node(self, node_id: str) -> Optional[CodeNode]:
         """Get node by ID."""
         return self.nodes.get(node_id)
 
+    def get_all_nodes(self) -> List[CodeNode]:
+        """Get all nodes in insertion order."""
+        return list(self.nodes.values())
+
     def get_dependencies(self, node_id: str) -> Set[str]:
         """Get direct dependencies of a node."""
         return self.edges.get(node_id, set()).copy()
@@ -101,97 +171,84 @@ class GraphBuilder:
         node_id: str,
         visited: Optional[Set[str]] = None,
     ) -> Set[str]:
-        """Get all transitive dependencies (recursive).
+        """Get all transitive dependencies.
 
         Mathematical: D*(v) = D(v) union { D*(u) for u in D(v) }
 
+        Memoized; an edit only invalidates the closures it can change.
+
         Args:
             node_id: Node ID.
-            visited: Set of visited nodes (for cycle detection).
+            visited: Nodes to exclude from the traversal (and the result).
 
         Returns:
             Set of all transitive dependency node IDs.
         """
-        if visited is None:
-            visited = set()
-
+        if not visited:
+            return self._index.dependencies_of(node_id)
         if node_id in visited:
             return set()
 
-        visited.add(node_id)
+        # Explicit exclusions cannot use the memo: iterative walk
+        seen = set(visited) | {node_id}
         all_deps: Set[str] = set()
-
-        direct_deps = self.get_dependencies(node_id)
-        all_deps.update(direct_deps)
-
-        for dep_id in direct_deps:
-            transitive_deps = self.get_all_dependencies(dep_id, visited.copy())
-            all_deps.update(transitive_deps)
-
+        stack = [node_id]
+        while stack:
+            for dep_id in self.edges.get(stack.pop(), ()):
+                all_deps.add(dep_id)
+                if dep_id not in seen:
+                    seen.add(dep_id)
+                    stack.append(dep_id)
         return all_deps
 
-    def topological_sort(self) -> List[str]:
-        """Compute topological ordering of nodes (Kahn's algorithm).
+    def get_all_dependents(self, node_id: str) -> Set[str]:
+        """Get all nodes that depend on this node, directly or transitively.
+
+        Args:
+            node_id: Node ID.
 
         Returns:
-            List of node IDs in topological order.
+            Set of all transitive dependent node IDs.
         """
-        in_degree: Dict[str, int] = {nid: 0 for nid in self.nodes}
+        return self._index.dependents_of(node_id)
 
-        for deps in self.edges.values():
-            for dep_id in deps:
-                if dep_id in in_degree:
-                    in_degree[dep_id] += 1
+    def get_impact(self, node_ids: Iterable[str]) -> Set[str]:
+        """Get nodes affected by a change to any of the given nodes.
 
-        queue = [nid for nid, degree in in_degree.items() if degree == 0]
-        result: List[str] = []
+        Args:
+            node_ids: Changed node IDs.
 
-        while queue:
-            node_id = queue.pop(0)
-            result.append(node_id)
+        Returns:
+            Changed nodes plus all their transitive dependents.
+        """
+        impacted: Set[str] = set()
+        for node_id in node_ids:
+            impacted.add(node_id)
+            impacted |= self._index.dependents_of(node_id)
+        return impacted
 
-            for dep_id in self.get_dependents(node_id):
-                in_degree[dep_id] -= 1
-                if in_degree[dep_id] == 0:
-                    queue.append(dep_id)
+    def topological_sort(self) -> List[str]:
+        """Return nodes ordered so that dependencies precede dependents.
 
-        if len(result) != len(self.nodes):
-            self._logger.log("Cycle detected in dependency graph", level="WARNING")
-            remaining = set(self.nodes.keys()) - set(result)
-            result.extend(remaining)
+        The order is maintained across edits rather than recomputed. Nodes on
+        a cycle are grouped together where their cycle would be ordered.
 
-        return result
+        Returns:
+            List of node IDs in topological order.
+        """
+        order = [nid for nid in self._index.order() if nid in self.nodes]
+        if not self._index.acyclic:
+            self._logger.log("Cycle detected in dependency graph", level="WARNING")
+        return order
 
     def detect_cycles(self) -> List[List[str]]:
         """Detect cycles in the dependency graph.
 
         Returns:
-            List of cycles (each cycle is a list of node IDs).
+            One cycle per strongly connected component that has one, as a
+            list of node IDs starting and ending with the same node.
         """
-        cycles: List[List[str]] = []
-        visited: Set[str] = set()
-        rec_stack: Set[str] = set()
-
-        def _dfs(node_id: str, path: List[str]) -> None:
-            visited.add(node_id)
-            rec_stack.add(node_id)
-            path.append(node_id)
-
-            for dep_id in self.get_dependencies(node_id):
-                if dep_id not in visited:
-                    _dfs(dep_id, path.copy())
-                elif dep_id in rec_stack:
-                    cycle_start = path.index(dep_id)
-                    cycle = path[cycle_start:] + [dep_id]
-                    cycles.append(cycle)
-
-            rec_stack.remove(node_id)
-
-        for node_id in self.nodes:
-            if node_id not in visited:
-                _dfs(node_id, [])
-
-        return cycles
+        return self._index.cycles()
 
     def get_connected_components(self) -> List[Set[str]]:
         """Find connected components in the graph (undirected).
@@ -199,28 +256,10 @@ class GraphBuilder:
         Returns:
             List of sets, each containing node IDs in a component.
         """
-        visited: Set[str] = set()
-        components: List[Set[str]] = []
-
-        def _dfs(node_id: str, component: Set[str]) -> None:
-            visited.add(node_id)
-            component.add(node_id)
-
-            for dep_id in self.get_dependencies(node_id):
-                if dep_id not in visited:
-                    _dfs(dep_id, component)
-
-            for dep_id in self.get_dependents(node_id):
-                if dep_id not in visited:
-                    _dfs(dep_id, component)
-
-        for node_id in self.nodes:
-            if node_id not in visited:
-                component: Set[str] = set()
-                _dfs(node_id, component)
-                components.append(component)
-
-        return components
+        return [
+            component for component in self._index.components()
+            if not component.isdisjoint(self.nodes)
+        ]
 
     def get_statistics(self) -> Dict[str, Any]:
         """Return graph statistics."""
@@ -0,0 +1,193 @@
+"""
+PATH: ai/nodal_vectorization/ivf_index.py
+PURPOSE: Approximate nearest-neighbour index (inverted file) over a unit-norm embedding matrix.
+
+Mathematical model:
+- Coarse quantizer: centroids C = {c_1..c_L} from spherical k-means on the rows
+- Inverted lists: list(l) = {i | argmax_j <v_i, c_j> = l}
+- Search: probe the n_probe lists whose centroids score highest against q,
+  then rank only their members exactly: cost ~ L + n * n_probe / L dot products
+  instead of n
+
+DEPENDENCIES:
+- numpy: k-means, batched assignment, candidate scoring
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+_KMEANS_ITERATIONS = 10
+_TRAINING_POINTS_PER_LIST = 64
+_ASSIGN_CHUNK_ROWS = 65536
+# Pending rows are merged into the inverted lists once they exceed this
+# fraction of the indexed rows
+_PENDING_MERGE_FRACTION = 1.0 / 16.0
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Nearest centroid (max inner product) per row, computed in chunks."""
+    labels = np.empty(vectors.shape[0], dtype=np.int64)
+    for start in range(0, vectors.shape[0], _ASSIGN_CHUNK_ROWS):
+        chunk = vectors[start:start + _ASSIGN_CHUNK_ROWS]
+        labels[start:start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+    return labels
+
+
+def spherical_kmeans(
+    vectors: np.ndarray,
+    n_clusters: int,
+    iterations: int = _KMEANS_ITERATIONS,
+    seed: int = 0,
+) -> np.ndarray:
+    """Cluster unit-norm rows by cosine; returns unit-norm centroids.
+
+    Args:
+        vectors: (n, d) matrix of unit-norm rows.
+        n_clusters: Number of centroids (clamped to n).
+        iterations: Lloyd iterations.
+        seed: RNG seed for initialisation and empty-cluster reseeding.
+
+    Returns:
+        (n_clusters, d) float32 centroid matrix.
+    """
+    rng = np.random.default_rng(seed)
+    n = vectors.shape[0]
+    n_clusters = max(1, min(n_clusters, n))
+    centroids = np.array(vectors[rng.choice(n, n_clusters, replace=False)], dtype=np.float32)
+
+    for _ in range(iterations):
+        labels = _assign(vectors, centroids)
+        # Per-cluster sums via one sort and reduceat (np.add.at is slow)
+        order = np.argsort(labels, kind='stable')
+        counts = np.bincount(labels, minlength=n_clusters)
+        present = np.flatnonzero(counts)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[present]
+        sums = np.zeros_like(centroids)
+        sums[present] = np.add.reduceat(vectors[order], starts, axis=0)
+        norms = np.linalg.norm(sums, axis=1)
+        empty = norms == 0
+        if empty.any():
+            # Reseed empty clusters with random rows
+            sums[empty] = vectors[rng.choice(n, int(empty.sum()))]
+            norms[empty] = np.linalg.norm(sums[empty], axis=1)
+        norms[norms == 0] = 1.0
+        centroids = (sums / norms[:, None]).astype(np.float32)
+    return centroids
+
+
+class IVFIndex:
+    """Inverted-file index over rows of an external embedding matrix.
+
+    The index stores only row numbers; vectors are read from the matrix
+    passed to each call, so it never holds a second copy of the embeddings.
+    Rows added after training go to a pending list that is scanned exactly
+    until it is merged into the inverted lists.
+    """
+
+    def __init__(self, n_lists: int, n_probe: int = 8) -> None:
+        """Initialise an untrained index.
+
+        Args:
+            n_lists: Number of inverted lists (k-means clusters).
+            n_probe: Lists scanned per query; higher is slower and more exact.
+        """
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.centroids: Optional[np.ndarray] = None
+        self.labels = np.zeros(0, dtype=np.int64)
+        # CSR layout: rows of list l are order[offsets[l]:offsets[l + 1]]
+        self.order = np.zeros(0, dtype=np.int64)
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self._pending: List[int] = []
+
+    @property
+    def trained(self) -> bool:
+        """Whether the coarse quantizer has been trained."""
+        return self.centroids is not None
+
+    def train(self, matrix: np.ndarray, seed: int = 0) -> None:
+        """Train centroids on a sample of rows and index every row.
+
+        Args:
+            matrix: (n, d) unit-norm embedding matrix.
+            seed: RNG seed.
+        """
+        n = matrix.shape[0]
+        sample_size = min(n, self.n_lists * _TRAINING_POINTS_PER_LIST)
+        rng = np.random.default_rng(seed)
+        sample = matrix[np.sort(rng.choice(n, sample_size, replace=False))]
+        self.centroids = spherical_kmeans(sample, self.n_lists, seed=seed)
+        self.n_lists = self.centroids.shape[0]
+        self.labels = _assign(matrix, self.centroids)
+        self._pending = []
+        self._rebuild_lists()
+
+    def restore(self, centroids: np.ndarray, labels: np.ndarray) -> None:
+        """Rebuild the inverted lists from saved centroids and row labels."""
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.n_lists = self.centroids.shape[0]
+        self.labels = np.array(labels, dtype=np.int64)
+        self._pending = []
+        self._rebuild_lists()
+
+    def add(self, row: int, vector: np.ndarray) -> None:
+        """Assign a new or overwritten row to its nearest list."""
+        label = int(np.argmax(self.centroids @ vector))
+        if row >= len(self.labels):
+            grown = np.full(max(row + 1, 2 * len(self.labels)), -1, dtype=np.int64)
+            grown[:len(self.labels)] = self.labels
+            self.labels = grown
+        self.labels[row] = label
+        self._pending.append(row)
+        if len(self._pending) > _PENDING_MERGE_FRACTION * max(len(self.order), 1):
+            self._rebuild_lists()
+
+    def search(
+        self,
+        matrix: np.ndarray,
+        queries: np.ndarray,
+        top_k: int,
+        valid: Optional[np.ndarray] = None,
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Approximate top-k rows per query.
+
+        Args:
+            matrix: The embedding matrix the index was built over.
+            queries: (m, d) unit-norm query matrix.
+            top_k: Results per query.
+            valid: Optional boolean mask; rows where it is False are skipped.
+
+        Returns:
+            Per query, (rows, scores) sorted by descending inner product.
+        """
+        probe = min(self.n_probe, self.n_lists)
+        list_scores = queries @ self.centroids.T
+        probed = np.argpartition(-list_scores, probe - 1, axis=1)[:, :probe]
+        pending = np.asarray(self._pending, dtype=np.int64)
+
+        results = []
+        for query, lists in zip(queries, probed):
+            parts = [self.order[self.offsets[l]:self.offsets[l + 1]] for l in lists]
+            parts.append(pending)
+            # Overwritten rows may sit in both an old list and the pending list
+            candidates = np.unique(np.concatenate(parts))
+            if valid is not None:
+                candidates = candidates[valid[candidates]]
+            scores = matrix[candidates] @ query
+            if top_k < len(candidates):
+                top = np.argpartition(-scores, top_k - 1)[:top_k]
+            else:
+                top = np.arange(len(candidates))
+            top = top[np.argsort(-scores[top], kind='stable')]
+            results.append((candidates[top], scores[top]))
+        return results
+
+    def _rebuild_lists(self) -> None:
+        indexed = np.flatnonzero(self.labels >= 0)
+        labels = self.labels[indexed]
+        sort = np.argsort(labels, kind='stable')
+        self.order = indexed[sort]
+        counts = np.bincount(labels, minlength=self.n_lists)
+        self.offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        self._pending = []
@@ -3,24 +3,24 @@ PATH: ai/nodal_vectorization/node_analyzer.py
 PURPOSE: Analyse code files and extract structure for node creation.
 
 FLOW:
-┌─────────────┐    ┌─────────┐    ┌──────────┐
-│ Python File │ →  │ AST     │ →  │ CodeNode │
-└─────────────┘    └─────────┘    └──────────┘
+┌─────────────┐    ┌──────────────────────┐    ┌──────────┐
+│ Python File │ →  │ Source facts (cached │ →  │ CodeNode │
+│             │    │ by content hash)     │    │          │
+└─────────────┘    └──────────────────────┘    └──────────┘
 
 DEPENDENCIES:
 - loggers.system_logger: structured logging
 - code_node: node data structures
+- utilities.source_analysis: single-pass AST facts, on-disk cache, process pool
 """
 
-import ast
 from pathlib import Path
-from typing import Any, Dict, List, Set
+from typing import Any, Dict, List, Optional, Set
 
 from loggers.system_logger import SystemLogger
 
 from ai.nodal_vectorization.code_node import CodeNode
-
-_BASE_COMPLEXITY = 1
+from utilities.source_analysis import SourceAnalysisCache, syntax_error_from_facts
 
 
 class NodeAnalyzer:
@@ -33,9 +33,16 @@ class NodeAnalyzer:
     - Relationships between modules
     """
 
-    def __init__(self) -> None:
-        """Initialise node analyser."""
+    def __init__(self, cache_path: Optional[str] = None, max_workers: Optional[int] = None) -> None:
+        """Initialise node analyser.
+
+        Args:
+            cache_path: JSON file persisting per-file analysis across runs
+                (None keeps the cache in memory only).
+            max_workers: Process pool size for files that need parsing.
+        """
         self._logger = SystemLogger()
+        self._cache = SourceAnalysisCache(cache_path, max_workers=max_workers)
         self._logger.log("NodeAnalyzer initialized", level="INFO")
 
     def analyze_file(self, file_path: str) -> CodeNode:
@@ -58,25 +65,37 @@ class NodeAnalyzer:
             raise FileNotFoundError(f"File not found: {file_path}")
 
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            facts = self._cache.get(file_path)
         except Exception as e:
             self._logger.log(f"Error reading file {file_path}: {e}", level="ERROR")
             raise
+        self._cache.save()
 
-        try:
-            tree = ast.parse(content, filename=file_path)
-        except SyntaxError as e:
-            self._logger.log(f"Syntax error in {file_path}: {e}", level="ERROR")
-            raise
+        node = self._node_from_facts(file_path_obj, facts)
+        self._logger.log(
+            f"Analyzed file: {file_path} ({len(node.functions)} functions, {len(node.classes)} classes)",
+            level="INFO",
+        )
+        return node
+
+    def _node_from_facts(self, file_path: Path, facts: Dict[str, Any]) -> CodeNode:
+        """Build a CodeNode from cached source facts.
 
-        functions = self._extract_functions(tree)
-        classes = self._extract_classes(tree)
-        imports = self._extract_imports(tree)
+        Raises:
+            SyntaxError: If the file has invalid Python syntax.
+        """
+        error = syntax_error_from_facts(facts, str(file_path))
+        if error is not None:
+            self._logger.log(f"Syntax error in {file_path}: {error}", level="ERROR")
+            raise error
+
+        functions = list(facts["functions"])
+        classes = list(facts["classes"])
+        imports = set(facts["imports"])
         dependencies = self._extract_dependencies(imports)
 
         node = CodeNode(
-            file_path=str(file_path_obj.absolute()),
+            file_path=str(file_path.absolute()),
             functions=functions,
             classes=classes,
         )
@@ -88,58 +107,22 @@ class NodeAnalyzer:
             node.add_dependency(dep)
 
         metadata: Dict[str, Any] = {
-            "line_count": len(content.splitlines()),
+            "line_count": facts["line_count"],
             "function_count": len(functions),
             "class_count": len(classes),
             "import_count": len(imports),
-            "complexity": self._compute_complexity(tree),
+            "complexity": facts["complexity"],
         }
 
         for key, value in metadata.items():
             node.update_metadata(key, value)
 
-        self._logger.log(
-            f"Analyzed file: {file_path} ({len(functions)} functions, {len(classes)} classes)",
-            level="INFO",
-        )
-
         return node
 
     # ------------------------------------------------------------------
-    # AST extraction helpers
+    # Helpers
     # ------------------------------------------------------------------
 
-    @staticmethod
-    def _extract_functions(tree: ast.AST) -> List[str]:
-        """Extract function names from AST."""
-        functions: List[str] = []
-
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                functions.append(node.name)
-
-        return functions
-
-    @staticmethod
-    def _extract_classes(tree: ast.AST) -> List[str]:
-        """Extract class names from AST."""
-        return [node.name for node in ast.walk(tree) if isinstance(node, ast.ClassDef)]
-
-    @staticmethod
-    def _extract_imports(tree: ast.AST) -> Set[str]:
-        """Extract import statements from AST."""
-        imports: Set[str] = set()
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    imports.add(alias.name)
-            elif isinstance(node, ast.ImportFrom):
-                if node.module:
-                    imports.add(node.module)
-
-        return imports
-
     @staticmethod
     def _extract_dependencies(imports: Set[str]) -> Set[str]:
         """Convert import names to potential node IDs for internal dependencies."""
@@ -152,24 +135,6 @@ class NodeAnalyzer:
 
         return dependencies
 
-    @staticmethod
-    def _compute_complexity(tree: ast.AST) -> int:
-        """Compute cyclomatic complexity.
-
-        Mathematical: C = 1 + number of decision points.
-        """
-        complexity = _BASE_COMPLEXITY
-
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.If, ast.While, ast.For, ast.AsyncFor)):
-                complexity += 1
-            elif isinstance(node, ast.Try):
-                complexity += 1
-            elif isinstance(node, (ast.With, ast.AsyncWith)):
-                complexity += 1
-
-        return complexity
-
     def analyze_directory(self, directory: str, pattern: str = "*.py") -> List[CodeNode]:
         """Analyse all Python files in a directory.
 
@@ -186,11 +151,19 @@ class NodeAnalyzer:
             self._logger.log(f"Directory not found: {directory}", level="ERROR")
             raise FileNotFoundError(f"Directory not found: {directory}")
 
+        file_paths = [path for path in dir_path.rglob(pattern) if path.is_file()]
+        # Unchanged files come from the cache; the rest are parsed in parallel
+        facts_by_path = self._cache.analyze_many(str(path) for path in file_paths)
+        self._cache.save()
+
         nodes: List[CodeNode] = []
-        for file_path in dir_path.rglob(pattern):
+        for file_path in file_paths:
+            facts = facts_by_path.get(str(file_path.absolute()))
+            if facts is None:
+                self._logger.log(f"Error analyzing {file_path}: could not read file", level="WARNING")
+                continue
             try:
-                node = self.analyze_file(str(file_path))
-                nodes.append(node)
+                nodes.append(self._node_from_facts(file_path, facts))
             except Exception as e:
                 self._logger.log(f"Error analyzing {file_path}: {e}", level="WARNING")
                 continue
@@ -3,46 +3,87 @@ PATH: ai/nodal_vectorization/vector_store.py
 PURPOSE: In-memory vector store for node embeddings with similarity search.
 
 Mathematical model:
-- Embeddings: E = {v_i | v_i in R^d, i in V}
-- Similarity: sim(i, j) = cos(v_i, v_j)
-- Nearest neighbour: NN(q, k) = {i | sim(v_i, q) in top k}
+- Embeddings: E = {v_i | v_i in R^d, i in V}, held as one row-normalised
+  float32 matrix U with u_i = v_i / ||v_i|| and the norms kept alongside
+- Similarity: sim(i, j) = cos(v_i, v_j) = <u_i, u_j>
+- Nearest neighbour: NN(q, k) = top-k of U q / ||q||, one matrix-vector
+  product plus a partial sort; a batch of queries is one matrix product
+- Large stores: an inverted-file index (ivf_index) probes only the rows
+  near q's closest centroids
 
 DEPENDENCIES:
 - loggers.system_logger: structured logging
 - code_node: node data structures
+- ivf_index: approximate nearest-neighbour index
 """
 
-from typing import Any, Dict, List, Optional, Tuple
+import json
+import math
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
 from loggers.system_logger import SystemLogger
 
 from ai.nodal_vectorization.code_node import CodeNode
+from ai.nodal_vectorization.ivf_index import IVFIndex
 
 _DEFAULT_EMBEDDING_DIM = 384
+_INITIAL_CAPACITY = 64
+# Stores at least this large build an approximate index on first search
+_DEFAULT_ANN_THRESHOLD = 1_000_000
+_DEFAULT_N_PROBE = 8
+# Upper bound on query-by-row score elements materialised at once
+_MAX_SCORE_BLOCK = 1 << 24
+
+_MATRIX_FILE = "embeddings.npy"
+_NORMS_FILE = "norms.npy"
+_NODES_FILE = "nodes.json"
+_CENTROIDS_FILE = "ivf_centroids.npy"
+_LABELS_FILE = "ivf_labels.npy"
 
 
 class VectorStore:
     """Stores and manages vector embeddings for code nodes.
 
-    Supports cosine-similarity nearest-neighbour search.
+    Supports cosine-similarity nearest-neighbour search, exact or through
+    an optional IVF index, and memory-mapped persistence.
     """
 
-    def __init__(self, embedding_dim: int = _DEFAULT_EMBEDDING_DIM) -> None:
+    def __init__(
+        self,
+        embedding_dim: int = _DEFAULT_EMBEDDING_DIM,
+        ann_threshold: int = _DEFAULT_ANN_THRESHOLD,
+    ) -> None:
         """Initialise vector store.
 
         Args:
             embedding_dim: Dimension of embeddings (default: 384 for sentence-transformers).
+            ann_threshold: Store size from which searches build and use an
+                approximate index automatically.
         """
         self.embedding_dim = embedding_dim
+        self.ann_threshold = ann_threshold
         self._logger = SystemLogger()
-        self.embeddings: Dict[str, np.ndarray] = {}
         self.nodes: Dict[str, CodeNode] = {}
 
+        # Row i of _matrix is the unit vector of node _ids[i]; _norms[i] is
+        # its original norm (0 for an all-zero embedding)
+        self._matrix = np.zeros((0, embedding_dim), dtype=np.float32)
+        self._norms = np.zeros(0, dtype=np.float32)
+        self._ids: List[str] = []
+        self._row_of: Dict[str, int] = {}
+        self._index: Optional[IVFIndex] = None
+
         self._logger.log(f"VectorStore initialized (dim={embedding_dim})", level="INFO")
 
-    def add_node(self, node: CodeNode, embedding: Optional[List[float]] = None) -> None:
+    @property
+    def embeddings(self) -> Dict[str, np.ndarray]:
+        """Snapshot of all embeddings keyed by node ID (copies; prefer get_embedding)."""
+        return {node_id: self._raw(row) for node_id, row in self._row_of.items()}
+
+    def add_node(self, node: CodeNode, embedding: Optional[Sequence[float]] = None) -> None:
         """Add a node to the store.
 
         Args:
@@ -51,25 +92,27 @@ class VectorStore:
         """
         self.nodes[node.node_id] = node
 
-        if embedding:
-            if len(embedding) != self.embedding_dim:
+        if embedding is not None and len(embedding) > 0:
+            vector = np.asarray(embedding, dtype=np.float32).ravel()
+            if vector.shape[0] != self.embedding_dim:
                 self._logger.log(
-                    f"Embedding dimension mismatch: {len(embedding)} != {self.embedding_dim}",
+                    f"Embedding dimension mismatch: {vector.shape[0]} != {self.embedding_dim}",
                     level="WARNING",
                 )
-                if len(embedding) < self.embedding_dim:
-                    embedding = embedding + [0.0] * (self.embedding_dim - len(embedding))
+                if vector.shape[0] < self.embedding_dim:
+                    vector = np.pad(vector, (0, self.embedding_dim - vector.shape[0]))
                 else:
-                    embedding = embedding[: self.embedding_dim]
+                    vector = vector[: self.embedding_dim]
 
-            self.embeddings[node.node_id] = np.array(embedding, dtype=np.float32)
-            node.set_embedding(embedding)
+            self._set_row(node.node_id, vector)
+            node.set_embedding(vector.tolist())
 
         self._logger.log(f"Node added to store: {node.node_id}", level="DEBUG")
 
     def get_embedding(self, node_id: str) -> Optional[np.ndarray]:
         """Get embedding for a node."""
-        return self.embeddings.get(node_id)
+        row = self._row_of.get(node_id)
+        return None if row is None else self._raw(row)
 
     def get_node(self, node_id: str) -> Optional[CodeNode]:
         """Get node by ID."""
@@ -78,7 +121,7 @@ class VectorStore:
     def similarity(self, node_id1: str, node_id2: str) -> float:
         """Compute cosine similarity between two nodes.
 
-        Mathematical: sim(i, j) = (v_i . v_j) / (||v_i|| ||v_j||)
+        Mathematical: sim(i, j) = <u_i, u_j> = (v_i . v_j) / (||v_i|| ||v_j||)
 
         Args:
             node_id1: First node ID.
@@ -87,27 +130,23 @@ class VectorStore:
         Returns:
             Cosine similarity normalised to [0, 1].
         """
-        v1 = self.embeddings.get(node_id1)
-        v2 = self.embeddings.get(node_id2)
+        row1 = self._row_of.get(node_id1)
+        row2 = self._row_of.get(node_id2)
 
-        if v1 is None or v2 is None:
+        if row1 is None or row2 is None:
             return 0.0
-
-        dot_product = np.dot(v1, v2)
-        norm1 = np.linalg.norm(v1)
-        norm2 = np.linalg.norm(v2)
-
-        if norm1 == 0 or norm2 == 0:
+        if self._norms[row1] == 0 or self._norms[row2] == 0:
             return 0.0
 
-        cosine = dot_product / (norm1 * norm2)
-        return float((cosine + 1.0) / 2.0)
+        cosine = float(np.dot(self._matrix[row1], self._matrix[row2]))
+        return (cosine + 1.0) / 2.0
 
     def find_similar(
         self,
         query_embedding: np.ndarray,
         top_k: int = 10,
         threshold: float = 0.0,
+        exact: bool = False,
     ) -> List[Tuple[str, float]]:
         """Find most similar nodes to a query embedding.
 
@@ -117,35 +156,55 @@ class VectorStore:
             query_embedding: Query vector.
             top_k: Number of results to return.
             threshold: Minimum similarity threshold.
+            exact: Scan every row even when an approximate index is in use.
 
         Returns:
             List of (node_id, similarity) tuples sorted descending.
         """
-        if query_embedding.shape[0] != self.embedding_dim:
+        query = np.asarray(query_embedding)
+        if query.ndim != 1 or query.shape[0] != self.embedding_dim:
             self._logger.log("Query embedding dimension mismatch", level="ERROR")
             return []
+        return self.find_similar_batch(query[None, :], top_k, threshold, exact)[0]
 
-        query_norm = np.linalg.norm(query_embedding)
-        if query_norm == 0:
-            return []
-
-        similarities: List[Tuple[str, float]] = []
-
-        for node_id, embedding in self.embeddings.items():
-            embedding_norm = np.linalg.norm(embedding)
-            if embedding_norm == 0:
-                continue
-
-            dot_product = np.dot(query_embedding, embedding)
-            cosine = dot_product / (query_norm * embedding_norm)
-            sim_normalized = float((cosine + 1.0) / 2.0)
-
-            if sim_normalized >= threshold:
-                similarities.append((node_id, sim_normalized))
+    def find_similar_batch(
+        self,
+        query_embeddings: np.ndarray,
+        top_k: int = 10,
+        threshold: float = 0.0,
+        exact: bool = False,
+    ) -> List[List[Tuple[str, float]]]:
+        """Find most similar nodes for each row of a query matrix.
 
-        similarities.sort(key=lambda x: x[1], reverse=True)
+        Args:
+            query_embeddings: (m, d) query matrix.
+            top_k: Number of results per query.
+            threshold: Minimum similarity threshold.
+            exact: Scan every row even when an approximate index is in use.
 
-        return similarities[:top_k]
+        Returns:
+            One result list per query, as returned by find_similar.
+        """
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        if queries.ndim != 2 or queries.shape[1] != self.embedding_dim:
+            self._logger.log("Query embedding dimension mismatch", level="ERROR")
+            return [[] for _ in range(queries.shape[0] if queries.ndim == 2 else 1)]
+
+        query_norms = np.linalg.norm(queries, axis=1)
+        usable = np.flatnonzero(query_norms > 0)
+        results: List[List[Tuple[str, float]]] = [[] for _ in range(queries.shape[0])]
+        if top_k <= 0 or len(usable) == 0 or not self._ids:
+            return results
+
+        unit = queries[usable] / query_norms[usable, None]
+        for position, (rows, scores) in zip(usable, self._search(unit, top_k, exact)):
+            # Clip float32 rounding so an identical vector scores exactly 1
+            similarities = (np.clip(scores.astype(np.float64), -1.0, 1.0) + 1.0) / 2.0
+            keep = similarities >= threshold
+            results[position] = [
+                (self._ids[row], float(sim)) for row, sim in zip(rows[keep], similarities[keep])
+            ]
+        return results
 
     def find_similar_to_node(
         self,
@@ -163,12 +222,12 @@ class VectorStore:
         Returns:
             List of (node_id, similarity) tuples.
         """
-        embedding = self.embeddings.get(node_id)
-        if embedding is None:
+        row = self._row_of.get(node_id)
+        if row is None:
             self._logger.log(f"Node not found: {node_id}", level="WARNING")
             return []
 
-        results = self.find_similar(embedding, top_k + 1, threshold)
+        results = self.find_similar(self._matrix[row], top_k + 1, threshold)
         results = [(nid, sim) for nid, sim in results if nid != node_id]
 
         return results[:top_k]
@@ -187,6 +246,189 @@ class VectorStore:
 
     def clear(self) -> None:
         """Clear all nodes and embeddings."""
-        self.embeddings.clear()
         self.nodes.clear()
+        self._matrix = np.zeros((0, self.embedding_dim), dtype=np.float32)
+        self._norms = np.zeros(0, dtype=np.float32)
+        self._ids = []
+        self._row_of = {}
+        self._index = None
         self._logger.log("VectorStore cleared", level="INFO")
+
+    def build_index(self, n_lists: Optional[int] = None, n_probe: int = _DEFAULT_N_PROBE) -> None:
+        """Train an approximate (IVF) index over the current embeddings.
+
+        Later additions are assigned to the trained lists; searches use
+        the index unless called with exact=True.
+
+        Args:
+            n_lists: Number of inverted lists (default: 4 * sqrt(n)).
+            n_probe: Lists scanned per query.
+        """
+        count = len(self._ids)
+        if count == 0:
+            self._logger.log("Cannot build index on an empty store", level="WARNING")
+            return
+        if n_lists is None:
+            n_lists = max(1, int(4 * math.sqrt(count)))
+        index = IVFIndex(n_lists, n_probe)
+        index.train(self._matrix[:count])
+        self._index = index
+        self._logger.log(
+            f"IVF index built (rows={count}, lists={index.n_lists}, probe={n_probe})",
+            level="INFO",
+        )
+
+    def save(self, directory: Union[str, Path]) -> None:
+        """Save embeddings as .npy files plus node metadata as JSON.
+
+        Args:
+            directory: Target directory (created if missing).
+        """
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        count = len(self._ids)
+        np.save(path / _MATRIX_FILE, self._matrix[:count])
+        np.save(path / _NORMS_FILE, self._norms[:count])
+        if self._index is not None:
+            np.save(path / _CENTROIDS_FILE, self._index.centroids)
+            np.save(path / _LABELS_FILE, self._index.labels[:count])
+        else:
+            # An index from an earlier save would be loaded against new rows
+            for name in (_CENTROIDS_FILE, _LABELS_FILE):
+                (path / name).unlink(missing_ok=True)
+        meta = {
+            "embedding_dim": self.embedding_dim,
+            "ids": self._ids,
+            "n_probe": self._index.n_probe if self._index is not None else None,
+            "nodes": [node.to_dict() for node in self.nodes.values()],
+        }
+        with open(path / _NODES_FILE, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        self._logger.log(f"VectorStore saved to {path} ({count} embeddings)", level="INFO")
+
+    @classmethod
+    def load(
+        cls,
+        directory: Union[str, Path],
+        mmap: bool = True,
+        ann_threshold: int = _DEFAULT_ANN_THRESHOLD,
+    ) -> "VectorStore":
+        """Load a store written by save().
+
+        With mmap=True the embedding matrix is memory-mapped read-only, so
+        opening is constant-time and processes loading the same directory
+        share its pages; the first write copies it into private memory.
+        Loaded nodes do not carry their embedding list; use get_embedding.
+
+        Args:
+            directory: Directory written by save().
+            mmap: Memory-map the embedding matrix instead of reading it.
+            ann_threshold: As in __init__.
+
+        Returns:
+            The loaded VectorStore.
+        """
+        path = Path(directory)
+        with open(path / _NODES_FILE, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+
+        store = cls(meta["embedding_dim"], ann_threshold)
+        mmap_mode = "r" if mmap else None
+        store._matrix = np.load(path / _MATRIX_FILE, mmap_mode=mmap_mode)
+        store._norms = np.load(path / _NORMS_FILE)
+        store._ids = list(meta["ids"])
+        store._row_of = {node_id: row for row, node_id in enumerate(store._ids)}
+
+        for data in meta["nodes"]:
+            node = CodeNode(
+                file_path=data["file_path"],
+                node_id=data["node_id"],
+                dependencies=set(data["dependencies"]),
+                imports=set(data["imports"]),
+                functions=list(data["functions"]),
+                classes=list(data["classes"]),
+                metadata=dict(data["metadata"]),
+                version=data["version"],
+                hash=data["hash"],
+            )
+            store.nodes[node.node_id] = node
+
+        if (path / _CENTROIDS_FILE).exists():
+            index = IVFIndex(0, meta.get("n_probe") or _DEFAULT_N_PROBE)
+            index.restore(np.load(path / _CENTROIDS_FILE), np.load(path / _LABELS_FILE))
+            store._index = index
+
+        store._logger.log(
+            f"VectorStore loaded from {path} ({len(store._ids)} embeddings, mmap={mmap})",
+            level="INFO",
+        )
+        return store
+
+    def _raw(self, row: int) -> np.ndarray:
+        """Original (un-normalised) embedding of a row."""
+        return self._matrix[row] * self._norms[row]
+
+    def _set_row(self, node_id: str, vector: np.ndarray) -> None:
+        """Store a vector as a unit row, appending or overwriting."""
+        row = self._row_of.get(node_id)
+        if row is None:
+            row = len(self._ids)
+            self._reserve(row + 1)
+            self._ids.append(node_id)
+            self._row_of[node_id] = row
+        elif not self._matrix.flags.writeable:
+            self._reserve(len(self._ids))
+
+        norm = float(np.linalg.norm(vector))
+        self._norms[row] = norm
+        self._matrix[row] = vector / norm if norm > 0 else 0.0
+        if self._index is not None:
+            self._index.add(row, self._matrix[row])
+
+    def _reserve(self, rows: int) -> None:
+        """Ensure a writable matrix with room for `rows` rows, doubling capacity."""
+        capacity = self._matrix.shape[0]
+        if rows <= capacity and self._matrix.flags.writeable:
+            return
+        new_capacity = max(rows, _INITIAL_CAPACITY)
+        if rows > capacity:
+            new_capacity = max(new_capacity, 2 * capacity)
+        count = len(self._ids)
+        matrix = np.zeros((new_capacity, self.embedding_dim), dtype=np.float32)
+        matrix[:count] = self._matrix[:count]
+        norms = np.zeros(new_capacity, dtype=np.float32)
+        norms[:count] = self._norms[:count]
+        self._matrix = matrix
+        self._norms = norms
+
+    def _search(
+        self, queries: np.ndarray, top_k: int, exact: bool
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Top-k (rows, cosines) per unit-norm query."""
+        count = len(self._ids)
+        valid = self._norms[:count] > 0
+        if not exact and self._index is None and count >= self.ann_threshold:
+            self.build_index()
+        if not exact and self._index is not None:
+            return self._index.search(self._matrix[:count], queries, top_k, valid)
+
+        matrix = self._matrix[:count]
+        k = min(top_k, int(valid.sum()))
+        results: List[Tuple[np.ndarray, np.ndarray]] = []
+        block = max(1, _MAX_SCORE_BLOCK // max(count, 1))
+        for start in range(0, queries.shape[0], block):
+            scores = queries[start:start + block] @ matrix.T
+            scores[:, ~valid] = -np.inf
+            if k == 0:
+                results.extend((np.zeros(0, dtype=np.int64), np.zeros(0)) for _ in scores)
+                continue
+            if k < count:
+                top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            else:
+                top = np.broadcast_to(np.arange(count), scores.shape)
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            ranking = np.argsort(-top_scores, axis=1, kind="stable")
+            top = np.take_along_axis(top, ranking, axis=1)
+            top_scores = np.take_along_axis(top_scores, ranking, axis=1)
+            results.extend(zip(top, top_scores))
+        return results
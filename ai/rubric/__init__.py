@@ -16,6 +16,7 @@ from ai.rubric.definitions import (
     get_rubric_for_domain,
 )
 from ai.rubric.evaluator import RubricEvaluator, RubricScore, RubricReport
+from ai.rubric.scoring_plan import ScoreMatrix, ScoringPlan
 from ai.rubric.quality_gate import QualityGate, GateDecision, GateVerdict
 
 __all__ = [
@@ -28,6 +29,8 @@ __all__ = [
     "RubricEvaluator",
     "RubricScore",
     "RubricReport",
+    "ScoreMatrix",
+    "ScoringPlan",
     "QualityGate",
     "GateDecision",
     "GateVerdict",
@@ -19,23 +19,31 @@ FLOW:
 
 DEPENDENCIES:
 - ai.rubric.definitions: Rubric structures
+- ai.rubric.scoring_plan: Compiled rubric, shared per-response scans
 - validators.code_validator: For programmatic code checks
-- re, ast: For programmatic content analysis
+- re: For programmatic content analysis
 """
 
 import re
-import ast
 import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 from datetime import datetime
 
 from ai.rubric.definitions import (
     Rubric,
     RubricDimension,
-    RubricQuestion,
     PHYSICS_RUBRIC,
 )
+from ai.rubric.scoring_plan import (
+    KeywordPattern,
+    QuestionScorer,
+    ResponseText,
+    ScoreMatrix,
+    ScoringPlan,
+)
 
 
 @dataclass
@@ -135,6 +143,158 @@ def _score_to_grade(score: float) -> str:
         return "F"
 
 
+# ============================================================
+# PATTERNS (compiled once, shared by every evaluator)
+# ============================================================
+
+def _p(pattern: str, flags: int = 0) -> KeywordPattern:
+    return KeywordPattern(pattern, flags)
+
+
+_I = re.IGNORECASE
+
+# Programmatic checks
+_UNIT_PATTERNS = [
+    _p(r'\b(?:m|kg|s|A|K|mol|cd|N|J|W|Pa|Hz|V|F|C|T|H|lm|lx|Bq|Gy|Sv)\b', _I),
+    _p(r'\b(?:meter|kilogram|second|ampere|kelvin|joule|watt|newton)\b', _I),
+    _p(r'\b(?:eV|MeV|GeV|TeV)\b', _I),
+    _p(r'(?:m/s|kg\*m|N\*m|J/s)', _I),
+    _p(r'\b(?:ergs?|dynes?|gauss)\b', _I),
+]
+_DIMENSIONAL = _p(r'dimension|unit[s]?\s+(?:of|are|is)|SI\s+unit|CGS|natural\s+units', _I)
+_BARE_NUMBER = _p(r'(?<!\[art_)(?<!\w)\d+\.?\d*(?!\w)')
+
+_CONSERVATION_PATTERNS = [
+    _p(r'conserv\w+\s+(?:of\s+)?(?:energy|momentum|charge|mass|angular|baryon|lepton)', _I),
+    _p(r'(?:energy|momentum|charge)\s+(?:is\s+)?conserv', _I),
+    _p(r'total\s+(?:energy|momentum)\s+(?:remains|unchanged|constant)', _I),
+    _p(r'Noether|symmetry.*conserv|conserv.*symmetry', _I),
+]
+_CONSERVATION_VERIFIED = _p(
+    r'verify|check|confirm|validated|conservation\s+(?:holds|satisfied|respected)', _I
+)
+
+_LATEX_INLINE = _p(r'\$[^$]+\$')
+_LATEX_DISPLAY = _p(r'\$\$[^$]+\$\$')
+_LATEX_COMMANDS = _p(r'\\(?:frac|sqrt|int|sum|partial|nabla|vec|hat|dot|ddot)')
+_ESCAPED_INLINE = _p(r'\\\([^)]+\\\)')
+_ESCAPED_DISPLAY = _p(r'\\\[[^\]]+\\\]')
+_HEADERS = _p(r'^#{1,6}\s', re.MULTILINE)
+_BOLD = _p(r'\*\*[^*]+\*\*')
+_BULLETS = _p(r'^[\s]*[-*]\s', re.MULTILINE)
+
+_ARTEFACT_REF = _p(r'\[art_[a-f0-9]+\]')
+_EQUATION_REF = _p(
+    r'(?:equation|eq\.|Eq\.|formula|law|theorem|principle|lemma)\s*(?:\(?\d+\)?|\[[\w.]+\])', _I
+)
+_NAMED_REF = _p(
+    r"(?:Newton|Einstein|Maxwell|Schr[oö]dinger|Dirac|Boltzmann|Lagrange|Hamilton|Euler|Gauss|Faraday|Ampere|Coulomb|Planck|Heisenberg|Bohr|Feynman)'s?\s+(?:law|equation|principle|theorem|constant|formula)",
+    _I,
+)
+_WORD_NUMBER = _p(r'(?<!\[art_)\b\d+\.?\d*\b')
+
+_DANGEROUS_PATTERNS = [
+    _p(r'\beval\b'), _p(r'\bexec\b'), _p(r'\bos\.'),
+    _p(r'\bsubprocess\b'), _p(r'\b__import__\b'),
+    _p(r'\bopen\s*\('), _p(r'\bsystem\s*\('),
+]
+_INPUT_VALIDATION = _p(r'(?:isinstance|assert|raise|ValueError|TypeError|if\s+not)')
+
+# Heuristics
+_LAW_PATTERNS = [
+    _p(r"Newton's\s+(?:first|second|third|law)", _I),
+    _p(r"conservation\s+of\s+(?:energy|momentum|angular|charge|mass)", _I),
+    _p(r"Maxwell's\s+equations?", _I),
+    _p(r"Schr[oö]dinger\s+equation", _I),
+    _p(r"Einstein\s+field\s+equations?", _I),
+    _p(r"E\s*=\s*mc\^?2", _I),
+    _p(r"F\s*=\s*ma", _I),
+    _p(r"Lagrangian|Hamiltonian|action\s+principle", _I),
+    _p(r"Boltzmann|partition\s+function|entropy", _I),
+    _p(r"Coulomb|Gauss|Faraday|Ampere", _I),
+]
+_APPLICABILITY = _p(r'valid\s+(?:when|for|in)|regime|approximation|limit', _I)
+
+_ASSUMPTION_PATTERNS = [
+    _p(r'assum\w+', _I),
+    _p(r'(?:we|let\s+us)\s+(?:assume|consider|suppose)', _I),
+    _p(r'neglect\w*|ignor\w*|approximat\w*', _I),
+    _p(r'ideal\w*|perfect\w*|frictionless|massless', _I),
+    _p(r'small\s+angle|linear\w*\s+regime', _I),
+    _p(r'valid\s+(?:when|for|if)', _I),
+]
+_JUSTIFICATION = _p(r'because|since|(?:this|which)\s+is\s+valid|justified', _I)
+
+_STEP_MARKERS = _p(
+    r'(?:^|\n)\s*(?:\d+[\.):]|step\s+\d|therefore|thus|hence|it follows|substitut|rearrang)',
+    _I | re.MULTILINE,
+)
+_MATH_EXPRESSION = _p(r'\$[^$]+\$|\\\([^)]+\\\)')
+_EQUALS = _p(r'=')
+
+_HAS_LATEX = _p(r'\$|\\[a-zA-Z]+')
+_DEFINED = _p(r'(?:where|let|define)\s+\$?\\?\w+', _I)
+
+_BOUNDARY_TERMS = _p(
+    r'boundary|initial\s+condition|limit(?:ing)?|special\s+case|edge\s+case|(?:as|when)\s+\w+\s*(?:→|->|approaches)',
+    _I,
+)
+
+_FIRST_PRINCIPLES = _p(
+    r'first\s+principle|fundament\w+|axiom|postulat|start(?:ing)?\s+from|begin(?:ning)?\s+with|deriv(?:e|ation)',
+    _I,
+)
+_REASONING_CHAIN = _p(
+    r'(?:therefore|thus|hence|it follows|this gives|this leads|which means|combining|substituting)',
+    _I,
+)
+_NUMBERED_STEP = _p(r'(?:^|\n)\s*\d+[\.):]', re.MULTILINE)
+
+_EXPLANATION_MARKERS = _p(
+    r'(?:in other words|this means|intuitively|physically|think of|imagine|like|analogy|simply put|basically)',
+    _I,
+)
+_SENTENCE_END = _p(r'[.!?]\s')
+
+_LIST_ITEMS = _p(r'^[\s]*[-*\d.]+\s', re.MULTILINE)
+
+_PHYSICS_LIBS = _p(r'numpy|scipy|sympy|matplotlib')
+_CODE_COMMENTS = _p(r'#\s+\S')
+_TRIPLE_QUOTE = _p(r'"""')
+_TYPE_HINTS = _p(r':\s*(?:int|float|str|List|Dict|Optional)')
+
+_INSIGHT_MARKERS = _p(
+    r'physic\w+\s+(?:meaning|interpretation|significance|insight|intuition)|'
+    r'what\s+this\s+(?:means|tells|shows)|'
+    r'the\s+key\s+(?:insight|idea|concept)|'
+    r'notice\s+that|importantly|remarkably|interestingly',
+    _I,
+)
+
+_CONNECTION_PATTERNS = [
+    _p(r'relat(?:ed|ion|es)\s+to', _I),
+    _p(r'connect\w+\s+(?:to|with)', _I),
+    _p(r'(?:special|limiting)\s+case', _I),
+    _p(r'general(?:iz\w+)?', _I),
+    _p(r'(?:quantum|classical|relativistic)\s+limit', _I),
+    _p(r'analogous|similar\s+to|just\s+like', _I),
+    _p(r'broader|wider|deeper\s+(?:context|implications|significance)', _I),
+]
+
+_VERIFICATION_PATTERNS = [
+    _p(r'dimensional\s+analysis|dimensions?\s+check', _I),
+    _p(r'(?:limiting|special)\s+case|(?:as|when)\s+\w+\s*(?:→|->|approaches)\s*(?:0|infinity|∞)', _I),
+    _p(r'sanity\s+check|cross.?check|verif\w+|validat\w+', _I),
+    _p(r'order\s+of\s+magnitude', _I),
+    _p(r'consistent\s+with|agrees?\s+with|matches', _I),
+    _p(r'known\s+result|expected|recover', _I),
+]
+
+# Batches at least this large are scored in a process pool
+PARALLEL_THRESHOLD = 256
+_BATCH_CHUNK_SIZE = 64
+
+
 class RubricEvaluator:
     """
     Evaluates AI responses against rubrics.
@@ -146,8 +306,14 @@ class RubricEvaluator:
     
     The combination follows the LLM-Rubric insight that calibrated
     multi-signal scoring outperforms single-method evaluation.
+    
+    The rubric is compiled once into a ScoringPlan; evaluate() scores one
+    response, score_batch() scores many into a ScoreMatrix.
     """
     
+    # Number of prepared responses kept for re-evaluation (gate retries)
+    TEXT_CACHE_SIZE = 128
+    
     def __init__(self, rubric: Optional[Rubric] = None):
         """
         Initialize evaluator.
@@ -157,15 +323,49 @@ class RubricEvaluator:
         """
         self.rubric = rubric or PHYSICS_RUBRIC
         
-        # Registry of programmatic evaluators
+        # Registry of programmatic evaluators: question id -> (check, confidence)
         self._programmatic_evaluators = {
-            "pa_units_dimensions": self._check_units_dimensions,
-            "pa_conservation": self._check_conservation_mentions,
-            "ec_visual_math": self._check_math_formatting,
-            "pv_sources": self._check_source_references,
-            "pv_artefact_coverage": self._check_artefact_coverage,
-            "cq_safety": self._check_code_safety,
+            "pa_units_dimensions": (self._check_units_dimensions, 0.85),
+            "pa_conservation": (self._check_conservation_mentions, 0.8),
+            "ec_visual_math": (self._check_math_formatting, 0.9),
+            "pv_sources": (self._check_source_references, 0.85),
+            "pv_artefact_coverage": (self._check_artefact_coverage, 0.9),
+            "cq_safety": (self._check_code_safety, 0.95),
+        }
+        
+        # Registry of heuristic evaluators (questions not listed score 2)
+        self._heuristic_evaluators = {
+            # Physics accuracy heuristics
+            "pa_fundamental_laws": self._heur_fundamental_laws,
+            "pa_assumptions": self._heur_assumptions,
+            # Math rigor heuristics
+            "mr_derivation_validity": self._heur_derivation,
+            "mr_notation_consistency": self._heur_notation,
+            "mr_boundary_conditions": self._heur_boundaries,
+            # Explanation clarity heuristics
+            "ec_first_principles": self._heur_first_principles,
+            "ec_plain_language": self._heur_plain_language,
+            "ec_structure": self._heur_structure,
+            # Code quality heuristics
+            "cq_correctness": self._heur_code_correctness,
+            "cq_readability": self._heur_code_readability,
+            # Pedagogical heuristics
+            "pv_insight": self._heur_insight,
+            "pv_connections": self._heur_connections,
+            "pv_verification": self._heur_verification,
         }
+        
+        scorers = {
+            qid: QuestionScorer(check, "programmatic", confidence)
+            for qid, (check, confidence) in self._programmatic_evaluators.items()
+        }
+        for qid, heuristic in self._heuristic_evaluators.items():
+            scorers.setdefault(qid, QuestionScorer(heuristic, "heuristic", 0.6))
+        self.plan = ScoringPlan(
+            self.rubric, scorers, default=QuestionScorer(self._heur_default, "heuristic", 0.6)
+        )
+        
+        self._texts: "OrderedDict[Tuple[str, Optional[str], bool], ResponseText]" = OrderedDict()
     
     def evaluate(
         self,
@@ -190,24 +390,13 @@ class RubricEvaluator:
         """
         start_time = time.time()
         
-        context = {
-            "content": content or "",
-            "query": query or "",
-            "code": code,
-            "artefacts": artefacts or [],
-            "reasoning": reasoning,
-            "has_code": bool(code) or self._detect_code_blocks(content or ""),
-        }
+        text = self._prepare(content, code, artefacts)
         
-        # Score each question
+        # Score each question (code questions are skipped if no code present)
         question_scores: List[RubricScore] = []
-        for question in self.rubric.questions:
-            # Skip code questions if no code present
-            if question.dimension == RubricDimension.CODE_QUALITY and not context["has_code"]:
-                continue
-            
-            score = self._evaluate_question(question, context)
-            question_scores.append(score)
+        for index, result in enumerate(self.plan.score(text)):
+            if result is not None:
+                question_scores.append(self._make_score(index, *result))
         
         # Aggregate by dimension
         dimensions = self._aggregate_dimensions(question_scores)
@@ -242,357 +431,220 @@ class RubricEvaluator:
             suggestions=suggestions,
         )
     
-    def _evaluate_question(
-        self, question: RubricQuestion, context: Dict[str, Any]
-    ) -> RubricScore:
-        """Evaluate a single rubric question."""
+    def score_batch(
+        self,
+        responses: Sequence[Union[str, Dict[str, Any]]],
+        max_workers: Optional[int] = None,
+    ) -> ScoreMatrix:
+        """
+        Score many responses at once.
         
-        # Try programmatic evaluation first
-        if question.id in self._programmatic_evaluators:
-            return self._programmatic_evaluators[question.id](question, context)
+        Batches of PARALLEL_THRESHOLD or more are spread over a process
+        pool; each worker compiles the plan once.
         
-        # Fall back to heuristic evaluation
-        return self._heuristic_evaluate(question, context)
-    
-    # ================================================================
-    # HEURISTIC EVALUATORS (fast, no LLM needed)
-    # ================================================================
-    
-    def _heuristic_evaluate(
-        self, question: RubricQuestion, context: Dict[str, Any]
-    ) -> RubricScore:
-        """
-        Heuristic evaluation based on content analysis.
+        Args:
+            responses: Response texts, or dicts with "content" and optional
+                "code" / "artefacts" (other evaluate() arguments are ignored)
+            max_workers: Process pool size (None = CPU count, 1 = inline)
         
-        Uses keyword matching, structural analysis, and pattern
-        detection to approximate quality scores.
+        Returns:
+            ScoreMatrix of responses x rubric questions
         """
-        content = context["content"]
-        question_id = question.id
-        max_score = question.max_score
-        
-        # Physics accuracy heuristics
-        if question_id == "pa_fundamental_laws":
-            score = self._heur_fundamental_laws(content)
-        elif question_id == "pa_assumptions":
-            score = self._heur_assumptions(content)
-        # Math rigor heuristics
-        elif question_id == "mr_derivation_validity":
-            score = self._heur_derivation(content)
-        elif question_id == "mr_notation_consistency":
-            score = self._heur_notation(content)
-        elif question_id == "mr_boundary_conditions":
-            score = self._heur_boundaries(content)
-        # Explanation clarity heuristics
-        elif question_id == "ec_first_principles":
-            score = self._heur_first_principles(content)
-        elif question_id == "ec_plain_language":
-            score = self._heur_plain_language(content)
-        elif question_id == "ec_structure":
-            score = self._heur_structure(content)
-        # Code quality heuristics
-        elif question_id == "cq_correctness":
-            score = self._heur_code_correctness(context.get("code", ""), content)
-        elif question_id == "cq_readability":
-            score = self._heur_code_readability(context.get("code", ""), content)
-        # Pedagogical heuristics
-        elif question_id == "pv_insight":
-            score = self._heur_insight(content)
-        elif question_id == "pv_connections":
-            score = self._heur_connections(content)
-        elif question_id == "pv_verification":
-            score = self._heur_verification(content)
-        else:
-            # Default: moderate score with low confidence
-            score = 2
-        
-        # Clamp to valid range
-        score = max(0, min(max_score, score))
-        normalized = score / max_score if max_score > 0 else 0.0
-        
-        # Find matching level
-        level_label = "Unknown"
-        explanation = "Heuristic evaluation"
-        for level in question.levels:
-            if level.score == score:
-                level_label = level.label
-                explanation = level.description
-                break
+        items = [
+            (r, None, None) if isinstance(r, str)
+            else (r.get("content", ""), r.get("code"), r.get("artefacts"))
+            for r in responses
+        ]
         
-        return RubricScore(
-            question_id=question.id,
-            question_text=question.question,
-            dimension=question.dimension,
-            score=normalized,
-            raw_score=score,
-            max_score=max_score,
-            level_label=level_label,
-            explanation=explanation,
-            evaluation_method="heuristic",
-            confidence=0.6,
-        )
+        rows: Optional[List[List[Optional[int]]]] = None
+        if len(items) >= PARALLEL_THRESHOLD and max_workers != 1:
+            chunks = [
+                items[i:i + _BATCH_CHUNK_SIZE]
+                for i in range(0, len(items), _BATCH_CHUNK_SIZE)
+            ]
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    initializer=_init_batch_worker,
+                    initargs=(self.rubric,),
+                ) as pool:
+                    rows = [row for chunk in pool.map(_score_batch_chunk, chunks) for row in chunk]
+            except (OSError, NotImplementedError, RuntimeError):
+                rows = None  # No process support here (e.g. sandboxed); score inline
+        if rows is None:
+            rows = [self.plan.raw_scores(ResponseText(*item)) for item in items]
+        
+        return self.plan.matrix(rows)
+    
+    def _prepare(
+        self,
+        content: str,
+        code: Optional[str],
+        artefacts: Optional[List[Dict]],
+    ) -> ResponseText:
+        """ResponseText for a response, reusing recent ones (scans are memoized)."""
+        content = content or ""
+        key = (content, code, bool(artefacts))
+        text = self._texts.get(key)
+        if text is None:
+            text = ResponseText(content, code, artefacts)
+            self._texts[key] = text
+            if len(self._texts) > self.TEXT_CACHE_SIZE:
+                self._texts.popitem(last=False)
+        else:
+            self._texts.move_to_end(key)
+        return text
     
     # ================================================================
     # PROGRAMMATIC EVALUATORS (reliable, measurable)
     # ================================================================
     
-    def _check_units_dimensions(
-        self, question: RubricQuestion, context: Dict[str, Any]
-    ) -> RubricScore:
+    def _check_units_dimensions(self, text: ResponseText) -> int:
         """Check for proper units and dimensional analysis."""
-        content = context["content"]
+        content = text.content
         
         # Look for unit patterns
-        unit_patterns = [
-            r'\b(?:m|kg|s|A|K|mol|cd|N|J|W|Pa|Hz|V|F|C|T|H|lm|lx|Bq|Gy|Sv)\b',
-            r'\b(?:meter|kilogram|second|ampere|kelvin|joule|watt|newton)\b',
-            r'\b(?:eV|MeV|GeV|TeV)\b',
-            r'(?:m/s|kg\*m|N\*m|J/s)',
-            r'\b(?:ergs?|dynes?|gauss)\b',
-        ]
-        
-        unit_count = sum(
-            len(re.findall(p, content, re.IGNORECASE))
-            for p in unit_patterns
-        )
+        unit_count = sum(content.count(p) for p in _UNIT_PATTERNS)
         
         # Check for dimensional analysis keywords
-        has_dimensional = bool(re.search(
-            r'dimension|unit[s]?\s+(?:of|are|is)|SI\s+unit|CGS|natural\s+units',
-            content, re.IGNORECASE
-        ))
+        has_dimensional = content.search(_DIMENSIONAL)
         
         # Numbers present without units?
-        numbers = re.findall(r'(?<!\[art_)(?<!\w)\d+\.?\d*(?!\w)', content)
-        numbers_count = len(numbers)
+        numbers_count = content.count(_BARE_NUMBER)
         
         if unit_count >= 5 and has_dimensional:
-            raw_score = 4
+            return 4
         elif unit_count >= 3:
-            raw_score = 3
+            return 3
         elif unit_count >= 1:
-            raw_score = 2
+            return 2
         elif numbers_count > 3:
-            raw_score = 1  # Numbers without units
-        else:
-            raw_score = 2  # No numbers needed (qualitative)
-        
-        return self._make_score(question, raw_score, "programmatic", 0.85)
+            return 1  # Numbers without units
+        return 2  # No numbers needed (qualitative)
     
-    def _check_conservation_mentions(
-        self, question: RubricQuestion, context: Dict[str, Any]
-    ) -> RubricScore:
+    def _check_conservation_mentions(self, text: ResponseText) -> int:
         """Check for conservation law awareness."""
-        content = context["content"]
+        content = text.content
         
-        conservation_patterns = [
-            r'conserv\w+\s+(?:of\s+)?(?:energy|momentum|charge|mass|angular|baryon|lepton)',
-            r'(?:energy|momentum|charge)\s+(?:is\s+)?conserv',
-            r'total\s+(?:energy|momentum)\s+(?:remains|unchanged|constant)',
-            r'Noether|symmetry.*conserv|conserv.*symmetry',
-        ]
-        
-        matches = sum(
-            len(re.findall(p, content, re.IGNORECASE))
-            for p in conservation_patterns
-        )
+        matches = sum(content.count(p) for p in _CONSERVATION_PATTERNS)
         
         # Also check for explicit verification
-        has_verification = bool(re.search(
-            r'verify|check|confirm|validated|conservation\s+(?:holds|satisfied|respected)',
-            content, re.IGNORECASE
-        ))
+        has_verification = content.search(_CONSERVATION_VERIFIED)
         
         if matches >= 3 and has_verification:
-            raw_score = 4
+            return 4
         elif matches >= 2:
-            raw_score = 3
+            return 3
         elif matches >= 1:
-            raw_score = 2
-        else:
-            # Not all problems need conservation checks
-            raw_score = 2
-        
-        return self._make_score(question, raw_score, "programmatic", 0.8)
+            return 2
+        # Not all problems need conservation checks
+        return 2
     
-    def _check_math_formatting(
-        self, question: RubricQuestion, context: Dict[str, Any]
-    ) -> RubricScore:
+    def _check_math_formatting(self, text: ResponseText) -> int:
         """Check for proper LaTeX/math formatting."""
-        content = context["content"]
-        
-        # LaTeX patterns
-        latex_inline = len(re.findall(r'\$[^$]+\$', content))
-        latex_display = len(re.findall(r'\$\$[^$]+\$\$', content))
-        latex_commands = len(re.findall(r'\\(?:frac|sqrt|int|sum|partial|nabla|vec|hat|dot|ddot)', content))
-        # Escaped LaTeX
-        escaped_inline = len(re.findall(r'\\\([^)]+\\\)', content))
-        escaped_display = len(re.findall(r'\\\[[^\]]+\\\]', content))
-        
-        total_math = latex_inline + latex_display + latex_commands + escaped_inline + escaped_display
+        content = text.content
+        
+        # LaTeX patterns (plain and escaped)
+        total_math = (
+            content.count(_LATEX_INLINE)
+            + content.count(_LATEX_DISPLAY)
+            + content.count(_LATEX_COMMANDS)
+            + content.count(_ESCAPED_INLINE)
+            + content.count(_ESCAPED_DISPLAY)
+        )
         
         # Markdown formatting
-        has_headers = bool(re.search(r'^#{1,6}\s', content, re.MULTILINE))
-        has_bold = bool(re.search(r'\*\*[^*]+\*\*', content))
-        has_lists = bool(re.search(r'^[\s]*[-*]\s', content, re.MULTILINE))
-        
-        format_features = sum([has_headers, has_bold, has_lists])
+        format_features = sum([
+            content.search(_HEADERS), content.search(_BOLD), content.search(_BULLETS),
+        ])
         
         if total_math >= 5 and format_features >= 2:
-            raw_score = 4
+            return 4
         elif total_math >= 3 or (total_math >= 1 and format_features >= 2):
-            raw_score = 3
+            return 3
         elif total_math >= 1 or format_features >= 1:
-            raw_score = 2
+            return 2
         elif len(content) > 200:
-            raw_score = 1  # Long content with no formatting
-        else:
-            raw_score = 2  # Short content may not need formatting
-        
-        return self._make_score(question, raw_score, "programmatic", 0.9)
+            return 1  # Long content with no formatting
+        return 2  # Short content may not need formatting
     
-    def _check_source_references(
-        self, question: RubricQuestion, context: Dict[str, Any]
-    ) -> RubricScore:
+    def _check_source_references(self, text: ResponseText) -> int:
         """Check for source references and citations."""
-        content = context["content"]
-        
-        # Artefact references
-        artefact_refs = len(re.findall(r'\[art_[a-f0-9]+\]', content))
-        
-        # Equation references
-        equation_refs = len(re.findall(
-            r'(?:equation|eq\.|Eq\.|formula|law|theorem|principle|lemma)\s*(?:\(?\d+\)?|\[[\w.]+\])',
-            content, re.IGNORECASE
-        ))
-        
-        # Named physics references
-        named_refs = len(re.findall(
-            r"(?:Newton|Einstein|Maxwell|Schr[oö]dinger|Dirac|Boltzmann|Lagrange|Hamilton|Euler|Gauss|Faraday|Ampere|Coulomb|Planck|Heisenberg|Bohr|Feynman)'s?\s+(?:law|equation|principle|theorem|constant|formula)",
-            content, re.IGNORECASE
-        ))
+        content = text.content
         
-        total_refs = artefact_refs + equation_refs + named_refs
+        # Artefact, equation and named physics references
+        total_refs = (
+            content.count(_ARTEFACT_REF)
+            + content.count(_EQUATION_REF)
+            + content.count(_NAMED_REF)
+        )
         
         if total_refs >= 5:
-            raw_score = 4
+            return 4
         elif total_refs >= 3:
-            raw_score = 3
+            return 3
         elif total_refs >= 1:
-            raw_score = 2
+            return 2
         elif len(content) > 300:
-            raw_score = 1  # Long answer with no references
-        else:
-            raw_score = 2
-        
-        return self._make_score(question, raw_score, "programmatic", 0.85)
+            return 1  # Long answer with no references
+        return 2
     
-    def _check_artefact_coverage(
-        self, question: RubricQuestion, context: Dict[str, Any]
-    ) -> RubricScore:
+    def _check_artefact_coverage(self, text: ResponseText) -> int:
         """Check artefact ID coverage for numeric values."""
-        content = context["content"]
-        artefacts = context.get("artefacts", [])
+        content = text.content
         
-        artefact_refs = re.findall(r'\[art_[a-f0-9]+\]', content)
-        numbers = re.findall(r'(?<!\[art_)\b\d+\.?\d*\b', content)
-        
-        ref_count = len(artefact_refs)
-        num_count = len(numbers)
+        ref_count = content.count(_ARTEFACT_REF)
+        numbers = content.findall(_WORD_NUMBER)
         
         # Filter trivial numbers (1, 2, 3 which are often step numbers)
         significant_numbers = [n for n in numbers if float(n) not in range(0, 10) or '.' in n]
         sig_count = len(significant_numbers)
         
         if ref_count > 0 and sig_count == 0:
-            raw_score = 4  # All numbers backed
+            return 4  # All numbers backed
         elif ref_count > 0 and ref_count >= sig_count:
-            raw_score = 4
+            return 4
         elif ref_count > 0:
-            raw_score = 3
+            return 3
         elif sig_count == 0:
-            raw_score = 3  # No significant numbers, no refs needed
-        elif len(artefacts) > 0:
-            raw_score = 2  # Artefacts exist but not referenced
-        else:
-            raw_score = 1
-        
-        return self._make_score(question, raw_score, "programmatic", 0.9)
+            return 3  # No significant numbers, no refs needed
+        elif len(text.artefacts) > 0:
+            return 2  # Artefacts exist but not referenced
+        return 1
     
-    def _check_code_safety(
-        self, question: RubricQuestion, context: Dict[str, Any]
-    ) -> RubricScore:
+    def _check_code_safety(self, text: ResponseText) -> Union[int, Tuple[int, float]]:
         """Check code safety using AST analysis."""
-        code = context.get("code") or ""
-        content = context["content"]
+        code = text.code
         
-        # Extract code blocks from content if no separate code
-        if not code:
-            code_blocks = re.findall(r'```(?:python)?\n(.*?)```', content, re.DOTALL)
-            code = '\n'.join(code_blocks)
-        
-        if not code.strip():
-            return self._make_score(question, 3, "programmatic", 0.9)
+        if not code.text.strip():
+            return 3, 0.9
         
         # Basic safety checks
-        dangerous_patterns = [
-            r'\beval\b', r'\bexec\b', r'\bos\.',
-            r'\bsubprocess\b', r'\b__import__\b',
-            r'\bopen\s*\(', r'\bsystem\s*\(',
-        ]
-        
-        danger_count = sum(
-            len(re.findall(p, code))
-            for p in dangerous_patterns
-        )
-        
-        # Try AST parse
-        try:
-            ast.parse(code)
-            has_syntax_error = False
-        except SyntaxError:
-            has_syntax_error = True
+        danger_count = sum(code.count(p) for p in _DANGEROUS_PATTERNS)
         
-        if has_syntax_error:
-            raw_score = 1
+        if not text.code_parses:
+            return 1
         elif danger_count >= 2:
-            raw_score = 0
+            return 0
         elif danger_count == 1:
-            raw_score = 1
-        else:
-            # Check for input validation
-            has_validation = bool(re.search(
-                r'(?:isinstance|assert|raise|ValueError|TypeError|if\s+not)',
-                code
-            ))
-            raw_score = 4 if has_validation else 3
-        
-        return self._make_score(question, raw_score, "programmatic", 0.95)
+            return 1
+        # Check for input validation
+        return 4 if code.search(_INPUT_VALIDATION) else 3
     
     # ================================================================
-    # HEURISTIC HELPERS
+    # HEURISTIC EVALUATORS (fast, no LLM needed)
     # ================================================================
     
-    def _heur_fundamental_laws(self, content: str) -> int:
+    def _heur_default(self, text: ResponseText) -> int:
+        """Default: moderate score with low confidence."""
+        return 2
+    
+    def _heur_fundamental_laws(self, text: ResponseText) -> int:
         """Heuristic: Are fundamental laws correctly cited?"""
-        law_patterns = [
-            r"Newton's\s+(?:first|second|third|law)",
-            r"conservation\s+of\s+(?:energy|momentum|angular|charge|mass)",
-            r"Maxwell's\s+equations?",
-            r"Schr[oö]dinger\s+equation",
-            r"Einstein\s+field\s+equations?",
-            r"E\s*=\s*mc\^?2",
-            r"F\s*=\s*ma",
-            r"Lagrangian|Hamiltonian|action\s+principle",
-            r"Boltzmann|partition\s+function|entropy",
-            r"Coulomb|Gauss|Faraday|Ampere",
-        ]
-        matches = sum(1 for p in law_patterns if re.search(p, content, re.IGNORECASE))
+        content = text.content
+        matches = sum(1 for p in _LAW_PATTERNS if content.search(p))
         
-        has_applicability = bool(re.search(
-            r'valid\s+(?:when|for|in)|regime|approximation|limit',
-            content, re.IGNORECASE
-        ))
+        has_applicability = content.search(_APPLICABILITY)
         
         if matches >= 3 and has_applicability:
             return 4
@@ -604,22 +656,12 @@ class RubricEvaluator:
             return 1
         return 2
     
-    def _heur_assumptions(self, content: str) -> int:
+    def _heur_assumptions(self, text: ResponseText) -> int:
         """Heuristic: Are assumptions stated?"""
-        assumption_patterns = [
-            r'assum\w+',
-            r'(?:we|let\s+us)\s+(?:assume|consider|suppose)',
-            r'neglect\w*|ignor\w*|approximat\w*',
-            r'ideal\w*|perfect\w*|frictionless|massless',
-            r'small\s+angle|linear\w*\s+regime',
-            r'valid\s+(?:when|for|if)',
-        ]
-        matches = sum(1 for p in assumption_patterns if re.search(p, content, re.IGNORECASE))
+        content = text.content
+        matches = sum(1 for p in _ASSUMPTION_PATTERNS if content.search(p))
         
-        has_justification = bool(re.search(
-            r'because|since|(?:this|which)\s+is\s+valid|justified',
-            content, re.IGNORECASE
-        ))
+        has_justification = content.search(_JUSTIFICATION)
         
         if matches >= 3 and has_justification:
             return 4
@@ -631,15 +673,12 @@ class RubricEvaluator:
             return 1
         return 2
     
-    def _heur_derivation(self, content: str) -> int:
+    def _heur_derivation(self, text: ResponseText) -> int:
         """Heuristic: Does the derivation have logical steps?"""
-        step_markers = len(re.findall(
-            r'(?:^|\n)\s*(?:\d+[\.):]|step\s+\d|therefore|thus|hence|it follows|substitut|rearrang)',
-            content, re.IGNORECASE | re.MULTILINE
-        ))
-        
-        math_expressions = len(re.findall(r'\$[^$]+\$|\\\([^)]+\\\)', content))
-        has_equals = len(re.findall(r'=', content))
+        content = text.content
+        step_markers = content.count(_STEP_MARKERS)
+        math_expressions = content.count(_MATH_EXPRESSION)
+        has_equals = content.count(_EQUALS)
         
         if step_markers >= 4 and math_expressions >= 3:
             return 4
@@ -651,10 +690,10 @@ class RubricEvaluator:
             return 1
         return 2
     
-    def _heur_notation(self, content: str) -> int:
+    def _heur_notation(self, text: ResponseText) -> int:
         """Heuristic: Is notation consistent?"""
-        has_latex = bool(re.search(r'\$|\\[a-zA-Z]+', content))
-        has_defined = bool(re.search(r'(?:where|let|define)\s+\$?\\?\w+', content, re.IGNORECASE))
+        has_latex = text.content.search(_HAS_LATEX)
+        has_defined = text.content.search(_DEFINED)
         
         if has_latex and has_defined:
             return 3
@@ -662,12 +701,9 @@ class RubricEvaluator:
             return 2
         return 2
     
-    def _heur_boundaries(self, content: str) -> int:
+    def _heur_boundaries(self, text: ResponseText) -> int:
         """Heuristic: Are boundary/special cases handled?"""
-        boundary_terms = len(re.findall(
-            r'boundary|initial\s+condition|limit(?:ing)?|special\s+case|edge\s+case|(?:as|when)\s+\w+\s*(?:→|->|approaches)',
-            content, re.IGNORECASE
-        ))
+        boundary_terms = text.content.count(_BOUNDARY_TERMS)
         
         if boundary_terms >= 3:
             return 4
@@ -677,19 +713,12 @@ class RubricEvaluator:
             return 2
         return 1
     
-    def _heur_first_principles(self, content: str) -> int:
+    def _heur_first_principles(self, text: ResponseText) -> int:
         """Heuristic: Does it build from first principles?"""
-        fp_markers = len(re.findall(
-            r'first\s+principle|fundament\w+|axiom|postulat|start(?:ing)?\s+from|begin(?:ning)?\s+with|deriv(?:e|ation)',
-            content, re.IGNORECASE
-        ))
-        
-        has_chain = bool(re.search(
-            r'(?:therefore|thus|hence|it follows|this gives|this leads|which means|combining|substituting)',
-            content, re.IGNORECASE
-        ))
-        
-        step_count = len(re.findall(r'(?:^|\n)\s*\d+[\.):]', content, re.MULTILINE))
+        content = text.content
+        fp_markers = content.count(_FIRST_PRINCIPLES)
+        has_chain = content.search(_REASONING_CHAIN)
+        step_count = content.count(_NUMBERED_STEP)
         
         if fp_markers >= 2 and has_chain and step_count >= 3:
             return 4
@@ -701,18 +730,14 @@ class RubricEvaluator:
             return 1
         return 2
     
-    def _heur_plain_language(self, content: str) -> int:
+    def _heur_plain_language(self, text: ResponseText) -> int:
         """Heuristic: Is there plain language alongside math?"""
-        has_math = bool(re.search(r'\$|\\[a-zA-Z]+', content))
-        
-        explanation_markers = len(re.findall(
-            r'(?:in other words|this means|intuitively|physically|think of|imagine|like|analogy|simply put|basically)',
-            content, re.IGNORECASE
-        ))
+        content = text.content
+        has_math = content.search(_HAS_LATEX)
+        explanation_markers = content.count(_EXPLANATION_MARKERS)
         
         # Check for reasonable sentence-to-math ratio
-        sentences = len(re.findall(r'[.!?]\s', content))
-        math_blocks = len(re.findall(r'\$\$[^$]+\$\$', content))
+        sentences = content.count(_SENTENCE_END)
         
         if explanation_markers >= 3 and has_math:
             return 4
@@ -724,11 +749,12 @@ class RubricEvaluator:
             return 1
         return 2
     
-    def _heur_structure(self, content: str) -> int:
+    def _heur_structure(self, text: ResponseText) -> int:
         """Heuristic: Is the response well-structured?"""
-        has_headers = len(re.findall(r'^#{1,6}\s', content, re.MULTILINE))
-        has_bold = len(re.findall(r'\*\*[^*]+\*\*', content))
-        has_lists = len(re.findall(r'^[\s]*[-*\d.]+\s', content, re.MULTILINE))
+        content = text.content
+        has_headers = content.count(_HEADERS)
+        has_bold = content.count(_BOLD)
+        has_lists = content.count(_LIST_ITEMS)
         has_sections = has_headers >= 2
         
         total_structure = has_headers + has_bold + has_lists
@@ -743,41 +769,30 @@ class RubricEvaluator:
             return 1  # Long unstructured content
         return 2
     
-    def _heur_code_correctness(self, code: str, content: str) -> int:
+    def _heur_code_correctness(self, text: ResponseText) -> int:
         """Heuristic: Code correctness check."""
-        if not code:
-            code_blocks = re.findall(r'```(?:python)?\n(.*?)```', content, re.DOTALL)
-            code = '\n'.join(code_blocks)
-        
-        if not code.strip():
+        code = text.code
+        if not code.text.strip():
             return 3
         
-        try:
-            ast.parse(code)
-        except SyntaxError:
+        if not text.code_parses:
             return 1
         
-        has_physics_lib = bool(re.search(r'numpy|scipy|sympy|matplotlib', code))
-        has_docstring = bool(re.search(r'""".*?"""|\'\'\'.*?\'\'\'', code, re.DOTALL))
+        has_physics_lib = code.search(_PHYSICS_LIBS)
         
-        if has_physics_lib and has_docstring:
-            return 3
-        elif has_physics_lib:
+        if has_physics_lib:
             return 3
         return 2
     
-    def _heur_code_readability(self, code: str, content: str) -> int:
+    def _heur_code_readability(self, text: ResponseText) -> int:
         """Heuristic: Code readability check."""
-        if not code:
-            code_blocks = re.findall(r'```(?:python)?\n(.*?)```', content, re.DOTALL)
-            code = '\n'.join(code_blocks)
-        
-        if not code.strip():
+        code = text.code
+        if not code.text.strip():
             return 3
         
-        has_comments = len(re.findall(r'#\s+\S', code))
-        has_docstring = bool(re.search(r'"""', code))
-        has_type_hints = bool(re.search(r':\s*(?:int|float|str|List|Dict|Optional)', code))
+        has_comments = code.count(_CODE_COMMENTS)
+        has_docstring = code.search(_TRIPLE_QUOTE)
+        has_type_hints = code.search(_TYPE_HINTS)
         
         score = 2
         if has_comments >= 3:
@@ -789,15 +804,9 @@ class RubricEvaluator:
         
         return min(score, 4)
     
-    def _heur_insight(self, content: str) -> int:
+    def _heur_insight(self, text: ResponseText) -> int:
         """Heuristic: Physical insight quality."""
-        insight_markers = len(re.findall(
-            r'physic\w+\s+(?:meaning|interpretation|significance|insight|intuition)|'
-            r'what\s+this\s+(?:means|tells|shows)|'
-            r'the\s+key\s+(?:insight|idea|concept)|'
-            r'notice\s+that|importantly|remarkably|interestingly',
-            content, re.IGNORECASE
-        ))
+        insight_markers = text.content.count(_INSIGHT_MARKERS)
         
         if insight_markers >= 3:
             return 4
@@ -805,22 +814,13 @@ class RubricEvaluator:
             return 3
         elif insight_markers >= 1:
             return 2
-        elif len(content) > 300:
+        elif len(text.content) > 300:
             return 1
         return 2
     
-    def _heur_connections(self, content: str) -> int:
+    def _heur_connections(self, text: ResponseText) -> int:
         """Heuristic: Connections to broader physics."""
-        connection_patterns = [
-            r'relat(?:ed|ion|es)\s+to',
-            r'connect\w+\s+(?:to|with)',
-            r'(?:special|limiting)\s+case',
-            r'general(?:iz\w+)?',
-            r'(?:quantum|classical|relativistic)\s+limit',
-            r'analogous|similar\s+to|just\s+like',
-            r'broader|wider|deeper\s+(?:context|implications|significance)',
-        ]
-        matches = sum(1 for p in connection_patterns if re.search(p, content, re.IGNORECASE))
+        matches = sum(1 for p in _CONNECTION_PATTERNS if text.content.search(p))
         
         if matches >= 3:
             return 4
@@ -830,17 +830,9 @@ class RubricEvaluator:
             return 2
         return 1
     
-    def _heur_verification(self, content: str) -> int:
+    def _heur_verification(self, text: ResponseText) -> int:
         """Heuristic: Verification methods present."""
-        verification_patterns = [
-            r'dimensional\s+analysis|dimensions?\s+check',
-            r'(?:limiting|special)\s+case|(?:as|when)\s+\w+\s*(?:→|->|approaches)\s*(?:0|infinity|∞)',
-            r'sanity\s+check|cross.?check|verif\w+|validat\w+',
-            r'order\s+of\s+magnitude',
-            r'consistent\s+with|agrees?\s+with|matches',
-            r'known\s+result|expected|recover',
-        ]
-        matches = sum(1 for p in verification_patterns if re.search(p, content, re.IGNORECASE))
+        matches = sum(1 for p in _VERIFICATION_PATTERNS if text.content.search(p))
         
         if matches >= 3:
             return 4
@@ -848,28 +840,26 @@ class RubricEvaluator:
             return 3
         elif matches >= 1:
             return 2
-        elif len(content) > 300:
-            return 1
         return 1
     
     # ================================================================
     # AGGREGATION
     # ================================================================
     
-    def _make_score(
-        self, question: RubricQuestion, raw_score: int, method: str, confidence: float
-    ) -> RubricScore:
-        """Create a RubricScore from a raw score."""
-        raw_score = max(0, min(question.max_score, raw_score))
-        normalized = raw_score / question.max_score if question.max_score > 0 else 0.0
-        
-        level_label = "Unknown"
-        explanation = ""
-        for level in question.levels:
-            if level.score == raw_score:
-                level_label = level.label
-                explanation = level.description
-                break
+    def _make_score(self, index: int, raw_score: int, confidence: float) -> RubricScore:
+        """Create a RubricScore for plan question `index` from a clamped raw score."""
+        plan = self.plan
+        question = plan.questions[index]
+        scorer = plan.scorers[index]
+        max_score = plan.max_scores[index]
+        normalized = raw_score / max_score if max_score > 0 else 0.0
+        
+        level = plan.levels[index].get(raw_score)
+        if level is not None:
+            level_label, explanation = level.label, level.description
+        else:
+            level_label = "Unknown"
+            explanation = "Heuristic evaluation" if scorer.method == "heuristic" else ""
         
         return RubricScore(
             question_id=question.id,
@@ -877,10 +867,10 @@ class RubricEvaluator:
             dimension=question.dimension,
             score=normalized,
             raw_score=raw_score,
-            max_score=question.max_score,
+            max_score=max_score,
             level_label=level_label,
             explanation=explanation,
-            evaluation_method=method,
+            evaluation_method=scorer.method,
             confidence=confidence,
         )
     
@@ -892,22 +882,18 @@ class RubricEvaluator:
         for score in scores:
             dims.setdefault(score.dimension, []).append(score)
         
+        weights = {q.id: q.weight for q in self.plan.questions}
         summaries = {}
         for dim, dim_scores in dims.items():
-            # Weighted average within dimension
-            total_weight = sum(
-                q.weight for q in self.rubric.questions
-                if q.id in [s.question_id for s in dim_scores]
-            )
+            # Weighted average within dimension (same summation order as the plan)
+            total_weight = sum(weights[s.question_id] for s in dim_scores)
             
             if total_weight == 0:
                 dim_score = 0.0
             else:
                 weighted_sum = 0.0
                 for s in dim_scores:
-                    q = next((q for q in self.rubric.questions if q.id == s.question_id), None)
-                    weight = q.weight if q else 1.0
-                    weighted_sum += s.score * weight
+                    weighted_sum += s.score * weights.get(s.question_id, 1.0)
                 dim_score = weighted_sum / total_weight
             
             threshold = self.rubric.get_gate_threshold(dim)
@@ -968,6 +954,23 @@ class RubricEvaluator:
         
         return strengths, weaknesses, suggestions
     
-    def _detect_code_blocks(self, content: str) -> bool:
-        """Detect if content contains code blocks."""
-        return bool(re.search(r'```\w*\n', content))
+
+
+# ============================================================
+# BATCH WORKERS (process pool)
+# ============================================================
+
+_batch_evaluator: Optional[RubricEvaluator] = None
+
+
+def _init_batch_worker(rubric: Rubric) -> None:
+    """Compile the rubric once per worker process."""
+    global _batch_evaluator
+    _batch_evaluator = RubricEvaluator(rubric)
+
+
+def _score_batch_chunk(
+    items: List[Tuple[str, Optional[str], Optional[List[Dict]]]],
+) -> List[List[Optional[int]]]:
+    plan = _batch_evaluator.plan
+    return [plan.raw_scores(ResponseText(*item)) for item in items]
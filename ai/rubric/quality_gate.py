@@ -28,15 +28,20 @@ FLOW:
 DEPENDENCIES:
 - ai.rubric.evaluator: RubricEvaluator, RubricReport
 - ai.rubric.definitions: Rubric, RubricDimension
+- ai.rubric.scoring_plan: ScoreMatrix (batch decisions)
+- numpy: Vectorized thresholds for batch decisions
 """
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 from datetime import datetime
 
+import numpy as np
+
 from ai.rubric.definitions import Rubric, RubricDimension, PHYSICS_RUBRIC, get_rubric_for_domain
 from ai.rubric.evaluator import RubricEvaluator, RubricReport
+from ai.rubric.scoring_plan import ScoreMatrix
 
 
 class GateVerdict(Enum):
@@ -185,7 +190,7 @@ class QualityGate:
             escalation_reason, recommended_tier = self._generate_escalation_info(report)
         
         # Update statistics
-        self._update_stats(report, verdict)
+        self._update_stats(report.overall_score, verdict)
         
         return GateDecision(
             verdict=verdict,
@@ -197,6 +202,63 @@ class QualityGate:
             max_attempts=self.max_attempts,
         )
     
+    def evaluate_batch(
+        self,
+        responses: Sequence[Union[str, Dict[str, Any]]],
+        attempt_number: Union[int, Sequence[int]] = 1,
+        max_workers: Optional[int] = None,
+    ) -> Tuple[ScoreMatrix, List[GateVerdict]]:
+        """
+        Gate many responses at once (e.g. a batch of generated solutions).
+        
+        Verdicts follow the same rules as evaluate(), applied to the whole
+        score matrix at once; no hints or escalation info are generated.
+        
+        Args:
+            responses: Response texts, or dicts with "content" and optional
+                "code" / "artefacts"
+            attempt_number: Attempt of every response, or one per response
+            max_workers: Process pool size for scoring (1 = inline)
+        
+        Returns:
+            (score matrix, verdict per response)
+        """
+        matrix = self.evaluator.score_batch(responses, max_workers=max_workers)
+        attempts = np.broadcast_to(np.asarray(attempt_number), (len(matrix),))
+        verdicts = self._decide_batch(matrix, attempts)
+        
+        for overall, verdict in zip(matrix.overall, verdicts):
+            self._update_stats(float(overall), verdict)
+        
+        return matrix, verdicts
+    
+    def _decide_batch(self, matrix: ScoreMatrix, attempts: np.ndarray) -> List[GateVerdict]:
+        """Vectorized _decide() over a score matrix."""
+        overall = matrix.overall
+        can_retry = attempts < self.max_attempts
+        
+        critical_failure = np.zeros(len(matrix), dtype=bool)
+        for critical_dim in self.CRITICAL_DIMENSIONS:
+            if critical_dim.value in matrix.dimensions:
+                # Unscored (NaN) dimensions compare False, as when absent from a report
+                critical_failure |= matrix.dimension(critical_dim.value) < self.CRITICAL_DIMENSION_MIN
+        
+        passes = (overall >= self.pass_threshold) & (matrix.failed_gates.sum(axis=1) <= 1)
+        
+        verdict_order = [GateVerdict.IMPROVE, GateVerdict.ESCALATE, GateVerdict.PASS]
+        codes = np.select(
+            [
+                critical_failure & can_retry,
+                critical_failure,
+                passes,
+                overall < self.escalate_threshold,
+                can_retry,
+            ],
+            [0, 1, 2, 1, 0],
+            default=1,
+        )
+        return [verdict_order[code] for code in codes]
+    
     def _decide(self, report: RubricReport, attempt_number: int) -> GateVerdict:
         """
         Make the gate decision based on report and attempt history.
@@ -329,7 +391,7 @@ class QualityGate:
         
         return reason, recommended
     
-    def _update_stats(self, report: RubricReport, verdict: GateVerdict):
+    def _update_stats(self, overall_score: float, verdict: GateVerdict):
         """Update gate statistics."""
         self._stats["total_evaluations"] += 1
         
@@ -343,7 +405,7 @@ class QualityGate:
             self._stats["rejected"] += 1
         
         # Track score history (keep last 100)
-        self._stats["score_history"].append(report.overall_score)
+        self._stats["score_history"].append(overall_score)
         if len(self._stats["score_history"]) > 100:
             self._stats["score_history"] = self._stats["score_history"][-100:]
         
@@ -12,7 +12,7 @@ ENDPOINTS:
 - GET /knowledge/domains/:name  - Get domain contents
 - GET /knowledge/path/:from/:to - Find derivation path
 - GET /knowledge/derivation/:id - Get derivation tree
-- GET /knowledge/search         - Search nodes
+- GET /knowledge/search         - Search nodes (BM25-ranked)
 """
 
 from flask import Blueprint, jsonify, request
@@ -91,13 +91,17 @@ def list_nodes():
         limit = request.args.get('limit', type=int)
         offset = request.args.get('offset', 0, type=int)
         
-        # Filter
+        # Filter (domain via the prebuilt domain index)
+        if domain:
+            node_ids = graph.get('domains', {}).get(domain, [])
+            candidates = (nodes[nid] for nid in node_ids if nid in nodes)
+        else:
+            candidates = nodes.values()
+        
         result = []
-        for node_id, node in nodes.items():
+        for node in candidates:
             if node_type and node.node_type.value != node_type:
                 continue
-            if domain and node.domain != domain:
-                continue
             result.append(node_to_dict(node))
         
         # Paginate
@@ -377,18 +381,19 @@ def search_nodes():
                 'error': 'Query parameter q is required'
             }), 400
         
+        limit = request.args.get('limit', 50, type=int)
+        domain = request.args.get('domain')
+        
+        from physics.knowledge import get_search_index
+        candidates = set(graph.get('domains', {}).get(domain, [])) if domain else None
+        hits = get_search_index().search(query, limit=limit, candidates=candidates)
+        
         results = []
-        for node_id, node in nodes.items():
-            # Search in name, description, tags
-            searchable = ' '.join([
-                node.name.lower(),
-                node.description.lower() if hasattr(node, 'description') else '',
-                ' '.join(node.tags) if hasattr(node, 'tags') else '',
-                node.domain.lower()
-            ])
-            
-            if query in searchable:
-                results.append(node_to_dict(node))
+        for node_id, score in hits:
+            if node_id in nodes:
+                node_dict = node_to_dict(nodes[node_id])
+                node_dict['score'] = round(score, 4)
+                results.append(node_dict)
         
         return jsonify({
             'success': True,
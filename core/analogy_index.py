@@ -0,0 +1,186 @@
+# core/
+"""
+PATH: core/analogy_index.py
+PURPOSE: Structural fingerprints, nearest-analogue retrieval and optimal key mapping for AnalogicalReasoner.
+
+FLOW:
+┌─────────────┐    ┌──────────────┐    ┌─────────────┐    ┌──────────────┐
+│   Domain    │───▶│  Structural  │───▶│  Top-k      │───▶│  Hungarian   │
+│    dict     │    │  features    │    │  cosine     │    │  key mapping │
+└─────────────┘    └──────────────┘    └─────────────┘    └──────────────┘
+
+First Principle Analysis:
+- Analogy is about shared structure, not shared values: key paths, the
+  types found at them, attributes shared at any depth, and the shape of
+  each nested dict (its child types)
+- Feature hashing turns the open-ended feature set into a fixed-width
+  signed vector; domains become rows of one matrix, and retrieval against
+  the whole library is one matrix-vector product plus a top-k selection
+- Mapping keys is an assignment problem: build the key-similarity matrix
+  and solve it optimally (Hungarian algorithm) rather than greedily. It is
+  the expensive step, so it only runs on the retrieved shortlist
+
+DEPENDENCIES:
+- numpy: Fingerprint matrix, cosine similarity
+- scipy: linear_sum_assignment (Hungarian algorithm)
+"""
+
+import zlib
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+
+# Relative weight of each feature family in a fingerprint
+_FEATURE_WEIGHTS = {
+    'path': 1.0,    # key path, e.g. path:orbit.radius
+    'leaf': 1.0,    # key path with value type, e.g. leaf:orbit.radius=number
+    'attr': 1.0,    # key with value type at any depth, e.g. attr:radius=number
+    'shape': 0.7,   # name-free shape of a dict, e.g. shape:1:number,number,str
+    'depth': 0.5,   # name-free type at a depth, e.g. depth:2=number
+}
+
+# Pairs scoring below this are left unmapped by map_keys
+MIN_MAPPING_SCORE = 0.3
+
+
+def _type_name(value: Any) -> str:
+    if isinstance(value, bool):
+        return 'bool'
+    if isinstance(value, (int, float)):
+        return 'number'
+    if isinstance(value, dict):
+        return 'dict'
+    if isinstance(value, (list, tuple, set)):
+        return 'list'
+    return type(value).__name__
+
+
+def structural_features(domain: Any, prefix: str = '', depth: int = 0,
+                        features: Optional[Counter] = None) -> Counter:
+    """Weighted structural features of a (possibly nested) domain dict."""
+    if features is None:
+        features = Counter()
+    if not isinstance(domain, dict):
+        return features
+
+    child_types = sorted(_type_name(v) for v in domain.values())
+    features[f"shape:{depth}:{','.join(child_types)}"] += _FEATURE_WEIGHTS['shape']
+    for key, value in domain.items():
+        path = f"{prefix}.{key}" if prefix else str(key)
+        type_name = _type_name(value)
+        features[f"path:{path}"] += _FEATURE_WEIGHTS['path']
+        features[f"leaf:{path}={type_name}"] += _FEATURE_WEIGHTS['leaf']
+        features[f"attr:{key}={type_name}"] += _FEATURE_WEIGHTS['attr']
+        features[f"depth:{depth}={type_name}"] += _FEATURE_WEIGHTS['depth']
+        if isinstance(value, dict):
+            structural_features(value, path, depth + 1, features)
+    return features
+
+
+def fingerprint(domain: Any, dim: int = 1024) -> np.ndarray:
+    """Unit-norm signed feature-hashing vector of a domain's structure."""
+    vector = np.zeros(dim, dtype=np.float64)
+    for feature, weight in structural_features(domain).items():
+        h = zlib.crc32(feature.encode('utf-8'))
+        sign = 1.0 if h & 0x80000000 else -1.0
+        vector[h % dim] += sign * weight
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def key_similarity(s_key: str, s_val: Any, t_key: str, t_val: Any, dim: int = 256) -> float:
+    """
+    Similarity of two domain entries for mapping.
+
+    Weighted: name (exact match, else character-trigram Jaccard) 0.4,
+    value type 0.3, structure 0.3 (fingerprint cosine for nested dicts,
+    type match otherwise).
+    """
+    if s_key == t_key:
+        name = 1.0
+    else:
+        a, b = _trigrams(str(s_key)), _trigrams(str(t_key))
+        name = len(a & b) / len(a | b) if a | b else 0.0
+
+    same_type = _type_name(s_val) == _type_name(t_val)
+    if isinstance(s_val, dict) and isinstance(t_val, dict):
+        structure = max(0.0, float(fingerprint(s_val, dim) @ fingerprint(t_val, dim)))
+    else:
+        structure = 1.0 if same_type else 0.0
+    return 0.4 * name + 0.3 * float(same_type) + 0.3 * structure
+
+
+def map_keys(source: Dict[str, Any], target: Dict[str, Any],
+             min_score: float = MIN_MAPPING_SCORE) -> Tuple[Dict[str, str], float]:
+    """
+    Optimal one-to-one mapping of source keys to target keys.
+
+    Returns:
+        (mapping, quality): quality is the summed similarity of the mapped
+        pairs over the size of the larger domain, in [0, 1]
+    """
+    if not isinstance(source, dict) or not isinstance(target, dict) or not source or not target:
+        return {}, 0.0
+    s_keys = list(source)
+    t_keys = list(target)
+    scores = np.array([
+        [key_similarity(s, source[s], t, target[t]) for t in t_keys]
+        for s in s_keys
+    ])
+    rows, cols = linear_sum_assignment(scores, maximize=True)
+
+    mapping = {}
+    total = 0.0
+    for r, c in zip(rows, cols):
+        if scores[r, c] >= min_score:
+            mapping[s_keys[r]] = t_keys[c]
+            total += float(scores[r, c])
+    return mapping, total / max(len(s_keys), len(t_keys))
+
+
+class StructuralIndex:
+    """
+    Library of domains as rows of a fingerprint matrix, queried by cosine.
+    """
+
+    def __init__(self, dim: int = 1024):
+        self.dim = dim
+        self.names: List[str] = []
+        self.domains: List[Dict[str, Any]] = []
+        self._matrix = np.zeros((0, dim), dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add(self, name: str, domain: Dict[str, Any]) -> int:
+        """Index a domain; returns its row."""
+        if len(self.names) == self._matrix.shape[0]:
+            grown = np.zeros((max(16, 2 * len(self.names)), self.dim), dtype=np.float64)
+            grown[:len(self.names)] = self._matrix[:len(self.names)]
+            self._matrix = grown
+        row = len(self.names)
+        self._matrix[row] = fingerprint(domain, self.dim)
+        self.names.append(name)
+        self.domains.append(domain)
+        return row
+
+    def query(self, domain: Dict[str, Any], k: int = 5) -> List[Tuple[int, float]]:
+        """Top-k rows by fingerprint cosine, best first."""
+        n = len(self.names)
+        if n == 0 or k <= 0:
+            return []
+        scores = self._matrix[:n] @ fingerprint(domain, self.dim)
+        if k < n:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(n)
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(int(i), float(scores[i])) for i in top]
@@ -21,6 +21,7 @@ Mathematical Foundation:
 
 DEPENDENCIES:
 - numpy: Numerical operations for neural processing
+- scipy: Sparse feature counts and random projection
 - sympy: Symbolic mathematics
 - validators: Input/output validation
 - loggers: System logging
@@ -34,6 +35,7 @@ from dataclasses import dataclass, field
 from enum import Enum
 import hashlib
 import json
+from scipy import sparse
 
 # Import validators and loggers
 import sys
@@ -77,6 +79,37 @@ class ProcessingResult:
         }
 
 
+# Hashed character-trigram feature space and its sparse projection
+_HASH_FEATURES = 4096
+_PROJECTION_NONZEROS = 4
+_EMBEDDING_SEED = 42
+_SPLITMIX_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_SPLITMIX_M1 = np.uint64(0xBF58476D1CE4E5B9)
+_SPLITMIX_M2 = np.uint64(0x94D049BB133111EB)
+
+
+def _stable_hash(keys: np.ndarray, seed: int) -> np.ndarray:
+    """
+    Fixed-seed splitmix64 finalizer over a uint64 array.
+
+    Unlike the builtin hash() it is not salted per process, so embeddings
+    agree across workers and restarts.
+    """
+    with np.errstate(over='ignore'):
+        h = keys + np.uint64(seed) * _SPLITMIX_GAMMA
+        h = (h ^ (h >> np.uint64(30))) * _SPLITMIX_M1
+        h = (h ^ (h >> np.uint64(27))) * _SPLITMIX_M2
+        return h ^ (h >> np.uint64(31))
+
+
+def _trigram_keys(text: str) -> np.ndarray:
+    """Injective uint64 key per character trigram (code points < 2**21)."""
+    codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    if len(codes) < 3:
+        return np.zeros(0, dtype=np.uint64)
+    return codes[:-2] | (codes[1:-1] << np.uint64(21)) | (codes[2:] << np.uint64(42))
+
+
 class NeuralComponent:
     """
     Neural processing component using embedding-based similarity and pattern matching.
@@ -95,21 +128,38 @@ class NeuralComponent:
         self.embedding_dim = embedding_dim
         self.logger = SystemLogger()
         
-        # Simple pattern memory (in production: use vector database)
-        self.pattern_memory: Dict[str, np.ndarray] = {}
+        # Learned patterns: row i of the matrix is the unit embedding of
+        # _pattern_ids[i]; _pattern_norms[i] is 0 for an all-zero embedding
+        self._pattern_matrix = np.zeros((0, embedding_dim))
+        self._pattern_norms = np.zeros(0)
+        self._pattern_ids: List[str] = []
+        self._pattern_rows: Dict[str, int] = {}
         self.pattern_outputs: Dict[str, Any] = {}
         
-        # Initialize random projection matrix for simple embeddings
-        np.random.seed(42)
-        self.projection_matrix = np.random.randn(1000, embedding_dim) / np.sqrt(embedding_dim)
+        # Sparse random projection (Achlioptas-style): each hashed trigram
+        # feature adds ±1/sqrt(s) to s fixed output dimensions
+        rng = np.random.default_rng(_EMBEDDING_SEED)
+        nonzeros = min(_PROJECTION_NONZEROS, embedding_dim)
+        columns = np.argsort(rng.random((_HASH_FEATURES, embedding_dim)), axis=1)[:, :nonzeros]
+        columns.sort(axis=1)
+        signs = rng.choice([-1.0, 1.0], size=columns.shape) / np.sqrt(nonzeros)
+        self.projection_matrix = sparse.csr_matrix(
+            (signs.ravel(), columns.ravel(), np.arange(0, columns.size + 1, nonzeros)),
+            shape=(_HASH_FEATURES, embedding_dim),
+        )
         
         self.logger.log("NeuralComponent initialized", level="INFO")
     
+    @property
+    def pattern_memory(self) -> Dict[str, np.ndarray]:
+        """Learned pattern embeddings by ID (unit-norm views into the pattern matrix)."""
+        return {pid: self._pattern_matrix[row] for pid, row in self._pattern_rows.items()}
+    
     def embed(self, data: Any) -> np.ndarray:
         """
         Create embedding for input data.
         
-        Uses a simple hash-based embedding approach.
+        Uses a stable hash-based embedding approach.
         In production, use pre-trained embeddings (BERT, etc.)
         
         Args:
@@ -118,25 +168,38 @@ class NeuralComponent:
         Returns:
             Embedding vector
         """
-        # Convert data to string representation
-        data_str = json.dumps(data, sort_keys=True, default=str)
-        
-        # Create feature vector from character n-grams
-        features = np.zeros(1000)
-        for i in range(len(data_str) - 2):
-            ngram = data_str[i:i+3]
-            idx = hash(ngram) % 1000
-            features[idx] += 1
+        return self.embed_batch([data])[0]
+    
+    def embed_batch(self, items: List[Any]) -> np.ndarray:
+        """
+        Embed many inputs at once.
         
-        # Normalize
-        norm = np.linalg.norm(features)
-        if norm > 0:
-            features = features / norm
+        Character trigrams of each item's JSON form are hashed into a sparse
+        count matrix (items x features), row-normalized, and multiplied by
+        the sparse projection in one product.
         
-        # Project to embedding dimension
-        embedding = features @ self.projection_matrix
+        Args:
+            items: Inputs to embed
+            
+        Returns:
+            Array of shape (len(items), embedding_dim)
+        """
+        keys = [_trigram_keys(json.dumps(item, sort_keys=True, default=str)) for item in items]
+        lengths = np.array([len(k) for k in keys], dtype=np.int64)
+        if lengths.sum() == 0:
+            return np.zeros((len(items), self.embedding_dim))
+        
+        buckets = _stable_hash(np.concatenate(keys), _EMBEDDING_SEED) % np.uint64(_HASH_FEATURES)
+        rows = np.repeat(np.arange(len(items)), lengths)
+        counts = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, buckets.astype(np.int64))),
+            shape=(len(items), _HASH_FEATURES),
+        )
+        norms = np.sqrt(np.asarray(counts.multiply(counts).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
         
-        return embedding
+        embeddings = np.asarray((counts @ self.projection_matrix).todense())
+        return embeddings / norms[:, None]
     
     def similarity(self, emb1: np.ndarray, emb2: np.ndarray) -> float:
         """
@@ -169,12 +232,119 @@ class NeuralComponent:
             input_data: Input data for the pattern
             output_data: Expected output for the pattern
         """
-        embedding = self.embed(input_data)
-        self.pattern_memory[pattern_id] = embedding
+        self._store_pattern(pattern_id, self.embed(input_data))
         self.pattern_outputs[pattern_id] = output_data
         
         self.logger.log(f"Learned pattern: {pattern_id}", level="DEBUG")
     
+    def match(self, embedding: np.ndarray, top_k: int = 3) -> List[Tuple[str, float]]:
+        """
+        Most similar learned patterns to an embedding.
+        
+        One matrix-vector product against the pattern matrix plus a
+        partial sort.
+        
+        Args:
+            embedding: Query embedding
+            top_k: Number of matches to return
+            
+        Returns:
+            (pattern_id, similarity in [0, 1]) pairs, best first
+        """
+        count = len(self._pattern_ids)
+        if count == 0 or top_k <= 0:
+            return []
+        
+        norm = np.linalg.norm(embedding)
+        if norm == 0:
+            similarities = np.zeros(count)
+        else:
+            cosines = self._pattern_matrix[:count] @ (embedding / norm)
+            similarities = (np.clip(cosines, -1.0, 1.0) + 1) / 2
+            similarities[self._pattern_norms[:count] == 0] = 0.0
+        
+        if top_k < count:
+            top = np.argpartition(-similarities, top_k - 1)[:top_k]
+        else:
+            top = np.arange(count)
+        top = top[np.argsort(-similarities[top], kind='stable')]
+        return [(self._pattern_ids[i], float(similarities[i])) for i in top]
+    
+    def save_patterns(self, path: str) -> None:
+        """
+        Save learned patterns to an .npz file.
+        
+        Outputs are stored as JSON (non-JSON values via str()).
+        
+        Args:
+            path: Target file path
+        """
+        count = len(self._pattern_ids)
+        meta = {
+            'embedding_dim': self.embedding_dim,
+            'hash_features': _HASH_FEATURES,
+            'seed': _EMBEDDING_SEED,
+            'pattern_ids': self._pattern_ids,
+            'outputs': [self.pattern_outputs.get(pid) for pid in self._pattern_ids],
+        }
+        with open(path, 'wb') as f:
+            np.savez(
+                f,
+                matrix=self._pattern_matrix[:count],
+                norms=self._pattern_norms[:count],
+                meta=np.array(json.dumps(meta, default=str)),
+            )
+        self.logger.log(f"Saved {count} patterns to {path}", level="INFO")
+    
+    def load_patterns(self, path: str) -> int:
+        """
+        Load patterns saved by save_patterns, replacing same-ID patterns.
+        
+        Args:
+            path: File written by save_patterns
+            
+        Returns:
+            Number of patterns loaded
+            
+        Raises:
+            ValueError: If the file was written with a different embedding
+                configuration (its vectors would not be comparable)
+        """
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            matrix = data['matrix']
+            norms = data['norms']
+        
+        config = (meta['embedding_dim'], meta['hash_features'], meta['seed'])
+        if config != (self.embedding_dim, _HASH_FEATURES, _EMBEDDING_SEED):
+            raise ValueError(f"Pattern file {path} uses embedding config {config}")
+        
+        for pid, unit, norm, output in zip(meta['pattern_ids'], matrix, norms, meta['outputs']):
+            self._store_pattern(pid, unit * norm)
+            self.pattern_outputs[pid] = output
+        
+        self.logger.log(f"Loaded {len(meta['pattern_ids'])} patterns from {path}", level="INFO")
+        return len(meta['pattern_ids'])
+    
+    def _store_pattern(self, pattern_id: str, embedding: np.ndarray) -> None:
+        """Write a pattern's unit embedding into the matrix, growing it by doubling."""
+        row = self._pattern_rows.get(pattern_id)
+        if row is None:
+            row = len(self._pattern_ids)
+            if row == self._pattern_matrix.shape[0]:
+                capacity = max(16, 2 * row)
+                matrix = np.zeros((capacity, self.embedding_dim))
+                matrix[:row] = self._pattern_matrix[:row]
+                norms = np.zeros(capacity)
+                norms[:row] = self._pattern_norms[:row]
+                self._pattern_matrix, self._pattern_norms = matrix, norms
+            self._pattern_ids.append(pattern_id)
+            self._pattern_rows[pattern_id] = row
+        
+        norm = float(np.linalg.norm(embedding))
+        self._pattern_norms[row] = norm
+        self._pattern_matrix[row] = embedding / norm if norm > 0 else 0.0
+    
     def process(self, input_data: Any) -> ProcessingResult:
         """
         Process input through neural pattern matching.
@@ -188,12 +358,9 @@ class NeuralComponent:
         input_embedding = self.embed(input_data)
         
         # Find most similar patterns
-        similarities = []
-        for pattern_id, pattern_emb in self.pattern_memory.items():
-            sim = self.similarity(input_embedding, pattern_emb)
-            similarities.append((pattern_id, sim))
+        top_matches = self.match(input_embedding, top_k=3)
         
-        if not similarities:
+        if not top_matches:
             # No patterns learned yet
             return ProcessingResult(
                 output={'type': 'no_match', 'data': input_data},
@@ -202,9 +369,7 @@ class NeuralComponent:
                 metadata={'embedding_dim': self.embedding_dim}
             )
         
-        # Sort by similarity
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        best_match = similarities[0]
+        best_match = top_matches[0]
         
         if best_match[1] > 0.7:  # Good match threshold
             return ProcessingResult(
@@ -214,7 +379,7 @@ class NeuralComponent:
                 metadata={
                     'matched_pattern': best_match[0],
                     'similarity': best_match[1],
-                    'top_matches': similarities[:3]
+                    'top_matches': top_matches
                 }
             )
         else:
@@ -0,0 +1,391 @@
+# core/
+"""
+PATH: core/explanation_search.py
+PURPOSE: Minimum-cost explanation sets for AbductiveReasoner via weighted set cover.
+
+FLOW:
+┌─────────────┐    ┌──────────────┐    ┌─────────────┐    ┌──────────────┐
+│ Hypotheses  │───▶│   Bitsets    │───▶│  Candidate  │───▶│ Greedy / B&B │───▶ ranked sets
+│ (explains)  │    │ (uint64 rows)│    │  coverage   │    │  set cover   │
+└─────────────┘    └──────────────┘    └─────────────┘    └──────────────┘
+
+First Principle Analysis:
+- An explanation is a set of hypotheses that jointly covers the
+  observations; the best one minimizes total cost (weighted set cover)
+- Cost of a hypothesis is its description length: -ln(prior) plus
+  complexity_weight per unit of complexity, so exp(-cost) of a set is an
+  unnormalized posterior and normalizing over the returned sets gives
+  posterior-style scores
+- Registered hypotheses are rows of a packed uint64 matrix over the
+  observation vocabulary; coverage of a query for all of them is one
+  AND + popcount over the matrix
+- Search then runs on the (few) candidates, projected onto the query's
+  observations, with each local bitset held as a Python int (cheaper
+  than NumPy per operation at that size)
+
+Search modes:
+- Greedy: lowest cost per newly covered observation, with lazy priority
+  updates (coverage only shrinks, so a stale heap entry is a lower bound)
+- Exact: branch and bound over the uncovered observation with the fewest
+  covering hypotheses, pruned by the k-th best cost, under a time budget;
+  the greedy cover seeds the incumbents
+
+DEPENDENCIES:
+- numpy: Packed bitset matrix, popcount
+"""
+
+import heapq
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+
+_WORD_BITS = 64
+_POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def _popcount_rows(words: np.ndarray) -> np.ndarray:
+    """Number of set bits in each row of a 2-D uint64 array."""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int64)
+    as_bytes = np.ascontiguousarray(words).view(np.uint8)
+    return _POPCOUNT_TABLE[as_bytes].sum(axis=1, dtype=np.int64)
+
+
+@dataclass
+class ExplanationSet:
+    """A minimal set of hypotheses that jointly explains the observations."""
+    hypotheses: List[str]
+    cost: float
+    score: float = 0.0  # Posterior-style: exp(-cost), normalized over the returned sets
+    explains: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'hypotheses': self.hypotheses,
+            'cost': self.cost,
+            'score': self.score,
+            'explains': self.explains
+        }
+
+
+@dataclass
+class ExplanationResult:
+    """Ranked explanation sets for one query."""
+    sets: List[ExplanationSet]
+    unexplained: List[str]
+    candidates: int
+    optimal: bool  # True if the exact search completed within its budget
+
+
+class _Item:
+    """A candidate hypothesis in query-local coordinates."""
+
+    __slots__ = ('name', 'cost', 'mask')
+
+    def __init__(self, name: str, cost: float, mask: int):
+        self.name = name
+        self.cost = cost
+        self.mask = mask
+
+
+class ExplanationSearch:
+    """
+    Registered hypotheses as packed bitsets, plus set-cover search over them.
+    """
+
+    def __init__(self, complexity_weight: float = math.log(2)):
+        """
+        Args:
+            complexity_weight: Cost (nats) per unit of hypothesis complexity
+        """
+        self.complexity_weight = complexity_weight
+        self.vocabulary: Dict[str, int] = {}
+        self.names: List[str] = []
+        self.costs: List[float] = []
+        self._rows = np.zeros((0, 1), dtype=np.uint64)
+
+    @property
+    def size(self) -> int:
+        return len(self.names)
+
+    def cost(self, complexity: float, prior: float) -> float:
+        """Description length of a hypothesis: -ln(prior) + weight·complexity."""
+        prior = min(max(prior, 1e-12), 1.0)
+        return -math.log(prior) + self.complexity_weight * complexity
+
+    def add(self, name: str, explains: Iterable[str], complexity: float = 1, prior: float = 0.5) -> None:
+        """Register a hypothesis."""
+        bits = [self.vocabulary.setdefault(obs, len(self.vocabulary)) for obs in explains]
+        words = max(1, -(-len(self.vocabulary) // _WORD_BITS))
+        if words > self._rows.shape[1]:
+            grown = np.zeros((self._rows.shape[0], max(words, 2 * self._rows.shape[1])), dtype=np.uint64)
+            grown[:, :self._rows.shape[1]] = self._rows
+            self._rows = grown
+        if self.size == self._rows.shape[0]:
+            grown = np.zeros((max(8, 2 * self.size), self._rows.shape[1]), dtype=np.uint64)
+            grown[:self.size] = self._rows
+            self._rows = grown
+
+        row = self._rows[self.size]
+        if bits:
+            index = np.asarray(bits, dtype=np.uint64)
+            np.bitwise_or.at(row, (index // _WORD_BITS).astype(np.intp),
+                             np.left_shift(np.uint64(1), index % np.uint64(_WORD_BITS)))
+        self.names.append(name)
+        self.costs.append(self.cost(complexity, prior))
+
+    def coverage(self, observations: List[str]) -> np.ndarray:
+        """Number of the given observations each registered hypothesis explains."""
+        if not self.size:
+            return np.zeros(0, dtype=np.int64)
+        query = np.zeros(self._rows.shape[1], dtype=np.uint64)
+        bits = [self.vocabulary[obs] for obs in observations if obs in self.vocabulary]
+        if bits:
+            index = np.asarray(bits, dtype=np.uint64)
+            np.bitwise_or.at(query, (index // _WORD_BITS).astype(np.intp),
+                             np.left_shift(np.uint64(1), index % np.uint64(_WORD_BITS)))
+        return _popcount_rows(self._rows[:self.size] & query)
+
+    def explain(self, observations: Iterable[str], k: int = 3, exact: bool = False,
+                time_budget: float = 0.5,
+                extra: Optional[List[Dict[str, Any]]] = None) -> ExplanationResult:
+        """
+        Ranked minimal explanation sets for the observations.
+
+        Args:
+            observations: Observations to explain
+            k: Maximum number of sets to return
+            exact: Use branch and bound (else greedy plus greedy variants)
+            time_budget: Seconds allowed for the exact search
+            extra: Query-specific hypotheses (dicts with name, explains,
+                complexity, prior), not registered
+
+        Returns:
+            ExplanationResult; observations no hypothesis explains are
+            reported as unexplained and the sets cover the rest
+        """
+        obs_list = sorted(set(observations))
+        items = self._candidates(obs_list, extra or [])
+
+        coverable = 0
+        for item in items:
+            coverable |= item.mask
+        unexplained = [obs for i, obs in enumerate(obs_list) if not coverable >> i & 1]
+
+        if not items:
+            return ExplanationResult([], unexplained, 0, exact)
+
+        greedy = self._minimal(self._greedy(items, coverable), items)
+        found = [greedy] + self._variants(items, coverable, greedy, k)
+        optimal = False
+        if exact:
+            found, optimal = self._branch_and_bound(items, coverable, k, time_budget, found)
+
+        unique: Dict[Tuple[int, ...], float] = {}
+        for chosen in found:
+            key = tuple(sorted(chosen))
+            unique[key] = sum(items[i].cost for i in key)
+        ranked = sorted(unique.items(), key=lambda kv: (kv[1], len(kv[0])))[:k]
+
+        best = ranked[0][1]
+        weights = [math.exp(best - cost) for _, cost in ranked]
+        total = sum(weights)
+        sets = []
+        for (chosen, cost), weight in zip(ranked, weights):
+            mask = 0
+            for i in chosen:
+                mask |= items[i].mask
+            sets.append(ExplanationSet(
+                hypotheses=[items[i].name for i in sorted(chosen, key=lambda i: items[i].cost)],
+                cost=cost,
+                score=weight / total,
+                explains=[obs for j, obs in enumerate(obs_list) if mask >> j & 1]
+            ))
+        return ExplanationResult(sets, unexplained, len(items), optimal)
+
+    def _candidates(self, obs_list: List[str], extra: List[Dict[str, Any]]) -> List[_Item]:
+        """Hypotheses covering at least one observation, as query-local int bitsets.
+
+        Hypotheses with identical coverage keep only the cheapest.
+        """
+        local = {obs: i for i, obs in enumerate(obs_list)}
+        best: Dict[int, _Item] = {}
+
+        def offer(name: str, cost: float, mask: int) -> None:
+            current = best.get(mask)
+            if mask and (current is None or cost < current.cost):
+                best[mask] = _Item(name, cost, mask)
+
+        known = [(local[obs], self.vocabulary[obs]) for obs in obs_list if obs in self.vocabulary]
+        if known and self.size:
+            hits = np.flatnonzero(self.coverage([obs_list[l] for l, _ in known]))
+            if len(hits):
+                positions = np.asarray([g for _, g in known], dtype=np.uint64)
+                words = (positions // _WORD_BITS).astype(np.intp)
+                shifts = positions % np.uint64(_WORD_BITS)
+                # hit hypotheses × query observations membership
+                member = ((self._rows[hits][:, words] >> shifts) & np.uint64(1)).astype(bool)
+                spread = np.zeros((len(hits), len(obs_list)), dtype=bool)
+                spread[:, [l for l, _ in known]] = member
+                packed = np.packbits(spread, axis=1, bitorder='little')
+                for h, row in zip(hits.tolist(), packed):
+                    offer(self.names[h], self.costs[h], int.from_bytes(row.tobytes(), 'little'))
+
+        for hyp in extra:
+            mask = 0
+            for obs in hyp['explains']:
+                if obs in local:
+                    mask |= 1 << local[obs]
+            offer(hyp['name'], self.cost(hyp.get('complexity', 1), hyp.get('prior', 0.5)), mask)
+
+        return sorted(best.values(), key=lambda item: item.cost)
+
+    @staticmethod
+    def _greedy(items: List[_Item], universe: int, banned: Optional[Set[int]] = None) -> List[int]:
+        """Greedy weighted set cover with lazy priority updates; [] if it cannot cover."""
+        heap = []
+        for i, item in enumerate(items):
+            if banned and i in banned:
+                continue
+            count = (item.mask & universe).bit_count()
+            if count:
+                heap.append((item.cost / count, i, count))
+        heapq.heapify(heap)
+
+        chosen = []
+        uncovered = universe
+        while uncovered and heap:
+            _, i, count = heapq.heappop(heap)
+            current = (items[i].mask & uncovered).bit_count()
+            if current == 0:
+                continue
+            if current < count:
+                # Stale: ratio only grows as coverage shrinks, so re-queue
+                heapq.heappush(heap, (items[i].cost / current, i, current))
+                continue
+            chosen.append(i)
+            uncovered &= ~items[i].mask
+        return chosen if not uncovered else []
+
+    @staticmethod
+    def _minimal(chosen: List[int], items: List[_Item]) -> List[int]:
+        """Drop redundant hypotheses, most expensive first."""
+        kept = list(chosen)
+        for i in sorted(chosen, key=lambda i: items[i].cost, reverse=True):
+            rest = 0
+            for j in kept:
+                if j != i:
+                    rest |= items[j].mask
+            if items[i].mask & ~rest == 0 and len(kept) > 1:
+                kept.remove(i)
+        return kept
+
+    def _variants(self, items: List[_Item], universe: int, best: List[int], k: int) -> List[List[int]]:
+        """Alternative covers: greedy again with one hypothesis of the best cover banned."""
+        variants = []
+        for i in best:
+            if len(variants) >= k - 1:
+                break
+            alternative = self._greedy(items, universe, banned={i})
+            if alternative:
+                variants.append(self._minimal(alternative, items))
+        return variants
+
+    @staticmethod
+    def _branch_and_bound(items: List[_Item], universe: int, k: int, time_budget: float,
+                          seed: List[List[int]]) -> Tuple[List[List[int]], bool]:
+        """
+        k cheapest minimal covers by branch and bound, starting from the
+        seed covers as incumbents.
+
+        Returns:
+            (covers found, whether the search completed within the budget)
+        """
+        n_bits = universe.bit_length()
+        covering: List[List[int]] = [[] for _ in range(n_bits)]
+        for i, item in enumerate(items):  # items are sorted by cost
+            mask = item.mask
+            while mask:
+                low = mask & -mask
+                covering[low.bit_length() - 1].append(i)
+                mask ^= low
+        min_cost = [items[c[0]].cost if c else math.inf for c in covering]
+
+        # Max-heap (negated) of the k best (cost, cover)
+        best: List[Tuple[float, Tuple[int, ...]]] = []
+        seen: Set[Tuple[int, ...]] = set()
+
+        def record(chosen: List[int], cost: float) -> None:
+            key = tuple(sorted(chosen))
+            if key in seen:
+                return
+            seen.add(key)
+            heapq.heappush(best, (-cost, key))
+            if len(best) > k:
+                heapq.heappop(best)
+
+        for cover in seed:
+            record(cover, sum(items[i].cost for i in cover))
+
+        deadline = time.perf_counter() + time_budget
+        nodes = 0
+        complete = True
+
+        def bound() -> float:
+            return -best[0][0] if len(best) >= k else math.inf
+
+        def is_minimal(chosen: List[int]) -> bool:
+            for i in chosen:
+                rest = 0
+                for j in chosen:
+                    if j != i:
+                        rest |= items[j].mask
+                if items[i].mask & ~rest == 0:
+                    return False
+            return True
+
+        def search(chosen: List[int], cost: float, uncovered: int, forbidden: Set[int]) -> None:
+            nonlocal nodes, complete
+            nodes += 1
+            if nodes & 255 == 0 and time.perf_counter() > deadline:
+                complete = False
+            if not complete:
+                return
+            if not uncovered:
+                if is_minimal(chosen):
+                    record(chosen, cost)
+                return
+
+            # Lower bounds: the dearest uncovered observation must still be
+            # paid for; and each observation must pay at least its cheapest
+            # share cost(h) / |h ∩ uncovered| of some hypothesis covering it
+            branch_options, dearest, shares = None, 0.0, 0.0
+            mask = uncovered
+            while mask:
+                low = mask & -mask
+                bit = low.bit_length() - 1
+                mask ^= low
+                dearest = max(dearest, min_cost[bit])
+                options = [i for i in covering[bit] if i not in forbidden]
+                if not options:
+                    return
+                shares += min(items[i].cost / (items[i].mask & uncovered).bit_count() for i in options)
+                if branch_options is None or len(options) < len(branch_options):
+                    branch_options = options
+            if cost + max(dearest, shares) >= bound():
+                return
+
+            banned = set(forbidden)
+            for i in branch_options:
+                if cost + items[i].cost >= bound():
+                    break  # options are sorted by cost
+                search(chosen + [i], cost + items[i].cost, uncovered & ~items[i].mask, banned)
+                banned = banned | {i}
+
+        search([], 0.0, universe, set())
+        covers = [list(key) for _, key in sorted(best, key=lambda entry: -entry[0])]
+        return covers, complete
@@ -0,0 +1,513 @@
+# core/
+"""
+PATH: core/pattern_mining.py
+PURPOSE: Columnar, vectorized pattern mining over observation records for InductiveReasoner.
+
+FLOW:
+┌─────────────┐    ┌──────────────┐    ┌─────────────┐    ┌──────────────┐
+│ Observation │───▶│  Columnar    │───▶│ Sufficient  │───▶│   Pattern    │
+│    dicts    │    │    table     │    │ statistics  │    │  detectors   │
+└─────────────┘    └──────────────┘    └─────────────┘    └──────────────┘
+
+First Principle Analysis:
+- Dict records are converted to columns once; every detector then works
+  on whole NumPy arrays instead of Python loops over records
+- Constancy, monotonicity and least-squares fits (linear, exponential and
+  power law, the last two in log space) only need a handful of running
+  sums per column, which merge by addition. Batch and streaming mining
+  therefore share one code path: a batch is a single update
+- Pairwise correlations for all numeric columns come from one set of
+  masked matrix products (co-moments over rows where both are present)
+- Periodicity needs the raw sequence (FFT), so it is only detected in
+  batch mode
+
+Index semantics: a column's values are taken in observation order,
+skipping records that lack the key; fits regress on that position.
+
+DEPENDENCIES:
+- numpy: Columnar storage, masked matrix products, FFT
+"""
+
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+
+# Distinct values tracked per numeric column (for dominant-value detection
+# if the column later turns out to be mixed); beyond this counts are dropped
+MAX_TRACKED_VALUES = 64
+
+# Detection thresholds
+LINEAR_TREND_MIN_CORRELATION = 0.8
+DOMINANT_VALUE_MIN_FREQUENCY = 0.7
+FUNCTIONAL_FORM_MIN_R2 = 0.95
+CORRELATION_MIN_ABS = 0.9
+PERIODIC_MIN_POWER_FRACTION = 0.5
+PERIODIC_MIN_LENGTH = 8
+
+
+def _fit(n: float, sx: float, sxx: float, sy: float, syy: float,
+         sxy: float) -> Optional[Tuple[float, float, float]]:
+    """Least-squares y = a + b·x from sums; (a, b, r) or None if degenerate."""
+    if n < 2:
+        return None
+    var_x = sxx - sx * sx / n
+    var_y = syy - sy * sy / n
+    cov = sxy - sx * sy / n
+    if var_x <= 0:
+        return None
+    slope = cov / var_x
+    intercept = (sy - slope * sx) / n
+    if var_y <= 1e-12 * max(1.0, syy):
+        return intercept, slope, 0.0
+    r = cov / np.sqrt(var_x * var_y)
+    return intercept, slope, float(np.clip(r, -1.0, 1.0))
+
+
+class ColumnSummary:
+    """
+    Mergeable sufficient statistics of one numeric column.
+
+    Sums are of (y - shift) to limit cancellation; shift is fixed when the
+    column is first seen.
+    """
+
+    def __init__(self, shift: float):
+        self.shift = shift
+        self.n = 0
+        self.s1 = 0.0
+        self.s2 = 0.0
+        self.s_iy = 0.0
+        self.first_value: Any = None
+        self.last: Optional[float] = None
+        self.minimum = np.inf
+        self.maximum = -np.inf
+        self.nondecreasing = True
+        self.nonincreasing = True
+        # Log-space sums, valid while every value is positive
+        self.positive = True
+        self.s_ly = self.s_ly2 = self.s_i_ly = 0.0
+        self.s_lx = self.s_lx2 = self.s_lx_ly = 0.0
+        self.counts: Optional[Counter] = Counter()
+
+    def update(self, values: np.ndarray) -> None:
+        """Add the next values of the column, in order."""
+        m = len(values)
+        if m == 0:
+            return
+        y = values.astype(np.float64, copy=False)
+        i = np.arange(self.n, self.n + m, dtype=np.float64)
+        z = y - self.shift
+
+        self.s1 += float(z.sum())
+        self.s2 += float(np.dot(z, z))
+        self.s_iy += float(np.dot(i, z))
+
+        if self.n == 0:
+            self.first_value = values[0].item()
+        else:
+            self.nondecreasing &= bool(self.last <= y[0])
+            self.nonincreasing &= bool(self.last >= y[0])
+        if m > 1:
+            steps = np.diff(y)
+            self.nondecreasing &= bool(np.all(steps >= 0))
+            self.nonincreasing &= bool(np.all(steps <= 0))
+        self.last = float(y[-1])
+        self.minimum = min(self.minimum, float(y.min()))
+        self.maximum = max(self.maximum, float(y.max()))
+
+        if self.positive and np.all(y > 0):
+            ly = np.log(y)
+            lx = np.log1p(i)
+            self.s_ly += float(ly.sum())
+            self.s_ly2 += float(np.dot(ly, ly))
+            self.s_i_ly += float(np.dot(i, ly))
+            self.s_lx += float(lx.sum())
+            self.s_lx2 += float(np.dot(lx, lx))
+            self.s_lx_ly += float(np.dot(lx, ly))
+        else:
+            self.positive = False
+
+        if self.counts is not None:
+            distinct, counts = np.unique(values, return_counts=True)
+            if len(distinct) > MAX_TRACKED_VALUES:
+                self.counts = None
+            else:
+                self.counts.update(dict(zip(map(str, distinct.tolist()), counts.tolist())))
+                if len(self.counts) > MAX_TRACKED_VALUES:
+                    self.counts = None
+
+        self.n += m
+
+    @property
+    def constant(self) -> bool:
+        return self.n > 0 and self.minimum == self.maximum
+
+    def _index_sums(self) -> Tuple[float, float]:
+        n = self.n
+        return n * (n - 1) / 2.0, (n - 1) * n * (2 * n - 1) / 6.0
+
+    def linear_fit(self) -> Optional[Tuple[float, float, float]]:
+        """(intercept, slope, r) of value against position."""
+        si, sii = self._index_sums()
+        fit = _fit(self.n, si, sii, self.s1, self.s2, self.s_iy)
+        if fit is None:
+            return None
+        return fit[0] + self.shift, fit[1], fit[2]
+
+    def exponential_fit(self) -> Optional[Tuple[float, float, float]]:
+        """(ln a, b, r) of ln(value) = ln a + b·position."""
+        if not self.positive:
+            return None
+        si, sii = self._index_sums()
+        return _fit(self.n, si, sii, self.s_ly, self.s_ly2, self.s_i_ly)
+
+    def power_fit(self) -> Optional[Tuple[float, float, float]]:
+        """(ln a, b, r) of ln(value) = ln a + b·ln(position + 1)."""
+        if not self.positive:
+            return None
+        return _fit(self.n, self.s_lx, self.s_lx2, self.s_ly, self.s_ly2, self.s_lx_ly)
+
+
+class CategorySummary:
+    """Value counts (as strings) of a non-numeric or mixed column."""
+
+    def __init__(self, first_value: Any = None, counts: Optional[Counter] = None, n: int = 0):
+        self.first_value = first_value
+        self.counts = counts
+        self.n = n
+
+    def update(self, values: List[Any]) -> None:
+        if not values:
+            return
+        if self.n == 0:
+            self.first_value = values[0]
+        if self.counts is not None:
+            self.counts.update(map(str, values))
+        self.n += len(values)
+
+    @property
+    def constant(self) -> bool:
+        return self.counts is not None and len(self.counts) == 1
+
+
+class PairwiseSummary:
+    """
+    Co-moment sums for every pair of numeric columns, over the rows where
+    both are present: one set of masked matrix products per update.
+    """
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.shift = np.zeros(0)
+        self.count = np.zeros((0, 0))
+        self.sum_a = np.zeros((0, 0))      # [a, b]: sum of a where b present
+        self.sum_aa = np.zeros((0, 0))     # [a, b]: sum of a² where b present
+        self.sum_ab = np.zeros((0, 0))
+
+    def update(self, keys: List[str], matrix: np.ndarray) -> None:
+        """
+        Args:
+            keys: Column names of matrix
+            matrix: rows × len(keys) float array, NaN where a value is missing
+        """
+        if not keys or matrix.shape[0] == 0:
+            return
+        new = [k for k in keys if k not in self.index]
+        if new:
+            self._grow(new, [np.nanmean(matrix[:, keys.index(k)]) for k in new])
+
+        cols = np.array([self.index[k] for k in keys])
+        present = ~np.isnan(matrix)
+        w = present.astype(np.float64)
+        z = np.where(present, matrix - self.shift[cols], 0.0)
+
+        grid = np.ix_(cols, cols)
+        self.count[grid] += w.T @ w
+        self.sum_a[grid] += z.T @ w
+        self.sum_aa[grid] += (z * z).T @ w
+        self.sum_ab[grid] += z.T @ z
+
+    def _grow(self, keys: List[str], shifts: List[float]) -> None:
+        old = len(self.keys)
+        size = old + len(keys)
+        for name in ('count', 'sum_a', 'sum_aa', 'sum_ab'):
+            grown = np.zeros((size, size))
+            grown[:old, :old] = getattr(self, name)
+            setattr(self, name, grown)
+        self.shift = np.concatenate([self.shift, np.asarray(shifts, dtype=np.float64)])
+        for key in keys:
+            self.index[key] = len(self.keys)
+            self.keys.append(key)
+
+    def correlations(self, keys: List[str]) -> List[Tuple[str, str, float, int]]:
+        """(key_a, key_b, r, rows) for each pair among keys with enough overlap."""
+        if len(keys) < 2:
+            return []
+        cols = np.array([self.index[k] for k in keys])
+        grid = np.ix_(cols, cols)
+        n = self.count[grid]
+        sa = self.sum_a[grid]
+        saa = self.sum_aa[grid]
+        sab = self.sum_ab[grid]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = sab - sa * sa.T / n
+            var_a = saa - sa * sa / n
+            var_b = var_a.T
+            r = cov / np.sqrt(var_a * var_b)
+
+        result = []
+        upper_a, upper_b = np.triu_indices(len(keys), k=1)
+        for a, b in zip(upper_a.tolist(), upper_b.tolist()):
+            if n[a, b] > 2 and np.isfinite(r[a, b]):
+                result.append((keys[a], keys[b], float(np.clip(r[a, b], -1, 1)), int(n[a, b])))
+        return result
+
+
+class ObservationTable:
+    """Observation dicts converted once into columns."""
+
+    def __init__(self, observations: List[Dict[str, Any]]):
+        values: Dict[str, List[Any]] = {}
+        rows: Dict[str, List[int]] = {}
+        n_rows = 0
+        for observation in observations:
+            if isinstance(observation, dict):
+                for key, value in observation.items():
+                    column = values.get(key)
+                    if column is None:
+                        column = values[key] = []
+                        rows[key] = []
+                    column.append(value)
+                    rows[key].append(n_rows)
+            n_rows += 1
+
+        self.n_rows = n_rows
+        self.keys: List[str] = list(values)
+        self.rows: Dict[str, np.ndarray] = {k: np.asarray(r, dtype=np.intp) for k, r in rows.items()}
+        # Numeric columns as arrays (original dtype), others as lists
+        self.columns: Dict[str, Union[np.ndarray, List[Any]]] = {}
+        for key, column in values.items():
+            self.columns[key] = self._as_numeric(column)
+
+    @staticmethod
+    def _as_numeric(column: List[Any]) -> Union[np.ndarray, List[Any]]:
+        try:
+            array = np.asarray(column)
+        except (ValueError, TypeError):
+            return column
+        if array.ndim == 1 and array.dtype.kind in 'biuf':
+            return array
+        return column
+
+    def is_numeric(self, key: str) -> bool:
+        return isinstance(self.columns[key], np.ndarray)
+
+    def dense(self, keys: List[str]) -> np.ndarray:
+        """rows × len(keys) float matrix of numeric columns, NaN where missing."""
+        matrix = np.full((self.n_rows, len(keys)), np.nan)
+        for j, key in enumerate(keys):
+            matrix[self.rows[key], j] = self.columns[key]
+        return matrix
+
+
+class PatternMiner:
+    """
+    Accumulates column and pairwise statistics over batches of observations
+    and reports patterns from them.
+    """
+
+    def __init__(self):
+        self.columns: Dict[str, Union[ColumnSummary, CategorySummary]] = {}
+        self.pairs = PairwiseSummary()
+        self.n_observations = 0
+
+    def update(self, table: ObservationTable) -> None:
+        """Merge one table (the next observations, in order)."""
+        numeric_keys = []
+        for key in table.keys:
+            column = table.columns[key]
+            summary = self.columns.get(key)
+            if table.is_numeric(key):
+                if summary is None:
+                    summary = self.columns[key] = ColumnSummary(shift=float(column[0]))
+                if isinstance(summary, ColumnSummary):
+                    summary.update(column)
+                    numeric_keys.append(key)
+                else:
+                    summary.update(column.tolist())
+            else:
+                if isinstance(summary, ColumnSummary):
+                    # Column turns out to be mixed: keep only its value counts
+                    summary = self.columns[key] = CategorySummary(
+                        summary.first_value, summary.counts, summary.n
+                    )
+                elif summary is None:
+                    summary = self.columns[key] = CategorySummary(counts=Counter())
+                summary.update(column)
+
+        self.pairs.update(numeric_keys, table.dense(numeric_keys))
+        self.n_observations += table.n_rows
+
+    def patterns(self, table: Optional[ObservationTable] = None) -> List[Dict[str, Any]]:
+        """
+        Patterns over everything merged so far.
+
+        Args:
+            table: The raw table, if the miner holds exactly that data; enables
+                periodicity detection, which needs the sequence itself
+        """
+        patterns: List[Dict[str, Any]] = []
+        varying = []
+        for key, summary in self.columns.items():
+            if isinstance(summary, ColumnSummary):
+                patterns.extend(self._numeric_patterns(key, summary))
+                if not summary.constant:
+                    varying.append(key)
+            else:
+                patterns.extend(self._category_patterns(key, summary))
+
+        if table is not None:
+            candidates = [
+                k for k in varying
+                if not (self.columns[k].nondecreasing or self.columns[k].nonincreasing)
+                and table.is_numeric(k)
+            ]
+            patterns.extend(_periodic_patterns(table, candidates))
+
+        valid = [k for k in varying if k in self.pairs.index]
+        for key_a, key_b, r, rows in self.pairs.correlations(valid):
+            if abs(r) >= CORRELATION_MIN_ABS:
+                patterns.append({
+                    'type': 'correlation',
+                    'key': f"{key_a}~{key_b}",
+                    'keys': [key_a, key_b],
+                    'correlation': r,
+                    'samples': rows,
+                    'confidence': abs(r)
+                })
+        return patterns
+
+    @staticmethod
+    def _numeric_patterns(key: str, s: ColumnSummary) -> List[Dict[str, Any]]:
+        if s.constant:
+            return [{'type': 'constant', 'key': key, 'value': s.first_value, 'confidence': 1.0}]
+
+        patterns = []
+        if s.nondecreasing or s.nonincreasing:
+            patterns.append({
+                'type': 'monotonic_increase' if s.nondecreasing else 'monotonic_decrease',
+                'key': key,
+                'confidence': 0.8
+            })
+            form = _best_functional_form(s)
+            if form is not None:
+                form['key'] = key
+                patterns.append(form)
+        elif s.n > 2:
+            fit = s.linear_fit()
+            if fit is not None and abs(fit[2]) > LINEAR_TREND_MIN_CORRELATION:
+                patterns.append({
+                    'type': 'linear_trend',
+                    'key': key,
+                    'slope': fit[1],
+                    'intercept': fit[0],
+                    'correlation': fit[2],
+                    'confidence': abs(fit[2])
+                })
+        return patterns
+
+    @staticmethod
+    def _category_patterns(key: str, s: CategorySummary) -> List[Dict[str, Any]]:
+        if s.n == 0:
+            return []
+        if s.constant:
+            return [{'type': 'constant', 'key': key, 'value': s.first_value, 'confidence': 1.0}]
+        if s.counts:
+            value, count = s.counts.most_common(1)[0]
+            frequency = count / s.n
+            if frequency > DOMINANT_VALUE_MIN_FREQUENCY:
+                return [{
+                    'type': 'dominant_value',
+                    'key': key,
+                    'value': value,
+                    'frequency': frequency,
+                    'confidence': frequency
+                }]
+        return []
+
+
+def _best_functional_form(s: ColumnSummary) -> Optional[Dict[str, Any]]:
+    """Best of linear, exponential and power-law fits against position, if good enough."""
+    if s.n < 3:
+        return None
+    candidates = []
+    fit = s.linear_fit()
+    if fit is not None:
+        candidates.append(('linear', {'a': fit[0], 'b': fit[1]}, fit[2] ** 2))
+    fit = s.exponential_fit()
+    if fit is not None:
+        candidates.append(('exponential', {'a': float(np.exp(fit[0])), 'b': fit[1]}, fit[2] ** 2))
+    fit = s.power_fit()
+    if fit is not None:
+        candidates.append(('power_law', {'a': float(np.exp(fit[0])), 'b': fit[1]}, fit[2] ** 2))
+    if not candidates:
+        return None
+
+    model, params, r2 = max(candidates, key=lambda c: c[2])
+    if r2 < FUNCTIONAL_FORM_MIN_R2:
+        return None
+    return {
+        'type': 'functional_form',
+        'model': model,
+        'params': params,
+        'r_squared': r2,
+        'confidence': r2
+    }
+
+
+def _periodic_patterns(table: ObservationTable, keys: List[str]) -> List[Dict[str, Any]]:
+    """Dominant FFT frequency of each detrended column, columns of equal length batched."""
+    by_length: Dict[int, List[str]] = {}
+    for key in keys:
+        length = len(table.columns[key])
+        if length >= PERIODIC_MIN_LENGTH:
+            by_length.setdefault(length, []).append(key)
+
+    patterns = []
+    for n, group in by_length.items():
+        y = np.column_stack([table.columns[k] for k in group]).astype(np.float64)
+        x = np.arange(n, dtype=np.float64)
+        xc = x - x.mean()
+        yc = y - y.mean(axis=0)
+        slope = (xc @ yc) / (xc @ xc)
+        residual = yc - np.outer(xc, slope)
+
+        power = np.abs(np.fft.rfft(residual, axis=0)) ** 2
+        power[0] = 0.0
+        total = power.sum(axis=0)
+        peak = power.argmax(axis=0)
+        for j, key in enumerate(group):
+            # At least two full cycles, and one frequency dominating
+            if total[j] <= 0 or peak[j] < 2:
+                continue
+            fraction = float(power[peak[j], j] / total[j])
+            if fraction >= PERIODIC_MIN_POWER_FRACTION:
+                patterns.append({
+                    'type': 'periodic',
+                    'key': key,
+                    'period': n / float(peak[j]),
+                    'power_fraction': fraction,
+                    'confidence': fraction
+                })
+    return patterns
+
+
+def mine_patterns(observations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Batch pattern mining: one columnar table, one miner update."""
+    table = ObservationTable(observations)
+    miner = PatternMiner()
+    miner.update(table)
+    return miner.patterns(table)
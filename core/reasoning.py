@@ -33,6 +33,7 @@ from enum import Enum
 from dataclasses import dataclass, field
 import numpy as np
 from collections import defaultdict
+import heapq
 import re
 
 import sys
@@ -41,6 +42,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from validators.data_validator import DataValidator
 from loggers.system_logger import SystemLogger
 from .engine import ReasoningEngine
+from .pattern_mining import ObservationTable, PatternMiner, mine_patterns
+from .explanation_search import ExplanationResult, ExplanationSearch
+from .analogy_index import StructuralIndex, map_keys
 
 
 class ReasoningType(Enum):
@@ -98,6 +102,44 @@ class ReasoningResult:
         }
 
 
+# Triangular norms for combining confidences along a derivation
+T_NORMS: Dict[str, Callable[[float, float], float]] = {
+    'product': lambda a, b: a * b,
+    'minimum': min,
+    'lukasiewicz': lambda a, b: max(0.0, a + b - 1.0),
+}
+
+
+@dataclass
+class Derivation:
+    """
+    One node of a derivation DAG: how a literal was obtained.
+    
+    A literal is a proposition with a truth value; premises are the parent
+    literals (for inference rules, the literal the implication was applied to).
+    """
+    proposition: str
+    value: bool
+    confidence: float
+    rule: str = "premise"  # premise | modus_ponens | modus_tollens
+    premise: Optional[Tuple[str, bool]] = None
+    implication: Optional[Implication] = None
+    
+    @property
+    def literal(self) -> str:
+        return self.proposition if self.value else f"¬{self.proposition}"
+    
+    def describe(self) -> str:
+        impl = self.implication
+        if self.rule == "modus_ponens":
+            return (f"By modus ponens: {impl.antecedent} and "
+                    f"({impl.antecedent} → {impl.consequent}) ⊢ {impl.consequent}")
+        if self.rule == "modus_tollens":
+            return (f"By modus tollens: ¬{impl.consequent} and "
+                    f"({impl.antecedent} → {impl.consequent}) ⊢ ¬{impl.antecedent}")
+        return f"Premise: {self.literal}"
+
+
 class DeductiveReasoner:
     """
     Deductive reasoning: derives conclusions that are logically certain 
@@ -108,20 +150,68 @@ class DeductiveReasoner:
     - Modus tollens: ¬Q, P→Q ⊢ ¬P
     - Hypothetical syllogism: P→Q, Q→R ⊢ P→R
     - Disjunctive syllogism: P∨Q, ¬P ⊢ Q
+    
+    Forward chaining is semi-naive: only newly derived literals are joined
+    against implications indexed by antecedent (modus ponens) or consequent
+    (modus tollens). Literals are settled best-confidence first, so each is
+    derived once with the strongest chain under the t-norm. Chained
+    implications are answered lazily per query (implies) instead of being
+    materialized; derivations are kept as a DAG (self.derivations).
     """
     
-    def __init__(self):
+    def __init__(self, t_norm: str = "product"):
+        """
+        Args:
+            t_norm: How confidences combine along a chain: 'product',
+                'minimum' (Gödel) or 'lukasiewicz'
+        """
+        if t_norm not in T_NORMS:
+            raise ValueError(f"Unknown t-norm: {t_norm}")
         self.logger = SystemLogger()
+        self.t_norm = t_norm
+        self._combine = T_NORMS[t_norm]
         self.implications: Set[Implication] = set()
         self.facts: Dict[str, bool] = {}
+        self.fact_confidence: Dict[str, float] = {}
+        self.derivations: Dict[str, Derivation] = {}
+        
+        # Implication indexes, rebuilt if self.implications is edited directly
+        self._by_antecedent: Dict[str, List[Implication]] = defaultdict(list)
+        self._by_consequent: Dict[str, List[Implication]] = defaultdict(list)
+        self._indexed: Set[Implication] = set()
+        # antecedent -> {reachable consequent: best chain confidence}
+        self._closure: Dict[str, Dict[str, float]] = {}
     
     def add_implication(self, antecedent: str, consequent: str, confidence: float = 1.0) -> None:
         """Add an implication rule."""
-        self.implications.add(Implication(antecedent, consequent, confidence))
+        impl = Implication(antecedent, consequent, confidence)
+        if impl in self.implications:
+            return
+        self.implications.add(impl)
+        if len(self._indexed) == len(self.implications) - 1:
+            self._index(impl)
+        self._closure.clear()
     
-    def add_fact(self, proposition: str, value: bool) -> None:
+    def add_fact(self, proposition: str, value: bool, confidence: float = 1.0) -> None:
         """Add a known fact."""
         self.facts[proposition] = value
+        self.fact_confidence[proposition] = confidence
+        self.derivations[proposition] = Derivation(proposition, value, confidence)
+    
+    def _index(self, impl: Implication) -> None:
+        self._by_antecedent[impl.antecedent].append(impl)
+        self._by_consequent[impl.consequent].append(impl)
+        self._indexed.add(impl)
+    
+    def _ensure_index(self) -> None:
+        if len(self._indexed) == len(self.implications):
+            return
+        self._by_antecedent = defaultdict(list)
+        self._by_consequent = defaultdict(list)
+        self._indexed = set()
+        for impl in self.implications:
+            self._index(impl)
+        self._closure.clear()
     
     def modus_ponens(self, p: str, implications: Set[Implication]) -> List[Tuple[str, float, str]]:
         """
@@ -134,12 +224,17 @@ class DeductiveReasoner:
         Returns:
             List of (conclusion, confidence, proof_step)
         """
+        if implications is self.implications:
+            self._ensure_index()
+            candidates = self._by_antecedent.get(p, [])
+        else:
+            candidates = [impl for impl in implications if impl.antecedent == p]
+        
         conclusions = []
-        for impl in implications:
-            if impl.antecedent == p:
-                confidence = impl.confidence
-                proof = f"By modus ponens: {p} and ({p} → {impl.consequent}) ⊢ {impl.consequent}"
-                conclusions.append((impl.consequent, confidence, proof))
+        for impl in candidates:
+            confidence = impl.confidence
+            proof = f"By modus ponens: {p} and ({p} → {impl.consequent}) ⊢ {impl.consequent}"
+            conclusions.append((impl.consequent, confidence, proof))
         return conclusions
     
     def modus_tollens(self, not_q: str, implications: Set[Implication]) -> List[Tuple[str, float, str]]:
@@ -159,12 +254,17 @@ class DeductiveReasoner:
             q = not_q[1:] if not_q.startswith('¬') else not_q[4:]
             q = q.strip()
             
-            for impl in implications:
-                if impl.consequent == q:
-                    not_p = f"¬{impl.antecedent}"
-                    confidence = impl.confidence
-                    proof = f"By modus tollens: {not_q} and ({impl.antecedent} → {q}) ⊢ {not_p}"
-                    conclusions.append((not_p, confidence, proof))
+            if implications is self.implications:
+                self._ensure_index()
+                candidates = self._by_consequent.get(q, [])
+            else:
+                candidates = [impl for impl in implications if impl.consequent == q]
+            
+            for impl in candidates:
+                not_p = f"¬{impl.antecedent}"
+                confidence = impl.confidence
+                proof = f"By modus tollens: {not_q} and ({impl.antecedent} → {q}) ⊢ {not_p}"
+                conclusions.append((not_p, confidence, proof))
         
         return conclusions
     
@@ -172,28 +272,238 @@ class DeductiveReasoner:
         """
         Apply hypothetical syllogism: P→Q, Q→R ⊢ P→R
         
+        One composition step over the given set, joined through an
+        antecedent index (use implies() for full chains).
+        
         Args:
             implications: Set of implications
             
         Returns:
             List of new derived implications
         """
+        by_antecedent: Dict[str, List[Implication]] = defaultdict(list)
+        for impl in implications:
+            by_antecedent[impl.antecedent].append(impl)
+        
         new_implications = []
-        impl_list = list(implications)
-        
-        for impl1 in impl_list:
-            for impl2 in impl_list:
-                if impl1.consequent == impl2.antecedent and impl1 != impl2:
-                    new_impl = Implication(
-                        impl1.antecedent,
-                        impl2.consequent,
-                        impl1.confidence * impl2.confidence
-                    )
-                    if new_impl not in implications:
-                        new_implications.append(new_impl)
+        seen = set()
+        for impl1 in implications:
+            for impl2 in by_antecedent.get(impl1.consequent, []):
+                if impl1 == impl2:
+                    continue
+                new_impl = Implication(
+                    impl1.antecedent,
+                    impl2.consequent,
+                    self._combine(impl1.confidence, impl2.confidence)
+                )
+                if new_impl not in implications and new_impl not in seen:
+                    seen.add(new_impl)
+                    new_implications.append(new_impl)
         
         return new_implications
     
+    def implies(self, antecedent: str, consequent: str) -> float:
+        """
+        Confidence that antecedent → consequent follows by chaining
+        implications (0.0 if it does not).
+        
+        The closure from each antecedent is computed on first query and
+        cached until implications change.
+        """
+        self._ensure_index()
+        reachable = self._closure.get(antecedent)
+        if reachable is None:
+            reachable = {}
+            heap = [(-impl.confidence, impl.consequent)
+                    for impl in self._by_antecedent.get(antecedent, [])]
+            heapq.heapify(heap)
+            while heap:
+                neg_conf, prop = heapq.heappop(heap)
+                if prop in reachable:
+                    continue
+                reachable[prop] = -neg_conf
+                for impl in self._by_antecedent.get(prop, []):
+                    if impl.consequent not in reachable:
+                        conf = self._combine(-neg_conf, impl.confidence)
+                        heapq.heappush(heap, (-conf, impl.consequent))
+            self._closure[antecedent] = reachable
+        return reachable.get(consequent, 0.0)
+    
+    def _chain(self, facts: Dict[str, bool], confidence: Dict[str, float],
+               relevant: Optional[Set[Tuple[str, bool]]] = None) -> Tuple[Dict[str, Derivation], int]:
+        """
+        Semi-naive forward chaining from the given facts.
+        
+        Known facts are never overridden. A max-heap on confidence settles
+        each proposition with its best derivation: t-norms never increase
+        confidence, so nothing popped later can beat it.
+        
+        Args:
+            facts: Known proposition truth values
+            confidence: Confidence of each known fact (default 1.0)
+            relevant: If given, only derive these (proposition, value) literals
+            
+        Returns:
+            (new derivations by proposition, number of literals expanded)
+        """
+        self._ensure_index()
+        derived: Dict[str, Derivation] = {}
+        best: Dict[str, float] = {}
+        heap: List[Tuple[float, int, str]] = []
+        counter = 0
+        for prop in facts:
+            heapq.heappush(heap, (-confidence.get(prop, 1.0), counter, prop))
+            counter += 1
+        
+        settled: Set[str] = set()
+        expanded = 0
+        while heap:
+            _, _, prop = heapq.heappop(heap)
+            if prop in settled:
+                continue
+            settled.add(prop)
+            expanded += 1
+            
+            if prop in facts:
+                value = facts[prop]
+                conf = confidence.get(prop, 1.0)
+            else:
+                derivation = derived[prop]
+                value = derivation.value
+                conf = derivation.confidence
+            
+            if value:
+                # Modus ponens: prop, prop → q ⊢ q
+                candidates = [(impl, impl.consequent, True) for impl in self._by_antecedent.get(prop, [])]
+                rule = "modus_ponens"
+            else:
+                # Modus tollens: ¬prop, p → prop ⊢ ¬p
+                candidates = [(impl, impl.antecedent, False) for impl in self._by_consequent.get(prop, [])]
+                rule = "modus_tollens"
+            
+            for impl, target, target_value in candidates:
+                if target in facts or target in settled:
+                    continue
+                if relevant is not None and (target, target_value) not in relevant:
+                    continue
+                new_conf = self._combine(conf, impl.confidence)
+                if new_conf <= best.get(target, -1.0):
+                    continue
+                best[target] = new_conf
+                derived[target] = Derivation(
+                    target, target_value, new_conf, rule, (prop, value), impl
+                )
+                heapq.heappush(heap, (-new_conf, counter, target))
+                counter += 1
+        
+        return derived, expanded
+    
+    @staticmethod
+    def _rounds(derived: Dict[str, Derivation]) -> int:
+        """
+        Semi-naive rounds the derivations take: the longest derivation chain
+        plus the final round that finds nothing new.
+        """
+        depth: Dict[str, int] = {}
+        for prop in derived:
+            chain = []
+            while prop in derived and prop not in depth:
+                chain.append(prop)
+                prop = derived[prop].premise[0]
+            level = depth.get(prop, 0)
+            for link in reversed(chain):
+                level += 1
+                depth[link] = level
+        return max(depth.values(), default=0) + 1
+    
+    def explain(self, proposition: str, derivations: Optional[Dict[str, Derivation]] = None) -> List[str]:
+        """
+        Proof of a proposition as lines, premises first, walking the DAG.
+        
+        Args:
+            proposition: Proposition (with or without a leading ¬)
+            derivations: DAG to walk (default: this reasoner's)
+        """
+        derivations = self.derivations if derivations is None else derivations
+        prop = proposition[1:] if proposition.startswith('¬') else proposition
+        lines: List[str] = []
+        visited: Set[str] = set()
+        stack = [(prop, False)]
+        while stack:
+            current, emitted = stack.pop()
+            node = derivations.get(current) or self.derivations.get(current)
+            if node is None:
+                continue
+            if emitted:
+                lines.append(node.describe())
+                continue
+            if current in visited:
+                continue
+            visited.add(current)
+            stack.append((current, True))
+            if node.premise is not None:
+                stack.append((node.premise[0], False))
+        return lines
+    
+    def query(self, goal: str) -> ReasoningResult:
+        """
+        Goal-directed (backward) proof of a single literal.
+        
+        Collects the literals that could support the goal by walking the
+        implication indexes backwards, then chains forward within that cone
+        only. Does not modify the known facts.
+        
+        Args:
+            goal: Proposition, optionally negated with ¬ or 'not '
+            
+        Returns:
+            ReasoningResult whose conclusion is the goal if proved, else None
+        """
+        goal = goal.strip()
+        value = not (goal.startswith('¬') or goal.startswith('not '))
+        prop = goal if value else (goal[1:] if goal.startswith('¬') else goal[4:]).strip()
+        
+        self._ensure_index()
+        relevant: Set[Tuple[str, bool]] = {(prop, value)}
+        frontier = [(prop, value)]
+        while frontier:
+            current, current_value = frontier.pop()
+            if current in self.facts:
+                continue
+            if current_value:
+                supports = [(impl.antecedent, True) for impl in self._by_consequent.get(current, [])]
+            else:
+                supports = [(impl.consequent, False) for impl in self._by_antecedent.get(current, [])]
+            for literal in supports:
+                if literal not in relevant:
+                    relevant.add(literal)
+                    frontier.append(literal)
+        
+        facts = {p: self.facts[p] for p, _ in relevant if p in self.facts}
+        derived, expanded = self._chain(facts, self.fact_confidence, relevant)
+        
+        node = derived.get(prop)
+        if node is None and prop in facts:
+            node = self.derivations.get(prop) or Derivation(
+                prop, facts[prop], self.fact_confidence.get(prop, 1.0)
+            )
+        proved = node is not None and node.value == value
+        literal = prop if value else f"¬{prop}"
+        
+        return ReasoningResult(
+            conclusion=literal if proved else None,
+            confidence=node.confidence if proved else 0.0,
+            reasoning_type=ReasoningType.DEDUCTIVE,
+            proof_steps=self.explain(prop, derived) if proved else [],
+            metadata={
+                'goal': literal,
+                'proved': proved,
+                'relevant_literals': len(relevant),
+                'expanded': expanded,
+                't_norm': self.t_norm
+            }
+        )
+    
     def reason(self, premises: List[str]) -> ReasoningResult:
         """
         Perform deductive reasoning on premises.
@@ -205,8 +515,6 @@ class DeductiveReasoner:
             ReasoningResult with conclusions
         """
         proof_steps = []
-        conclusions = []
-        current_confidence = 1.0
         
         # Parse premises into facts and implications
         for premise in premises:
@@ -223,51 +531,30 @@ class DeductiveReasoner:
                 premise = premise.strip()
                 if premise.startswith('¬') or premise.startswith('not '):
                     prop = premise[1:] if premise.startswith('¬') else premise[4:]
-                    self.facts[prop.strip()] = False
+                    self.add_fact(prop.strip(), False)
                 else:
-                    self.facts[premise] = True
+                    self.add_fact(premise, True)
                 proof_steps.append(f"Added fact: {premise}")
         
-        # Apply forward chaining
-        changed = True
-        iterations = 0
-        max_iterations = 100
+        # Semi-naive forward chaining
+        derived, expanded = self._chain(self.facts, self.fact_confidence)
         
-        while changed and iterations < max_iterations:
-            changed = False
-            iterations += 1
-            
-            # Apply modus ponens for all known true facts
-            for fact, value in list(self.facts.items()):
-                if value:
-                    new_conclusions = self.modus_ponens(fact, self.implications)
-                    for conc, conf, proof in new_conclusions:
-                        if conc not in self.facts:
-                            self.facts[conc] = True
-                            conclusions.append(conc)
-                            proof_steps.append(proof)
-                            current_confidence = min(current_confidence, conf)
-                            changed = True
-                else:
-                    # Apply modus tollens
-                    not_fact = f"¬{fact}"
-                    new_conclusions = self.modus_tollens(not_fact, self.implications)
-                    for conc, conf, proof in new_conclusions:
-                        # Extract the proposition from ¬P
-                        prop = conc[1:] if conc.startswith('¬') else conc
-                        if prop not in self.facts:
-                            self.facts[prop] = False
-                            conclusions.append(conc)
-                            proof_steps.append(proof)
-                            current_confidence = min(current_confidence, conf)
-                            changed = True
-            
-            # Apply hypothetical syllogism to derive new implications
-            new_impls = self.hypothetical_syllogism(self.implications)
-            for impl in new_impls:
-                self.implications.add(impl)
-                proof_steps.append(f"By hypothetical syllogism: {impl.antecedent} → {impl.consequent}")
-                changed = True
+        conclusions = []
+        current_confidence = 1.0
+        dag = {}
+        for prop, node in derived.items():
+            self.facts[prop] = node.value
+            self.fact_confidence[prop] = node.confidence
+            self.derivations[prop] = node
+            conclusions.append(node.literal)
+            proof_steps.append(node.describe())
+            current_confidence = min(current_confidence, node.confidence)
+            dag[node.literal] = {
+                'rule': node.rule,
+                'from': [node.premise[0] if node.premise[1] else f"¬{node.premise[0]}",
+                         f"{node.implication.antecedent} → {node.implication.consequent}"],
+                'confidence': node.confidence
+            }
         
         return ReasoningResult(
             conclusion=conclusions if conclusions else list(self.facts.items()),
@@ -275,9 +562,12 @@ class DeductiveReasoner:
             reasoning_type=ReasoningType.DEDUCTIVE,
             proof_steps=proof_steps,
             metadata={
-                'iterations': iterations,
+                'iterations': self._rounds(derived),
+                'literals_expanded': expanded,
                 'facts_derived': len(conclusions),
-                'total_facts': len(self.facts)
+                'total_facts': len(self.facts),
+                'derivations': dag,
+                't_norm': self.t_norm
             }
         )
 
@@ -292,18 +582,50 @@ class InductiveReasoner:
     - Hypothesis formation
     """
     
-    def __init__(self):
+    def __init__(self, batch_size: int = 4096, keep_observations: bool = True):
+        """
+        Args:
+            batch_size: Observations buffered by add_observation before they
+                are folded into the streaming statistics
+            keep_observations: Also keep every observation in self.observations
+        """
         self.logger = SystemLogger()
         self.observations: List[Dict[str, Any]] = []
+        self.batch_size = batch_size
+        self.keep_observations = keep_observations
+        self._miner = PatternMiner()
+        self._pending: List[Dict[str, Any]] = []
     
     def add_observation(self, observation: Dict[str, Any]) -> None:
-        """Add an observation to the dataset."""
-        self.observations.append(observation)
+        """Add an observation to the dataset and the streaming statistics."""
+        if self.keep_observations:
+            self.observations.append(observation)
+        self._pending.append(observation)
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+    
+    def _flush(self) -> None:
+        if self._pending:
+            self._miner.update(ObservationTable(self._pending))
+            self._pending = []
+    
+    def stream_patterns(self) -> List[Dict[str, Any]]:
+        """
+        Patterns over all observations added so far, from running
+        statistics only (no periodicity, which needs the raw sequence).
+        """
+        self._flush()
+        return self._miner.patterns()
     
     def find_patterns(self, observations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Find common patterns in observations.
         
+        Observations are converted to columns once and every detector runs
+        column-wise (see core/pattern_mining.py): constant, monotonic,
+        linear trend, functional form (linear/exponential/power law),
+        periodicity, dominant value, and pairwise correlation.
+        
         Args:
             observations: List of observation dictionaries
             
@@ -312,84 +634,7 @@ class InductiveReasoner:
         """
         if not observations:
             return []
-        
-        patterns = []
-        
-        # Find common keys
-        all_keys = set()
-        for obs in observations:
-            if isinstance(obs, dict):
-                all_keys.update(obs.keys())
-        
-        # For each key, find if there's a consistent pattern
-        for key in all_keys:
-            values = [obs.get(key) for obs in observations if isinstance(obs, dict) and key in obs]
-            
-            if not values:
-                continue
-            
-            # Check for constant value
-            if len(set(str(v) for v in values)) == 1:
-                patterns.append({
-                    'type': 'constant',
-                    'key': key,
-                    'value': values[0],
-                    'confidence': 1.0
-                })
-            
-            # Check for numeric trends
-            elif all(isinstance(v, (int, float)) for v in values):
-                # Check monotonic increase
-                if all(values[i] <= values[i+1] for i in range(len(values)-1)):
-                    patterns.append({
-                        'type': 'monotonic_increase',
-                        'key': key,
-                        'confidence': 0.8
-                    })
-                # Check monotonic decrease
-                elif all(values[i] >= values[i+1] for i in range(len(values)-1)):
-                    patterns.append({
-                        'type': 'monotonic_decrease',
-                        'key': key,
-                        'confidence': 0.8
-                    })
-                # Check for linear relationship
-                else:
-                    # Simple linear fit
-                    x = np.arange(len(values))
-                    y = np.array(values)
-                    if len(x) > 1:
-                        # Calculate correlation
-                        correlation = np.corrcoef(x, y)[0, 1] if len(x) > 2 else 0
-                        if abs(correlation) > 0.8:
-                            slope = (y[-1] - y[0]) / (len(y) - 1) if len(y) > 1 else 0
-                            patterns.append({
-                                'type': 'linear_trend',
-                                'key': key,
-                                'slope': slope,
-                                'correlation': correlation,
-                                'confidence': abs(correlation)
-                            })
-            
-            # Check for categorical patterns
-            else:
-                value_counts = defaultdict(int)
-                for v in values:
-                    value_counts[str(v)] += 1
-                
-                most_common = max(value_counts.items(), key=lambda x: x[1])
-                frequency = most_common[1] / len(values)
-                
-                if frequency > 0.7:
-                    patterns.append({
-                        'type': 'dominant_value',
-                        'key': key,
-                        'value': most_common[0],
-                        'frequency': frequency,
-                        'confidence': frequency
-                    })
-        
-        return patterns
+        return mine_patterns(observations)
     
     def generalize(self, patterns: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -427,6 +672,29 @@ class InductiveReasoner:
                     'rule': f"Most likely: {pattern['key']} = {pattern['value']} (frequency: {pattern['frequency']:.2f})",
                     'confidence': pattern['confidence']
                 })
+            elif pattern['type'] == 'functional_form':
+                a, b = pattern['params']['a'], pattern['params']['b']
+                forms = {
+                    'linear': f"{a:.4g} + {b:.4g}·n",
+                    'exponential': f"{a:.4g}·exp({b:.4g}·n)",
+                    'power_law': f"{a:.4g}·(n+1)^{b:.4g}"
+                }
+                hypothesis['rules'].append({
+                    'rule': f"{pattern['key']} ≈ {forms[pattern['model']]} (R² = {pattern['r_squared']:.3f})",
+                    'confidence': pattern['confidence']
+                })
+            elif pattern['type'] == 'periodic':
+                hypothesis['rules'].append({
+                    'rule': f"{pattern['key']} repeats with period ≈ {pattern['period']:.2f}",
+                    'confidence': pattern['confidence']
+                })
+            elif pattern['type'] == 'correlation':
+                key_a, key_b = pattern['keys']
+                direction = "increases" if pattern['correlation'] > 0 else "decreases"
+                hypothesis['rules'].append({
+                    'rule': f"{key_b} {direction} with {key_a} (r = {pattern['correlation']:.3f})",
+                    'confidence': pattern['confidence']
+                })
             
             hypothesis['confidence'] = min(hypothesis['confidence'], pattern['confidence'])
         
@@ -488,12 +756,27 @@ class AbductiveReasoner:
     - Hypothesis generation
     - Explanation ranking by simplicity and coverage
     - Bayesian hypothesis scoring
+    - Minimum-cost explanation sets (weighted set cover over bitsets, see
+      core/explanation_search.py)
     """
     
-    def __init__(self):
+    # Per-hypothesis proof steps listed by reason()
+    MAX_LISTED_HYPOTHESES = 10
+    
+    def __init__(self, max_explanations: int = 3, exact: bool = False, time_budget: float = 0.5):
+        """
+        Args:
+            max_explanations: Number of ranked explanation sets to return
+            exact: Search explanation sets by branch and bound instead of greedily
+            time_budget: Seconds allowed for the exact search
+        """
         self.logger = SystemLogger()
         self.hypotheses: List[Dict[str, Any]] = []
         self.priors: Dict[str, float] = {}  # Prior probabilities for hypotheses
+        self.max_explanations = max_explanations
+        self.exact = exact
+        self.time_budget = time_budget
+        self.search = ExplanationSearch()
     
     def add_hypothesis(self, name: str, explains: List[str], complexity: int = 1, prior: float = 0.5) -> None:
         """
@@ -512,6 +795,38 @@ class AbductiveReasoner:
             'prior': prior
         })
         self.priors[name] = prior
+        if self.search.size == len(self.hypotheses) - 1:
+            self.search.add(name, explains, complexity, prior)
+    
+    def _ensure_search(self) -> None:
+        """Rebuild the bitset index if self.hypotheses was edited directly."""
+        if self.search.size == len(self.hypotheses):
+            return
+        self.search = ExplanationSearch(self.search.complexity_weight)
+        for hyp in self.hypotheses:
+            self.search.add(hyp['name'], hyp['explains'], hyp['complexity'], hyp['prior'])
+    
+    def explain(self, observations: List[str],
+                generated: Optional[List[Dict[str, Any]]] = None) -> ExplanationResult:
+        """
+        Ranked minimal sets of hypotheses (registered and generated) that
+        jointly explain the observations.
+        
+        Args:
+            observations: Observations to explain
+            generated: Hypotheses already generated for these observations;
+                generate_hypotheses() is called if omitted
+        """
+        self._ensure_search()
+        if generated is None:
+            generated = self.generate_hypotheses(list(observations))
+        return self.search.explain(
+            observations,
+            k=self.max_explanations,
+            exact=self.exact,
+            time_budget=self.time_budget,
+            extra=generated
+        )
     
     def score_hypothesis(self, hypothesis: Dict[str, Any], observations: Set[str]) -> float:
         """
@@ -596,7 +911,8 @@ class AbductiveReasoner:
             proof_steps.append(f"Observation to explain: {obs_str}")
         
         # Combine existing and generated hypotheses
-        all_hypotheses = self.hypotheses + self.generate_hypotheses(list(observations))
+        generated = self.generate_hypotheses(list(observations))
+        all_hypotheses = self.hypotheses + generated
         
         if not all_hypotheses:
             return ReasoningResult(
@@ -607,19 +923,30 @@ class AbductiveReasoner:
                 metadata={'hypotheses_evaluated': 0}
             )
         
-        # Score all hypotheses
-        scored = []
-        for hyp in all_hypotheses:
-            score = self.score_hypothesis(hyp, observations)
-            scored.append((hyp, score))
+        # Score all hypotheses: registered ones from bitset coverage in one pass
+        self._ensure_search()
+        obs_list = list(observations)
+        covered = np.concatenate([
+            self.search.coverage(obs_list),
+            [len(hyp['explains'] & observations) for hyp in generated]
+        ]).astype(np.float64)
+        complexity = np.array([hyp['complexity'] for hyp in all_hypotheses], dtype=np.float64)
+        prior = np.array([hyp['prior'] for hyp in all_hypotheses], dtype=np.float64)
+        scores = covered / len(observations) / complexity * prior if observations else np.zeros(len(all_hypotheses))
+        
+        # Sort by score (stable, so ties keep registration order)
+        order = np.argsort(-scores, kind='stable')
+        scored = [(all_hypotheses[i], float(scores[i])) for i in order]
+        
+        for i in order[:self.MAX_LISTED_HYPOTHESES]:
+            hyp = all_hypotheses[i]
             proof_steps.append(
-                f"Hypothesis '{hyp['name']}': score={score:.4f} "
-                f"(coverage={len(hyp['explains'] & observations)}/{len(observations)}, "
+                f"Hypothesis '{hyp['name']}': score={scores[i]:.4f} "
+                f"(coverage={int(covered[i])}/{len(observations)}, "
                 f"complexity={hyp['complexity']}, prior={hyp['prior']:.2f})"
             )
-        
-        # Sort by score
-        scored.sort(key=lambda x: x[1], reverse=True)
+        if len(order) > self.MAX_LISTED_HYPOTHESES:
+            proof_steps.append(f"... {len(order) - self.MAX_LISTED_HYPOTHESES} more hypotheses scored")
         
         # Best explanation
         best = scored[0]
@@ -628,6 +955,14 @@ class AbductiveReasoner:
         
         proof_steps.append(f"Best explanation: '{best_hypothesis['name']}' with score {best_score:.4f}")
         
+        # Best combinations of hypotheses
+        search = self.explain(obs_list, generated)
+        for rank, explanation in enumerate(search.sets, 1):
+            proof_steps.append(
+                f"Explanation set {rank}: {{{', '.join(explanation.hypotheses)}}} "
+                f"cost={explanation.cost:.3f}, score={explanation.score:.3f}"
+            )
+        
         # Calculate confidence based on score margin
         if len(scored) > 1:
             second_best = scored[1][1]
@@ -642,14 +977,18 @@ class AbductiveReasoner:
                 'explains': list(best_hypothesis['explains']),
                 'unexplained': list(observations - best_hypothesis['explains']),
                 'score': best_score,
-                'alternatives': [(h['name'], s) for h, s in scored[1:4]]  # Top 3 alternatives
+                'alternatives': [(h['name'], s) for h, s in scored[1:4]],  # Top 3 alternatives
+                'explanation_sets': [e.to_dict() for e in search.sets]
             },
             confidence=confidence,
             reasoning_type=ReasoningType.ABDUCTIVE,
             proof_steps=proof_steps,
             metadata={
                 'hypotheses_evaluated': len(scored),
-                'observations_count': len(observations)
+                'observations_count': len(observations),
+                'explanation_candidates': search.candidates,
+                'explanation_search': 'exact' if self.exact else 'greedy',
+                'explanation_optimal': search.optimal
             }
         )
 
@@ -662,11 +1001,20 @@ class AnalogicalReasoner:
     - Structure mapping
     - Similarity computation
     - Knowledge transfer
+    - Retrieval of analogous domains from a library by structural
+      fingerprint (see core/analogy_index.py)
     """
     
-    def __init__(self):
+    def __init__(self, shortlist_size: int = 10):
+        """
+        Args:
+            shortlist_size: Library domains retrieved by fingerprint cosine
+                before exact similarity scoring
+        """
         self.logger = SystemLogger()
         self.analogies: List[Dict[str, Any]] = []  # Known analogies/cases
+        self.shortlist_size = shortlist_size
+        self.index = StructuralIndex()  # Library of domains
     
     def add_analogy(self, source_domain: Dict[str, Any], target_domain: Dict[str, Any], 
                    mapping: Dict[str, str]) -> None:
@@ -683,6 +1031,41 @@ class AnalogicalReasoner:
             'target': target_domain,
             'mapping': mapping
         })
+        self.index.add(f"analogy_{len(self.analogies) - 1}", source_domain)
+    
+    def add_domain(self, name: str, domain: Dict[str, Any]) -> None:
+        """Add a domain to the library that reason() retrieves analogues from."""
+        self.index.add(name, domain)
+    
+    def retrieve(self, target: Dict[str, Any], k: int = 3) -> List[Dict[str, Any]]:
+        """
+        Most analogous library domains for a target.
+        
+        Shortlists by fingerprint cosine over the whole library, then ranks
+        the shortlist by the quality of its optimal key mapping.
+        
+        Args:
+            target: Domain to find analogues for
+            k: Number of analogues to return
+            
+        Returns:
+            List of {'name', 'domain', 'mapping', 'similarity', 'cosine'},
+            best first; similarity averages cosine and mapping quality
+        """
+        shortlist = self.index.query(target, max(k, self.shortlist_size))
+        ranked = []
+        for row, cosine in shortlist:
+            domain = self.index.domains[row]
+            mapping, quality = map_keys(domain, target)
+            ranked.append({
+                'name': self.index.names[row],
+                'domain': domain,
+                'mapping': mapping,
+                'similarity': 0.5 * max(cosine, 0.0) + 0.5 * quality,
+                'cosine': cosine
+            })
+        ranked.sort(key=lambda r: r['similarity'], reverse=True)
+        return ranked[:k]
     
     def compute_structural_similarity(self, domain1: Dict[str, Any], domain2: Dict[str, Any]) -> float:
         """
@@ -732,6 +1115,10 @@ class AnalogicalReasoner:
         """
         Find mapping between source and target domains.
         
+        Solves the assignment over a key-similarity matrix (name, value
+        type, nested structure) with the Hungarian algorithm; pairs too
+        dissimilar to be analogous stay unmapped.
+        
         Args:
             source: Source domain
             target: Target domain
@@ -739,29 +1126,7 @@ class AnalogicalReasoner:
         Returns:
             Mapping from source keys to target keys
         """
-        mapping = {}
-        
-        source_keys = set(source.keys()) if isinstance(source, dict) else set()
-        target_keys = set(target.keys()) if isinstance(target, dict) else set()
-        
-        # Direct matches
-        for key in source_keys & target_keys:
-            mapping[key] = key
-        
-        # Try to match remaining keys by type
-        unmatched_source = source_keys - set(mapping.keys())
-        unmatched_target = target_keys - set(mapping.values())
-        
-        for s_key in unmatched_source:
-            for t_key in unmatched_target:
-                if isinstance(source, dict) and isinstance(target, dict):
-                    s_val = source.get(s_key)
-                    t_val = target.get(t_key)
-                    if type(s_val) == type(t_val):
-                        mapping[s_key] = t_key
-                        unmatched_target.discard(t_key)
-                        break
-        
+        mapping, _ = map_keys(source, target)
         return mapping
     
     def transfer_knowledge(self, source: Dict[str, Any], mapping: Dict[str, str], 
@@ -836,12 +1201,26 @@ class AnalogicalReasoner:
             elif isinstance(premise, str):
                 query = premise
         
+        retrieved = None
+        if not source_domain and target_domain and len(self.index):
+            candidates = self.retrieve(target_domain, k=1)
+            if candidates:
+                retrieved = candidates[0]
+                source_domain = retrieved['domain']
+                proof_steps.append(
+                    f"Retrieved analogue '{retrieved['name']}' from {len(self.index)} library domains "
+                    f"(similarity: {retrieved['similarity']:.4f})"
+                )
+        
         proof_steps.append(f"Source domain: {source_domain}")
         proof_steps.append(f"Target domain: {target_domain}")
         proof_steps.append(f"Query: {query}")
         
-        # Compute similarity
-        similarity = self.compute_structural_similarity(source_domain, target_domain)
+        # Compute similarity (name-independent for a retrieved analogue)
+        if retrieved is not None:
+            similarity = retrieved['similarity']
+        else:
+            similarity = self.compute_structural_similarity(source_domain, target_domain)
         proof_steps.append(f"Structural similarity: {similarity:.4f}")
         
         if similarity < 0.1:
@@ -854,7 +1233,7 @@ class AnalogicalReasoner:
             )
         
         # Find mapping
-        mapping = self.find_mapping(source_domain, target_domain)
+        mapping = retrieved['mapping'] if retrieved is not None else self.find_mapping(source_domain, target_domain)
         proof_steps.append(f"Found mapping: {mapping}")
         
         # Transfer knowledge
@@ -877,7 +1256,8 @@ class AnalogicalReasoner:
             proof_steps=proof_steps,
             metadata={
                 'similarity': similarity,
-                'mapping_coverage': mapping_coverage
+                'mapping_coverage': mapping_coverage,
+                'retrieved_source': retrieved['name'] if retrieved else None
             }
         )
 
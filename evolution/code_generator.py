@@ -10,7 +10,7 @@ First Principle Analysis:
 
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, List, Sequence
 
 from loggers.evolution_logger import EvolutionLogger
 from loggers.system_logger import SystemLogger
@@ -44,6 +44,32 @@ class CodeGenerator:
         Raises:
             ValueError: If spec is invalid or generated code fails validation.
         """
+        code = self._render_function(function_spec)
+        _, results = self.validator.validate_many([code])[0]
+        self._check_generated(results)
+        self._log_generated(function_spec, code)
+        return code
+
+    def generate_functions(self, function_specs: Sequence[Dict[str, Any]]) -> List[str]:
+        """Generate several functions, validating them as one batch.
+
+        Args:
+            function_specs: Function specifications, as for generate_function.
+
+        Returns:
+            Generated function code, one string per spec.
+
+        Raises:
+            ValueError: If a spec is invalid or any generated function fails validation.
+        """
+        codes = [self._render_function(spec) for spec in function_specs]
+        for _, results in self.validator.validate_many(codes):
+            self._check_generated(results)
+        for spec, code in zip(function_specs, codes):
+            self._log_generated(spec, code)
+        return codes
+
+    def _render_function(self, function_spec: Dict[str, Any]) -> str:
         if not isinstance(function_spec, dict):
             self._logger.log("Invalid function specification", level="ERROR")
             raise ValueError("Function specification must be a dictionary")
@@ -55,23 +81,25 @@ class CodeGenerator:
         body = function_spec.get("body", "pass")
 
         param_str = ", ".join(params)
-        code = f"def {name}({param_str}):\n    {body}\n"
+        return f"def {name}({param_str}):\n    {body}\n"
 
-        if not self.validator.validate_syntax(code):
+    def _check_generated(self, results: Dict[str, Any]) -> None:
+        if not results["syntax_valid"]:
             self._logger.log("Generated code has syntax errors", level="ERROR")
             raise ValueError("Generated code is invalid")
 
-        if not self.validator.validate_safety(code):
+        if not results["safety_valid"]:
             self._logger.log("Generated code is unsafe", level="ERROR")
             raise ValueError("Generated code is unsafe")
 
+    def _log_generated(self, function_spec: Dict[str, Any], code: str) -> None:
+        name = function_spec.get("name", "generated_function")
         self.evolution_logger.log_evolution(
             "code_generation",
             {"function_name": name, "code_length": len(code)},
         )
 
         self._logger.log(f"Function generated: {name}", level="INFO")
-        return code
 
     def generate_module(self, module_spec: Dict[str, Any]) -> str:
         """Generate a Python module from specification.
@@ -258,6 +258,82 @@ class SelfEvolutionEngine:
             self.logger.log(f"Error evolving function: {str(e)}", level="ERROR")
             return False, None
     
+    def evolve_function_variants(self,
+                                 file_path: str,
+                                 function_name: str,
+                                 improvement_specs: List[Dict[str, Any]]) -> List[EvolutionCandidate]:
+        """
+        Generate one candidate per improvement specification and validate them together.
+        
+        Candidates are validated as one batch (duplicates analysed once) and
+        only those passing are recorded in the evolution history.
+        
+        Args:
+            file_path: Path to file containing function
+            function_name: Name of function to evolve
+            improvement_specs: Specifications, one per candidate
+            
+        Returns:
+            Valid candidates, best performance score first
+        """
+        cot = ChainOfThoughtLogger()
+        step_id = cot.start_step(
+            action="EVOLVE_FUNCTION_VARIANTS",
+            input_data={
+                'file_path': file_path,
+                'function_name': function_name,
+                'num_specs': len(improvement_specs)
+            },
+            level=LogLevel.DECISION
+        )
+        
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                current_code = f.read()
+            
+            codes = [
+                self._generate_improved_code(current_code, function_name, spec)
+                for spec in improvement_specs
+            ]
+            
+            candidates = []
+            for code, spec, (is_valid, _) in zip(codes, improvement_specs,
+                                                  self._validate_codes(codes, file_path)):
+                if not is_valid:
+                    continue
+                candidate = EvolutionCandidate(
+                    code=code,
+                    file_path=file_path,
+                    version=self._increment_version(),
+                    performance_score=self._evaluate_performance(code, current_code),
+                    validation_passed=True,
+                    metadata=spec
+                )
+                self.evolution_history.append(candidate)
+                candidates.append(candidate)
+            
+            candidates.sort(key=lambda c: -c.performance_score)
+            
+            cot.end_step(
+                step_id,
+                output_data={'valid_candidates': len(candidates)},
+                validation_passed=bool(candidates)
+            )
+            
+            self.evolution_logger.log_evolution("function_evolution_variants", {
+                'file_path': file_path,
+                'function_name': function_name,
+                'candidates': len(codes),
+                'valid_candidates': len(candidates)
+            })
+            
+            return candidates
+        
+        except Exception as e:
+            cot.end_step(step_id, output_data={'error': str(e)}, validation_passed=False)
+            self.logger.log(f"Error evolving function variants: {str(e)}", level="ERROR")
+            return []
+    
     def _generate_improved_code(self,
                                 current_code: str,
                                 function_name: str,
@@ -355,18 +431,33 @@ class SelfEvolutionEngine:
         Returns:
             Tuple of (is_valid, message)
         """
-        # Syntax validation
-        if not self.code_validator.validate_syntax(code):
-            return False, "Syntax validation failed"
-        
-        # Safety validation
-        if not self.code_validator.validate_safety(code):
-            return False, "Safety validation failed"
-        
-        # Physics constraints (if applicable)
-        # This would check against first-principles constraints
+        return self._validate_codes([code], file_path)[0]
+    
+    def _validate_codes(self, codes: List[str], file_path: str) -> List[Tuple[bool, str]]:
+        """
+        Validate several generated candidates in one batch.
         
-        return True, "Validation passed"
+        Args:
+            codes: Candidate code strings
+            file_path: File path for context
+            
+        Returns:
+            One (is_valid, message) per candidate
+        """
+        outcomes = []
+        for _, results in self.code_validator.validate_many(codes):
+            # Syntax validation
+            if not results['syntax_valid']:
+                outcomes.append((False, "Validation timed out" if results.get('timed_out')
+                                 else "Syntax validation failed"))
+            # Safety validation
+            elif not results['safety_valid']:
+                outcomes.append((False, "Safety validation failed"))
+            # Physics constraints (if applicable)
+            # This would check against first-principles constraints
+            else:
+                outcomes.append((True, "Validation passed"))
+        return outcomes
     
     def _evaluate_performance(self, new_code: str, old_code: str) -> float:
         """
@@ -6,7 +6,7 @@ Enables the system to modify its own code with validation.
 
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, List, Sequence, Tuple
 
 from loggers.evolution_logger import EvolutionLogger
 from loggers.system_logger import SystemLogger
@@ -32,11 +32,38 @@ class SelfModifier:
 
         Args:
             file_path: Path to file to modify.
-            modification: Modification specification.
+            modification: Modification specification; new source under 'code'
+                is validated first.
 
         Returns:
             True if successful, False otherwise.
         """
+        return self.modify_many([(file_path, modification)])[0]
+
+    def modify_many(self, modifications: Sequence[Tuple[str, Dict[str, Any]]]) -> List[bool]:
+        """Apply several modifications, validating their new code as one batch.
+
+        Args:
+            modifications: (file path, modification specification) pairs.
+
+        Returns:
+            One success flag per modification, in order.
+        """
+        codes = [m["code"] for _, m in modifications if "code" in m]
+        outcomes = iter(self.validator.validate_many(codes))
+
+        applied = []
+        for file_path, modification in modifications:
+            if "code" in modification:
+                is_valid, _ = next(outcomes)
+                if not is_valid:
+                    self._logger.log(f"Rejected invalid modification for {file_path}", level="WARNING")
+                    applied.append(False)
+                    continue
+            applied.append(self._apply(file_path, modification))
+        return applied
+
+    def _apply(self, file_path: str, modification: Dict[str, Any]) -> bool:
         self._logger.log(f"Modifying code in {file_path}", level="INFO")
         self.evolution_logger.log_evolution(
             "self_modification",
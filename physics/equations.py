@@ -29,7 +29,8 @@ DEPENDENCIES:
 - loggers: System logging
 """
 
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from collections import OrderedDict
 from dataclasses import dataclass, field
 import numpy as np
 from enum import Enum
@@ -135,14 +136,21 @@ class EquationParser:
         'harmonic_oscillator': 'x = A * cos(omega * t + phi)'
     }
     
+    # Parsed expressions kept in the LRU cache
+    CACHE_SIZE = 256
+    
     def __init__(self):
         self.logger = SystemLogger()
         self.known_symbols: Dict[str, Any] = {}
+        self._cache: OrderedDict = OrderedDict()
     
     def parse(self, equation_str: str) -> Tuple[Any, List[Any]]:
         """
         Parse an equation string into SymPy expression.
         
+        Results are cached by normalized equation text, so repeated calls
+        with the same equation (modulo whitespace) skip the parser.
+        
         Args:
             equation_str: Equation as string
             
@@ -152,9 +160,31 @@ class EquationParser:
         if not SYMPY_AVAILABLE:
             raise RuntimeError("SymPy is required for equation parsing")
         
-        # Preprocess the string
-        processed = self._preprocess(equation_str)
+        key = self.normalize(equation_str)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached[0], list(cached[1])
+        
+        parsed, symbols_found = self._parse(key, equation_str)
+        self._cache[key] = (parsed, tuple(symbols_found))
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return parsed, symbols_found
+    
+    def normalize(self, equation_str: str) -> str:
+        """
+        Normalized equation text used as a cache key.
         
+        Applies the notation replacements and drops insignificant
+        whitespace around operators.
+        """
+        processed = self._preprocess(equation_str)
+        processed = re.sub(r'\s*([=+\-*/(),])\s*', r'\1', processed)
+        return re.sub(r'\s+', ' ', processed)
+    
+    def _parse(self, processed: str, equation_str: str) -> Tuple[Any, List[Any]]:
+        """Parse preprocessed text (uncached)."""
         # Check if it's an equation (contains =)
         if '=' in processed and processed.count('=') == 1:
             left, right = processed.split('=')
@@ -228,12 +258,28 @@ class EquationSolver:
         'g': 9.80665,  # Standard gravity (m/s²)
     }
     
+    # Solved expressions / compiled functions kept in the LRU caches
+    CACHE_SIZE = 256
+    
+    # lambdify backends (SciPy adds special functions such as LambertW)
+    _NUMERIC_MODULES = ['scipy', 'numpy'] if SCIPY_AVAILABLE else ['numpy']
+    
+    # Starting points for the scalar numerical solver
+    INITIAL_GUESSES = [0, 1, -1, 10, -10, 100, -100]
+    
     def __init__(self):
         """Initialize equation solver."""
         self.validator = DataValidator()
         self.logger = SystemLogger()
         self.parser = EquationParser()
         
+        # (normalized equation, solve_for) -> general solutions (None if unsolvable)
+        self._solution_cache: OrderedDict = OrderedDict()
+        # Keys whose equation SymPy has no algorithm for (e.g. x = cos(a*x))
+        self._no_closed_form: set = set()
+        # (normalized equation, role, symbols...) -> lambdified callables
+        self._function_cache: OrderedDict = OrderedDict()
+        
         self.logger.log("EquationSolver initialized", level="INFO")
     
     def solve(self, equation: str, variables: Dict[str, float], 
@@ -262,8 +308,9 @@ class EquationSolver:
             return self._simple_solve(equation, variables)
         
         try:
-            # Parse the equation
+            # Parse the equation (cached)
             parsed, found_symbols = self.parser.parse(equation)
+            cache_key = self.parser.normalize(equation)
             
             # Determine variable to solve for
             if solve_for is None:
@@ -297,12 +344,12 @@ class EquationSolver:
             solve_symbol = Symbol(solve_for)
             
             if method == SolveMethod.SYMBOLIC or method == SolveMethod.AUTO:
-                result = self._solve_symbolic(parsed, solve_symbol, subs_dict)
+                result = self._solve_symbolic(parsed, solve_symbol, subs_dict, cache_key)
                 if result.solutions:
                     return result
             
             if method == SolveMethod.NUMERICAL or (method == SolveMethod.AUTO and not result.solutions):
-                return self._solve_numerical(parsed, solve_symbol, subs_dict, variables)
+                return self._solve_numerical(parsed, solve_symbol, subs_dict, variables, cache_key)
             
             return result
             
@@ -315,14 +362,20 @@ class EquationSolver:
             )
     
     def _solve_symbolic(self, parsed: Any, solve_symbol: Any, 
-                       subs_dict: Dict[Any, float]) -> EquationResult:
+                       subs_dict: Dict[Any, float],
+                       cache_key: Optional[str] = None) -> EquationResult:
         """
         Solve equation symbolically.
         
+        With a cache key, the equation is solved once in general form and
+        the known values are substituted into the cached solutions; if that
+        yields nothing finite, the substituted equation is solved directly.
+        
         Args:
             parsed: Parsed equation
             solve_symbol: Symbol to solve for
             subs_dict: Substitution dictionary
+            cache_key: Normalized equation text (enables the solution cache)
             
         Returns:
             EquationResult
@@ -339,15 +392,37 @@ class EquationSolver:
             # Substitute known values first (partially)
             # Keep the solve_symbol free
             partial_subs = {k: v for k, v in subs_dict.items() if k != solve_symbol}
+            
             equation_substituted = equation.subs(partial_subs)
+            solutions = []
+            general = self._general_solutions(cache_key, equation, solve_symbol) if cache_key else None
+            if general:
+                solutions = [sol.subs(partial_subs) for sol in general]
+                solutions = [sol for sol in solutions if not sol.has(sp.zoo, sp.nan)]
+                # Match solve() on a float-substituted equation
+                solutions = [
+                    sol.evalf() if not sol.free_symbols and sol.has(sp.Float) else sol
+                    for sol in solutions
+                ]
+                # A general solution need not hold for every parameter value
+                # (sqrt(x) = a gives x = a**2, which is spurious for a < 0)
+                if not all(self._satisfies(equation_substituted, solve_symbol, sol) for sol in solutions):
+                    solutions = []
             
-            # Solve
-            solutions = solve(equation_substituted, solve_symbol)
+            if not solutions:
+                if cache_key and (cache_key, str(solve_symbol)) in self._no_closed_form:
+                    # Substituting numbers will not make SymPy able to solve it
+                    raise NotImplementedError(f"No closed form for {solve_symbol} in {equation}")
+                # Solve the substituted equation directly
+                solutions = solve(equation_substituted, solve_symbol)
             
             # Convert to list if necessary
             if not isinstance(solutions, list):
                 solutions = [solutions]
             
+            # Drop complex roots of numeric equations
+            solutions = [sol for sol in solutions if sol.free_symbols or self._is_real(sol)]
+            
             # Evaluate numerical values
             numerical_solutions = []
             for sol in solutions:
@@ -379,17 +454,44 @@ class EquationSolver:
                 metadata={'error': str(e)}
             )
     
+    @staticmethod
+    def _satisfies(equation: Any, solve_symbol: Any, solution: Any, tol: float = 1e-9) -> bool:
+        """Whether a numeric solution satisfies the equation (symbolic ones pass)."""
+        if solution.free_symbols:
+            return True
+        try:
+            lhs = complex(equation.lhs.subs(solve_symbol, solution).evalf())
+            rhs = complex(equation.rhs.subs(solve_symbol, solution).evalf())
+        except (AttributeError, TypeError, ValueError):
+            return False
+        return abs(lhs - rhs) <= tol * max(1.0, abs(lhs), abs(rhs))
+    
+    @staticmethod
+    def _is_real(value: Any, tol: float = 1e-12) -> bool:
+        """Whether a numeric SymPy value is real (up to rounding)."""
+        try:
+            z = complex(value.evalf())
+        except (TypeError, ValueError):
+            return False
+        return abs(z.imag) <= tol * max(1.0, abs(z.real))
+    
     def _solve_numerical(self, parsed: Any, solve_symbol: Any,
                         subs_dict: Dict[Any, float],
-                        variables: Dict[str, float]) -> EquationResult:
+                        variables: Dict[str, float],
+                        cache_key: Optional[str] = None) -> EquationResult:
         """
         Solve equation numerically.
         
+        Runs a vectorized Newton iteration from all initial guesses at once
+        (per-guess convergence), falling back to fsolve for guesses where
+        Newton does not converge.
+        
         Args:
             parsed: Parsed equation
             solve_symbol: Symbol to solve for
             subs_dict: Substitution dictionary
             variables: Original variable dictionary
+            cache_key: Normalized equation text (enables the function cache)
             
         Returns:
             EquationResult
@@ -403,43 +505,30 @@ class EquationSolver:
             )
         
         try:
-            # Create a function from the equation
-            if isinstance(parsed, Eq):
-                # Convert equation to f(x) = 0 form
-                expr = parsed.lhs - parsed.rhs
-            else:
-                expr = parsed
-            
-            # Substitute known values
-            for sym, val in subs_dict.items():
-                if sym != solve_symbol:
-                    expr = expr.subs(sym, val)
+            residual, derivative, params = self._residual_functions(
+                cache_key, parsed, solve_symbol
+            )
+            missing = [p for p in params if Symbol(p) not in subs_dict]
+            if missing:
+                raise ValueError(f"Missing values for {missing}")
+            args = [float(subs_dict[Symbol(p)]) for p in params]
             
-            # Create numerical function
-            f = sp.lambdify(solve_symbol, expr, 'numpy')
+            initial_guesses = list(self.INITIAL_GUESSES)
+            x0 = np.array(initial_guesses, dtype=float)
+            roots, converged = self._newton(residual, derivative, x0, args)
+            solutions = [float(x) for x in roots[converged]]
             
-            # Try multiple initial guesses
-            initial_guesses = [0, 1, -1, 10, -10, 100, -100]
-            solutions = []
-            
-            for guess in initial_guesses:
+            # fsolve fallback for guesses Newton could not handle
+            f = lambda x: residual(x, *args)
+            for guess in x0[~converged]:
                 try:
                     sol = optimize.fsolve(f, guess, full_output=True)
                     if sol[2] == 1:  # Converged
                         solutions.append(float(sol[0][0]))
-                except:
+                except Exception:
                     continue
             
-            # Remove duplicates (within tolerance)
-            unique_solutions = []
-            for sol in solutions:
-                is_duplicate = False
-                for existing in unique_solutions:
-                    if abs(sol - existing) < 1e-10:
-                        is_duplicate = True
-                        break
-                if not is_duplicate:
-                    unique_solutions.append(sol)
+            unique_solutions = self._deduplicate_roots(solutions)
             
             return EquationResult(
                 solutions=unique_solutions,
@@ -461,6 +550,357 @@ class EquationSolver:
                 metadata={'error': str(e)}
             )
     
+    # =========================================================================
+    # Batch (vectorized) solving
+    # =========================================================================
+    
+    def solve_batch(self, equation: str, variables: Dict[str, Any],
+                    solve_for: Optional[str] = None,
+                    bracket: Tuple[float, float] = (-100.0, 100.0),
+                    samples: int = 400) -> EquationResult:
+        """
+        Solve an equation for many parameter values at once.
+        
+        Values in `variables` may be scalars or NumPy arrays; they are
+        broadcast together. Closed-form solutions are lambdified once and
+        evaluated vectorized. Equations without a closed form are solved by
+        scanning `bracket` for sign changes and refining every bracket with
+        a vectorized safeguarded Newton/bisection iteration.
+        
+        Args:
+            equation: Equation string (e.g., "F = m * a")
+            variables: Known values (scalars or arrays)
+            solve_for: Variable to solve for (auto-detected if None)
+            bracket: Search interval for implicit equations
+            samples: Grid points used to locate sign changes
+            
+        Returns:
+            EquationResult whose solutions are arrays of the broadcast
+            shape, one per root branch (NaN where a branch has no real
+            root). With all variables known, solutions holds the residual
+            check (equations) or the value (expressions).
+        """
+        if not SYMPY_AVAILABLE:
+            return EquationResult(
+                solutions=[],
+                method_used="sympy_unavailable",
+                metadata={'error': 'SymPy required for batch solving'}
+            )
+        
+        try:
+            parsed, found_symbols = self.parser.parse(equation)
+            cache_key = self.parser.normalize(equation)
+            
+            # Physical constants fill in symbols not given explicitly
+            values = {
+                name: value for name, value in self.CONSTANTS.items()
+                if Symbol(name) in parsed.free_symbols and name not in variables
+            }
+            values.update(variables)
+            arrays = dict(zip(values, np.broadcast_arrays(
+                *(np.asarray(v, dtype=float) for v in values.values())
+            ))) if values else {}
+            shape = next(iter(arrays.values())).shape if arrays else ()
+            
+            if solve_for is None:
+                unknown = sorted({str(sym) for sym in found_symbols} - set(values))
+                if not unknown:
+                    return self._evaluate_batch(parsed, cache_key, arrays, shape)
+                if len(unknown) > 1:
+                    self.logger.log(f"Multiple unknowns: {unknown}", level="WARNING")
+                solve_for = unknown[0]
+            
+            solve_symbol = Symbol(solve_for)
+            equation_eq = parsed if isinstance(parsed, Eq) else Eq(parsed, 0)
+            
+            general = self._general_solutions(cache_key, equation_eq, solve_symbol)
+            if general:
+                try:
+                    return self._closed_form_batch(general, cache_key, solve_for, arrays, shape)
+                except (NameError, TypeError, ValueError) as e:
+                    # e.g. special functions NumPy cannot evaluate
+                    self.logger.log(f"Closed-form batch evaluation failed: {e}", level="DEBUG")
+            
+            residual, derivative, params = self._residual_functions(cache_key, parsed, solve_symbol)
+            args = self._batch_arguments(params, arrays)
+            roots = self._bracketed_roots(residual, derivative, args, shape, bracket, samples)
+            return EquationResult(
+                solutions=list(roots),
+                method_used="numerical_vectorized",
+                is_exact=False,
+                variables_solved=[solve_for],
+                metadata={
+                    'shape': shape,
+                    'num_solutions': len(roots),
+                    'bracket': bracket,
+                    'samples': samples,
+                }
+            )
+        
+        except Exception as e:
+            self.logger.log(f"Batch solving failed: {e}", level="ERROR")
+            return EquationResult(
+                solutions=[],
+                method_used="batch_failed",
+                metadata={'error': str(e)}
+            )
+    
+    def _closed_form_batch(self, general: List[Any], cache_key: str, solve_for: str,
+                           arrays: Dict[str, np.ndarray], shape: Tuple[int, ...]) -> EquationResult:
+        """Evaluate cached general solutions over the input arrays."""
+        params = tuple(sorted({str(sym) for sol in general for sym in sol.free_symbols}))
+        funcs = self._cached_function(
+            (cache_key, 'solutions', solve_for, params),
+            lambda: [sp.lambdify([Symbol(p) for p in params], sol, modules=self._NUMERIC_MODULES)
+                     for sol in general],
+        )
+        args = self._batch_arguments(params, arrays)
+        with np.errstate(all='ignore'):
+            branches = [self._real_part(np.broadcast_to(func(*args), shape)) for func in funcs]
+        return EquationResult(
+            solutions=branches,
+            method_used="symbolic_vectorized",
+            symbolic_form=str(general[0]),
+            latex_form=latex(general[0]),
+            is_exact=True,
+            variables_solved=[solve_for],
+            metadata={'shape': shape, 'num_solutions': len(branches)}
+        )
+    
+    def _evaluate_batch(self, parsed: Any, cache_key: str,
+                        arrays: Dict[str, np.ndarray], shape: Tuple[int, ...]) -> EquationResult:
+        """Vectorized counterpart of _evaluate."""
+        sides = [parsed.lhs, parsed.rhs] if isinstance(parsed, Eq) else [parsed]
+        params = tuple(sorted(arrays))
+        funcs = self._cached_function(
+            (cache_key, 'evaluate', params),
+            lambda: [sp.lambdify([Symbol(p) for p in params], side, modules=self._NUMERIC_MODULES) for side in sides],
+        )
+        args = [arrays[p] for p in params]
+        values = [np.broadcast_to(np.asarray(func(*args), dtype=float), shape) for func in funcs]
+        if len(values) == 2:
+            lhs, rhs = values
+            satisfied = np.isclose(lhs, rhs, rtol=0.0, atol=1e-10)
+            return EquationResult(
+                solutions=[satisfied],
+                method_used="evaluation_vectorized",
+                is_exact=True,
+                metadata={'lhs': lhs, 'rhs': rhs, 'satisfied': satisfied}
+            )
+        return EquationResult(
+            solutions=[values[0]],
+            method_used="evaluation_vectorized",
+            is_exact=True
+        )
+    
+    # =========================================================================
+    # Caches
+    # =========================================================================
+    
+    def _general_solutions(self, cache_key: str, equation: Any, solve_symbol: Any) -> Optional[List[Any]]:
+        """Solutions of the unsubstituted equation for solve_symbol (cached)."""
+        key = (cache_key, str(solve_symbol))
+        if key in self._solution_cache:
+            self._solution_cache.move_to_end(key)
+            return self._solution_cache[key]
+        
+        try:
+            solutions = solve(equation, solve_symbol)
+            if not isinstance(solutions, list):
+                solutions = [solutions]
+            solutions = [sol for sol in solutions if isinstance(sol, sp.Expr)] or None
+        except NotImplementedError:
+            solutions = None
+            self._no_closed_form.add(key)
+        except Exception:
+            solutions = None
+        
+        self._solution_cache[key] = solutions
+        if len(self._solution_cache) > self.CACHE_SIZE:
+            evicted, _ = self._solution_cache.popitem(last=False)
+            self._no_closed_form.discard(evicted)
+        return solutions
+    
+    def _cached_function(self, key: Tuple, build: Callable[[], Any]) -> Any:
+        """Lambdified function(s) for key, built on first use."""
+        if key in self._function_cache:
+            self._function_cache.move_to_end(key)
+            return self._function_cache[key]
+        funcs = build()
+        self._function_cache[key] = funcs
+        if len(self._function_cache) > self.CACHE_SIZE:
+            self._function_cache.popitem(last=False)
+        return funcs
+    
+    def _residual_functions(self, cache_key: Optional[str], parsed: Any,
+                            solve_symbol: Any) -> Tuple[Callable, Callable, Tuple[str, ...]]:
+        """
+        Residual f(x, *params) = lhs - rhs and its derivative in x.
+        
+        Returns:
+            (residual, derivative, parameter names in argument order)
+        """
+        expr = parsed.lhs - parsed.rhs if isinstance(parsed, Eq) else parsed
+        params = tuple(sorted(str(sym) for sym in expr.free_symbols if sym != solve_symbol))
+        
+        def build():
+            arg_symbols = [solve_symbol] + [Symbol(p) for p in params]
+            return (
+                sp.lambdify(arg_symbols, expr, modules=self._NUMERIC_MODULES),
+                sp.lambdify(arg_symbols, diff(expr, solve_symbol), modules=self._NUMERIC_MODULES),
+            )
+        
+        if cache_key is None:
+            residual, derivative = build()
+        else:
+            residual, derivative = self._cached_function(
+                (cache_key, 'residual', str(solve_symbol), params), build
+            )
+        return residual, derivative, params
+    
+    # =========================================================================
+    # Vectorized root finding
+    # =========================================================================
+    
+    @staticmethod
+    def _batch_arguments(params: Tuple[str, ...], arrays: Dict[str, np.ndarray]) -> List[np.ndarray]:
+        missing = [p for p in params if p not in arrays]
+        if missing:
+            raise ValueError(f"Missing values for {missing}")
+        return [arrays[p] for p in params]
+    
+    @staticmethod
+    def _real_part(values: Any, tol: float = 1e-12) -> np.ndarray:
+        """Real values as float array; NaN where the value is complex."""
+        values = np.asarray(values)
+        if np.iscomplexobj(values):
+            real = values.real.astype(float)
+            real[np.abs(values.imag) > tol * np.maximum(1.0, np.abs(real))] = np.nan
+            return real
+        return values.astype(float)
+    
+    @staticmethod
+    def _deduplicate_roots(roots: List[float], tol: float = 1e-10) -> List[float]:
+        """Drop roots within tol (relative to magnitude) of an earlier root."""
+        unique: List[float] = []
+        for root in roots:
+            if all(abs(root - existing) > tol * max(1.0, abs(existing)) for existing in unique):
+                unique.append(root)
+        return unique
+    
+    @staticmethod
+    def _newton(residual: Callable, derivative: Callable, x0: np.ndarray,
+                args: List[Any], tol: float = 1e-12,
+                max_iter: int = 100) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Newton iteration over an array of starting points.
+        
+        Each element converges independently; elements whose derivative
+        vanishes or that diverge are reported as not converged.
+        
+        Returns:
+            (roots, converged_mask)
+        """
+        x = np.array(x0, dtype=float)
+        converged = np.zeros(x.shape, dtype=bool)
+        active = np.ones(x.shape, dtype=bool)
+        
+        with np.errstate(all='ignore'):
+            for _ in range(max_iter):
+                fx = np.broadcast_to(residual(x, *args), x.shape)
+                dfx = np.broadcast_to(derivative(x, *args), x.shape)
+                step = fx / dfx
+                
+                bad = active & ~np.isfinite(step)
+                active &= ~bad
+                
+                x_new = np.where(active, x - step, x)
+                done = active & (np.abs(x_new - x) <= tol * np.maximum(1.0, np.abs(x_new)))
+                x = x_new
+                converged |= done
+                active &= ~done
+                if not active.any():
+                    break
+            
+            # Confirm with the residual (guards against stalls on flat regions)
+            fx = np.broadcast_to(residual(x, *args), x.shape)
+            converged &= np.isfinite(x) & (np.abs(fx) <= 1e-8 * np.maximum(1.0, np.abs(x)))
+        
+        return x, converged
+    
+    @staticmethod
+    def _bracketed_roots(residual: Callable, derivative: Callable,
+                         args: List[np.ndarray], shape: Tuple[int, ...],
+                         bracket: Tuple[float, float], samples: int,
+                         tol: float = 1e-12, max_iter: int = 100) -> np.ndarray:
+        """
+        All sign-change roots of residual(x, *args) inside bracket, per element.
+        
+        The grid scan finds brackets for every element at once; each bracket
+        is then refined by safeguarded Newton (bisection when the Newton step
+        leaves the bracket) on just the elements that have a sign change
+        there. Roots at grid points are kept; tangent roots (no sign change)
+        are not detected.
+        
+        Returns:
+            Array of shape (n_roots, *shape), roots ascending, NaN padded
+        """
+        grid = np.linspace(bracket[0], bracket[1], samples)
+        grid_shape = (samples,) + (1,) * len(shape)
+        with np.errstate(all='ignore'):
+            values = np.broadcast_to(
+                residual(grid.reshape(grid_shape), *args), (samples,) + shape
+            )
+        
+        roots = np.full((samples,) + shape, np.nan)
+        
+        # Exact zeros on grid points
+        exact = values == 0
+        roots[exact] = np.broadcast_to(grid.reshape(grid_shape), (samples,) + shape)[exact]
+        
+        sign_change = (np.sign(values[:-1]) * np.sign(values[1:])) < 0
+        flat_args = [np.broadcast_to(a, shape) for a in args]
+        
+        with np.errstate(all='ignore'):
+            for k in np.flatnonzero(sign_change.reshape(samples - 1, -1).any(axis=1)):
+                mask = sign_change[k]
+                params = [a[mask] for a in flat_args]
+                lo = np.full(int(mask.sum()), grid[k])
+                hi = np.full(lo.shape, grid[k + 1])
+                f_lo = values[k][mask]
+                x = 0.5 * (lo + hi)
+                done = np.zeros(lo.shape, dtype=bool)
+                
+                for _ in range(max_iter):
+                    fx = residual(x, *params)
+                    # Shrink the bracket around the sign change
+                    same = np.sign(fx) == np.sign(f_lo)
+                    lo = np.where(same, x, lo)
+                    f_lo = np.where(same, fx, f_lo)
+                    hi = np.where(same, hi, x)
+                    
+                    step = fx / derivative(x, *params)
+                    newton = x - step
+                    inside = np.isfinite(newton) & (newton > lo) & (newton < hi)
+                    x_new = np.where(inside, newton, 0.5 * (lo + hi))
+                    
+                    done |= (fx == 0) | (np.abs(x_new - x) <= tol * np.maximum(1.0, np.abs(x)))
+                    x = np.where(done, x, x_new)
+                    if done.all():
+                        break
+                
+                roots[k][mask] = x
+        
+        # Sort per element (NaN last) and drop near-duplicates
+        roots = np.sort(roots, axis=0)
+        duplicate = np.zeros(roots.shape, dtype=bool)
+        duplicate[1:] = np.abs(np.diff(roots, axis=0)) <= 1e-9 * np.maximum(1.0, np.abs(roots[1:]))
+        roots[duplicate] = np.nan
+        roots = np.sort(roots, axis=0)
+        
+        count = int(np.max(np.sum(~np.isnan(roots), axis=0), initial=0))
+        return roots[:count]
+    
     def _evaluate(self, parsed: Any, variables: Dict[str, float]) -> EquationResult:
         """
         Evaluate an expression with all variables known.
@@ -6,7 +6,8 @@ ARCHITECTURE:
 ├── base/               # Core node and relation types
 │   ├── node.py        # KnowledgeNode, ConstantNode, EquationNode, etc.
 │   ├── relation.py    # Relation types and factory functions
-│   └── loader.py      # Auto-discovery and graph building
+│   ├── loader.py      # Auto-discovery and graph building
+│   └── snapshot.py    # Precompiled binary graph snapshot
 ├── constants/          # Physical constants by category
 │   ├── universal.py   # c, h, G, Planck units
 │   ├── electromagnetic.py
@@ -34,8 +35,16 @@ USAGE:
     from physics.knowledge.base import GraphBuilder
     builder = GraphBuilder(loader)
     path = builder.find_path('newton_second_law', 'escape_velocity', graph)
+
+SNAPSHOTS:
+    Set PHYSICS_KNOWLEDGE_SNAPSHOT to a file path to serve the graph from a
+    precompiled snapshot instead of importing every knowledge module. Build it
+    ahead of time with ``python -m physics.knowledge.base.snapshot PATH``; a
+    stale or missing snapshot is rebuilt by the first process that needs it.
 """
 
+import os
+
 # Legacy import for backwards compatibility
 from .physics_graph import PhysicsKnowledgeGraph
 
@@ -56,19 +65,47 @@ from .base import (
     Requires,
     NodeLoader,
     GraphBuilder,
+    KnowledgeSnapshot,
 )
+from .base.snapshot import SNAPSHOT_ENV_VAR
+from utilities.text_search import TextIndex
+
+# Term-frequency boosts for knowledge-node search fields
+SEARCH_FIELD_WEIGHTS = {
+    'name': 3.0,
+    'tags': 2.0,
+    'symbols': 2.0,
+    'domain': 1.5,
+    'description': 1.0,
+}
 
 # Singleton instances
 _loader = None
 _graph = None
+_snapshot_payload = None
+_search_index = None
+
+
+def _get_snapshot_payload():
+    """Load (or refresh) the configured snapshot, if any."""
+    global _snapshot_payload
+    if _snapshot_payload is None:
+        path = os.getenv(SNAPSHOT_ENV_VAR)
+        if path:
+            _snapshot_payload = KnowledgeSnapshot(path).load_or_build()
+    return _snapshot_payload
 
 
 def get_loader() -> NodeLoader:
     """Get or create the singleton node loader."""
     global _loader
     if _loader is None:
-        _loader = NodeLoader()
-        _loader.load_all()
+        payload = _get_snapshot_payload()
+        if payload is not None:
+            _loader = KnowledgeSnapshot(os.getenv(SNAPSHOT_ENV_VAR)).restore_loader(payload)
+        else:
+            _loader = NodeLoader()
+            _loader.load_all()
     return _loader
 
 
@@ -87,17 +124,66 @@ def get_knowledge_graph() -> dict:
     """
     global _graph
     if _graph is None:
-        loader = get_loader()
-        builder = GraphBuilder(loader)
-        _graph = builder.build_graph()
+        payload = _get_snapshot_payload()
+        if payload is not None:
+            _graph = payload['graph']
+        else:
+            loader = get_loader()
+            builder = GraphBuilder(loader)
+            _graph = builder.build_graph()
     return _graph
 
 
+def _node_search_fields(node: KnowledgeNode) -> dict:
+    """Searchable text fields of a knowledge node."""
+    symbols = [
+        getattr(node, 'symbol', ''),
+        getattr(node, 'sympy', ''),
+        getattr(node, 'latex', ''),
+    ]
+    for variable in getattr(node, 'variables', ()):
+        if isinstance(variable, (tuple, list)):
+            # (symbol, description, unit) - units would only add noise
+            symbols.extend(str(part) for part in variable[:2])
+        else:
+            symbols.append(str(variable))
+    return {
+        'name': node.name,
+        'description': node.description,
+        'tags': node.tags,
+        'domain': node.domain.replace('_', ' '),
+        'symbols': symbols,
+    }
+
+
+def get_search_index() -> TextIndex:
+    """
+    Get the BM25 search index over all knowledge nodes.
+    
+    Built once from the knowledge graph and rebuilt by reload_knowledge().
+    Use add_node_to_index() to index nodes created at runtime.
+    """
+    global _search_index
+    if _search_index is None:
+        index = TextIndex(SEARCH_FIELD_WEIGHTS)
+        for node in get_knowledge_graph()['nodes'].values():
+            index.add(node.id, _node_search_fields(node))
+        _search_index = index
+    return _search_index
+
+
+def add_node_to_index(node: KnowledgeNode) -> None:
+    """Incrementally (re)index a single node."""
+    get_search_index().add(node.id, _node_search_fields(node))
+
+
 def reload_knowledge():
     """Force reload of all knowledge (for development/evolution)."""
-    global _loader, _graph
+    global _loader, _graph, _snapshot_payload, _search_index
     _loader = None
     _graph = None
+    _snapshot_payload = None
+    _search_index = None
     return get_knowledge_graph()
 
 
@@ -125,9 +211,12 @@ __all__ = [
     # Loaders
     'NodeLoader',
     'GraphBuilder',
+    'KnowledgeSnapshot',
     
     # Functions
     'get_loader',
     'get_knowledge_graph',
+    'get_search_index',
+    'add_node_to_index',
     'reload_knowledge',
 ]
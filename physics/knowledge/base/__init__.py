@@ -25,6 +25,7 @@ from .relation import (
     SpecialCase
 )
 from .loader import NodeLoader, GraphBuilder
+from .snapshot import KnowledgeSnapshot, compute_source_hash
 
 __all__ = [
     'KnowledgeNode',
@@ -45,5 +46,7 @@ __all__ = [
     'Generalizes',
     'SpecialCase',
     'NodeLoader',
-    'GraphBuilder'
+    'GraphBuilder',
+    'KnowledgeSnapshot',
+    'compute_source_hash'
 ]
@@ -139,6 +139,26 @@ class NodeLoader:
         """Get all loaded relations."""
         return self._relations.copy()
     
+    @property
+    def loaded_modules(self) -> Set[str]:
+        """Get the names of all loaded modules."""
+        return set(self._loaded_modules)
+    
+    def restore(
+        self,
+        nodes: Dict[str, KnowledgeNode],
+        relations: Dict[str, Relation],
+        loaded_modules: List[str],
+    ) -> None:
+        """
+        Restore loader state from a precompiled snapshot.
+        
+        Marks the modules as loaded so later load_all() calls skip them.
+        """
+        self._nodes = dict(nodes)
+        self._relations = dict(relations)
+        self._loaded_modules = set(loaded_modules)
+    
     def get_node(self, node_id: str) -> Optional[KnowledgeNode]:
         """Get a node by ID."""
         return self._nodes.get(node_id)
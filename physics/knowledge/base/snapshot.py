@@ -0,0 +1,284 @@
+"""
+PATH: physics/knowledge/base/snapshot.py
+PURPOSE: Precompiled, versioned binary snapshot of the physics knowledge graph
+
+DESIGN PRINCIPLES:
+- Build once, load many: the fully resolved nodes, relations and adjacency
+  produced by NodeLoader + GraphBuilder are serialized to a single file
+- Invalidated by a source hash over the knowledge modules (path, mtime,
+  size and content), so editing an equation module forces a rebuild
+- A cold start unpickles one file instead of importing ~100 modules and
+  rebuilding the graph; each worker still holds its own unpickled copy
+- Atomic replace on write; a torn or foreign file is treated as a miss
+- importlib discovery remains the fallback for development
+
+FILE LAYOUT:
+    MAGIC (8 bytes) | format version (uint32) | source hash (64 ascii hex)
+    | payload length (uint64) | pickled payload
+
+USAGE:
+    # Build step (CI / container image / deploy hook)
+    python -m physics.knowledge.base.snapshot /var/cache/physics/knowledge.snap
+
+    # Workers
+    export PHYSICS_KNOWLEDGE_SNAPSHOT=/var/cache/physics/knowledge.snap
+"""
+
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .loader import NodeLoader, GraphBuilder
+
+SNAPSHOT_MAGIC = b"PKGSNAP\x00"
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_ENV_VAR = "PHYSICS_KNOWLEDGE_SNAPSHOT"
+
+_HEADER = struct.Struct("<8sI64sQ")
+
+# Root of the physics.knowledge package on disk; hashing walks the
+# filesystem directly so a cache hit never imports the knowledge modules.
+_KNOWLEDGE_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_SUBPACKAGES = ['constants', 'equations', 'theorems', 'principles']
+
+
+def compute_source_hash(
+    subpackages: Optional[Iterable[str]] = None,
+    root: Optional[Path] = None,
+) -> str:
+    """
+    Hash the knowledge source modules.
+
+    Covers every ``.py`` file under the given subpackages plus the ``base``
+    package (node/relation class definitions affect unpickling).
+
+    Args:
+        subpackages: Subpackages to cover (default: all knowledge subpackages)
+        root: Package root directory (default: physics/knowledge)
+
+    Returns:
+        SHA-256 hex digest
+    """
+    root = root or _KNOWLEDGE_ROOT
+    subpackages = list(subpackages or DEFAULT_SUBPACKAGES)
+
+    files: List[Path] = []
+    for subpkg in subpackages + ['base']:
+        directory = root.joinpath(*subpkg.split('.'))
+        if directory.is_dir():
+            files.extend(directory.rglob('*.py'))
+
+    digest = hashlib.sha256()
+    digest.update(f"format:{SNAPSHOT_FORMAT_VERSION}".encode())
+    for path in sorted(files):
+        stat = path.stat()
+        digest.update(str(path.relative_to(root)).encode())
+        digest.update(struct.pack("<qq", stat.st_mtime_ns, stat.st_size))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class KnowledgeSnapshot:
+    """
+    Binary snapshot of a built knowledge graph.
+
+    The payload holds the graph dict returned by ``GraphBuilder.build_graph``
+    plus the loader state (explicit relations and loaded module names), so
+    both ``get_knowledge_graph()`` and ``get_loader()`` can be served from it.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        base_package: str = "physics.knowledge",
+        subpackages: Optional[List[str]] = None,
+    ):
+        self.path = Path(path)
+        self.base_package = base_package
+        self.subpackages = list(subpackages or DEFAULT_SUBPACKAGES)
+
+    def source_hash(self) -> str:
+        """Current hash of the knowledge source modules."""
+        return compute_source_hash(self.subpackages)
+
+    def read_header(self) -> Optional[Dict[str, Any]]:
+        """
+        Read the snapshot header without touching the payload.
+
+        Returns:
+            Header dict, or None if the file is missing or not a snapshot
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                raw = f.read(_HEADER.size)
+        except OSError:
+            return None
+        if len(raw) < _HEADER.size:
+            return None
+
+        magic, version, source_hash, length = _HEADER.unpack(raw)
+        if magic != SNAPSHOT_MAGIC:
+            return None
+        return {
+            'format_version': version,
+            'source_hash': source_hash.decode('ascii', errors='replace'),
+            'payload_length': length,
+        }
+
+    def is_fresh(self, source_hash: Optional[str] = None) -> bool:
+        """Check whether the snapshot matches the current sources."""
+        header = self.read_header()
+        if header is None or header['format_version'] != SNAPSHOT_FORMAT_VERSION:
+            return False
+        return header['source_hash'] == (source_hash or self.source_hash())
+
+    def load(self, source_hash: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Load the snapshot payload if it is fresh.
+
+        The file is memory-mapped read-only and unpickled straight from the
+        mapping, avoiding an intermediate copy of the payload. The resulting
+        objects live in this process; nothing is shared between workers.
+
+        Args:
+            source_hash: Precomputed source hash (computed if omitted)
+
+        Returns:
+            Payload dict with 'graph', 'relations' and 'modules', or None
+            if the snapshot is missing, stale or corrupt
+        """
+        header = self.read_header()
+        if header is None or header['format_version'] != SNAPSHOT_FORMAT_VERSION:
+            return None
+        if header['source_hash'] != (source_hash or self.source_hash()):
+            return None
+
+        try:
+            with open(self.path, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    end = _HEADER.size + header['payload_length']
+                    if end > len(mapped):
+                        return None
+                    view = memoryview(mapped)
+                    try:
+                        payload = pickle.loads(view[_HEADER.size:end])
+                    finally:
+                        view.release()
+        except (OSError, ValueError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+
+        if not isinstance(payload, dict) or 'graph' not in payload:
+            return None
+        return payload
+
+    def build(self, loader: Optional[NodeLoader] = None) -> Dict[str, Any]:
+        """
+        Discover all modules, build the graph and write the snapshot.
+
+        Args:
+            loader: Already-populated loader to reuse (loaded if omitted)
+
+        Returns:
+            The payload that was written
+        """
+        source_hash = self.source_hash()
+        payload = self._build_payload(loader)
+        self.write(payload, source_hash)
+        return payload
+
+    def load_or_build(self) -> Dict[str, Any]:
+        """
+        Load the snapshot, rebuilding it from the sources if stale.
+
+        A read-only or full cache directory is not fatal: the freshly
+        built payload is returned even if it could not be written.
+        """
+        source_hash = self.source_hash()
+        payload = self.load(source_hash)
+        if payload is not None:
+            return payload
+
+        payload = self._build_payload()
+        try:
+            self.write(payload, source_hash)
+        except OSError as e:
+            print(f"Warning: Could not write knowledge snapshot {self.path}: {e}")
+        return payload
+
+    def write(self, payload: Dict[str, Any], source_hash: str) -> None:
+        """Atomically write a payload under the given source hash."""
+        data = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+        header = _HEADER.pack(
+            SNAPSHOT_MAGIC,
+            SNAPSHOT_FORMAT_VERSION,
+            source_hash.encode('ascii'),
+            len(data),
+        )
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=f".{self.path.name}.", dir=str(self.path.parent)
+        )
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(header)
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _build_payload(self, loader: Optional[NodeLoader] = None) -> Dict[str, Any]:
+        """Run importlib discovery and graph resolution."""
+        if loader is None:
+            loader = NodeLoader(self.base_package)
+            loader.load_all(self.subpackages)
+        return {
+            'graph': GraphBuilder(loader).build_graph(),
+            'relations': loader.relations,
+            'modules': sorted(loader.loaded_modules),
+        }
+
+    def restore_loader(self, payload: Dict[str, Any]) -> NodeLoader:
+        """Rebuild a NodeLoader from a snapshot payload without importing modules."""
+        loader = NodeLoader(self.base_package)
+        loader.restore(
+            nodes=payload['graph']['nodes'],
+            relations=payload.get('relations', {}),
+            loaded_modules=payload.get('modules', []),
+        )
+        return loader
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Build step: ``python -m physics.knowledge.base.snapshot [PATH]``."""
+    argv = sys.argv[1:] if argv is None else argv
+    path = argv[0] if argv else os.getenv(SNAPSHOT_ENV_VAR)
+    if not path:
+        print(f"usage: snapshot.py PATH (or set {SNAPSHOT_ENV_VAR})", file=sys.stderr)
+        return 2
+
+    snapshot = KnowledgeSnapshot(path)
+    payload = snapshot.build()
+    stats = payload['graph']['statistics']
+    print(
+        f"Wrote {path}: {stats['total_nodes']} nodes, "
+        f"{stats['total_relations']} relations, {len(payload['modules'])} modules"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
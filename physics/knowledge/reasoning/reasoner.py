@@ -20,6 +20,11 @@ import json
 
 from .tree_index import PhysicsTreeIndex, TreeNode, NodeType
 
+# Raw BM25 score mapped to relevance 0.5. Relevance is score / (score + this),
+# an absolute scale: the 0.3 cutoff in _find_relevant_in_subtree keeps nodes
+# scoring above ~3 (a title or keyword hit), not nodes near the query's top hit.
+RELEVANCE_HALF_SCORE = 7.0
+
 
 class ReasoningStep(Enum):
     """Types of reasoning steps during navigation."""
@@ -103,6 +108,10 @@ class PhysicsReasoner:
         self.tree = tree_index
         self.llm = llm_func
         
+        # Index-backed relevance scores for the most recent query
+        self._scored_query: Optional[str] = None
+        self._query_scores: Dict[str, float] = {}
+        
         # Domain keyword mappings for fast initial routing
         self.domain_keywords = {
             'classical_mechanics': {
@@ -242,26 +251,18 @@ class PhysicsReasoner:
         return relevant
     
     def _relevance_score(self, node: TreeNode, query: str) -> float:
-        """Score node relevance to query."""
-        score = 0.0
-        
-        # Check title
-        if any(word in node.title.lower() for word in query.split()):
-            score += 0.5
-        
-        # Check keywords
-        for keyword in node.keywords:
-            if keyword.lower() in query:
-                score += 0.3
-        
-        # Check summary
-        if node.summary:
-            summary_lower = node.summary.lower()
-            query_words = query.split()
-            matches = sum(1 for w in query_words if w in summary_lower)
-            score += matches * 0.1
+        """
+        Score node relevance to query.
         
-        return min(1.0, score)
+        One BM25 lookup over the tree's inverted index scores every node for
+        the query; subsequent calls for the same query are dictionary hits.
+        The raw score is squashed into [0, 1) with RELEVANCE_HALF_SCORE.
+        """
+        if query != self._scored_query:
+            self._query_scores = self.tree.search_scores(query)
+            self._scored_query = query
+        score = self._query_scores.get(node.node_id, 0.0)
+        return score / (score + RELEVANCE_HALF_SCORE)
     
     def explain_concept(self, node_id: str) -> str:
         """
@@ -29,6 +29,11 @@ from typing import Dict, List, Optional, Any, Set
 from enum import Enum
 import json
 
+from utilities.text_search import TextIndex
+
+# Term-frequency boosts for tree-node search fields
+SEARCH_FIELD_WEIGHTS = {'title': 3.0, 'keywords': 2.0, 'summary': 1.0}
+
 
 class NodeType(Enum):
     ROOT = "root"
@@ -110,6 +115,7 @@ class PhysicsTreeIndex:
         )
         self.node_index: Dict[str, TreeNode] = {"root": self.root}
         self.domain_trees: Dict[str, TreeNode] = {}
+        self._search_index: Optional[TextIndex] = None
     
     def add_domain(self, domain_id: str, title: str, summary: str, 
                    keywords: List[str] = None) -> TreeNode:
@@ -126,6 +132,7 @@ class PhysicsTreeIndex:
         self.root.children.append(node)
         self.node_index[domain_id] = node
         self.domain_trees[domain_id] = node
+        self._index_node(node)
         return node
     
     def add_node(self, node_id: str, title: str, node_type: NodeType,
@@ -157,8 +164,33 @@ class PhysicsTreeIndex:
         
         parent.children.append(node)
         self.node_index[node_id] = node
+        self._index_node(node)
         return node
     
+    def _index_node(self, node: TreeNode) -> None:
+        """Keep the text index current once it has been built."""
+        if self._search_index is not None:
+            self._search_index.add(node.node_id, self._search_fields(node))
+    
+    @staticmethod
+    def _search_fields(node: TreeNode) -> Dict[str, Any]:
+        return {'title': node.title, 'keywords': node.keywords, 'summary': node.summary}
+    
+    def search_scores(self, query: str) -> Dict[str, float]:
+        """
+        Raw BM25 relevance of every matching node (unnormalized, so a score
+        does not depend on the other hits for the same query).
+        
+        The inverted index is built on first call and updated incrementally
+        by add_domain/add_node afterwards.
+        """
+        if self._search_index is None:
+            self._search_index = TextIndex(SEARCH_FIELD_WEIGHTS)
+            for node in self.node_index.values():
+                self._search_index.add(node.node_id, self._search_fields(node))
+        
+        return self._search_index.score(query)
+    
     def get_node(self, node_id: str) -> Optional[TreeNode]:
         """Get a node by ID."""
         return self.node_index.get(node_id)
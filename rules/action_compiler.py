@@ -0,0 +1,291 @@
+# rules/
+"""
+PATH: rules/action_compiler.py
+PURPOSE: Compile rule action expressions once into sandboxed, reusable code.
+
+FLOW:
+┌─────────────┐    ┌──────────────┐    ┌─────────────┐    ┌──────────────┐
+│ Expression  │───▶│  ast.parse   │───▶│  Whitelist  │───▶│   compile    │───▶ CompiledExpression
+│   string    │    │              │    │   check     │    │  (bytecode)  │
+└─────────────┘    └──────────────┘    └─────────────┘    └──────────────┘
+
+First Principle Analysis:
+- Rule actions are fixed when the rule is added, so parsing and checking
+  an expression can happen once instead of on every firing
+- eval() with empty builtins is not a sandbox: attribute access reaches
+  interpreter internals (().__class__...). Safety has to come from what
+  the expression may contain, so only a whitelist of AST nodes is accepted
+- Names are looked up lazily (context, then bindings, then the safe
+  functions), so no namespace dict is built per call
+- The names an expression reads are known statically; they are the
+  expression's dependencies
+
+Accepted syntax: literals, names, arithmetic/boolean/comparison operators,
+conditional expressions, subscripts and slices, list/tuple/set/dict
+displays, and calls to the safe functions below. Rejected: attribute
+access, names starting with '_', lambdas, comprehensions, starred
+arguments, assignment expressions.
+
+DEPENDENCIES:
+- ast (standard library)
+"""
+
+import ast
+import re
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Optional, Union
+
+
+# Functions callable from expressions
+SAFE_FUNCTIONS: Dict[str, Any] = {
+    'abs': abs,
+    'min': min,
+    'max': max,
+    'sum': sum,
+    'len': len,
+    'round': round,
+    'int': int,
+    'float': float,
+    'str': str,
+}
+
+# Constants always resolvable (kept for expressions written as names)
+SAFE_CONSTANTS: Dict[str, Any] = {
+    'True': True,
+    'False': False,
+    'None': None,
+}
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.Constant, ast.Name, ast.Load,
+    ast.BoolOp, ast.And, ast.Or,
+    ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+    ast.UnaryOp, ast.UAdd, ast.USub, ast.Not,
+    ast.Compare, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+    ast.In, ast.NotIn, ast.Is, ast.IsNot,
+    ast.IfExp, ast.Call, ast.keyword,
+    ast.Subscript, ast.Slice,
+    ast.Tuple, ast.List, ast.Set, ast.Dict,
+)
+
+# Prefix for call targets rewritten to the safe function table; user names
+# may not start with '_', so these cannot collide with context keys
+_FUNCTION_PREFIX = '_fn_'
+
+_TEMPLATE_PATTERN = re.compile(r'\$\{([^}]+)\}')
+
+
+class ExpressionError(ValueError):
+    """Raised when an expression cannot be parsed or uses disallowed syntax."""
+
+    def __init__(self, message: str, source: str = ''):
+        super().__init__(message)
+        self.source = source
+
+
+class _Scope:
+    """Read-only name lookup over context, bindings and the safe tables."""
+
+    __slots__ = ('context', 'bindings')
+
+    def __init__(self, context: Dict[str, Any], bindings: Dict[str, Any]):
+        self.context = context
+        self.bindings = bindings
+
+    def __getitem__(self, name: str) -> Any:
+        # Same precedence as the former namespace dict: context wins
+        if name in self.context:
+            return self.context[name]
+        if name in self.bindings:
+            return self.bindings[name]
+        if name.startswith(_FUNCTION_PREFIX):
+            return SAFE_FUNCTIONS[name[len(_FUNCTION_PREFIX):]]
+        return SAFE_CONSTANTS[name]
+
+
+class CompiledExpression:
+    """An expression checked and compiled once, evaluated against any context."""
+
+    __slots__ = ('source', 'code', 'dependencies')
+
+    def __init__(self, source: str, code: Any, dependencies: FrozenSet[str]):
+        self.source = source
+        self.code = code
+        # Context/binding names the expression reads
+        self.dependencies = dependencies
+
+    def evaluate(self, context: Dict[str, Any], bindings: Dict[str, Any]) -> Any:
+        """
+        Evaluate the expression.
+
+        Raises:
+            NameError: If a name is in neither context nor bindings
+            Exception: Whatever the expression itself raises
+        """
+        return eval(self.code, {'__builtins__': {}}, _Scope(context, bindings))
+
+
+class CompiledTemplate:
+    """A string with ${expression} placeholders, split and compiled once."""
+
+    __slots__ = ('source', 'parts', 'dependencies')
+
+    def __init__(self, source: str, parts: List[Union[str, CompiledExpression]]):
+        self.source = source
+        self.parts = parts
+        deps: set = set()
+        for part in parts:
+            if isinstance(part, CompiledExpression):
+                deps |= part.dependencies
+        self.dependencies = frozenset(deps)
+
+
+class _Validator(ast.NodeTransformer):
+    """Rejects non-whitelisted nodes, collects names, rewrites call targets."""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.names: set = set()
+
+    def generic_visit(self, node: ast.AST) -> ast.AST:
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ExpressionError(
+                f"Disallowed syntax '{type(node).__name__}' in expression '{self.source}'",
+                self.source,
+            )
+        return super().generic_visit(node)
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        if node.id.startswith('_'):
+            raise ExpressionError(
+                f"Disallowed name '{node.id}' in expression '{self.source}'", self.source
+            )
+        if node.id not in SAFE_CONSTANTS:
+            self.names.add(node.id)
+        return self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> ast.AST:
+        func = node.func
+        if not isinstance(func, ast.Name) or func.id not in SAFE_FUNCTIONS:
+            name = func.id if isinstance(func, ast.Name) else type(func).__name__
+            raise ExpressionError(
+                f"Call to '{name}' not allowed in expression '{self.source}'", self.source
+            )
+        if any(k.arg is None for k in node.keywords):
+            raise ExpressionError(
+                f"'**' arguments not allowed in expression '{self.source}'", self.source
+            )
+        node.args = [self.visit(arg) for arg in node.args]
+        node.keywords = [self.visit(k) for k in node.keywords]
+        node.func = ast.copy_location(
+            ast.Name(id=_FUNCTION_PREFIX + func.id, ctx=ast.Load()), func
+        )
+        return node
+
+
+class ActionCompiler:
+    """
+    Compiles expressions and ${...} templates, cached by source string.
+
+    Compilation errors are cached too, so a bad expression is parsed once.
+    """
+
+    def __init__(self, cache_size: int = 1024):
+        self.cache_size = cache_size
+        self._cache: 'OrderedDict[Any, Any]' = OrderedDict()
+
+    def expression(self, source: str) -> CompiledExpression:
+        """
+        Compile an expression.
+
+        Raises:
+            ExpressionError: If it does not parse or uses disallowed syntax
+        """
+        result = self._cached(('expr', source), self._compile_expression, source)
+        if isinstance(result, ExpressionError):
+            # Cached instance: drop the previous traceback before re-raising
+            raise result.with_traceback(None)
+        return result
+
+    def template(self, source: str) -> Optional[CompiledTemplate]:
+        """
+        Compile a string with ${...} placeholders; None if it has none.
+
+        A placeholder that fails to compile is kept as a compiled error and
+        rendered as a failed evaluation, matching per-call evaluation.
+        """
+        if '${' not in source:
+            return None
+        return self._cached(('template', source), self._compile_template, source)
+
+    def dependencies(self, action: Any) -> FrozenSet[str]:
+        """
+        Context keys an action reads: $compute expressions, ${...}
+        templates and $name references anywhere in its values.
+
+        Raises:
+            ExpressionError: If any expression in the action is invalid
+        """
+        deps: set = set()
+        self._collect(action, deps)
+        return frozenset(deps)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def _collect(self, value: Any, deps: set) -> None:
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if key == '$compute' and isinstance(item, dict):
+                    deps |= self.expression(item.get('expression', '')).dependencies
+                else:
+                    self._collect(item, deps)
+        elif isinstance(value, list):
+            for item in value:
+                self._collect(item, deps)
+        elif isinstance(value, str):
+            if value.startswith('$') and not value.startswith('${'):
+                deps.add(value[1:])
+            template = self.template(value)
+            if template is not None:
+                for part in template.parts:
+                    if isinstance(part, ExpressionError):
+                        raise part.with_traceback(None)
+                deps |= template.dependencies
+
+    def _cached(self, key: Any, build: Any, source: str) -> Any:
+        result = self._cache.get(key)
+        if result is not None:
+            self._cache.move_to_end(key)
+            return result
+        result = build(source)
+        self._cache[key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def _compile_expression(self, source: str) -> Union[CompiledExpression, ExpressionError]:
+        try:
+            tree = ast.parse(source.strip(), mode='eval')
+        except SyntaxError as e:
+            return ExpressionError(f"Invalid expression '{source}': {e.msg}", source)
+
+        validator = _Validator(source)
+        try:
+            tree = ast.fix_missing_locations(validator.visit(tree))
+        except ExpressionError as e:
+            return e
+        code = compile(tree, '<rule expression>', 'eval')
+        return CompiledExpression(source, code, frozenset(validator.names))
+
+    def _compile_template(self, source: str) -> CompiledTemplate:
+        parts: List[Any] = []
+        position = 0
+        for match in _TEMPLATE_PATTERN.finditer(source):
+            if match.start() > position:
+                parts.append(source[position:match.start()])
+            parts.append(self._compile_expression(match.group(1)))
+            position = match.end()
+        if position < len(source):
+            parts.append(source[position:])
+        return CompiledTemplate(source, parts)
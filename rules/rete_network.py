@@ -0,0 +1,473 @@
+# rules/
+"""
+PATH: rules/rete_network.py
+PURPOSE: Compiled, incremental (Rete-style) matching network for RuleEngine conditions.
+
+FLOW:
+┌─────────────┐    ┌──────────────┐    ┌─────────────┐    ┌──────────────┐
+│   Context   │───▶│ Changed keys │───▶│ Alpha nodes │───▶│  Beta joins  │───▶ matches
+│             │    │   (diff)     │    │ (per key)   │    │ (bindings)   │
+└─────────────┘    └──────────────┘    └─────────────┘    └──────────────┘
+
+First Principle Analysis:
+- A rule condition is a conjunction of tests, one per top-level context key
+- Each test depends only on the value under its key, so its result can be
+  cached and shared by every rule that uses the identical test (alpha node)
+- Variable bindings from different keys must agree; that is a join over
+  the conditions in key order (beta node), shared between rules with the
+  same condition prefix
+- Between calls only keys whose value changed are re-tested, and only the
+  joins downstream of a changed test are recomputed
+
+Semantics match PatternMatcher.match exactly:
+- Conditions are joined in the order of the condition's keys, so bindings
+  and the first-failing-condition behaviour (including exceptions raised
+  by operators) are the same as the recursive matcher
+- Conditions that cannot be split safely (top-level operators, or a
+  variable shared between keys that also appears under $or/$not) are
+  evaluated by PatternMatcher as a whole, but still only when one of their
+  keys changed
+
+DEPENDENCIES:
+- rules.rule_engine: PatternMatcher, Rule, RuleMatch
+"""
+
+import copy
+import heapq
+from typing import Any, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .rule_engine import PatternMatcher, Rule, RuleMatch
+
+
+MISSING = object()
+
+# Values compared by value between calls; anything else is also compared
+# by identity and snapshotted so in-place mutation is detected
+_SCALAR_TYPES = (int, float, complex, str, bytes, bool, type(None))
+
+
+class _Snapshot:
+    """A non-scalar context value plus a deep copy taken when it was seen."""
+
+    __slots__ = ('value', 'copy')
+
+    def __init__(self, value: Any, snapshot: Any):
+        self.value = value
+        self.copy = snapshot
+
+
+class _DictSnapshot:
+    """A dict context value plus a snapshot of each of its items."""
+
+    __slots__ = ('value', 'items')
+
+    def __init__(self, value: Dict[Any, Any], items: Dict[Any, Any]):
+        self.value = value
+        self.items = items
+
+
+def snapshot_value(value: Any) -> Any:
+    """Record a context value so a later value_changed() call can compare it."""
+    return refresh_snapshot(MISSING, value)[1]
+
+
+def value_changed(previous: Any, value: Any) -> bool:
+    """True if value differs from the snapshot_value() taken earlier."""
+    if isinstance(previous, _DictSnapshot):
+        if previous.value is not value or len(previous.items) != len(value):
+            return True
+        for key, item in previous.items.items():
+            if key not in value or value_changed(item, value[key]):
+                return True
+        return False
+
+    if isinstance(previous, _Snapshot):
+        # Same object with unchanged contents
+        if previous.value is not value or previous.copy is MISSING:
+            return True
+        try:
+            return not bool(previous.copy == value)
+        except Exception:
+            return True
+
+    if previous is MISSING or value is MISSING:
+        return previous is not value
+    if not isinstance(value, _SCALAR_TYPES) or type(previous) is not type(value):
+        return True
+    return not (previous == value)
+
+
+def refresh_snapshot(previous: Any, value: Any) -> Tuple[bool, Any]:
+    """
+    (changed, snapshot) for value against an earlier snapshot.
+
+    Unchanged snapshots are returned as they are, and a dict that was
+    mutated in place only has its changed items copied again.
+    """
+    if not value_changed(previous, value):
+        return False, previous
+    if value is MISSING or isinstance(value, _SCALAR_TYPES):
+        return True, value
+    if type(value) is dict:
+        old_items = previous.items if isinstance(previous, _DictSnapshot) else {}
+        items = {
+            key: refresh_snapshot(old_items.get(key, MISSING), item)[1]
+            for key, item in value.items()
+        }
+        return True, _DictSnapshot(value, items)
+    try:
+        return True, _Snapshot(value, copy.deepcopy(value))
+    except Exception:
+        return True, _Snapshot(value, MISSING)
+
+
+class _MatchError:
+    """An exception raised while testing a condition, re-raised when reached."""
+
+    __slots__ = ('error',)
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+class AlphaNode:
+    """Test of one sub-pattern against the value under one context key."""
+
+    __slots__ = ('id', 'key', 'pattern', 'result', 'successors')
+
+    def __init__(self, node_id: int, key: str, pattern: Any):
+        self.id = node_id
+        self.key = key
+        self.pattern = pattern
+        # (matched, bindings) or _MatchError; None until first evaluated
+        self.result: Any = None
+        self.successors: List['BetaNode'] = []
+
+    def evaluate(self, context: Dict[str, Any], matcher: 'PatternMatcher') -> None:
+        if self.key not in context:
+            self.result = (False, None)
+            return
+        bindings: Dict[str, Any] = {}
+        try:
+            matched = matcher.match_value(self.pattern, context[self.key], bindings)
+        except Exception as e:
+            self.result = _MatchError(e)
+            return
+        self.result = (True, bindings) if matched else (False, None)
+
+
+class BetaNode:
+    """Join of a parent beta memory with one alpha node's bindings."""
+
+    __slots__ = ('index', 'parent', 'alpha', 'memory', 'children', 'rules')
+
+    def __init__(self, index: int, parent: Optional['BetaNode'], alpha: AlphaNode):
+        self.index = index
+        self.parent = parent
+        self.alpha = alpha
+        # Joined bindings if every condition so far matched, else None
+        self.memory: Optional[Dict[str, Any]] = None
+        self.children: List['BetaNode'] = []
+        self.rules: List[int] = []  # indices of rules terminating here
+
+    def evaluate(self) -> None:
+        if self.parent is None:
+            upstream: Optional[Dict[str, Any]] = {}
+        else:
+            upstream = self.parent.memory
+        if upstream is None:
+            self.memory = None
+            return
+
+        result = self.alpha.result
+        if isinstance(result, _MatchError):
+            raise result.error
+        matched, bindings = result
+        if not matched:
+            self.memory = None
+            return
+
+        joined = dict(upstream)
+        for name, value in bindings.items():
+            if name in joined:
+                if not (joined[name] == value):
+                    self.memory = None
+                    return
+            else:
+                joined[name] = value
+        self.memory = joined
+
+
+class _WholeCondition:
+    """A condition evaluated by PatternMatcher as a unit."""
+
+    __slots__ = ('rule_index', 'keys')
+
+    def __init__(self, rule_index: int, keys: Optional[Set[str]]):
+        self.rule_index = rule_index
+        self.keys = keys  # None: depends on the whole context
+
+
+class ReteNetwork:
+    """
+    Matching network compiled from a list of rules.
+
+    Build once per rule set; call match() with successive contexts. Results
+    are equivalent to running PatternMatcher.match on every rule.
+    """
+
+    def __init__(self, rules: List['Rule'], matcher: 'PatternMatcher'):
+        self.rules = list(rules)
+        self.matcher = matcher
+
+        self._alphas: Dict[Tuple[str, str], AlphaNode] = {}
+        self._alphas_by_key: Dict[str, List[AlphaNode]] = {}
+        self._betas: List[BetaNode] = []
+        self._beta_index: Dict[Tuple[int, ...], BetaNode] = {}
+        self._wholes: List[_WholeCondition] = []
+        self._always: List[int] = []  # rules with an empty condition
+
+        # Key names used by match scoring (any depth of any pattern)
+        self._score_keys: Set[str] = set()
+
+        for index, rule in enumerate(self.rules):
+            self._compile(index, rule)
+
+        self._watched_keys = set(self._alphas_by_key)
+        for whole in self._wholes:
+            if whole.keys is not None:
+                self._watched_keys.update(whole.keys)
+
+        self.reset()
+
+    # ------------------------------------------------------------------
+    # Compilation
+    # ------------------------------------------------------------------
+
+    def _compile(self, index: int, rule: 'Rule') -> None:
+        condition = rule.condition
+        self._collect_score_keys(condition)
+
+        if not isinstance(condition, dict) or any(
+            isinstance(k, str) and k.startswith('$') for k in condition
+        ):
+            self._wholes.append(_WholeCondition(index, None))
+            return
+
+        if not condition:
+            self._always.append(index)
+            return
+
+        if not self._separable(condition):
+            self._wholes.append(_WholeCondition(index, set(condition)))
+            return
+
+        parent: Optional[BetaNode] = None
+        prefix: Tuple[int, ...] = ()
+        for key, pattern in condition.items():
+            alpha = self._alpha(key, pattern)
+            prefix = prefix + (alpha.id,)
+            beta = self._beta_index.get(prefix)
+            if beta is None:
+                beta = BetaNode(len(self._betas), parent, alpha)
+                self._betas.append(beta)
+                self._beta_index[prefix] = beta
+                alpha.successors.append(beta)
+                if parent is not None:
+                    parent.children.append(beta)
+            parent = beta
+        parent.rules.append(index)
+
+    def _alpha(self, key: str, pattern: Any) -> AlphaNode:
+        signature = (key, repr(pattern))
+        alpha = self._alphas.get(signature)
+        if alpha is None:
+            alpha = AlphaNode(len(self._alphas), key, pattern)
+            self._alphas[signature] = alpha
+            self._alphas_by_key.setdefault(key, []).append(alpha)
+        return alpha
+
+    def _separable(self, condition: Dict[str, Any]) -> bool:
+        """
+        True if per-key tests joined on bindings equal sequential matching.
+
+        A variable bound by one key changes how a later key's $or/$not
+        branches are tried, so such variables force whole-condition matching.
+        """
+        seen: Set[str] = set()
+        branched: Set[str] = set()
+        shared: Set[str] = set()
+        for pattern in condition.values():
+            local: Set[str] = set()
+            self._collect_variables(pattern, False, local, branched)
+            shared.update(local & seen)
+            seen.update(local)
+        return not (shared & branched)
+
+    def _collect_variables(self, pattern: Any, in_branch: bool,
+                           found: Set[str], branched: Set[str]) -> None:
+        """Variables in pattern, following PatternMatcher's traversal."""
+        operators = self.matcher.OPERATORS
+        if isinstance(pattern, str):
+            if pattern.startswith('$') and not pattern.startswith('$gt') and pattern not in operators:
+                found.add(pattern[1:])
+                if in_branch:
+                    branched.add(pattern[1:])
+        elif isinstance(pattern, dict):
+            for key, value in pattern.items():
+                if key in operators:
+                    continue
+                if key == '$and':
+                    if isinstance(value, list):
+                        for sub in value:
+                            self._collect_variables(sub, in_branch, found, branched)
+                elif key == '$or':
+                    if isinstance(value, list):
+                        for sub in value:
+                            self._collect_variables(sub, True, found, branched)
+                elif key == '$not':
+                    self._collect_variables(value, True, found, branched)
+                else:
+                    self._collect_variables(value, in_branch, found, branched)
+        elif isinstance(pattern, list):
+            for item in pattern:
+                self._collect_variables(item, in_branch, found, branched)
+
+    def _collect_score_keys(self, pattern: Any) -> None:
+        if isinstance(pattern, dict):
+            for key, value in pattern.items():
+                if isinstance(key, str) and not key.startswith('$'):
+                    self._score_keys.add(key)
+                    self._collect_score_keys(value)
+
+    # ------------------------------------------------------------------
+    # Matching
+    # ------------------------------------------------------------------
+
+    def reset(self) -> None:
+        """Forget all cached state; the next match() re-evaluates everything."""
+        self._values: Dict[str, Any] = {}
+        self._present: Optional[frozenset] = None
+        self._matched: Dict[int, Dict[str, Any]] = {}
+        self._order: Optional[List[int]] = None  # sorted self._matched keys
+        self._match_objects: Dict[int, 'RuleMatch'] = {}
+        self._scores: Dict[int, float] = {}  # valid while self._present holds
+        self._primed = False
+        for alpha in self._alphas.values():
+            alpha.result = None
+        for beta in self._betas:
+            beta.memory = None
+
+    def match(self, context: Dict[str, Any]) -> List['RuleMatch']:
+        """
+        Rules matching context, in rule order, with their bindings and scores.
+
+        RuleMatch objects are reused while a rule's match is unchanged; treat
+        them (and their bindings) as read-only.
+
+        Raises whatever PatternMatcher.match would raise for the same rules.
+        """
+        from .rule_engine import RuleMatch
+
+        try:
+            self._propagate(context)
+        except Exception:
+            self.reset()
+            raise
+
+        # Scores depend only on which pattern keys are present
+        present = frozenset(k for k in self._score_keys if k in context)
+        if present != self._present:
+            self._present = present
+            self._scores.clear()
+            self._match_objects.clear()
+
+        if self._order is None:
+            self._order = sorted(self._matched)
+
+        matches = []
+        for index in self._order:
+            match = self._match_objects.get(index)
+            if match is None:
+                rule = self.rules[index]
+                score = self._scores.get(index)
+                if score is None:
+                    score = self.matcher.calculate_match_score(rule.condition, context)
+                    self._scores[index] = score
+                match = RuleMatch(rule=rule, bindings=self._matched[index], match_score=score)
+                self._match_objects[index] = match
+            matches.append(match)
+        return matches
+
+    def _propagate(self, context: Dict[str, Any]) -> None:
+        first_run = not self._primed
+        if first_run:
+            changed = set(self._watched_keys)
+            for key in changed:
+                self._values[key] = snapshot_value(context.get(key, MISSING))
+            for index in self._always:
+                self._set_matched(index, {})
+            self._primed = True
+        else:
+            changed = set()
+            for key in self._watched_keys:
+                is_changed, snapshot = refresh_snapshot(
+                    self._values.get(key, MISSING), context.get(key, MISSING)
+                )
+                if is_changed:
+                    changed.add(key)
+                    self._values[key] = snapshot
+
+        # Alpha layer: re-test conditions on changed keys
+        dirty: List[int] = []
+        queued: Set[int] = set()
+        for key in changed:
+            for alpha in self._alphas_by_key.get(key, ()):
+                alpha.evaluate(context, self.matcher)
+                for beta in alpha.successors:
+                    if beta.index not in queued:
+                        queued.add(beta.index)
+                        heapq.heappush(dirty, beta.index)
+
+        # Beta layer: recompute joins in topological (creation) order
+        while dirty:
+            beta = self._betas[heapq.heappop(dirty)]
+            before = beta.memory
+            beta.evaluate()
+            if self._same_memory(before, beta.memory):
+                continue
+            for index in beta.rules:
+                self._set_matched(index, beta.memory)
+            for child in beta.children:
+                if child.index not in queued:
+                    queued.add(child.index)
+                    heapq.heappush(dirty, child.index)
+
+        # Whole conditions: re-match when one of their keys changed; those
+        # with top-level operators see the entire context and always re-match
+        for whole in self._wholes:
+            if not first_run and whole.keys is not None and not (whole.keys & changed):
+                continue
+            condition = self.rules[whole.rule_index].condition
+            matched, bindings = self.matcher.match(condition, context)
+            self._set_matched(whole.rule_index, bindings if matched else None)
+
+    def _set_matched(self, index: int, bindings: Optional[Dict[str, Any]]) -> None:
+        if bindings is None:
+            if self._matched.pop(index, None) is not None:
+                self._order = None
+        else:
+            if index not in self._matched:
+                self._order = None
+            self._matched[index] = bindings
+        self._match_objects.pop(index, None)
+
+    @staticmethod
+    def _same_memory(before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> bool:
+        if before is None or after is None:
+            return before is after
+        try:
+            return bool(before == after)
+        except Exception:
+            return False
@@ -37,6 +37,8 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from validators.rule_validator import RuleValidator
 from loggers.system_logger import SystemLogger
+from .rete_network import ReteNetwork, MISSING, refresh_snapshot, snapshot_value, value_changed
+from .action_compiler import ActionCompiler, ExpressionError
 
 
 class ConflictResolutionStrategy(Enum):
@@ -171,6 +173,20 @@ class PatternMatcher:
         matches = self._match_recursive(pattern, context, bindings)
         return matches, bindings
     
+    def match_value(self, pattern: Any, value: Any, bindings: Dict[str, Any]) -> bool:
+        """
+        Match any sub-pattern against a value, adding to existing bindings.
+        
+        Args:
+            pattern: Pattern to match (any pattern form, not only a condition)
+            value: Value to match against
+            bindings: Variable bindings, checked and extended in place
+            
+        Returns:
+            True if pattern matches value
+        """
+        return self._match_recursive(pattern, value, bindings)
+    
     def _match_recursive(self, pattern: Any, value: Any, bindings: Dict[str, Any]) -> bool:
         """
         Recursively match pattern against value.
@@ -302,16 +318,35 @@ class ActionExecutor:
     - Compute expressions
     - Call functions
     - Modify context
+    
+    Expressions and ${...} templates are compiled once by an ActionCompiler
+    (whitelisted syntax only) and reused on every firing.
     """
     
     def __init__(self):
         self.logger = SystemLogger()
         self.custom_actions: Dict[str, Callable] = {}
+        self.compiler = ActionCompiler()
     
     def register_action(self, name: str, func: Callable) -> None:
         """Register a custom action function."""
         self.custom_actions[name] = func
     
+    def prepare(self, action: Dict[str, Any]) -> frozenset:
+        """
+        Compile every expression in an action ahead of execution.
+        
+        Args:
+            action: Action specification
+            
+        Returns:
+            Names of the context keys/bindings the action reads
+            
+        Raises:
+            ExpressionError: If an expression is invalid or not allowed
+        """
+        return self.compiler.dependencies(action)
+    
     def execute(self, action: Dict[str, Any], context: Dict[str, Any], 
                 bindings: Dict[str, Any]) -> Tuple[Any, Dict[str, Any]]:
         """
@@ -399,15 +434,13 @@ class ActionExecutor:
                     return context[var_name]
             
             # Check for expression syntax: ${expression}
-            if '${' in value:
-                def replace_expr(match):
-                    expr = match.group(1)
-                    try:
-                        return str(self._evaluate_expression(expr, context, bindings))
-                    except:
-                        return match.group(0)
-                
-                return re.sub(r'\$\{([^}]+)\}', replace_expr, value)
+            template = self.compiler.template(value)
+            if template is not None:
+                return ''.join(
+                    part if isinstance(part, str)
+                    else str(self._evaluate_compiled(part, context, bindings))
+                    for part in template.parts
+                )
             
             return value
         
@@ -432,28 +465,22 @@ class ActionExecutor:
         Returns:
             Evaluated result
         """
-        # Create safe evaluation context
-        safe_context = {
-            'True': True,
-            'False': False,
-            'None': None,
-            'abs': abs,
-            'min': min,
-            'max': max,
-            'sum': sum,
-            'len': len,
-            'round': round,
-            'int': int,
-            'float': float,
-            'str': str,
-            **bindings,
-            **context
-        }
-        
         try:
-            return eval(expression, {"__builtins__": {}}, safe_context)
+            compiled = self.compiler.expression(expression)
+        except ExpressionError as e:
+            compiled = e
+        return self._evaluate_compiled(compiled, context, bindings)
+    
+    def _evaluate_compiled(self, compiled: Any, context: Dict[str, Any],
+                           bindings: Dict[str, Any]) -> Any:
+        """Evaluate a CompiledExpression (or report an ExpressionError); None on failure."""
+        if isinstance(compiled, ExpressionError):
+            self.logger.log(str(compiled), level="WARNING")
+            return None
+        try:
+            return compiled.evaluate(context, bindings)
         except Exception as e:
-            self.logger.log(f"Error evaluating expression '{expression}': {e}", level="WARNING")
+            self.logger.log(f"Error evaluating expression '{compiled.source}': {e}", level="WARNING")
             return None
 
 
@@ -462,18 +489,26 @@ class RuleEngine:
     Executes rules in the rule-based system.
     
     Features:
-    - Pattern matching with variable binding
+    - Pattern matching with variable binding, compiled into an incremental
+      matching network (see rete_network.py) that is rebuilt when the set
+      of enabled rules changes
     - Multiple conflict resolution strategies
+    - Action expressions compiled when the rule is added; with
+      skip_unchanged, a rule is not re-fired while every context key it
+      reads (condition keys and action dependencies) is unchanged since it
+      last fired
     - Rule lifecycle management
     - Execution statistics
     """
     
-    def __init__(self, strategy: ConflictResolutionStrategy = ConflictResolutionStrategy.PRIORITY):
+    def __init__(self, strategy: ConflictResolutionStrategy = ConflictResolutionStrategy.PRIORITY,
+                 skip_unchanged: bool = False):
         """
         Initialize rule engine.
         
         Args:
             strategy: Conflict resolution strategy to use
+            skip_unchanged: Skip re-firing rules whose inputs did not change
         """
         self.validator = RuleValidator()
         self.logger = SystemLogger()
@@ -482,8 +517,18 @@ class RuleEngine:
         
         self.rules: List[Rule] = []
         self.strategy = strategy
+        self.skip_unchanged = skip_unchanged
         self.execution_history: List[ExecutionResult] = []
         
+        # Compiled matching network for the enabled rules
+        self._network: Optional[ReteNetwork] = None
+        self._network_signature: Tuple = ()
+        
+        # id(rule) -> context keys the rule reads (None: unknown), and the
+        # snapshot of those keys when it last fired
+        self._rule_inputs: Dict[int, Optional[frozenset]] = {}
+        self._fired_inputs: Dict[int, Dict[str, Any]] = {}
+        
         self.logger.log("RuleEngine initialized", level="INFO")
     
     def add_rule(self, rule: Dict[str, Any]) -> bool:
@@ -500,6 +545,12 @@ class RuleEngine:
             self.logger.log("Invalid rule provided", level="WARNING")
             return False
         
+        try:
+            action_inputs = self.action_executor.prepare(rule.get('action', {}))
+        except ExpressionError as e:
+            self.logger.log(f"Invalid rule expression: {e}", level="WARNING")
+            return False
+        
         # Create Rule object
         new_rule = Rule(
             name=rule.get('name', f'rule_{len(self.rules)}'),
@@ -511,6 +562,7 @@ class RuleEngine:
         )
         
         self.rules.append(new_rule)
+        self._rule_inputs[id(new_rule)] = self._condition_inputs(new_rule, action_inputs)
         self.logger.log(f"Rule added: {new_rule.name}", level="INFO")
         return True
     
@@ -519,6 +571,8 @@ class RuleEngine:
         for i, rule in enumerate(self.rules):
             if rule.name == rule_name:
                 self.rules.pop(i)
+                self._rule_inputs.pop(id(rule), None)
+                self._fired_inputs.pop(id(rule), None)
                 self.logger.log(f"Rule removed: {rule_name}", level="INFO")
                 return True
         return False
@@ -578,6 +632,23 @@ class RuleEngine:
             import time
             start_time = time.time()
             
+            inputs = self._get_rule_inputs(match.rule) if self.skip_unchanged else None
+            if inputs is not None:
+                previous = self._fired_inputs.get(id(match.rule))
+                if previous is not None and not any(
+                    value_changed(snapshot, current_context.get(key, MISSING))
+                    for key, snapshot in previous.items()
+                ):
+                    self.logger.log(f"Rule {match.rule.name} skipped: inputs unchanged", level="DEBUG")
+                    continue
+                # Re-snapshot only the inputs that changed since the last firing
+                fired_inputs = {
+                    key: refresh_snapshot(previous[key], current_context.get(key, MISSING))[1]
+                    if previous is not None and key in previous
+                    else snapshot_value(current_context.get(key, MISSING))
+                    for key in inputs
+                }
+            
             try:
                 output, current_context = self.action_executor.execute(
                     match.rule.action,
@@ -588,6 +659,8 @@ class RuleEngine:
                 # Update rule statistics
                 match.rule.last_fired = datetime.now()
                 match.rule.fire_count += 1
+                if inputs is not None:
+                    self._fired_inputs[id(match.rule)] = fired_inputs
                 
                 result = ExecutionResult(
                     rule_name=match.rule.name,
@@ -622,19 +695,49 @@ class RuleEngine:
         Returns:
             List of RuleMatch objects
         """
-        matching = []
-        
-        for rule in self.rules:
-            if not rule.enabled:
-                continue
-            
-            matches, bindings = self.pattern_matcher.match(rule.condition, context)
-            
-            if matches:
-                score = self.pattern_matcher.calculate_match_score(rule.condition, context)
-                matching.append(RuleMatch(rule=rule, bindings=bindings, match_score=score))
+        return self._get_network().match(context)
+    
+    def _get_network(self) -> ReteNetwork:
+        """
+        Compiled network for the enabled rules, rebuilt if they changed.
         
-        return matching
+        The signature covers rule identity and enabled flag, so rules added,
+        removed or toggled directly (not only via the methods above) are
+        picked up.
+        """
+        signature = tuple((id(rule), rule.enabled) for rule in self.rules)
+        if self._network is None or signature != self._network_signature:
+            enabled = [rule for rule in self.rules if rule.enabled]
+            self._network = ReteNetwork(enabled, self.pattern_matcher)
+            self._network_signature = signature
+            live = {id(rule) for rule in self.rules}
+            self._rule_inputs = {k: v for k, v in self._rule_inputs.items() if k in live}
+            self._fired_inputs = {k: v for k, v in self._fired_inputs.items() if k in live}
+        return self._network
+    
+    def _get_rule_inputs(self, rule: Rule) -> Optional[frozenset]:
+        """Context keys a rule reads, computed on first use for rules not added via add_rule."""
+        key = id(rule)
+        if key not in self._rule_inputs:
+            try:
+                action_inputs = self.action_executor.prepare(rule.action)
+            except ExpressionError:
+                action_inputs = None
+            self._rule_inputs[key] = self._condition_inputs(rule, action_inputs)
+        return self._rule_inputs[key]
+    
+    @staticmethod
+    def _condition_inputs(rule: Rule, action_inputs: Optional[frozenset]) -> Optional[frozenset]:
+        """
+        Condition keys plus action dependencies, or None when they cannot be
+        determined statically (top-level condition operators, $call actions
+        with side effects, or invalid expressions).
+        """
+        if action_inputs is None or '$call' in rule.action:
+            return None
+        if any(key.startswith('$') for key in rule.condition):
+            return None
+        return frozenset(rule.condition) | action_inputs
     
     def _resolve_conflicts(self, matches: List[RuleMatch], context: Dict[str, Any]) -> List[RuleMatch]:
         """
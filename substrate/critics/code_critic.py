@@ -17,6 +17,8 @@
 #
 # NOTES FOR FUTURE AI:
 #   - Use AST analysis for structural issues
+#   - File checks come from utilities.source_analysis: one parse and one
+#     visitor pass per file content, cached by content hash
 #   - Use LLM for semantic issues
 #   - Propose concrete patches, not vague suggestions
 
@@ -31,6 +33,7 @@ import os
 import re
 
 from substrate.critics.local_llm import LocalLLMBackend, LLMResponse
+from utilities.source_analysis import SourceAnalysisCache
 from substrate.memory.reasoning_trace import ReasoningTrace, CriticAnnotation
 
 
@@ -119,16 +122,29 @@ class CodeCritic:
     - Pattern matching for common anti-patterns
     """
     
+    # Checks answered from cached source facts (everything except "llm")
+    STATIC_CHECKS = ("syntax", "complexity", "style", "bugs", "performance")
+    
     def __init__(
         self,
         llm_backend: LocalLLMBackend,
         codebase_root: str = ".",
-        critic_id: Optional[str] = None
+        critic_id: Optional[str] = None,
+        analysis_cache_path: Optional[str] = None,
     ):
+        """
+        Args:
+            llm_backend: LLM for semantic analysis and patch proposals
+            codebase_root: Root that file paths are relative to
+            critic_id: Stable critic ID (generated if omitted)
+            analysis_cache_path: JSON file persisting static analysis
+                results across runs (None = in-memory only)
+        """
         self.llm = llm_backend
         self.codebase_root = codebase_root
         self.critic_id = critic_id or f"code_critic_{uuid.uuid4().hex[:8]}"
         self._analysis_count = 0
+        self._analysis = SourceAnalysisCache(analysis_cache_path)
     
     def analyze_file(
         self,
@@ -145,42 +161,71 @@ class CodeCritic:
         Returns:
             List of CodeIssues found
         """
-        self._analysis_count += 1
-        issues = []
+        return self.analyze_files([file_path], check_types)[file_path]
+    
+    def analyze_files(
+        self,
+        file_paths: List[str],
+        check_types: Optional[Set[str]] = None
+    ) -> Dict[str, List[CodeIssue]]:
+        """
+        Analyze many files; unchanged files are answered from the cache and
+        the rest are parsed in parallel.
+        
+        Args:
+            file_paths: Paths relative to codebase_root
+            check_types: Which checks to run
+            
+        Returns:
+            Dict of file path -> CodeIssues found
+        """
+        self._analysis_count += len(file_paths)
         
         check_types = check_types or {
             "syntax", "complexity", "style", "bugs", "performance", "llm"
         }
         
-        # Read file
-        try:
-            full_path = os.path.join(self.codebase_root, file_path)
-            with open(full_path) as f:
-                code = f.read()
-        except Exception as e:
-            issues.append(CodeIssue(
-                issue_type="file_error",
-                severity="error",
-                message=f"Could not read file: {e}",
-                file_path=file_path,
-            ))
-            return issues
-        
-        # Programmatic checks
-        if "syntax" in check_types:
-            issues.extend(self._check_syntax(code, file_path))
-        
-        if "complexity" in check_types:
-            issues.extend(self._check_complexity(code, file_path))
+        full_paths = {p: os.path.join(self.codebase_root, p) for p in file_paths}
+        facts_by_path = {}
+        if any(check in check_types for check in self.STATIC_CHECKS):
+            facts_by_path = self._analysis.analyze_many(full_paths.values())
+            self._analysis.save()
         
-        if "style" in check_types:
-            issues.extend(self._check_style(code, file_path))
+        results = {}
+        for file_path, full_path in full_paths.items():
+            facts = facts_by_path.get(os.path.abspath(full_path))
+            results[file_path] = self._issues_for_file(file_path, full_path, facts, check_types)
         
-        if "bugs" in check_types:
-            issues.extend(self._check_common_bugs(code, file_path))
+        return results
+    
+    def _issues_for_file(
+        self,
+        file_path: str,
+        full_path: str,
+        facts: Optional[Dict[str, Any]],
+        check_types: Set[str]
+    ) -> List[CodeIssue]:
+        issues = []
+        static = any(check in check_types for check in self.STATIC_CHECKS)
+        
+        # Read file (for the LLM, or to report why analysis had no facts)
+        code = None
+        if "llm" in check_types or (static and facts is None):
+            try:
+                with open(full_path) as f:
+                    code = f.read()
+            except Exception as e:
+                issues.append(CodeIssue(
+                    issue_type="file_error",
+                    severity="error",
+                    message=f"Could not read file: {e}",
+                    file_path=file_path,
+                ))
+                return issues
         
-        if "performance" in check_types:
-            issues.extend(self._check_performance(code, file_path))
+        # Programmatic checks
+        if facts is not None:
+            issues.extend(self._issues_from_facts(facts, file_path, check_types))
         
         # LLM analysis
         if "llm" in check_types:
@@ -188,6 +233,36 @@ class CodeCritic:
         
         return issues
     
+    def _issues_from_facts(
+        self,
+        facts: Dict[str, Any],
+        file_path: str,
+        check_types: Set[str]
+    ) -> List[CodeIssue]:
+        """Turn cached source facts into CodeIssues, in check order."""
+        issues = []
+        
+        error = facts.get("syntax_error")
+        if error and "syntax" in check_types:
+            issues.append(CodeIssue(
+                issue_type="syntax_error",
+                severity="error",
+                message=error["message"],
+                file_path=file_path,
+                line_number=error["lineno"],
+                confidence=1.0,
+            ))
+        
+        for check in self.STATIC_CHECKS[1:]:
+            if check not in check_types:
+                continue
+            for finding in facts["findings"]:
+                if finding["check"] == check:
+                    fields = {k: v for k, v in finding.items() if k != "check"}
+                    issues.append(CodeIssue(file_path=file_path, **fields))
+        
+        return issues
+    
     def analyze_function(
         self,
         code: str,
@@ -315,64 +390,6 @@ Respond with JSON:
         
         return patches
     
-    def _check_syntax(self, code: str, file_path: str) -> List[CodeIssue]:
-        """Check for syntax errors."""
-        issues = []
-        
-        try:
-            ast.parse(code)
-        except SyntaxError as e:
-            issues.append(CodeIssue(
-                issue_type="syntax_error",
-                severity="error",
-                message=str(e),
-                file_path=file_path,
-                line_number=e.lineno,
-                confidence=1.0,
-            ))
-        
-        return issues
-    
-    def _check_complexity(self, code: str, file_path: str) -> List[CodeIssue]:
-        """Check for overly complex code."""
-        issues = []
-        
-        try:
-            tree = ast.parse(code)
-        except SyntaxError:
-            return issues
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                # Count complexity indicators
-                complexity = self._compute_cyclomatic(node)
-                
-                if complexity > 15:
-                    issues.append(CodeIssue(
-                        issue_type="high_complexity",
-                        severity="warning",
-                        message=f"Function {node.name} has high cyclomatic complexity ({complexity})",
-                        file_path=file_path,
-                        line_number=node.lineno,
-                        function_name=node.name,
-                        suggestion="Consider breaking into smaller functions",
-                    ))
-                
-                # Check nesting depth
-                max_depth = self._compute_max_depth(node)
-                if max_depth > 5:
-                    issues.append(CodeIssue(
-                        issue_type="deep_nesting",
-                        severity="warning",
-                        message=f"Function {node.name} has deep nesting ({max_depth} levels)",
-                        file_path=file_path,
-                        line_number=node.lineno,
-                        function_name=node.name,
-                        suggestion="Consider early returns or extracting nested logic",
-                    ))
-        
-        return issues
-    
     def _compute_cyclomatic(self, node: ast.AST) -> int:
         """Compute cyclomatic complexity of a function."""
         complexity = 1
@@ -385,127 +402,6 @@ Respond with JSON:
         
         return complexity
     
-    def _compute_max_depth(self, node: ast.AST, current_depth: int = 0) -> int:
-        """Compute maximum nesting depth."""
-        max_depth = current_depth
-        
-        for child in ast.iter_child_nodes(node):
-            if isinstance(child, (ast.If, ast.While, ast.For, ast.With, ast.Try)):
-                child_depth = self._compute_max_depth(child, current_depth + 1)
-                max_depth = max(max_depth, child_depth)
-            else:
-                child_depth = self._compute_max_depth(child, current_depth)
-                max_depth = max(max_depth, child_depth)
-        
-        return max_depth
-    
-    def _check_style(self, code: str, file_path: str) -> List[CodeIssue]:
-        """Check for style issues."""
-        issues = []
-        lines = code.split("\n")
-        
-        for i, line in enumerate(lines, 1):
-            # Long lines
-            if len(line) > 120:
-                issues.append(CodeIssue(
-                    issue_type="line_too_long",
-                    severity="info",
-                    message=f"Line exceeds 120 characters ({len(line)})",
-                    file_path=file_path,
-                    line_number=i,
-                    code_snippet=line[:80] + "...",
-                ))
-            
-            # Trailing whitespace
-            if line.rstrip() != line and line.strip():
-                issues.append(CodeIssue(
-                    issue_type="trailing_whitespace",
-                    severity="info",
-                    message="Line has trailing whitespace",
-                    file_path=file_path,
-                    line_number=i,
-                ))
-        
-        return issues
-    
-    def _check_common_bugs(self, code: str, file_path: str) -> List[CodeIssue]:
-        """Check for common bug patterns."""
-        issues = []
-        
-        try:
-            tree = ast.parse(code)
-        except SyntaxError:
-            return issues
-        
-        for node in ast.walk(tree):
-            # Mutable default arguments
-            if isinstance(node, ast.FunctionDef):
-                for default in node.args.defaults + node.args.kw_defaults:
-                    if default and isinstance(default, (ast.List, ast.Dict, ast.Set)):
-                        issues.append(CodeIssue(
-                            issue_type="mutable_default",
-                            severity="warning",
-                            message=f"Function {node.name} has mutable default argument",
-                            file_path=file_path,
-                            line_number=node.lineno,
-                            function_name=node.name,
-                            suggestion="Use None as default and initialize in function body",
-                            confidence=1.0,
-                        ))
-            
-            # Bare except
-            if isinstance(node, ast.ExceptHandler) and node.type is None:
-                issues.append(CodeIssue(
-                    issue_type="bare_except",
-                    severity="warning",
-                    message="Bare except clause catches all exceptions including SystemExit",
-                    file_path=file_path,
-                    line_number=node.lineno,
-                    suggestion="Catch specific exceptions or at least Exception",
-                    confidence=1.0,
-                ))
-            
-            # Comparison to None using ==
-            if isinstance(node, ast.Compare):
-                for op, comp in zip(node.ops, node.comparators):
-                    if isinstance(op, (ast.Eq, ast.NotEq)) and isinstance(comp, ast.Constant) and comp.value is None:
-                        issues.append(CodeIssue(
-                            issue_type="none_comparison",
-                            severity="info",
-                            message="Use 'is None' or 'is not None' for None comparisons",
-                            file_path=file_path,
-                            line_number=node.lineno,
-                            confidence=1.0,
-                        ))
-        
-        return issues
-    
-    def _check_performance(self, code: str, file_path: str) -> List[CodeIssue]:
-        """Check for performance issues."""
-        issues = []
-        
-        try:
-            tree = ast.parse(code)
-        except SyntaxError:
-            return issues
-        
-        for node in ast.walk(tree):
-            # String concatenation in loop
-            if isinstance(node, (ast.For, ast.While)):
-                for child in ast.walk(node):
-                    if isinstance(child, ast.AugAssign) and isinstance(child.op, ast.Add):
-                        if isinstance(child.target, ast.Name):
-                            issues.append(CodeIssue(
-                                issue_type="string_concat_loop",
-                                severity="info",
-                                message="Possible string concatenation in loop - consider using list.join()",
-                                file_path=file_path,
-                                line_number=child.lineno,
-                                confidence=0.6,
-                            ))
-        
-        return issues
-    
     def _check_function_complexity(
         self,
         tree: ast.AST,
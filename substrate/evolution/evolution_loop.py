@@ -21,14 +21,25 @@
 #   - This is intentionally unconstrained per user request
 #   - Technical validators (tests, syntax) still apply
 #   - Evolution is continuous, not gated
+#   - run_cycle is a DAG of stages (see _cycle_stages); independent stages
+#     run concurrently and each stage's wall time lands on EvolutionResult
+#   - Critic analyses fan out on a thread pool under a per-cycle time budget;
+#     traces already critiqued are skipped
+#   - Graph consistency is checked incrementally (ConsistencyMonitor)
+#   - Code patches of a cycle share one test run scoped to the tests that
+#     reference the patched modules; on failure each patch is retried alone
 
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Set, Callable, Tuple
+from typing import Dict, List, Optional, Any, Set, Callable, Tuple, Union
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime
 from enum import Enum, auto
+import ast
 import json
 import os
+import shlex
 import time
 import threading
 import queue
@@ -39,6 +50,7 @@ import shutil
 
 from substrate.graph.formula import Formula, FormulaStatus, FormulaLayer, Evidence
 from substrate.graph.formula_graph import FormulaGraph, EdgeType
+from substrate.graph.consistency import ConsistencyMonitor
 from substrate.planner.formula_planner import FormulaPlanner, DerivationPlan
 from substrate.memory.reasoning_trace import ReasoningTrace, TraceStore
 from substrate.critics.local_llm import LocalLLMBackend, LLMConfig, create_llm_backend
@@ -138,6 +150,11 @@ class EvolutionResult:
     # Issues addressed
     issues_addressed: List[str] = field(default_factory=list)
     
+    # Pipeline profile: wall time per stage, and work dropped for overrunning
+    # its time budget (e.g. "logic_critic:<trace id>")
+    stage_timings_ms: Dict[str, float] = field(default_factory=dict)
+    timed_out: List[str] = field(default_factory=list)
+    
     def to_dict(self) -> Dict[str, Any]:
         return {
             "cycle_id": self.cycle_id,
@@ -154,6 +171,8 @@ class EvolutionResult:
             "edges_removed": self.edges_removed,
             "code_patches_applied": self.code_patches_applied,
             "issues_addressed": self.issues_addressed,
+            "stage_timings_ms": self.stage_timings_ms,
+            "timed_out": self.timed_out,
         }
 
 
@@ -175,6 +194,17 @@ class EvolutionConfig:
     test_command: str = "python -m pytest tests/ -x"
     run_smoke_tests_before_patch: bool = True   # Run quick smoke tests before full tests
     smoke_test_command: str = "python -m pytest -q -k smoke"
+    batch_tests: bool = True             # One test run for all patches of a cycle
+    scope_tests: bool = True             # Only run tests referencing patched modules
+    scoped_test_command: str = "python -m pytest -x"  # Test files are appended
+    test_dir: str = "tests"
+    
+    # Pipeline
+    stage_workers: int = 4                     # Threads for independent cycle stages
+    critic_workers: int = 4                    # Threads for critic analyses
+    critic_time_budget_seconds: float = 60.0   # Per cycle; late analyses are dropped
+    critic_traces_per_cycle: int = 5           # New traces critiqued per cycle
+    incremental_consistency: bool = True       # Re-check only what changed
     
     # Formula evolution
     auto_add_formulas: bool = True       # Automatically add new formulas
@@ -198,12 +228,26 @@ class EvolutionConfig:
             "codebase_root": self.codebase_root,
             "auto_apply_patches": self.auto_apply_patches,
             "run_tests_after_patch": self.run_tests_after_patch,
+            "batch_tests": self.batch_tests,
+            "scope_tests": self.scope_tests,
+            "stage_workers": self.stage_workers,
+            "critic_workers": self.critic_workers,
+            "critic_time_budget_seconds": self.critic_time_budget_seconds,
+            "incremental_consistency": self.incremental_consistency,
             "auto_add_formulas": self.auto_add_formulas,
             "auto_deprecate_formulas": self.auto_deprecate_formulas,
             "deprecation_threshold": self.deprecation_threshold,
         }
 
 
+@dataclass
+class _CycleStage:
+    """A node of the evolution cycle DAG; run receives the outputs of finished stages."""
+    name: str
+    run: Callable[[Dict[str, Any]], Any]
+    deps: Tuple[str, ...] = ()
+
+
 class EvolutionLoop:
     """
     Unconstrained self-modification engine.
@@ -254,6 +298,13 @@ class EvolutionLoop:
         self._cycle_count = 0
         self._recent_targets: List[str] = []
         
+        # Pipeline state
+        self._stage_pool: Optional[ThreadPoolExecutor] = None
+        self._critic_pool: Optional[ThreadPoolExecutor] = None
+        self._critiqued: OrderedDict = OrderedDict()  # trace id -> step count analyzed
+        self._critiques_in_flight: Set[str] = set()
+        self._consistency = ConsistencyMonitor(formula_graph)
+        
         # Ensure directories exist
         os.makedirs(config.backup_dir, exist_ok=True)
         os.makedirs(config.log_dir, exist_ok=True)
@@ -277,6 +328,11 @@ class EvolutionLoop:
         self._running = False
         if self._thread:
             self._thread.join(timeout=5.0)
+        for name in ("_stage_pool", "_critic_pool"):
+            pool = getattr(self, name)
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+                setattr(self, name, None)
         self._log("Evolution loop stopped")
     
     def _run_loop(self):
@@ -317,15 +373,125 @@ class EvolutionLoop:
         
         self._log(f"Starting evolution cycle {cycle_id}")
         
-        # Phase 1: Gather data
-        traces = self.trace_store.get_recent(n=20)
-        failed_traces = self.trace_store.get_failed()
-        low_confidence_traces = self.trace_store.get_low_confidence(0.5)
+        start = time.perf_counter()
+        self._run_stages(self._cycle_stages(result), result)
+        result.stage_timings_ms["total"] = (time.perf_counter() - start) * 1000
+        
+        result.completed_at = datetime.now()
+        
+        self._log(f"Cycle {cycle_id} complete: {result.actions_succeeded}/{result.actions_applied} actions succeeded")
+        self._save_cycle_log(result)
+        
+        return result
+    
+    # =========================================================================
+    # Cycle stages
+    # =========================================================================
+    
+    def _cycle_stages(self, result: EvolutionResult) -> List[_CycleStage]:
+        """
+        The stage DAG of one cycle.
+        
+        gather ──┬─▶ critique ──────┐
+                 └─▶ trace_actions ─┼─▶ propose ─▶ apply ─▶ tests
+        consistency ────────────────┘
+        """
+        return [
+            _CycleStage("gather", lambda out: self._stage_gather()),
+            _CycleStage("consistency", lambda out: self._stage_consistency()),
+            _CycleStage("critique", lambda out: self._stage_critique(out["gather"], result),
+                        deps=("gather",)),
+            _CycleStage("trace_actions", lambda out: self._stage_trace_actions(out["gather"]),
+                        deps=("gather",)),
+            _CycleStage("propose", lambda out: self._stage_propose(out),
+                        deps=("critique", "trace_actions", "consistency")),
+            _CycleStage("apply", lambda out: self._stage_apply(out["propose"], result),
+                        deps=("propose",)),
+            _CycleStage("tests", lambda out: self._stage_tests(out["apply"], result),
+                        deps=("apply",)),
+        ]
+    
+    def _run_stages(self, stages: List[_CycleStage], result: EvolutionResult) -> Dict[str, Any]:
+        """Run stages as soon as their dependencies are done; returns outputs by name."""
+        outputs: Dict[str, Any] = {}
+        waiting = {stage.name: stage for stage in stages}
+        running: Dict[Future, str] = {}
+        pool = self._pool("_stage_pool", self.config.stage_workers)
+        
+        while waiting or running:
+            for name, stage in list(waiting.items()):
+                if all(dep in outputs for dep in stage.deps):
+                    del waiting[name]
+                    running[pool.submit(self._run_stage, stage, outputs, result)] = name
+            if not running:
+                raise RuntimeError(f"Unsatisfiable stage dependencies: {sorted(waiting)}")
+            
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                outputs[running.pop(future)] = future.result()
+        
+        return outputs
+    
+    @staticmethod
+    def _run_stage(stage: _CycleStage, outputs: Dict[str, Any], result: EvolutionResult) -> Any:
+        start = time.perf_counter()
+        try:
+            return stage.run(outputs)
+        finally:
+            result.stage_timings_ms[stage.name] = (time.perf_counter() - start) * 1000
+    
+    def _pool(self, name: str, workers: int) -> ThreadPoolExecutor:
+        pool = getattr(self, name)
+        if pool is None:
+            pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix=f"evolution{name}")
+            setattr(self, name, pool)
+        return pool
+    
+    def _stage_gather(self) -> Dict[str, List[ReasoningTrace]]:
+        """Phase 1: Gather data."""
+        return {
+            "recent": self.trace_store.get_recent(n=20),
+            "failed": self.trace_store.get_failed(),
+        }
+    
+    def _stage_critique(
+        self,
+        gathered: Dict[str, List[ReasoningTrace]],
+        result: EvolutionResult,
+    ) -> List[Dict[str, Any]]:
+        """Phase 2: Analyze new traces with critics, in parallel, within the time budget."""
+        todo = []
+        for trace in gathered["recent"]:  # Most recent first
+            if len(todo) >= self.config.critic_traces_per_cycle:
+                break
+            if trace.id in self._critiques_in_flight:
+                continue
+            if self._critiqued.get(trace.id) == len(trace.steps):
+                continue  # Unchanged since its last analysis
+            todo.append(trace)
+        
+        pool = self._pool("_critic_pool", self.config.critic_workers)
+        futures: Dict[Future, ReasoningTrace] = {}
+        for trace in todo:
+            self._critiques_in_flight.add(trace.id)
+            future = pool.submit(self.logic_critic.analyze, trace)
+            future.add_done_callback(lambda _, tid=trace.id: self._critiques_in_flight.discard(tid))
+            futures[future] = trace
+        
+        done, late = wait(futures, timeout=self.config.critic_time_budget_seconds)
+        for future in late:
+            future.cancel()
+            result.timed_out.append(f"{self.logic_critic.critic_id}:{futures[future].id}")
         
-        # Phase 2: Analyze with critics
         all_issues = []
-        for trace in traces[-5:]:  # Analyze last 5 traces
-            logic_issues = self.logic_critic.analyze(trace)
+        for future in done:
+            trace = futures[future]
+            try:
+                logic_issues = future.result()
+            except Exception as e:
+                self._log(f"Logic critic failed on trace {trace.id}: {e}", level="error")
+                continue
+            self._mark_critiqued(trace)
             all_issues.extend([
                 {"type": "logic", "issue": i, "trace_id": trace.id}
                 for i in logic_issues
@@ -338,22 +504,39 @@ class EvolutionLoop:
                  for i in logic_issues]
             )
         
-        # Phase 3: Generate evolution actions
+        return all_issues
+    
+    def _mark_critiqued(self, trace: ReasoningTrace):
+        self._critiqued[trace.id] = len(trace.steps)
+        self._critiqued.move_to_end(trace.id)
+        while len(self._critiqued) > 1000:
+            self._critiqued.popitem(last=False)
+    
+    def _stage_trace_actions(self, gathered: Dict[str, List[ReasoningTrace]]) -> List[EvolutionAction]:
+        """Phase 3a: Actions from trace failures."""
         actions = []
-        
-        # From trace failures
-        for trace in failed_traces[:5]:
+        for trace in gathered["failed"][:5]:
             actions.extend(self._generate_actions_from_trace(trace))
+        return actions
+    
+    def _stage_consistency(self) -> List[Dict[str, Any]]:
+        """Graph consistency issues (incremental unless configured otherwise)."""
+        if self.config.incremental_consistency:
+            return self._consistency.check()
+        return self.graph.check_consistency()
+    
+    def _stage_propose(self, outputs: Dict[str, Any]) -> List[EvolutionAction]:
+        """Phase 3b/4: Generate, filter and prioritize actions."""
+        actions = list(outputs["trace_actions"])
         
         # From critic issues
-        for issue_data in all_issues:
+        for issue_data in outputs["critique"]:
             action = self._generate_action_from_issue(issue_data)
             if action:
                 actions.append(action)
         
         # From graph analysis
-        graph_issues = self.graph.check_consistency()
-        for issue in graph_issues:
+        for issue in outputs["consistency"]:
             action = self._generate_action_from_graph_issue(issue)
             if action:
                 actions.append(action)
@@ -362,35 +545,80 @@ class EvolutionLoop:
         meta_suggestions = self.meta_critic.suggest_improvements()
         # (Meta-critic adjusts other critics, doesn't directly create actions)
         
-        # Phase 4: Filter and prioritize actions
         actions = self._filter_actions(actions)
-        actions = sorted(actions, key=lambda a: -a.confidence)[:self.config.max_actions_per_cycle]
+        return sorted(actions, key=lambda a: -a.confidence)[:self.config.max_actions_per_cycle]
+    
+    def _stage_apply(
+        self,
+        actions: List[EvolutionAction],
+        result: EvolutionResult,
+    ) -> List[Tuple[EvolutionAction, str, str]]:
+        """
+        Phase 5: Apply actions (NO SAFETY GATES).
         
+        Returns:
+            Code patches written but not yet tested, as
+            (action, file path, original content), when tests are batched
+        """
         result.actions_proposed = len(actions)
+        batch = self.config.batch_tests and self.config.run_tests_after_patch
+        untested = []
         
-        # Phase 5: Apply actions (NO SAFETY GATES)
         for action in actions:
             if action.confidence >= self.config.min_confidence_for_action:
-                success = self._apply_action(action)
-                action.applied = True
-                action.success = success
-                action.applied_at = datetime.now()
-                
-                result.actions_applied += 1
-                if success:
-                    result.actions_succeeded += 1
-                    self._update_result_counts(result, action)
+                if batch and action.action_type == EvolutionType.PATCH_CODE:
+                    written = self._write_patch_with_backup(action)
+                    if written is None:
+                        self._record_outcome(result, action, False)
+                    else:
+                        untested.append((action,) + written)
                 else:
-                    result.actions_failed += 1
+                    self._record_outcome(result, action, self._apply_action(action))
             
             result.actions.append(action)
         
-        result.completed_at = datetime.now()
+        return untested
+    
+    def _stage_tests(
+        self,
+        untested: List[Tuple[EvolutionAction, str, str]],
+        result: EvolutionResult,
+    ):
+        """Phase 6: One test run for the cycle's patches; isolate failures one by one."""
+        if not untested:
+            return
         
-        self._log(f"Cycle {cycle_id} complete: {result.actions_succeeded}/{result.actions_applied} actions succeeded")
-        self._save_cycle_log(result)
+        error = self._test_patches([action.patch.file_path for action, _, _ in untested])
+        if error is None:
+            for action, _, _ in untested:
+                self._record_outcome(result, action, True)
+            return
         
-        return result
+        for action, file_path, original in reversed(untested):
+            self._revert_patch(file_path, original)
+        
+        if len(untested) == 1:
+            action = untested[0][0]
+            action.error_message = f"{error}, reverted"
+            self._log(f"Reverted patch to: {action.patch.file_path} ({error.lower()})")
+            self._record_outcome(result, action, False)
+            return
+        
+        self._log(f"Batched tests failed for {len(untested)} patches, retrying individually")
+        for action, _, _ in untested:
+            self._record_outcome(result, action, self._apply_code_patch(action))
+    
+    def _record_outcome(self, result: EvolutionResult, action: EvolutionAction, success: bool):
+        action.applied = True
+        action.success = success
+        action.applied_at = datetime.now()
+        
+        result.actions_applied += 1
+        if success:
+            result.actions_succeeded += 1
+            self._update_result_counts(result, action)
+        else:
+            result.actions_failed += 1
     
     # =========================================================================
     # Action generation
@@ -744,10 +972,7 @@ Suggest updated regime conditions. Respond with JSON:
             action.error_message = f"Formula not found: {action.target}"
             return False
         
-        formula.status = FormulaStatus.DEPRECATED
-        formula.modified_at = datetime.now()
-        
-        self.graph.add_formula(formula, overwrite=True)
+        self.graph.set_status(formula.id, FormulaStatus.DEPRECATED)
         self._log(f"Deprecated formula: {formula.name}")
         
         return True
@@ -803,16 +1028,38 @@ Suggest updated regime conditions. Respond with JSON:
         return success
     
     def _apply_code_patch(self, action: EvolutionAction) -> bool:
-        """Apply a code patch."""
+        """Apply a code patch and test it on its own."""
+        written = self._write_patch(action)
+        if written is None:
+            return False
+        file_path, content = written
+        
+        if self.config.run_tests_after_patch:
+            error = self._test_patches([action.patch.file_path])
+            if error is not None:
+                self._revert_patch(file_path, content)
+                action.error_message = f"{error}, reverted"
+                self._log(f"Reverted patch to: {action.patch.file_path} ({error.lower()})")
+                return False
+        
+        return True
+    
+    def _write_patch(self, action: EvolutionAction) -> Optional[Tuple[str, str]]:
+        """
+        Write a code patch to disk without testing it.
+        
+        Returns:
+            (file path, original content), or None if the patch does not apply
+        """
         patch = action.patch
         if not patch:
-            return False
+            return None
         
         file_path = os.path.join(self.config.codebase_root, patch.file_path)
         
         if not os.path.exists(file_path):
             action.error_message = f"File not found: {file_path}"
-            return False
+            return None
         
         # Read current content
         with open(file_path) as f:
@@ -821,7 +1068,7 @@ Suggest updated regime conditions. Respond with JSON:
         # Check if old code exists
         if patch.old_code not in content:
             action.error_message = "Old code not found in file"
-            return False
+            return None
         
         # Apply patch
         new_content = content.replace(patch.old_code, patch.new_code, 1)
@@ -831,28 +1078,186 @@ Suggest updated regime conditions. Respond with JSON:
             f.write(new_content)
         
         self._log(f"Applied patch to: {patch.file_path}")
-
-        # Run smoke tests first if configured
+        return file_path, content
+    
+    def _write_patch_with_backup(self, action: EvolutionAction) -> Optional[Tuple[str, str]]:
+        """_write_patch with the backup and error handling of _apply_action."""
+        try:
+            if self.config.create_backups:
+                self._create_backup(action)
+            return self._write_patch(action)
+        except Exception as e:
+            action.error_message = str(e)
+            self._log(f"Action failed: {e}", level="error")
+            return None
+    
+    @staticmethod
+    def _revert_patch(file_path: str, content: str):
+        with open(file_path, "w") as f:
+            f.write(content)
+    
+    def _test_patches(self, patched_files: List[str]) -> Optional[str]:
+        """
+        Run smoke tests, then the tests covering the patched files.
+        
+        Returns:
+            None if tests pass, else "Smoke tests failed" / "Tests failed"
+        """
         if self.config.run_smoke_tests_before_patch and self.config.smoke_test_command:
-            smoke_pass = self._run_tests(self.config.smoke_test_command)
-            if not smoke_pass:
-                with open(file_path, "w") as f:
-                    f.write(content)
-                action.error_message = "Smoke tests failed, reverted"
-                self._log(f"Reverted patch to: {patch.file_path} (smoke tests failed)")
-                return False
-
-        # Run full tests if configured
+            if not self._run_tests(self.config.smoke_test_command):
+                return "Smoke tests failed"
+        
         if self.config.run_tests_after_patch:
-            tests_pass = self._run_tests(self.config.test_command)
-            if not tests_pass:
-                with open(file_path, "w") as f:
-                    f.write(content)
-                action.error_message = "Tests failed, reverted"
-                self._log(f"Reverted patch to: {patch.file_path} (tests failed)")
-                return False
+            if not self._run_tests(self._scoped_test_command(patched_files)):
+                return "Tests failed"
         
-        return True
+        return None
+    
+    def _scoped_test_command(self, patched_files: List[str]) -> List[str]:
+        """
+        Test argv limited to test files that transitively import a patched module.
+        
+        A test file is selected if it is itself patched, is named
+        test_<module>.py, or reaches a patched module through the reverse
+        import closure of the codebase (importing a.b.c also runs the
+        __init__ of a and a.b). Falls back to the full test_command when
+        scoping is off, a patched file is not a Python module of the
+        codebase, the closure cannot be computed, or nothing matches.
+        """
+        full_command = shlex.split(self.config.test_command)
+        test_dir = os.path.join(self.config.codebase_root, self.config.test_dir)
+        if not self.config.scope_tests or not os.path.isdir(test_dir):
+            return full_command
+        
+        imports = self._module_imports()
+        if imports is None:
+            return full_command
+        
+        targets = set()
+        for path in patched_files:
+            dotted = self._module_name(path)
+            if dotted is None or dotted not in imports:
+                return full_command
+            targets.add(dotted)
+        
+        # Reverse import edges, then everything that reaches a patched module
+        importers: Dict[str, Set[str]] = {}
+        for module, deps in imports.items():
+            for dep in deps:
+                importers.setdefault(dep, set()).add(module)
+        reached = set(targets)
+        frontier = list(targets)
+        while frontier:
+            for importer in importers.get(frontier.pop(), ()):
+                if importer not in reached:
+                    reached.add(importer)
+                    frontier.append(importer)
+        
+        stems = {dotted.rsplit(".", 1)[-1] for dotted in targets}
+        selected = []
+        for root, dirs, files in os.walk(test_dir):
+            dirs.sort()
+            for name in sorted(files):
+                if not (name.startswith("test_") and name.endswith(".py")):
+                    continue
+                rel_path = os.path.relpath(os.path.join(root, name), self.config.codebase_root)
+                if self._module_name(rel_path) in reached or name[len("test_"):-3] in stems:
+                    selected.append(rel_path)
+        
+        if not selected:
+            return full_command
+        return shlex.split(self.config.scoped_test_command) + selected
+    
+    @staticmethod
+    def _module_name(rel_path: str) -> Optional[str]:
+        """Dotted module name of a .py path relative to the codebase root."""
+        stem, ext = os.path.splitext(os.path.normpath(rel_path))
+        if ext != ".py" or stem.startswith(os.pardir):
+            return None
+        if os.path.basename(stem) == "__init__":
+            stem = os.path.dirname(stem)
+        return stem.replace(os.sep, ".") or None
+    
+    def _module_imports(self) -> Optional[Dict[str, Set[str]]]:
+        """
+        Codebase modules each module imports, keyed by dotted name.
+        
+        Imported names are trimmed to the longest known module ("from x
+        import y" where y is not a submodule maps to x) and every module
+        depends on its enclosing packages. Returns None if a module cannot
+        be read or parsed, since its imports are then unknown.
+        """
+        root = self.config.codebase_root
+        sources: Dict[str, Tuple[str, bool]] = {}
+        for current, dirs, files in os.walk(root):
+            dirs[:] = [d for d in dirs if not d.startswith(".") and d != "__pycache__"]
+            for name in files:
+                if not name.endswith(".py"):
+                    continue
+                path = os.path.join(current, name)
+                dotted = self._module_name(os.path.relpath(path, root))
+                if dotted is None:
+                    continue
+                try:
+                    with open(path, encoding="utf-8", errors="ignore") as f:
+                        sources[dotted] = (f.read(), name == "__init__.py")
+                except OSError:
+                    return None
+        
+        imports: Dict[str, Set[str]] = {}
+        for dotted, (source, is_package) in sources.items():
+            package = dotted if is_package else dotted.rpartition(".")[0]
+            names = self._imported_modules(source, package or None)
+            if names is None:
+                return None
+            deps: Set[str] = set()
+            for imported in names:
+                parts = imported.split(".")
+                # The imported module and the packages it runs on the way
+                for i in range(1, len(parts) + 1):
+                    prefix = ".".join(parts[:i])
+                    if prefix in sources:
+                        deps.add(prefix)
+            parents = dotted.split(".")[:-1]
+            deps.update(".".join(parents[:i]) for i in range(1, len(parents) + 1)
+                        if ".".join(parents[:i]) in sources)
+            deps.discard(dotted)
+            imports[dotted] = deps
+        return imports
+    
+    @staticmethod
+    def _imported_modules(source: str, package: Optional[str] = None) -> Optional[Set[str]]:
+        """
+        Absolute names a module imports, including "from x import y" as x.y.
+        
+        package resolves relative imports (the importing module's package).
+        Returns None if the source does not parse.
+        """
+        try:
+            tree = ast.parse(source)
+        except (SyntaxError, ValueError):
+            return None
+        imported: Set[str] = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                imported.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                if node.level:
+                    if package is None:
+                        continue
+                    parts = package.split(".")
+                    if node.level - 1 >= len(parts):
+                        continue
+                    base = ".".join(parts[:len(parts) - (node.level - 1)])
+                    if node.module:
+                        base = f"{base}.{node.module}"
+                elif node.module:
+                    base = node.module
+                else:
+                    continue
+                imported.add(base)
+                imported.update(f"{base}.{alias.name}" for alias in node.names)
+        return imported
     
     def _apply_generate_code(self, action: EvolutionAction) -> bool:
         """Generate new code file."""
@@ -886,12 +1291,14 @@ Suggest updated regime conditions. Respond with JSON:
         
         return True
     
-    def _run_tests(self, command: Optional[str] = None) -> bool:
-        """Run test suite (supports smoke/full)."""
+    def _run_tests(self, command: Optional[Union[str, List[str]]] = None) -> bool:
+        """Run test suite (supports smoke/full); a string command is split shell-style."""
         cmd = command or self.config.test_command
+        if isinstance(cmd, str):
+            cmd = shlex.split(cmd)
         try:
             result = subprocess.run(
-                cmd.split(),
+                cmd,
                 cwd=self.config.codebase_root,
                 capture_output=True,
                 timeout=120,
@@ -5,13 +5,16 @@
 #   - Provides concrete computation for formulas (avoids LLM math)
 # MAIN EXPORTS:
 #   - FormulaExecutor: executes formulas using SymPy/SciPy where possible
+#   - CompiledFormula: cached solved + lambdified formula
+#   - PlanCompiler: fuses a whole derivation plan into one NumPy function
 # NON-RESPONSIBILITIES:
 #   - Does NOT plan derivations
 #   - Does NOT manage graph or critics
 # NOTES FOR FUTURE AI:
 #   - Extend with PDE/ODE solvers and kernel accelerators as needed
 
-from substrate.execution.executor import FormulaExecutor
+from substrate.execution.executor import CompiledFormula, FormulaExecutor
+from substrate.execution.plan_compiler import CompiledPlan, PlanCompiler
 
-__all__ = ["FormulaExecutor"]
+__all__ = ["FormulaExecutor", "CompiledFormula", "PlanCompiler", "CompiledPlan"]
 
@@ -5,6 +5,7 @@
 #   - Replaces LLM math for formula execution with deterministic computation
 # MAIN EXPORTS:
 #   - FormulaExecutor
+#   - CompiledFormula: cached solved + lambdified formula
 # NON-RESPONSIBILITIES:
 #   - Does NOT plan derivations or manage graph state
 # NOTES FOR FUTURE AI:
@@ -13,22 +14,60 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 import sympy as sp
 
 from substrate.graph.formula import Formula
 
 
+@dataclass
+class CompiledFormula:
+    """A formula solved for one target and lambdified over NumPy.
+
+    Produced once per (formula id, expression hash, target, input ordering)
+    and reused for every evaluation; the callable accepts scalars or arrays.
+    """
+
+    formula_id: str
+    expr_hash: str
+    target: str
+    input_symbols: Tuple[str, ...]
+    expr: sp.Expr
+    func: Callable[..., Any]
+
+    def __call__(self, *args: Any) -> Any:
+        return self.func(*args)
+
+
+def _expression_hash(expr_str: str) -> str:
+    return hashlib.sha1(expr_str.encode("utf-8")).hexdigest()
+
+
 @dataclass
 class FormulaExecutor:
     """Executes a Formula using symbolic/numeric backends.
 
     Tries SymPy first; falls back to simple evaluation.
     Returns a dict of outputs or None on failure.
+
+    Parsing, solving and lambdifying happen once per formula expression and
+    are cached (LRU, cache_size entries). The cache key includes a hash of
+    the expression, so an edited formula recompiles; call invalidate() or
+    bind_graph() to drop stale entries eagerly.
     """
 
+    cache_size: int = 512
+    use_cse: bool = True
+    _cache: "OrderedDict[Tuple, CompiledFormula]" = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _failed: Dict[Tuple, str] = field(default_factory=dict, init=False, repr=False)
+
     def evaluate_formula(
         self, formula: Formula, variables: Dict[str, Any]
     ) -> Optional[Dict[str, Any]]:
@@ -42,52 +81,183 @@ class FormulaExecutor:
             Dict of output symbol -> value, or None if evaluation fails.
         """
         try:
-            expr_str = formula.sympy_expr or formula.symbolic_form
-            if not expr_str:
+            compiled = self.compile(formula)
+            if compiled is None:
                 return None
+            args = self._arguments(compiled, variables)
+            return {compiled.target: compiled(*args)}
+        except Exception:
+            return None
 
-            expr = sp.sympify(expr_str)
+    def evaluate_batch(
+        self,
+        formula: Formula,
+        columns: Dict[str, Any],
+        target: Optional[str] = None,
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """Evaluate a formula over column arrays of inputs in one call.
 
-            if isinstance(expr, sp.Equality):
-                left, right = expr.lhs, expr.rhs
-                outputs: List[str] = (
-                    [v.symbol for v in formula.outputs] or list(expr.free_symbols)
-                )
-                target = sp.Symbol(outputs[0])
-                solution = sp.solve(sp.Eq(left, right), target)
-                if not solution:
-                    return None
-                val = self._evaluate_expression(solution[0], variables)
-                return {outputs[0]: val}
+        Args:
+            formula: The Formula to execute.
+            columns: Mapping of symbol -> array-like (or scalar); columns
+                are broadcast against each other.
+            target: Output symbol to solve for (default: first output).
 
-            outputs = [v.symbol for v in formula.outputs]
-            if not outputs:
+        Returns:
+            Dict of output symbol -> array with the broadcast input shape,
+            or None if evaluation fails.
+        """
+        try:
+            compiled = self.compile(formula, target=target)
+            if compiled is None:
                 return None
-
-            result_val = self._evaluate_expression(expr, variables)
-            return {outputs[0]: result_val}
+            args = [np.asarray(a) for a in self._arguments(compiled, columns)]
+            shape = np.broadcast_shapes(*(a.shape for a in args)) if args else ()
+            result = np.asarray(compiled(*args))
+            if result.shape != shape:
+                # Constant or partially-dependent expressions
+                result = np.broadcast_to(result, shape).copy()
+            return {compiled.target: result}
         except Exception:
             return None
 
-    def _evaluate_expression(self, expr: sp.Expr, variables: Dict[str, Any]) -> Any:
-        """Evaluate a SymPy expression with given variables.
+    # ------------------------------------------------------------------
+    # Compilation cache
+    # ------------------------------------------------------------------
+
+    def compile(
+        self,
+        formula: Formula,
+        target: Optional[str] = None,
+        input_symbols: Optional[Sequence[str]] = None,
+    ) -> Optional[CompiledFormula]:
+        """Solve and lambdify a formula, reusing the cached result.
 
         Args:
-            expr: SymPy expression to evaluate.
-            variables: Mapping of symbol name -> value.
+            formula: The Formula to compile.
+            target: Output symbol to solve for (default: first output).
+            input_symbols: Argument order for the callable (default: the
+                expression's free symbols, sorted by name).
 
         Returns:
-            Numeric result.
+            CompiledFormula, or None if the formula cannot be compiled.
+        """
+        expr_str = formula.sympy_expr or formula.symbolic_form
+        if not expr_str:
+            return None
+
+        order = tuple(input_symbols) if input_symbols is not None else None
+        key = (formula.id, _expression_hash(expr_str), target, order)
+        compiled = self._cache.get(key)
+        if compiled is not None:
+            self._cache.move_to_end(key)
+            return compiled
+        if key in self._failed:
+            return None
+
+        try:
+            compiled = self._compile(formula, expr_str, key[1], target, order)
+        except Exception as e:
+            compiled = None
+            self._failed[key] = str(e)
+        if compiled is None:
+            self._failed.setdefault(key, "no solution")
+            if len(self._failed) > self.cache_size:
+                self._failed.pop(next(iter(self._failed)))
+            return None
+
+        self._cache[key] = compiled
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return compiled
+
+    def invalidate(self, formula_id: Optional[str] = None) -> int:
+        """Drop cached compilations for one formula (or all).
+
+        Returns:
+            Number of cache entries removed.
+        """
+        if formula_id is None:
+            removed = len(self._cache)
+            self._cache.clear()
+            self._failed.clear()
+            return removed
+
+        stale = [k for k in self._cache if k[0] == formula_id]
+        for k in stale:
+            del self._cache[k]
+        for k in [k for k in self._failed if k[0] == formula_id]:
+            del self._failed[k]
+        return len(stale)
+
+    def bind_graph(self, graph: Any) -> None:
+        """Invalidate cached compilations when formulas in graph change."""
+
+        def on_change(change: Any) -> None:
+            if change.op == "reset":
+                self.invalidate()
+            elif change.op in ("update_formula", "remove_formula"):
+                self.invalidate(change.formula_id)
+
+        graph.on_change(on_change)
+
+    def cache_info(self) -> Dict[str, int]:
+        return {"size": len(self._cache), "failed": len(self._failed), "max_size": self.cache_size}
+
+    def _compile(
+        self,
+        formula: Formula,
+        expr_str: str,
+        expr_hash: str,
+        target: Optional[str],
+        order: Optional[Tuple[str, ...]],
+    ) -> Optional[CompiledFormula]:
+        expr = sp.sympify(expr_str)
+
+        if isinstance(expr, sp.Equality):
+            outputs: List[str] = (
+                [v.symbol for v in formula.outputs] or [str(s) for s in expr.free_symbols]
+            )
+            target = target or outputs[0]
+            solution = sp.solve(sp.Eq(expr.lhs, expr.rhs), sp.Symbol(target))
+            if not solution:
+                return None
+            solved = solution[0]
+        else:
+            outputs = [v.symbol for v in formula.outputs]
+            if not outputs:
+                return None
+            target = target or outputs[0]
+            solved = expr
+
+        if order is None:
+            order = tuple(sorted(str(s) for s in solved.free_symbols))
+        args = [sp.Symbol(name) for name in order]
+
+        modules = ["numpy", "math"]
+        try:
+            func = sp.lambdify(args, solved, modules=modules, cse=self.use_cse)
+        except TypeError:
+            # SymPy < 1.9 has no cse argument
+            func = sp.lambdify(args, solved, modules=modules)
+
+        return CompiledFormula(
+            formula_id=formula.id,
+            expr_hash=expr_hash,
+            target=target,
+            input_symbols=order,
+            expr=solved,
+            func=func,
+        )
+
+    @staticmethod
+    def _arguments(compiled: CompiledFormula, variables: Dict[str, Any]) -> List[Any]:
+        """Positional arguments for a compiled formula.
 
         Raises:
             ValueError: If required variables are missing.
         """
-        symbols = list(expr.free_symbols)
-        subs = {sp.Symbol(k): v for k, v in variables.items() if sp.Symbol(k) in symbols}
-        missing = [s for s in symbols if s not in subs]
+        missing = [s for s in compiled.input_symbols if s not in variables]
         if missing:
             raise ValueError(f"Missing variables for evaluation: {missing}")
-
-        func = sp.lambdify(list(subs.keys()), expr, modules=["numpy", "math"])
-        args = [subs[s] for s in subs]
-        return func(*args)
+        return [variables[s] for s in compiled.input_symbols]
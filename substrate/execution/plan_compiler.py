@@ -0,0 +1,187 @@
+# PATH: substrate/execution/plan_compiler.py
+# PURPOSE:
+#   - Fuse a multi-step DerivationPlan into one vectorized NumPy function
+# ROLE IN ARCHITECTURE:
+#   - Sits between FormulaPlanner (produces plans) and FormulaExecutor
+#     (compiles single formulas); inlines each step's solved expression
+#     into the next so a whole plan runs as one array computation
+# MAIN EXPORTS:
+#   - PlanCompiler: compiles and caches fused plans
+#   - CompiledPlan: fused callable mapping known inputs to all targets
+# NON-RESPONSIBILITIES:
+#   - Does NOT plan derivations or validate regimes
+#   - Does NOT record reasoning traces (use per-step execution for that)
+# NOTES FOR FUTURE AI:
+#   - Steps are inlined in plan order using the same solve-for-first-output
+#     semantics as FormulaExecutor.evaluate_formula
+#   - Cache key includes each step's expression hash, so edited formulas
+#     recompile without explicit invalidation
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+import sympy as sp
+
+from substrate.execution.executor import FormulaExecutor, _expression_hash
+from substrate.graph.formula_graph import FormulaGraph
+
+if TYPE_CHECKING:
+    from substrate.planner.formula_planner import DerivationPlan
+
+
+@dataclass
+class CompiledPlan:
+    """A derivation plan fused into a single lambdified function.
+
+    Calling it with column arrays (or scalars) for the input symbols returns
+    a dict of target symbol -> array with the broadcast input shape.
+    """
+
+    signature: Tuple
+    input_symbols: Tuple[str, ...]
+    targets: Tuple[str, ...]
+    exprs: Dict[str, sp.Expr]
+    func: Callable[..., Any]
+
+    def __call__(self, columns: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        missing = [s for s in self.input_symbols if s not in columns]
+        if missing:
+            raise ValueError(f"Missing variables for evaluation: {missing}")
+        args = [np.asarray(columns[s]) for s in self.input_symbols]
+        shape = np.broadcast_shapes(*(a.shape for a in args)) if args else ()
+        values = self.func(*args)
+        result = {}
+        for target, value in zip(self.targets, values):
+            value = np.asarray(value)
+            if value.shape != shape:
+                value = np.broadcast_to(value, shape).copy()
+            result[target] = value
+        return result
+
+
+@dataclass
+class PlanCompiler:
+    """Compiles DerivationPlans into fused NumPy functions, cached per signature.
+
+    A plan signature is the ordered (formula id, expression hash) of its
+    steps plus the sorted input symbols and the targets.
+    """
+
+    graph: FormulaGraph
+    executor: FormulaExecutor = field(default_factory=FormulaExecutor)
+    cache_size: int = 128
+    use_cse: bool = True
+    _cache: "OrderedDict[Tuple, CompiledPlan]" = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+
+    def compile(self, plan: DerivationPlan, include_steps: bool = False) -> CompiledPlan:
+        """Fuse a plan into one function of its inputs.
+
+        Args:
+            plan: The plan to fuse.
+            include_steps: Also return every step's output symbol (after the
+                plan outputs), e.g. to report intermediate values.
+
+        Raises:
+            ValueError: If a formula is missing, cannot be solved, or the
+                plan does not produce all requested outputs.
+        """
+        steps = sorted(plan.steps, key=lambda s: s.order)
+        formulas = []
+        for step in steps:
+            formula = self.graph.get_formula(step.formula_id)
+            if formula is None:
+                raise ValueError(f"Formula not found: {step.formula_id}")
+            formulas.append(formula)
+
+        input_symbols = tuple(sorted(plan.problem_inputs))
+        targets = tuple(plan.problem_outputs)
+        if include_steps:
+            for formula in formulas:
+                step = self.executor.compile(formula)
+                if step is None:
+                    raise ValueError(f"Cannot compile formula: {formula.id}")
+                if step.target not in targets:
+                    targets += (step.target,)
+        signature = (
+            tuple(
+                (f.id, _expression_hash(f.sympy_expr or f.symbolic_form or ""))
+                for f in formulas
+            ),
+            input_symbols,
+            targets,
+        )
+
+        compiled = self._cache.get(signature)
+        if compiled is not None:
+            self._cache.move_to_end(signature)
+            return compiled
+
+        compiled = self._fuse(formulas, input_symbols, targets, signature)
+        self._cache[signature] = compiled
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return compiled
+
+    def evaluate(
+        self,
+        plan: DerivationPlan,
+        columns: Optional[Dict[str, Any]] = None,
+        include_steps: bool = False,
+    ) -> Dict[str, np.ndarray]:
+        """Evaluate a plan over column arrays (default: the plan's own inputs)."""
+        compiled = self.compile(plan, include_steps=include_steps)
+        return compiled(columns if columns is not None else plan.problem_inputs)
+
+    def invalidate(self) -> None:
+        self._cache.clear()
+
+    def _fuse(
+        self,
+        formulas: List[Any],
+        input_symbols: Tuple[str, ...],
+        targets: Tuple[str, ...],
+        signature: Tuple,
+    ) -> CompiledPlan:
+        # symbol name -> expression in terms of the plan inputs
+        env: Dict[str, sp.Expr] = {name: sp.Symbol(name) for name in input_symbols}
+
+        for formula in formulas:
+            step = self.executor.compile(formula)
+            if step is None:
+                raise ValueError(f"Cannot compile formula: {formula.id}")
+            unresolved = [s for s in step.input_symbols if s not in env]
+            if unresolved:
+                raise ValueError(
+                    f"Step {formula.id} needs {unresolved}, not produced earlier in the plan"
+                )
+            env[step.target] = step.expr.xreplace(
+                {sp.Symbol(s): env[s] for s in step.input_symbols}
+            )
+
+        missing = [t for t in targets if t not in env]
+        if missing:
+            raise ValueError(f"Plan does not produce outputs: {missing}")
+
+        exprs = {t: env[t] for t in targets}
+        args = [sp.Symbol(name) for name in input_symbols]
+        body = [exprs[t] for t in targets]
+        modules = ["numpy", "math"]
+        try:
+            func = sp.lambdify(args, body, modules=modules, cse=self.use_cse)
+        except TypeError:
+            # SymPy < 1.9 has no cse argument
+            func = sp.lambdify(args, body, modules=modules)
+
+        return CompiledPlan(
+            signature=signature,
+            input_symbols=input_symbols,
+            targets=targets,
+            exprs=exprs,
+            func=func,
+        )
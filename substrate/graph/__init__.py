@@ -6,7 +6,12 @@
 #   - Core data structures for representing physical laws and their relationships
 
 from substrate.graph.formula import Formula, FormulaStatus, FormulaLayer
-from substrate.graph.formula_graph import FormulaGraph, EdgeType
+from substrate.graph.formula_graph import FormulaGraph, EdgeType, GraphChange
+from substrate.graph.graph_store import GraphStore
+from substrate.graph.consistency import ConsistencyMonitor
 
-__all__ = ["Formula", "FormulaStatus", "FormulaLayer", "FormulaGraph", "EdgeType"]
+__all__ = [
+    "Formula", "FormulaStatus", "FormulaLayer",
+    "FormulaGraph", "EdgeType", "GraphChange", "GraphStore", "ConsistencyMonitor",
+]
 
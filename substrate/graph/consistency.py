@@ -0,0 +1,321 @@
+# PATH: substrate/graph/consistency.py
+# PURPOSE:
+#   - Incremental version of FormulaGraph.check_consistency()
+#   - Re-examines only formulas and edges touched since the last check
+#
+# ROLE IN ARCHITECTURE:
+#   - Subscribes to FormulaGraph change events; never mutates the graph
+#   - Used by EvolutionLoop so a cycle's consistency stage costs O(changes)
+#     instead of O(graph)
+#
+# MAIN EXPORTS:
+#   - ConsistencyMonitor: Cached consistency issues kept current from change events
+#
+# NON-RESPONSIBILITIES:
+#   - Does NOT define the invariants (same issue types and dicts as
+#     FormulaGraph.check_consistency)
+#   - Does NOT resolve issues (that's EvolutionLoop)
+#
+# NOTES FOR FUTURE AI:
+#   - Issues are cached per key: contradictions per contradicting pair
+#     (duplicate CONTRADICTS edges report once),
+#     orphans / low-confidence per formula, derivation cycles per
+#     "closing" edge (the edge whose addition closed the cycle)
+#   - A derivation edge u -> v closes a cycle iff u is reachable from v;
+#     that search only visits what v can reach over derivation edges
+#   - Removing an edge or formula drops the cycles through it and re-searches
+#     from their closing edges, so the graph has a cycle iff at least one is
+#     reported (the reported cycles may differ from a full DFS's)
+#   - Formulas mutated in place without going through the graph emit no
+#     event; check(full=True) rescans everything
+
+from __future__ import annotations
+from collections import Counter, defaultdict, deque
+from typing import Any, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+import threading
+
+from substrate.graph.formula import FormulaLayer, FormulaStatus
+
+if TYPE_CHECKING:
+    from substrate.graph.formula_graph import Edge, FormulaGraph, GraphChange
+
+
+def _derivation_types():
+    from substrate.graph.formula_graph import EdgeType
+    return {
+        EdgeType.DERIVES_FROM, EdgeType.SPECIAL_CASE_OF,
+        EdgeType.GENERALIZES, EdgeType.DEPENDS_ON,
+    }
+
+
+class ConsistencyMonitor:
+    """
+    Consistency issues of a FormulaGraph, maintained incrementally.
+
+    Example:
+        monitor = ConsistencyMonitor(graph)
+        issues = monitor.check()   # full scan on first call
+        graph.add_edge(...)
+        issues = monitor.check()   # only the new edge's neighbourhood
+    """
+
+    def __init__(self, graph: FormulaGraph):
+        from substrate.graph.formula_graph import EdgeType
+
+        self.graph = graph
+        self._contradicts = EdgeType.CONTRADICTS
+        self._derivation = _derivation_types()
+
+        self._lock = threading.Lock()
+        self._needs_full = True
+        self._dirty: Set[str] = set()
+        self._removed: Set[str] = set()
+        self._added_edges: List[Edge] = []
+        self._removed_edges: List[Edge] = []
+
+        # Cached issues
+        self._contradictions: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._cycles: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._orphans: Dict[str, Dict[str, Any]] = {}
+        self._low_confidence: Dict[str, Dict[str, Any]] = {}
+
+        # Undirected neighbour counts, so removing a formula (which drops its
+        # edges without per-edge events) can re-examine former neighbours
+        self._neighbors: Dict[str, Counter] = defaultdict(Counter)
+
+        self.last_checked_version = -1
+        self.last_examined = 0
+
+        graph.on_change(self._on_change)
+
+    def close(self):
+        """Stop listening to the graph."""
+        self.graph.remove_change_callback(self._on_change)
+
+    def _on_change(self, change: GraphChange):
+        with self._lock:
+            if change.op == "reset":
+                self._needs_full = True
+            elif change.op == "remove_formula":
+                self._removed.add(change.formula_id)
+                self._dirty.discard(change.formula_id)
+            elif change.op in ("add_edge", "remove_edge"):
+                edges = self._added_edges if change.op == "add_edge" else self._removed_edges
+                edges.append(change.edge)
+            elif change.formula_id:
+                self._dirty.add(change.formula_id)
+
+    # =========================================================================
+    # Checking
+    # =========================================================================
+
+    def check(self, full: bool = False) -> List[Dict[str, Any]]:
+        """
+        Current consistency issues, in check_consistency() order.
+
+        Args:
+            full: Rescan the whole graph instead of applying pending changes
+        """
+        with self._lock:
+            full = full or self._needs_full
+            dirty, removed = self._dirty, self._removed
+            added, dropped = self._added_edges, self._removed_edges
+            self._needs_full = False
+            self._dirty, self._removed = set(), set()
+            self._added_edges, self._removed_edges = [], []
+
+        if full:
+            self._rebuild()
+        else:
+            self._apply(dirty, removed, added, dropped)
+        self.last_checked_version = self.graph.version
+
+        return (
+            list(self._contradictions.values())
+            + list(self._cycles.values())
+            + list(self._orphans.values())
+            + list(self._low_confidence.values())
+        )
+
+    def _rebuild(self):
+        graph = self.graph
+        self._contradictions.clear()
+        self._cycles.clear()
+        self._orphans.clear()
+        self._low_confidence.clear()
+        self._neighbors.clear()
+
+        for edge in graph._edges:
+            self._link(edge, 1)
+        for edge in graph._by_edge_type.get(self._contradicts, []):
+            self._check_contradiction(edge.source_id, edge.target_id)
+        for cycle in graph._find_cycles(self._derivation):
+            self._cycles[(cycle[-2], cycle[-1])] = self._cycle_issue(cycle)
+        for fid in graph._formulas:
+            self._check_formula(fid)
+        self.last_examined = len(graph._formulas) + len(graph._edges)
+
+    def _apply(
+        self,
+        dirty: Set[str],
+        removed: Set[str],
+        added: List[Edge],
+        dropped: List[Edge],
+    ):
+        graph = self.graph
+        recheck: Set[str] = set(dirty)
+        reopen: Set[Tuple[str, str]] = set()
+
+        for edge in dropped:
+            self._link(edge, -1)
+            recheck.update((edge.source_id, edge.target_id))
+            pair = (edge.source_id, edge.target_id)
+            if edge.edge_type == self._contradicts:
+                self._contradictions.pop(pair, None)
+                self._check_contradiction(*pair)
+            elif edge.edge_type in self._derivation and not self._has_derivation_edge(*pair):
+                reopen.update(self._drop_cycles(
+                    lambda nodes: any(step == pair for step in zip(nodes, nodes[1:]))
+                ))
+
+        for edge in added:
+            self._link(edge, 1)
+            recheck.update((edge.source_id, edge.target_id))
+            if edge.edge_type in self._derivation:
+                reopen.add((edge.source_id, edge.target_id))
+
+        for fid in removed:
+            neighbors = self._neighbors.pop(fid, Counter())
+            recheck.update(neighbors)
+            for neighbor in neighbors:
+                self._neighbors[neighbor].pop(fid, None)
+            if fid in graph._formulas:
+                # Removed and re-added within one batch: resync its neighbours
+                recheck.add(fid)
+                for edge in graph._outgoing.get(fid, []) + graph._incoming.get(fid, []):
+                    self._link(edge, 1)
+            self._orphans.pop(fid, None)
+            self._low_confidence.pop(fid, None)
+            for key in [k for k in self._contradictions if fid in k]:
+                del self._contradictions[key]
+            reopen.update(self._drop_cycles(lambda nodes: fid in nodes))
+
+        # Status / existence changes affect contradictions on incident edges
+        for fid in recheck:
+            for edge in graph._outgoing.get(fid, []) + graph._incoming.get(fid, []):
+                if edge.edge_type == self._contradicts:
+                    self._check_contradiction(edge.source_id, edge.target_id)
+            self._check_formula(fid)
+
+        for source_id, target_id in reopen:
+            self._close_cycle(source_id, target_id)
+
+        self.last_examined = len(recheck) + len(added) + len(dropped) + len(removed)
+
+    # =========================================================================
+    # Per-key checks (same rules as FormulaGraph.check_consistency)
+    # =========================================================================
+
+    def _link(self, edge: Edge, delta: int):
+        for a, b in ((edge.source_id, edge.target_id), (edge.target_id, edge.source_id)):
+            counts = self._neighbors[a]
+            counts[b] += delta
+            if counts[b] == 0:
+                del counts[b]
+
+    def _check_contradiction(self, source_id: str, target_id: str):
+        key = (source_id, target_id)
+        source = self.graph._formulas.get(source_id)
+        target = self.graph._formulas.get(target_id)
+        still_linked = any(
+            e.target_id == target_id and e.edge_type == self._contradicts
+            for e in self.graph._outgoing.get(source_id, [])
+        )
+        if (
+            still_linked and source and target
+            and source.status == FormulaStatus.ACCEPTED
+            and target.status == FormulaStatus.ACCEPTED
+        ):
+            self._contradictions[key] = {
+                "type": "contradiction",
+                "severity": "high",
+                "message": f"Contradiction between accepted formulas: {source.name} and {target.name}",
+                "formula_ids": [source.id, target.id],
+            }
+        else:
+            self._contradictions.pop(key, None)
+
+    def _check_formula(self, fid: str):
+        formula = self.graph._formulas.get(fid)
+        if formula is None:
+            self._orphans.pop(fid, None)
+            self._low_confidence.pop(fid, None)
+            return
+
+        if (
+            not self.graph._outgoing.get(fid) and not self.graph._incoming.get(fid)
+            and formula.layer not in {FormulaLayer.AXIOM, FormulaLayer.FUNDAMENTAL}
+        ):
+            self._orphans[fid] = {
+                "type": "orphan",
+                "severity": "low",
+                "message": f"Formula {formula.name} has no connections",
+                "formula_ids": [fid],
+            }
+        else:
+            self._orphans.pop(fid, None)
+
+        if formula.status == FormulaStatus.ACCEPTED and formula.confidence < 0.5:
+            self._low_confidence[fid] = {
+                "type": "low_confidence_accepted",
+                "severity": "medium",
+                "message": f"Accepted formula {formula.name} has low confidence: {formula.confidence}",
+                "formula_ids": [fid],
+            }
+        else:
+            self._low_confidence.pop(fid, None)
+
+    @staticmethod
+    def _cycle_issue(cycle: List[str]) -> Dict[str, Any]:
+        return {
+            "type": "derivation_cycle",
+            "severity": "medium",
+            "message": f"Cycle in derivation graph: {' -> '.join(cycle)}",
+            "formula_ids": cycle,
+        }
+
+    def _has_derivation_edge(self, source_id: str, target_id: str) -> bool:
+        return any(
+            e.target_id == target_id and e.edge_type in self._derivation
+            for e in self.graph._outgoing.get(source_id, [])
+        )
+
+    def _drop_cycles(self, predicate) -> List[Tuple[str, str]]:
+        """Drop cached cycles whose node list matches; returns their closing edges."""
+        keys = [k for k, issue in self._cycles.items() if predicate(issue["formula_ids"])]
+        for key in keys:
+            del self._cycles[key]
+        return keys
+
+    def _close_cycle(self, source_id: str, target_id: str):
+        """Record a cycle closed by source -> target, if target reaches source."""
+        self._cycles.pop((source_id, target_id), None)
+        if not self._has_derivation_edge(source_id, target_id):
+            return
+
+        # BFS from target over derivation edges, looking for source
+        parent: Dict[str, Optional[str]] = {target_id: None}
+        frontier = deque([target_id])
+        while frontier:
+            node = frontier.popleft()
+            if node == source_id:
+                path = [node]
+                while parent[path[-1]] is not None:
+                    path.append(parent[path[-1]])
+                path.reverse()  # target ... source
+                self._cycles[(source_id, target_id)] = self._cycle_issue([source_id] + path)
+                return
+            for edge in self.graph._outgoing.get(node, []):
+                if edge.edge_type in self._derivation and edge.target_id not in parent:
+                    parent[edge.target_id] = node
+                    frontier.append(edge.target_id)
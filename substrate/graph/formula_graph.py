@@ -13,7 +13,8 @@
 #
 # NON-RESPONSIBILITIES:
 #   - Does NOT plan derivation paths (that's FormulaPlanner)
-#   - Does NOT handle persistence (uses simple JSON for now)
+#   - Does NOT implement the binary store (that's GraphStore); it only
+#     emits GraphChange events that a store can append to its log
 #
 # NOTES FOR FUTURE AI:
 #   - This is the "fabric of reality" - treat it with respect
@@ -28,12 +29,27 @@ from datetime import datetime
 import json
 import os
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 
 from substrate.graph.formula import (
     Formula, FormulaStatus, FormulaLayer, 
     Variable, RegimeOfValidity, Evidence
 )
+from substrate.graph.path_search import (
+    EDGE_WEIGHTS, EdgeWeight, RankedPath, SearchBudget,
+    bidirectional_bfs, yen_k_shortest_paths,
+)
+from utilities.text_search import TextIndex
+
+# Term-frequency boosts for formula search fields
+SEARCH_FIELD_WEIGHTS = {
+    "name": 3.0,
+    "tags": 2.0,
+    "symbols": 2.0,
+    "domain": 1.5,
+    "description": 1.0,
+    "symbolic_form": 1.0,
+}
 
 
 class EdgeType(Enum):
@@ -103,6 +119,23 @@ class Edge:
         return cls(**d)
 
 
+@dataclass
+class GraphChange:
+    """
+    A single mutation of the graph, emitted to change listeners.
+    
+    op is one of: add_formula, update_formula, remove_formula, set_status,
+    add_edge, remove_edge, or reset (whole graph replaced, e.g. by load()).
+    version is the graph version after the change.
+    """
+    op: str
+    version: int
+    formula_id: Optional[str] = None
+    formula: Optional[Formula] = None
+    edge: Optional[Edge] = None
+    status: Optional[FormulaStatus] = None
+
+
 class FormulaGraph:
     """
     The Formula Graph - the reality substrate of Beyond Frontier.
@@ -114,17 +147,21 @@ class FormulaGraph:
     Key operations:
     - add_formula / remove_formula: Modify nodes
     - add_edge / remove_edge: Modify relationships
-    - find_paths: Find derivation chains between formulas
+    - find_paths / shortest_path / k_shortest_paths: Bounded, ranked
+      derivation chains between formulas (cached per graph version)
     - query: Find formulas matching criteria
     - check_consistency: Validate graph invariants
     """
     
-    def __init__(self, persist_path: Optional[str] = None):
+    def __init__(self, persist_path: Optional[str] = None, store_path: Optional[str] = None):
         """
         Initialize the formula graph.
         
         Args:
             persist_path: Path to JSON file for persistence (optional)
+            store_path: Directory of an append-only GraphStore (optional).
+                When given, the graph is loaded from the store and every
+                mutation is appended to its write-ahead log.
         """
         self._formulas: Dict[str, Formula] = {}
         self._edges: List[Edge] = []
@@ -140,10 +177,58 @@ class FormulaGraph:
         self._incoming: Dict[str, List[Edge]] = defaultdict(list)
         self._by_edge_type: Dict[EdgeType, List[Edge]] = defaultdict(list)
         
+        # Index keys each formula was filed under; formulas are often mutated
+        # in place before add_formula(overwrite=True), so removal must not
+        # rely on the formula's current attributes.
+        self._indexed_keys: Dict[str, Tuple[str, frozenset, FormulaStatus, FormulaLayer]] = {}
+        
+        # Full-text search index (built lazily on first search)
+        self._search_index: Optional[TextIndex] = None
+        
+        # Mutation tracking: monotonically increasing version + listeners
+        self._version = 0
+        self._change_callbacks: List[Callable[[GraphChange], None]] = []
+        
+        # Path query cache, valid for a single graph version
+        self._path_cache: OrderedDict = OrderedDict()
+        self._path_cache_version = 0
+        self._path_cache_size = 256
+        
         # Persistence
         self._persist_path = persist_path
+        self._store = None
         if persist_path and os.path.exists(persist_path):
             self.load(persist_path)
+        if store_path:
+            from substrate.graph.graph_store import GraphStore
+            self.attach_store(GraphStore(store_path))
+    
+    # =========================================================================
+    # Change tracking
+    # =========================================================================
+    
+    @property
+    def version(self) -> int:
+        """Graph version; incremented on every mutation."""
+        return self._version
+    
+    def on_change(self, callback: Callable[[GraphChange], None]) -> None:
+        """Register a callback invoked after every graph mutation."""
+        self._change_callbacks.append(callback)
+    
+    def remove_change_callback(self, callback: Callable[[GraphChange], None]) -> None:
+        """Unregister a change callback."""
+        if callback in self._change_callbacks:
+            self._change_callbacks.remove(callback)
+    
+    def _emit(self, op: str, **kwargs) -> None:
+        """Bump the version and notify listeners."""
+        self._version += 1
+        if not self._change_callbacks:
+            return
+        change = GraphChange(op=op, version=self._version, **kwargs)
+        for callback in list(self._change_callbacks):
+            callback(change)
     
     # =========================================================================
     # Node operations
@@ -164,7 +249,8 @@ class FormulaGraph:
             return False
         
         # Remove from indices if overwriting
-        if formula.id in self._formulas:
+        existed = formula.id in self._formulas
+        if existed:
             self._remove_from_indices(self._formulas[formula.id])
         
         # Add formula
@@ -173,6 +259,11 @@ class FormulaGraph:
         # Update indices
         self._add_to_indices(formula)
         
+        self._emit(
+            "update_formula" if existed else "add_formula",
+            formula_id=formula.id,
+            formula=formula,
+        )
         return True
     
     def remove_formula(self, formula_id: str) -> Optional[Formula]:
@@ -196,8 +287,31 @@ class FormulaGraph:
                        if e.source_id != formula_id and e.target_id != formula_id]
         self._rebuild_edge_indices()
         
+        self._emit("remove_formula", formula_id=formula_id)
         return formula
     
+    def set_status(self, formula_id: str, status: FormulaStatus) -> bool:
+        """
+        Change a formula's lifecycle status.
+        
+        Cheaper than add_formula(overwrite=True) for the common evolution
+        case, and logged as a compact status change by GraphStore.
+        
+        Returns:
+            True if the formula exists
+        """
+        formula = self._formulas.get(formula_id)
+        if formula is None:
+            return False
+        
+        self._remove_from_indices(formula)
+        formula.status = status
+        formula.modified_at = datetime.now()
+        self._add_to_indices(formula)
+        
+        self._emit("set_status", formula_id=formula_id, status=status)
+        return True
+    
     def get_formula(self, formula_id: str) -> Optional[Formula]:
         """Get a formula by ID."""
         return self._formulas.get(formula_id)
@@ -213,14 +327,38 @@ class FormulaGraph:
             self._by_tag[tag].add(formula.id)
         self._by_status[formula.status].add(formula.id)
         self._by_layer[formula.layer].add(formula.id)
+        self._indexed_keys[formula.id] = (
+            formula.domain, frozenset(formula.tags), formula.status, formula.layer
+        )
+        if self._search_index is not None:
+            self._search_index.add(formula.id, self._search_fields(formula))
     
     def _remove_from_indices(self, formula: Formula):
         """Remove formula from lookup indices."""
-        self._by_domain[formula.domain].discard(formula.id)
-        for tag in formula.tags:
+        domain, tags, status, layer = self._indexed_keys.pop(
+            formula.id,
+            (formula.domain, frozenset(formula.tags), formula.status, formula.layer),
+        )
+        self._by_domain[domain].discard(formula.id)
+        for tag in tags:
             self._by_tag[tag].discard(formula.id)
-        self._by_status[formula.status].discard(formula.id)
-        self._by_layer[formula.layer].discard(formula.id)
+        self._by_status[status].discard(formula.id)
+        self._by_layer[layer].discard(formula.id)
+        if self._search_index is not None:
+            self._search_index.remove(formula.id)
+    
+    @staticmethod
+    def _search_fields(formula: Formula) -> Dict[str, Any]:
+        """Searchable text fields of a formula."""
+        variables = formula.inputs + formula.outputs + formula.parameters
+        return {
+            "name": formula.name,
+            "description": formula.description,
+            "tags": formula.tags,
+            "domain": formula.domain,
+            "symbolic_form": [formula.symbolic_form, formula.sympy_expr or ""],
+            "symbols": [v.symbol for v in variables] + [v.name for v in variables],
+        }
     
     # =========================================================================
     # Edge operations
@@ -261,13 +399,17 @@ class FormulaGraph:
             created_by=created_by,
         )
         
-        self._edges.append(edge)
-        self._outgoing[source_id].append(edge)
-        self._incoming[target_id].append(edge)
-        self._by_edge_type[edge_type].append(edge)
-        
+        self._insert_edge(edge)
         return True
     
+    def _insert_edge(self, edge: Edge):
+        """Insert a fully built edge into the edge list and indices."""
+        self._edges.append(edge)
+        self._outgoing[edge.source_id].append(edge)
+        self._incoming[edge.target_id].append(edge)
+        self._by_edge_type[edge.edge_type].append(edge)
+        self._emit("add_edge", edge=edge)
+    
     def remove_edge(self, source_id: str, target_id: str, edge_type: EdgeType) -> bool:
         """Remove a specific edge."""
         for i, edge in enumerate(self._edges):
@@ -275,7 +417,10 @@ class FormulaGraph:
                 edge.target_id == target_id and 
                 edge.edge_type == edge_type):
                 self._edges.pop(i)
-                self._rebuild_edge_indices()
+                self._outgoing[source_id].remove(edge)
+                self._incoming[target_id].remove(edge)
+                self._by_edge_type[edge_type].remove(edge)
+                self._emit("remove_edge", edge=edge)
                 return True
         return False
     
@@ -376,6 +521,36 @@ class FormulaGraph:
         
         return results
     
+    def search(
+        self,
+        query: str,
+        domain: Optional[str] = None,
+        limit: int = 10,
+    ) -> List[Tuple[Formula, float]]:
+        """
+        Full-text search over formula names, descriptions, tags, domains,
+        symbolic forms and variable symbols, ranked by BM25.
+        
+        The index is built on first use and kept up to date incrementally
+        as formulas are added, overwritten or removed.
+        
+        Args:
+            query: Free text, LaTeX or symbol names
+            domain: Restrict to a domain
+            limit: Maximum results
+            
+        Returns:
+            List of (formula, score), best first
+        """
+        if self._search_index is None:
+            self._search_index = TextIndex(SEARCH_FIELD_WEIGHTS)
+            for formula in self._formulas.values():
+                self._search_index.add(formula.id, self._search_fields(formula))
+        
+        candidates = self._by_domain.get(domain, set()) if domain else None
+        hits = self._search_index.search(query, limit=limit, candidates=candidates)
+        return [(self._formulas[fid], score) for fid, score in hits]
+    
     def find_by_input_output(
         self,
         inputs: Optional[List[str]] = None,
@@ -416,62 +591,157 @@ class FormulaGraph:
     # Path finding
     # =========================================================================
     
-    def find_paths(
+    def shortest_path(
         self,
         start_id: str,
         end_id: str,
         max_depth: int = 10,
-        allowed_edge_types: Optional[Set[EdgeType]] = None
-    ) -> List[List[Tuple[str, EdgeType]]]:
+        allowed_edge_types: Optional[Set[EdgeType]] = None,
+        time_budget: Optional[float] = None,
+    ) -> Optional[RankedPath]:
         """
-        Find all paths from start formula to end formula.
+        Fewest-hops connection between two formulas (bidirectional BFS).
         
         Args:
             start_id: Starting formula ID
             end_id: Target formula ID
-            max_depth: Maximum path length
+            max_depth: Maximum path length in edges
             allowed_edge_types: Edge types to traverse (None = all)
+            time_budget: Wall-clock limit in seconds (None = unlimited)
             
         Returns:
-            List of paths, where each path is list of (formula_id, edge_type) tuples
+            RankedPath, or None if unreachable within the budget
         """
         if start_id not in self._formulas or end_id not in self._formulas:
-            return []
+            return None
         
-        paths = []
-        visited = set()
+        key = ("bfs", start_id, end_id, max_depth, self._edge_type_key(allowed_edge_types))
+        cached = self._path_cache_get(key)
+        if cached is not None:
+            return cached[0] if cached else None
         
-        def dfs(current_id: str, path: List[Tuple[str, EdgeType]], depth: int):
-            if depth > max_depth:
-                return
-            
-            if current_id == end_id:
-                paths.append(path.copy())
-                return
-            
-            if current_id in visited:
-                return
-            
-            visited.add(current_id)
-            
-            for edge in self._outgoing.get(current_id, []):
-                if allowed_edge_types and edge.edge_type not in allowed_edge_types:
-                    continue
-                path.append((edge.target_id, edge.edge_type))
-                dfs(edge.target_id, path, depth + 1)
-                path.pop()
+        budget = SearchBudget(max_depth=max_depth, time_budget=time_budget)
+        path = bidirectional_bfs(self, start_id, end_id, budget, allowed_edge_types)
+        if not budget.exhausted:
+            self._path_cache_put(key, [path] if path else [])
+        return path
+    
+    def k_shortest_paths(
+        self,
+        start_id: str,
+        end_id: str,
+        k: int = 5,
+        weight: Any = "hops",
+        max_depth: int = 10,
+        allowed_edge_types: Optional[Set[EdgeType]] = None,
+        time_budget: Optional[float] = None,
+    ) -> List[RankedPath]:
+        """
+        The k cheapest loopless paths between two formulas (Yen's algorithm).
+        
+        Args:
+            start_id: Starting formula ID
+            end_id: Target formula ID
+            k: Number of paths
+            weight: Name in EDGE_WEIGHTS ("hops", "confidence", "layer",
+                "cost") or a callable (graph, edge) -> non-negative float
+            max_depth: Maximum path length in edges
+            allowed_edge_types: Edge types to traverse (None = all)
+            time_budget: Wall-clock limit in seconds; on expiry the paths
+                found so far are returned (and not cached)
             
-            visited.remove(current_id)
+        Returns:
+            Paths ordered by cost, cheapest first
+        """
+        if start_id not in self._formulas or end_id not in self._formulas:
+            return []
         
-        dfs(start_id, [(start_id, None)], 0)
+        weight_fn: EdgeWeight = EDGE_WEIGHTS[weight] if isinstance(weight, str) else weight
+        key = None
+        if isinstance(weight, str):
+            key = ("yen", start_id, end_id, k, weight, max_depth,
+                   self._edge_type_key(allowed_edge_types))
+            cached = self._path_cache_get(key)
+            if cached is not None:
+                return list(cached)
+        
+        budget = SearchBudget(max_depth=max_depth, time_budget=time_budget)
+        paths = yen_k_shortest_paths(
+            self, start_id, end_id, k, weight_fn, budget, allowed_edge_types
+        )
+        if key is not None and not budget.exhausted:
+            self._path_cache_put(key, paths)
         return paths
     
+    def find_paths(
+        self,
+        start_id: str,
+        end_id: str,
+        max_depth: int = 10,
+        allowed_edge_types: Optional[Set[EdgeType]] = None,
+        max_paths: int = 20,
+        time_budget: Optional[float] = 1.0,
+    ) -> List[List[Tuple[str, EdgeType]]]:
+        """
+        Find paths from start formula to end formula, shortest first.
+        
+        Enumerating every simple path is exponential on dense graphs, so this
+        returns at most max_paths paths (k-shortest by hop count) and stops
+        when time_budget seconds have elapsed.
+        
+        Args:
+            start_id: Starting formula ID
+            end_id: Target formula ID
+            max_depth: Maximum path length
+            allowed_edge_types: Edge types to traverse (None = all)
+            max_paths: Maximum number of paths to return
+            time_budget: Wall-clock limit in seconds (None = unlimited)
+            
+        Returns:
+            List of paths, where each path is list of (formula_id, edge_type) tuples
+        """
+        if start_id == end_id and start_id in self._formulas:
+            return [[(start_id, None)]]
+        paths = self.k_shortest_paths(
+            start_id, end_id,
+            k=max_paths,
+            max_depth=max_depth,
+            allowed_edge_types=allowed_edge_types,
+            time_budget=time_budget,
+        )
+        return [p.to_legacy() for p in paths]
+    
+    @staticmethod
+    def _edge_type_key(edge_types: Optional[Set[EdgeType]]) -> Optional[frozenset]:
+        return frozenset(edge_types) if edge_types else None
+    
+    def _path_cache_get(self, key: Tuple) -> Optional[List[RankedPath]]:
+        """Cached result for key, or None; drops the cache if the graph changed."""
+        if self._path_cache_version != self._version:
+            self._path_cache.clear()
+            self._path_cache_version = self._version
+            return None
+        result = self._path_cache.get(key)
+        if result is not None:
+            self._path_cache.move_to_end(key)
+        return result
+    
+    def _path_cache_put(self, key: Tuple, result: List[RankedPath]):
+        if self._path_cache_version != self._version:
+            self._path_cache.clear()
+            self._path_cache_version = self._version
+        self._path_cache[key] = result
+        if len(self._path_cache) > self._path_cache_size:
+            self._path_cache.popitem(last=False)
+    
     def find_derivation_chain(
         self,
         inputs: Set[str],
         outputs: Set[str],
         context: Dict[str, Any],
-        max_chain_length: int = 10
+        max_chain_length: int = 10,
+        max_chains: int = 50,
+        time_budget: Optional[float] = 1.0,
     ) -> List[List[str]]:
         """
         Find chains of formulas that derive outputs from inputs.
@@ -483,11 +753,14 @@ class FormulaGraph:
             outputs: Required output variable symbols
             context: Context for applicability checking
             max_chain_length: Maximum number of formulas in chain
+            max_chains: Stop after this many chains
+            time_budget: Wall-clock limit in seconds (None = unlimited)
             
         Returns:
             List of formula ID chains, each chain derives outputs from inputs
         """
         chains = []
+        budget = SearchBudget(max_depth=max_chain_length, time_budget=time_budget)
         
         # Find formulas that provide each output
         output_providers: Dict[str, List[Formula]] = {}
@@ -504,7 +777,7 @@ class FormulaGraph:
             current_chain: List[str],
             depth: int
         ):
-            if depth > max_chain_length:
+            if depth > max_chain_length or len(chains) >= max_chains or budget.expired():
                 return
             
             if not needed_outputs:
@@ -636,8 +909,38 @@ class FormulaGraph:
     # Persistence
     # =========================================================================
     
+    def attach_store(self, store, compact: bool = False):
+        """
+        Persist this graph through an append-only GraphStore.
+        
+        If the store already holds data it is loaded into the graph (replacing
+        current contents); otherwise the current contents become its first
+        snapshot. From then on every mutation is appended to the store's log.
+        
+        Args:
+            store: A substrate.graph.graph_store.GraphStore
+            compact: Force an immediate snapshot after attaching
+        """
+        if store.exists():
+            store.load_into(self)
+        else:
+            compact = True
+        self._store = store
+        store.attach(self)
+        if compact:
+            store.compact(self)
+    
     def save(self, path: Optional[str] = None):
-        """Save graph to JSON file."""
+        """
+        Save the graph.
+        
+        With an attached GraphStore and no explicit path, this compacts the
+        write-ahead log into a fresh snapshot. Otherwise writes a JSON file.
+        """
+        if path is None and self._store is not None:
+            self._store.compact(self)
+            return
+        
         path = path or self._persist_path
         if not path:
             raise ValueError("No path specified for saving")
@@ -661,8 +964,7 @@ class FormulaGraph:
             data = json.load(f)
         
         # Clear current state
-        self._formulas.clear()
-        self._edges.clear()
+        self.clear()
         
         # Load formulas
         for f_dict in data.get("formulas", []):
@@ -676,6 +978,80 @@ class FormulaGraph:
             self._edges.append(edge)
         
         self._rebuild_edge_indices()
+        self._emit("reset")
+    
+    def _export_indexes(self) -> Dict[str, Any]:
+        """Secondary indexes in a serializable form (edges by list position)."""
+        position = {id(edge): i for i, edge in enumerate(self._edges)}
+        return {
+            "by_domain": {k: sorted(v) for k, v in self._by_domain.items() if v},
+            "by_tag": {k: sorted(v) for k, v in self._by_tag.items() if v},
+            "by_status": {k.name: sorted(v) for k, v in self._by_status.items() if v},
+            "by_layer": {k.name: sorted(v) for k, v in self._by_layer.items() if v},
+            "outgoing": {k: [position[id(e)] for e in v] for k, v in self._outgoing.items() if v},
+            "incoming": {k: [position[id(e)] for e in v] for k, v in self._incoming.items() if v},
+        }
+    
+    def _restore(
+        self,
+        formulas: List[Formula],
+        edges: List[Edge],
+        indexes: Optional[Dict[str, Any]],
+        version: int,
+    ):
+        """
+        Replace graph contents from a stored snapshot (not logged).
+        
+        Secondary indexes are taken from the snapshot when present instead
+        of being recomputed formula by formula. Emits a reset; the version
+        becomes the snapshot's, or moves past the current one if that is
+        already higher, so version-keyed caches never see an old version.
+        """
+        self.clear()
+        self._formulas = {f.id: f for f in formulas}
+        self._edges = list(edges)
+        
+        if not indexes:
+            for formula in formulas:
+                self._add_to_indices(formula)
+            self._rebuild_edge_indices()
+        else:
+            self._by_domain = defaultdict(set, {k: set(v) for k, v in indexes["by_domain"].items()})
+            self._by_tag = defaultdict(set, {k: set(v) for k, v in indexes["by_tag"].items()})
+            self._by_status = defaultdict(
+                set, {FormulaStatus[k]: set(v) for k, v in indexes["by_status"].items()}
+            )
+            self._by_layer = defaultdict(
+                set, {FormulaLayer[k]: set(v) for k, v in indexes["by_layer"].items()}
+            )
+            self._indexed_keys = {
+                f.id: (f.domain, frozenset(f.tags), f.status, f.layer) for f in formulas
+            }
+            self._outgoing = defaultdict(
+                list, {k: [self._edges[i] for i in v] for k, v in indexes["outgoing"].items()}
+            )
+            self._incoming = defaultdict(
+                list, {k: [self._edges[i] for i in v] for k, v in indexes["incoming"].items()}
+            )
+            self._by_edge_type = defaultdict(list)
+            for edge in self._edges:
+                self._by_edge_type[edge.edge_type].append(edge)
+        
+        # The reset event bumps this to max(current + 1, version)
+        self._version = max(self._version, version - 1)
+        self._emit("reset")
+    
+    def clear(self):
+        """Remove all formulas, edges and index entries (not logged)."""
+        self._formulas.clear()
+        self._edges.clear()
+        self._indexed_keys.clear()
+        self._by_domain = defaultdict(set)
+        self._by_tag = defaultdict(set)
+        self._by_status = defaultdict(set)
+        self._by_layer = defaultdict(set)
+        self._search_index = None
+        self._rebuild_edge_indices()
     
     # =========================================================================
     # Statistics
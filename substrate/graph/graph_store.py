@@ -0,0 +1,391 @@
+# PATH: substrate/graph/graph_store.py
+# PURPOSE:
+#   - Append-only binary persistence for the FormulaGraph
+#   - Write-ahead log of mutations + periodically compacted snapshot
+#
+# ROLE IN ARCHITECTURE:
+#   - Storage backend behind FormulaGraph(store_path=...) / attach_store()
+#   - Subscribes to FormulaGraph change events; never mutates the graph
+#     except when loading
+#
+# MAIN EXPORTS:
+#   - GraphStore: WAL + snapshot store
+#
+# NON-RESPONSIBILITIES:
+#   - Does NOT define graph semantics (that's FormulaGraph)
+#   - Does NOT replace the JSON export used for backups
+#
+# NOTES FOR FUTURE AI:
+#   - Layout of a store directory:
+#       snapshot.bin  header | seq | crc32 | payload(formulas, edges, indexes)
+#       wal.log       header | record*  where record = len | crc32 | op | payload
+#   - Records carry the graph version (seq); on load, records with
+#     seq <= snapshot seq are skipped, so a crash between writing a snapshot
+#     and truncating the log is harmless
+#   - A torn or corrupt tail record is dropped and the log truncated there
+#   - Payloads use msgpack when installed, compact JSON otherwise; the codec
+#     is recorded in each file header
+
+from __future__ import annotations
+from typing import Any, Dict, Optional, Tuple, TYPE_CHECKING
+import json
+import os
+import struct
+import tempfile
+import threading
+import zlib
+
+from substrate.graph.formula import Formula, FormulaStatus
+
+if TYPE_CHECKING:
+    from substrate.graph.formula_graph import FormulaGraph, GraphChange
+
+try:
+    import msgpack
+    _HAS_MSGPACK = True
+except ImportError:
+    msgpack = None
+    _HAS_MSGPACK = False
+
+
+STORE_FORMAT_VERSION = 1
+
+CODEC_JSON = 0
+CODEC_MSGPACK = 1
+
+_WAL_MAGIC = b"FGWAL\x00"
+_SNAP_MAGIC = b"FGSNAP"
+_FILE_HEADER = struct.Struct("<6sBB")          # magic, format version, codec
+_SNAP_META = struct.Struct("<QI")              # seq, crc32
+_RECORD_HEADER = struct.Struct("<IIB")         # payload length, crc32, opcode
+
+OPCODES = {
+    "add_formula": 1,
+    "update_formula": 2,
+    "remove_formula": 3,
+    "set_status": 4,
+    "add_edge": 5,
+    "remove_edge": 6,
+}
+_OPNAMES = {code: name for name, code in OPCODES.items()}
+
+
+def _encode(obj: Any, codec: int) -> bytes:
+    if codec == CODEC_MSGPACK:
+        return msgpack.packb(obj, use_bin_type=True)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _decode(data: bytes, codec: int) -> Any:
+    if codec == CODEC_MSGPACK:
+        if not _HAS_MSGPACK:
+            raise RuntimeError("Graph store was written with msgpack; install msgpack to read it")
+        return msgpack.unpackb(data, raw=False)
+    return json.loads(data.decode("utf-8"))
+
+
+class GraphStore:
+    """
+    Write-ahead log + snapshot persistence for a FormulaGraph.
+
+    Every graph mutation is appended as one small binary record, so saving
+    cost is proportional to the change, not the graph. Every `compact_every`
+    records (or on FormulaGraph.save()) the log is folded into a snapshot
+    that also carries the secondary indexes, so loading restores them
+    instead of recomputing.
+
+    Example:
+        graph = FormulaGraph(store_path="data/formula_graph.store")
+        graph.add_formula(f)      # appended to wal.log
+        graph.save()              # compacts into snapshot.bin
+    """
+
+    SNAPSHOT_FILE = "snapshot.bin"
+    WAL_FILE = "wal.log"
+
+    def __init__(
+        self,
+        path: str,
+        compact_every: int = 1000,
+        fsync: bool = False,
+        codec: Optional[int] = None,
+    ):
+        """
+        Args:
+            path: Store directory
+            compact_every: Compact after this many logged records (0 = never)
+            fsync: fsync the log after every record (durable but slower);
+                snapshots are always fsynced
+            codec: CODEC_JSON or CODEC_MSGPACK (default: msgpack if installed)
+        """
+        self.path = path
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self.codec = codec if codec is not None else (CODEC_MSGPACK if _HAS_MSGPACK else CODEC_JSON)
+
+        self._lock = threading.RLock()
+        self._wal = None
+        self._graph: Optional[FormulaGraph] = None
+        self._records_since_compaction = 0
+        self._loading = False
+
+    @property
+    def snapshot_path(self) -> str:
+        return os.path.join(self.path, self.SNAPSHOT_FILE)
+
+    @property
+    def wal_path(self) -> str:
+        return os.path.join(self.path, self.WAL_FILE)
+
+    def exists(self) -> bool:
+        """True if the store holds a snapshot or a log."""
+        return os.path.exists(self.snapshot_path) or os.path.exists(self.wal_path)
+
+    # =========================================================================
+    # Attach / append
+    # =========================================================================
+
+    def attach(self, graph: FormulaGraph):
+        """Start logging the graph's mutations."""
+        self._graph = graph
+        graph.on_change(self.append)
+
+    def detach(self):
+        """Stop logging and close the log file."""
+        with self._lock:
+            if self._graph is not None:
+                self._graph.remove_change_callback(self.append)
+                self._graph = None
+            self._close_wal()
+
+    def append(self, change: GraphChange):
+        """Append one graph change to the write-ahead log."""
+        if self._loading:
+            return
+        if change.op == "reset":
+            # Whole graph replaced; a log of deltas no longer applies
+            if self._graph is not None:
+                self.compact(self._graph)
+            return
+
+        opcode = OPCODES.get(change.op)
+        if opcode is None:
+            return
+
+        payload = {"seq": change.version}
+        if change.formula_id is not None:
+            payload["id"] = change.formula_id
+        if change.formula is not None:
+            payload["formula"] = change.formula.to_dict()
+        if change.edge is not None:
+            payload["edge"] = change.edge.to_dict()
+        if change.status is not None:
+            payload["status"] = change.status.name
+
+        data = _encode(payload, self.codec)
+        record = _RECORD_HEADER.pack(len(data), zlib.crc32(data), opcode) + data
+
+        with self._lock:
+            wal = self._open_wal()
+            wal.write(record)
+            wal.flush()
+            if self.fsync:
+                os.fsync(wal.fileno())
+            self._records_since_compaction += 1
+            should_compact = (
+                self.compact_every > 0
+                and self._records_since_compaction >= self.compact_every
+                and self._graph is not None
+            )
+
+        if should_compact:
+            self.compact(self._graph)
+
+    def _open_wal(self):
+        if self._wal is None:
+            os.makedirs(self.path, exist_ok=True)
+            new = not os.path.exists(self.wal_path) or os.path.getsize(self.wal_path) == 0
+            self._wal = open(self.wal_path, "ab")
+            if new:
+                self._wal.write(_FILE_HEADER.pack(_WAL_MAGIC, STORE_FORMAT_VERSION, self.codec))
+                self._wal.flush()
+            else:
+                self.codec = self._read_wal_codec()
+        return self._wal
+
+    def _read_wal_codec(self) -> int:
+        with open(self.wal_path, "rb") as f:
+            header = f.read(_FILE_HEADER.size)
+        magic, _version, codec = _FILE_HEADER.unpack(header)
+        if magic != _WAL_MAGIC:
+            raise ValueError(f"Not a graph store log: {self.wal_path}")
+        return codec
+
+    def _close_wal(self):
+        if self._wal is not None:
+            self._wal.close()
+            self._wal = None
+
+    # =========================================================================
+    # Compaction
+    # =========================================================================
+
+    def compact(self, graph: FormulaGraph):
+        """
+        Fold the log into a fresh snapshot of the graph.
+
+        The snapshot is written to a temp file, fsynced and atomically
+        renamed over the old one; only then is the log reset.
+        """
+        with self._lock:
+            payload = {
+                "formulas": [f.to_dict() for f in graph._formulas.values()],
+                "edges": [e.to_dict() for e in graph._edges],
+                "indexes": graph._export_indexes(),
+            }
+            data = _encode(payload, self.codec)
+            header = _FILE_HEADER.pack(_SNAP_MAGIC, STORE_FORMAT_VERSION, self.codec)
+            meta = _SNAP_META.pack(graph.version, zlib.crc32(data))
+
+            os.makedirs(self.path, exist_ok=True)
+            self._atomic_write(self.snapshot_path, header + meta + data)
+
+            # Reset the log (also atomically, so it is never half-truncated)
+            self._close_wal()
+            self._atomic_write(
+                self.wal_path,
+                _FILE_HEADER.pack(_WAL_MAGIC, STORE_FORMAT_VERSION, self.codec),
+            )
+            self._records_since_compaction = 0
+
+    def _atomic_write(self, path: str, data: bytes):
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", dir=self.path)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    # =========================================================================
+    # Loading
+    # =========================================================================
+
+    def load_into(self, graph: FormulaGraph) -> Dict[str, int]:
+        """
+        Replace the graph's contents with the stored state.
+
+        Restores formulas, edges and secondary indexes from the snapshot,
+        then replays newer log records.
+
+        Returns:
+            Stats dict: snapshot_seq, replayed, dropped_bytes
+        """
+        with self._lock:
+            self._loading = True
+            try:
+                snapshot_seq = self._load_snapshot(graph)
+                replayed, dropped = self._replay_wal(graph, snapshot_seq)
+            finally:
+                self._loading = False
+            return {"snapshot_seq": snapshot_seq, "replayed": replayed, "dropped_bytes": dropped}
+
+    def _load_snapshot(self, graph: FormulaGraph) -> int:
+        from substrate.graph.formula_graph import Edge
+
+        if not os.path.exists(self.snapshot_path):
+            graph._restore([], [], None, version=0)
+            return 0
+
+        with open(self.snapshot_path, "rb") as f:
+            raw = f.read()
+
+        magic, _version, codec = _FILE_HEADER.unpack_from(raw, 0)
+        if magic != _SNAP_MAGIC:
+            raise ValueError(f"Not a graph store snapshot: {self.snapshot_path}")
+        seq, crc = _SNAP_META.unpack_from(raw, _FILE_HEADER.size)
+        data = raw[_FILE_HEADER.size + _SNAP_META.size:]
+        if zlib.crc32(data) != crc:
+            raise ValueError(f"Corrupt graph store snapshot: {self.snapshot_path}")
+
+        payload = _decode(data, codec)
+        formulas = [Formula.from_dict(d) for d in payload.get("formulas", [])]
+        edges = [Edge.from_dict(d) for d in payload.get("edges", [])]
+        graph._restore(formulas, edges, payload.get("indexes"), version=seq)
+        return seq
+
+    def _replay_wal(self, graph: FormulaGraph, after_seq: int) -> Tuple[int, int]:
+        """Apply log records newer than after_seq; truncate a torn tail."""
+        if not os.path.exists(self.wal_path):
+            return 0, 0
+
+        with open(self.wal_path, "rb") as f:
+            raw = f.read()
+        if len(raw) < _FILE_HEADER.size:
+            return 0, len(raw)
+
+        magic, _version, codec = _FILE_HEADER.unpack_from(raw, 0)
+        if magic != _WAL_MAGIC:
+            raise ValueError(f"Not a graph store log: {self.wal_path}")
+        self.codec = codec
+
+        offset = _FILE_HEADER.size
+        replayed = 0
+        last_seq = after_seq
+        while offset + _RECORD_HEADER.size <= len(raw):
+            length, crc, opcode = _RECORD_HEADER.unpack_from(raw, offset)
+            start = offset + _RECORD_HEADER.size
+            data = raw[start:start + length]
+            if len(data) < length or zlib.crc32(data) != crc or opcode not in _OPNAMES:
+                break
+
+            payload = _decode(data, codec)
+            seq = payload.get("seq", 0)
+            if seq > after_seq:
+                self._apply(graph, _OPNAMES[opcode], payload)
+                replayed += 1
+                last_seq = max(last_seq, seq)
+            offset = start + length
+
+        dropped = len(raw) - offset
+        if dropped:
+            # Torn write from a crash: cut the log back to the last good record
+            with open(self.wal_path, "r+b") as f:
+                f.truncate(offset)
+
+        graph._version = max(graph._version, last_seq)
+        self._records_since_compaction = replayed
+        return replayed, dropped
+
+    @staticmethod
+    def _apply(graph: FormulaGraph, op: str, payload: Dict[str, Any]):
+        from substrate.graph.formula_graph import Edge
+
+        if op in ("add_formula", "update_formula"):
+            graph.add_formula(Formula.from_dict(payload["formula"]), overwrite=True)
+        elif op == "remove_formula":
+            graph.remove_formula(payload["id"])
+        elif op == "set_status":
+            graph.set_status(payload["id"], FormulaStatus[payload["status"]])
+        elif op == "add_edge":
+            edge = Edge.from_dict(payload["edge"])
+            if edge.source_id in graph and edge.target_id in graph:
+                graph._insert_edge(edge)
+        elif op == "remove_edge":
+            edge = Edge.from_dict(payload["edge"])
+            graph.remove_edge(edge.source_id, edge.target_id, edge.edge_type)
+
+    def stats(self) -> Dict[str, Any]:
+        """Sizes of the on-disk files."""
+        def size(p: str) -> int:
+            return os.path.getsize(p) if os.path.exists(p) else 0
+        return {
+            "snapshot_bytes": size(self.snapshot_path),
+            "wal_bytes": size(self.wal_path),
+            "records_since_compaction": self._records_since_compaction,
+            "codec": "msgpack" if self.codec == CODEC_MSGPACK else "json",
+        }
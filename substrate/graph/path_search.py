@@ -0,0 +1,347 @@
+# PATH: substrate/graph/path_search.py
+# PURPOSE:
+#   - Bounded, ranked path search over the FormulaGraph
+#   - Bidirectional BFS for shortest connections, Dijkstra for weighted
+#     shortest paths, Yen's algorithm for k-shortest loopless paths
+#
+# ROLE IN ARCHITECTURE:
+#   - Algorithms behind FormulaGraph.shortest_path / k_shortest_paths /
+#     find_paths; operate on any object exposing get_edges_from/get_edges_to
+#
+# MAIN EXPORTS:
+#   - RankedPath: A path (list of edges) with its total cost
+#   - SearchBudget: Depth + wall-clock budget with early termination
+#   - EDGE_WEIGHTS: Named edge-weight functions
+#   - bidirectional_bfs, dijkstra, yen_k_shortest_paths
+#
+# NON-RESPONSIBILITIES:
+#   - Does NOT cache results (FormulaGraph owns the version-keyed cache)
+#
+# NOTES FOR FUTURE AI:
+#   - Every search respects max_depth (edges per path) and an optional
+#     time budget; on timeout the best results found so far are returned
+#     and budget.exhausted is set
+#   - Weights must be non-negative; use -log(p) for probabilities
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+import heapq
+import itertools
+import math
+import time
+
+from substrate.graph.formula import FormulaLayer
+
+if TYPE_CHECKING:
+    from substrate.graph.formula_graph import Edge, EdgeType, FormulaGraph
+
+
+EdgeWeight = Callable[["FormulaGraph", "Edge"], float]
+
+
+def _hop_weight(graph: FormulaGraph, edge: Edge) -> float:
+    return 1.0
+
+
+def _confidence_weight(graph: FormulaGraph, edge: Edge) -> float:
+    """-log of edge confidence times target formula confidence."""
+    target = graph.get_formula(edge.target_id)
+    p = edge.confidence * (target.confidence if target else 1.0)
+    return -math.log(max(p, 1e-9))
+
+
+_LAYER_COST = {
+    FormulaLayer.AXIOM: 0.5,
+    FormulaLayer.FUNDAMENTAL: 1.0,
+    FormulaLayer.EFFECTIVE: 1.5,
+    FormulaLayer.PHENOMENOLOGICAL: 2.0,
+    FormulaLayer.APPROXIMATION: 2.5,
+    FormulaLayer.NUMERICAL: 3.0,
+}
+
+
+def _layer_weight(graph: FormulaGraph, edge: Edge) -> float:
+    """Prefer chains through more fundamental formulas."""
+    target = graph.get_formula(edge.target_id)
+    return _LAYER_COST.get(target.layer, 1.0) if target else 1.0
+
+
+def _cost_weight(graph: FormulaGraph, edge: Edge) -> float:
+    """Explicit evaluation cost from edge metadata (default 1)."""
+    return float(edge.metadata.get("cost", 1.0))
+
+
+EDGE_WEIGHTS: Dict[str, EdgeWeight] = {
+    "hops": _hop_weight,
+    "confidence": _confidence_weight,
+    "layer": _layer_weight,
+    "cost": _cost_weight,
+}
+
+
+@dataclass
+class SearchBudget:
+    """Depth and wall-clock limits for a path search."""
+    max_depth: int = 10
+    time_budget: Optional[float] = None  # seconds
+    exhausted: bool = False
+    _deadline: Optional[float] = field(default=None, repr=False)
+
+    def __post_init__(self):
+        if self.time_budget is not None:
+            self._deadline = time.monotonic() + self.time_budget
+
+    def expired(self) -> bool:
+        """True once the time budget is spent (sticky)."""
+        if not self.exhausted and self._deadline is not None and time.monotonic() > self._deadline:
+            self.exhausted = True
+        return self.exhausted
+
+
+@dataclass
+class RankedPath:
+    """A path through the graph as a list of edges, with its total cost."""
+    start_id: str
+    edges: List[Edge]
+    cost: float
+
+    @property
+    def node_ids(self) -> List[str]:
+        return [self.start_id] + [e.target_id for e in self.edges]
+
+    def to_legacy(self) -> List[Tuple[str, Optional[EdgeType]]]:
+        """The (formula_id, edge_type) format returned by find_paths."""
+        return [(self.start_id, None)] + [(e.target_id, e.edge_type) for e in self.edges]
+
+    def to_dict(self) -> Dict:
+        return {
+            "nodes": self.node_ids,
+            "edge_types": [e.edge_type.name for e in self.edges],
+            "cost": self.cost,
+        }
+
+
+def _allowed(edge: Edge, edge_types: Optional[Set[EdgeType]]) -> bool:
+    return not edge_types or edge.edge_type in edge_types
+
+
+def bidirectional_bfs(
+    graph: FormulaGraph,
+    start_id: str,
+    end_id: str,
+    budget: SearchBudget,
+    edge_types: Optional[Set[EdgeType]] = None,
+) -> Optional[RankedPath]:
+    """
+    Fewest-hops path from start to end, searching from both ends.
+
+    Expands the smaller frontier each round, so the explored region is
+    roughly 2·b^(d/2) instead of b^d.
+    """
+    if start_id == end_id:
+        return RankedPath(start_id, [], 0.0)
+
+    # node -> edge used to reach it (None for the roots)
+    fwd_parent: Dict[str, Optional[Edge]] = {start_id: None}
+    bwd_parent: Dict[str, Optional[Edge]] = {end_id: None}
+    fwd_frontier = [start_id]
+    bwd_frontier = [end_id]
+    fwd_depth = bwd_depth = 0
+
+    while fwd_frontier and bwd_frontier and fwd_depth + bwd_depth < budget.max_depth:
+        if budget.expired():
+            return None
+
+        expand_forward = len(fwd_frontier) <= len(bwd_frontier)
+        next_frontier: List[str] = []
+        meet: Optional[str] = None
+
+        if expand_forward:
+            for node in fwd_frontier:
+                for edge in graph.get_edges_from(node):
+                    if not _allowed(edge, edge_types) or edge.target_id in fwd_parent:
+                        continue
+                    fwd_parent[edge.target_id] = edge
+                    next_frontier.append(edge.target_id)
+                    if edge.target_id in bwd_parent:
+                        meet = edge.target_id
+                        break
+                if meet:
+                    break
+            fwd_frontier = next_frontier
+            fwd_depth += 1
+        else:
+            for node in bwd_frontier:
+                for edge in graph.get_edges_to(node):
+                    if not _allowed(edge, edge_types) or edge.source_id in bwd_parent:
+                        continue
+                    bwd_parent[edge.source_id] = edge
+                    next_frontier.append(edge.source_id)
+                    if edge.source_id in fwd_parent:
+                        meet = edge.source_id
+                        break
+                if meet:
+                    break
+            bwd_frontier = next_frontier
+            bwd_depth += 1
+
+        if meet is not None:
+            edges: List[Edge] = []
+            node = meet
+            while fwd_parent[node] is not None:
+                edge = fwd_parent[node]
+                edges.append(edge)
+                node = edge.source_id
+            edges.reverse()
+            node = meet
+            while bwd_parent[node] is not None:
+                edge = bwd_parent[node]
+                edges.append(edge)
+                node = edge.target_id
+            return RankedPath(start_id, edges, float(len(edges)))
+
+    return None
+
+
+def dijkstra(
+    graph: FormulaGraph,
+    start_id: str,
+    end_id: str,
+    weight: EdgeWeight,
+    budget: SearchBudget,
+    edge_types: Optional[Set[EdgeType]] = None,
+    blocked_nodes: Optional[Set[str]] = None,
+    blocked_edges: Optional[Set[int]] = None,
+    depth_offset: int = 0,
+) -> Optional[RankedPath]:
+    """
+    Cheapest path under `weight`, with at most budget.max_depth edges.
+
+    Searches over (node, hops) states, so a cheaper route that spends too
+    many hops cannot hide a costlier one that fits the limit. States of a
+    node pop in order of cost; a later state is kept only if it used fewer
+    hops than every earlier one, so the result is the cheapest path within
+    the hop limit.
+
+    Args:
+        blocked_nodes: Nodes that may not be entered (Yen's root path)
+        blocked_edges: id()s of edges that may not be used (Yen's spur)
+        depth_offset: Edges already used before start (Yen's root length)
+    """
+    blocked_nodes = blocked_nodes or set()
+    blocked_edges = blocked_edges or set()
+    max_hops = budget.max_depth - depth_offset
+    if max_hops < 0:
+        return None
+
+    counter = itertools.count()
+    best: Dict[Tuple[str, int], float] = {(start_id, 0): 0.0}
+    parent: Dict[Tuple[str, int], Edge] = {}
+    best_hops: Dict[str, int] = {}
+    heap: List[Tuple[float, int, str, int]] = [(0.0, next(counter), start_id, 0)]
+
+    while heap:
+        if budget.expired():
+            return None
+        cost, _, node, hops = heapq.heappop(heap)
+        if cost > best[(node, hops)]:
+            continue  # stale heap entry
+        if hops >= best_hops.get(node, max_hops + 1):
+            continue  # dominated: cheaper and no longer
+        best_hops[node] = hops
+
+        if node == end_id:
+            edges: List[Edge] = []
+            while hops:
+                edge = parent[(node, hops)]
+                edges.append(edge)
+                node, hops = edge.source_id, hops - 1
+            edges.reverse()
+            return RankedPath(start_id, edges, cost)
+
+        next_hops = hops + 1
+        if next_hops > max_hops:
+            continue
+
+        for edge in graph.get_edges_from(node):
+            nxt = edge.target_id
+            if (next_hops >= best_hops.get(nxt, max_hops + 1) or nxt in blocked_nodes
+                    or id(edge) in blocked_edges or not _allowed(edge, edge_types)):
+                continue
+            state = (nxt, next_hops)
+            new_cost = cost + weight(graph, edge)
+            if new_cost < best.get(state, math.inf):
+                best[state] = new_cost
+                parent[state] = edge
+                heapq.heappush(heap, (new_cost, next(counter), nxt, next_hops))
+
+    return None
+
+
+def yen_k_shortest_paths(
+    graph: FormulaGraph,
+    start_id: str,
+    end_id: str,
+    k: int,
+    weight: EdgeWeight,
+    budget: SearchBudget,
+    edge_types: Optional[Set[EdgeType]] = None,
+) -> List[RankedPath]:
+    """
+    Yen's algorithm: the k cheapest loopless paths, best first.
+
+    Parallel edges of different types count as distinct paths. Stops early
+    (returning what it has) when the time budget runs out.
+    """
+    first = dijkstra(graph, start_id, end_id, weight, budget, edge_types)
+    if first is None:
+        return []
+
+    found: List[RankedPath] = [first]
+    seen: Set[Tuple[int, ...]] = {tuple(id(e) for e in first.edges)}
+    counter = itertools.count()
+    candidates: List[Tuple[float, int, RankedPath]] = []
+
+    while len(found) < k:
+        previous = found[-1]
+        for i in range(len(previous.edges)):
+            if budget.expired():
+                return found
+
+            root_edges = previous.edges[:i]
+            spur_node = previous.start_id if i == 0 else root_edges[-1].target_id
+            root_cost = sum(weight(graph, e) for e in root_edges)
+
+            # Block the next edge of every found path sharing this root
+            blocked_edges: Set[int] = set()
+            for path in found:
+                if [id(e) for e in path.edges[:i]] == [id(e) for e in root_edges]:
+                    if len(path.edges) > i:
+                        blocked_edges.add(id(path.edges[i]))
+
+            # Root path nodes (except the spur node) may not be revisited
+            blocked_nodes = {previous.start_id} | {e.target_id for e in root_edges}
+            blocked_nodes.discard(spur_node)
+
+            spur = dijkstra(
+                graph, spur_node, end_id, weight, budget, edge_types,
+                blocked_nodes=blocked_nodes,
+                blocked_edges=blocked_edges,
+                depth_offset=i,
+            )
+            if spur is None:
+                continue
+
+            total = RankedPath(start_id, root_edges + spur.edges, root_cost + spur.cost)
+            key = tuple(id(e) for e in total.edges)
+            if key not in seen:
+                seen.add(key)
+                heapq.heappush(candidates, (total.cost, next(counter), total))
+
+        if not candidates:
+            break
+        _, _, best = heapq.heappop(candidates)
+        found.append(best)
+
+    return found
@@ -41,6 +41,7 @@ from substrate.memory.reasoning_trace import (
 from substrate.critics.local_llm import LocalLLMBackend
 from substrate.critics.logic_critic import LogicCritic
 from substrate.execution.executor import FormulaExecutor
+from substrate.execution.plan_compiler import PlanCompiler
 
 
 @dataclass
@@ -114,13 +115,18 @@ class ChatbotInterface:
         planner: Optional[FormulaPlanner] = None,
         logic_critic: Optional[LogicCritic] = None,
         executor: Optional[FormulaExecutor] = None,
+        plan_compiler: Optional[PlanCompiler] = None,
     ):
         self.graph = formula_graph
         self.llm = llm_backend
         self.trace_store = trace_store
         self.planner = planner or FormulaPlanner(formula_graph)
         self.logic_critic = logic_critic or LogicCritic(llm_backend, formula_graph)
-        self.executor = executor or FormulaExecutor()
+        if executor is None:
+            executor = FormulaExecutor()
+            executor.bind_graph(formula_graph)
+        self.executor = executor
+        self.plan_compiler = plan_compiler or PlanCompiler(formula_graph, executor)
 
         self._sessions: Dict[str, ChatSession] = {}
 
@@ -357,6 +363,57 @@ If not a physics problem, return {{"is_physics_problem": false}}"""
 
         variables = dict(problem.get("inputs", {}))
 
+        if not self._execute_fused(plan, variables, trace):
+            self._execute_steps(plan, variables, trace)
+
+        result = {out: variables.get(out) for out in problem.get("outputs", [])}
+        result["all_variables"] = variables
+
+        trace.add_step(
+            TraceStepType.RESULT_COMPUTED,
+            "Computed result",
+            outputs=result,
+        )
+        return result
+
+    def _execute_fused(
+        self,
+        plan: DerivationPlan,
+        variables: Dict[str, Any],
+        trace: ReasoningTrace,
+    ) -> bool:
+        """Run the whole plan as one compiled function (see PlanCompiler).
+
+        Returns False, leaving variables untouched, if the plan cannot be
+        fused (missing or unsolvable formula, step inputs not available).
+        """
+        try:
+            values = self.plan_compiler.evaluate(plan, variables, include_steps=True)
+        except Exception:
+            return False
+
+        values = {k: v.item() if v.ndim == 0 else v for k, v in values.items()}
+        variables.update(values)
+        for step in sorted(plan.steps, key=lambda s: s.order):
+            formula = self.graph.get_formula(step.formula_id)
+            target = self.executor.compile(formula).target
+            trace.add_step(
+                TraceStepType.STEP_EXECUTED,
+                f"Executed: {formula.name}",
+                formula_id=formula.id,
+                formula_name=formula.name,
+                inputs={k: variables.get(k) for k in [v.symbol for v in formula.inputs]},
+                outputs={target: values[target]},
+            )
+        return True
+
+    def _execute_steps(
+        self,
+        plan: DerivationPlan,
+        variables: Dict[str, Any],
+        trace: ReasoningTrace,
+    ) -> None:
+        """Run the plan one formula at a time, skipping steps that fail."""
         for step in sorted(plan.steps, key=lambda s: s.order):
             formula = self.graph.get_formula(step.formula_id)
             if not formula:
@@ -386,16 +443,6 @@ If not a physics problem, return {{"is_physics_problem": false}}"""
                     success=False,
                 )
 
-        result = {out: variables.get(out) for out in problem.get("outputs", [])}
-        result["all_variables"] = variables
-
-        trace.add_step(
-            TraceStepType.RESULT_COMPUTED,
-            "Computed result",
-            outputs=result,
-        )
-        return result
-
     def _execute_formula(
         self,
         formula: Formula,
@@ -586,29 +633,8 @@ The system is continuously learning, so this gap may be addressed in future upda
         domain: Optional[str] = None,
         limit: int = 10,
     ) -> List[Dict[str, Any]]:
-        results = []
-        query_lower = query.lower()
-
-        for formula in self.graph.get_all_formulas():
-            score = 0
-            if query_lower in formula.name.lower():
-                score += 10
-            if formula.description and query_lower in formula.description.lower():
-                score += 5
-            if query_lower in formula.symbolic_form.lower():
-                score += 3
-            for tag in formula.tags:
-                if query_lower in tag.lower():
-                    score += 2
-
-            if domain and formula.domain != domain:
-                score = 0
-
-            if score > 0:
-                results.append((score, formula))
-
-        results.sort(key=lambda x: -x[0])
-        return [f.to_dict() for _, f in results[:limit]]
+        hits = self.graph.search(query, domain=domain, limit=limit)
+        return [f.to_dict() for f, _ in hits]
 
     def get_graph_stats(self) -> Dict[str, Any]:
         return self.graph.stats()
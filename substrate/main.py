@@ -28,6 +28,7 @@ import json
 
 from substrate.graph.formula import Formula
 from substrate.graph.formula_graph import FormulaGraph, create_classical_mechanics_graph
+from substrate.graph.graph_store import GraphStore
 from substrate.planner.formula_planner import FormulaPlanner
 from substrate.memory.reasoning_trace import TraceStore
 from substrate.critics.local_llm import (
@@ -40,6 +41,7 @@ from substrate.critics.meta_critic import MetaCritic
 from substrate.evolution.evolution_loop import EvolutionLoop, EvolutionConfig
 from substrate.interface.chatbot import ChatbotInterface, ChatSession
 from substrate.execution.executor import FormulaExecutor
+from substrate.execution.plan_compiler import PlanCompiler
 
 
 @dataclass
@@ -48,7 +50,9 @@ class PhysicsAIConfig:
     
     # Paths
     data_dir: str = ".beyondfrontier_data"
-    graph_path: str = "formula_graph.json"
+    graph_path: str = "formula_graph.json"       # legacy JSON, migrated on first start
+    graph_store_path: str = "formula_graph.store"  # append-only WAL + snapshot
+    trace_log_path: Optional[str] = None   # indexed trace history under data_dir, e.g. "traces.log" (None = off)
     
     # LLM configuration (resolved from env vars at instantiation)
     llm_backend_type: str = field(default_factory=lambda: os.getenv("LLM_BACKEND", "throttled_openai"))
@@ -73,6 +77,8 @@ class PhysicsAIConfig:
         return {
             "data_dir": self.data_dir,
             "graph_path": self.graph_path,
+            "graph_store_path": self.graph_store_path,
+            "trace_log_path": self.trace_log_path,
             "llm_backend_type": self.llm_backend_type,
             "llm_model_name": self.llm_model_name,
             "llm_server_url": self.llm_server_url,
@@ -147,26 +153,39 @@ class PhysicsAI:
     def _init_graph(self):
         """Initialize FormulaGraph."""
         graph_path = os.path.join(self.config.data_dir, self.config.graph_path)
+        store = GraphStore(os.path.join(self.config.data_dir, self.config.graph_store_path))
         
-        if os.path.exists(graph_path):
-            # Load existing graph
+        if store.exists():
+            # Load existing graph from snapshot + write-ahead log
+            self.graph = FormulaGraph()
+        elif os.path.exists(graph_path):
+            # Migrate legacy JSON graph into the store
             self.graph = FormulaGraph(persist_path=graph_path)
         elif self.config.seed_classical_mechanics:
             # Create with classical mechanics seed
             self.graph = create_classical_mechanics_graph()
-            self.graph._persist_path = graph_path
         else:
             # Empty graph
-            self.graph = FormulaGraph(persist_path=graph_path)
+            self.graph = FormulaGraph()
+        
+        self.graph._persist_path = graph_path
+        self.graph.attach_store(store)
     
     def _init_memory(self):
         """Initialize memory systems."""
-        self.trace_store = TraceStore(max_buffer_size=1000)
+        log_path = None
+        if self.config.trace_log_path:
+            log_path = os.path.join(self.config.data_dir, self.config.trace_log_path)
+        self.trace_store = TraceStore(max_buffer_size=1000, log_path=log_path)
     
     def _init_critics(self):
         """Initialize critic systems."""
         self.logic_critic = LogicCritic(self.llm, self.graph)
-        self.code_critic = CodeCritic(self.llm, self.config.codebase_root)
+        self.code_critic = CodeCritic(
+            self.llm,
+            self.config.codebase_root,
+            analysis_cache_path=os.path.join(self.config.data_dir, "code_analysis.json"),
+        )
         self.meta_critic = MetaCritic(self.llm)
         
         # Register critics
@@ -180,6 +199,8 @@ class PhysicsAI:
     def _init_executor(self):
         """Initialize formula executor."""
         self.executor = FormulaExecutor()
+        self.executor.bind_graph(self.graph)
+        self.plan_compiler = PlanCompiler(self.graph, self.executor)
     
     def _init_evolution(self):
         """Initialize evolution loop."""
@@ -211,6 +232,7 @@ class PhysicsAI:
             planner=self.planner,
             logic_critic=self.logic_critic,
             executor=self.executor,
+            plan_compiler=self.plan_compiler,
         )
     
     # =========================================================================
@@ -246,6 +268,9 @@ class PhysicsAI:
         # Save graph
         self.graph.save()
         
+        # Log traces that critics changed since they were stored
+        self.trace_store.flush()
+        
         print("Beyond Frontier stopped")
     
     # =========================================================================
@@ -333,6 +358,27 @@ class PhysicsAI:
         )
         return [p.to_dict() for p in plans]
 
+    def execute_plan(
+        self,
+        inputs: Dict[str, Any],
+        outputs: List[str],
+        context: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Plan and evaluate outputs as one fused computation.
+
+        Input values may be scalars or arrays (e.g. a grid of knowns); the
+        best plan is compiled once and evaluated over all of them.
+        """
+        plans = self.planner.plan(
+            inputs=inputs,
+            outputs=outputs,
+            context=context or {},
+            max_plans=1,
+        )
+        if not plans:
+            raise ValueError(f"No derivation plan found for {outputs}")
+        return self.plan_compiler.evaluate(plans[0])
+
     def execute_formula(
         self,
         formula_id: str,
@@ -2,7 +2,8 @@
 # PURPOSE:
 #   - Package for memory management (hot memory / reasoning traces)
 
-from substrate.memory.reasoning_trace import ReasoningTrace, TraceStep, TraceStepType
+from substrate.memory.reasoning_trace import ReasoningTrace, TraceStep, TraceStepType, TraceStore
+from substrate.memory.trace_log import TraceLog
 
-__all__ = ["ReasoningTrace", "TraceStep", "TraceStepType"]
+__all__ = ["ReasoningTrace", "TraceStep", "TraceStepType", "TraceStore", "TraceLog"]
 
@@ -13,6 +13,7 @@
 #   - ReasoningTrace: Complete trace for a problem
 #   - TraceStep: Single step in reasoning
 #   - TraceStepType: Types of reasoning steps
+#   - TraceStore: Indexed buffer of recent traces (+ optional on-disk log)
 #
 # NON-RESPONSIBILITIES:
 #   - Does NOT execute reasoning (that's the executor)
@@ -25,12 +26,17 @@
 
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set, Any, Union
+from typing import Callable, Deque, Dict, List, Optional, Set, Any, Tuple, Union
+from collections import deque
 from datetime import datetime
 from enum import Enum, auto
+import bisect
 import json
+import threading
 import uuid
 
+from substrate.memory.trace_log import TraceLog
+
 
 class TraceStepType(Enum):
     """Types of steps in a reasoning trace."""
@@ -170,6 +176,12 @@ class CriticAnnotation:
             "confidence": self.confidence,
             "timestamp": self.timestamp.isoformat(),
         }
+    
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> CriticAnnotation:
+        d = d.copy()
+        d["timestamp"] = datetime.fromisoformat(d["timestamp"]) if d.get("timestamp") else datetime.now()
+        return cls(**d)
 
 
 @dataclass
@@ -224,6 +236,23 @@ class ReasoningTrace:
     created_at: datetime = field(default_factory=datetime.now)
     completed_at: Optional[datetime] = None
     
+    def __post_init__(self):
+        # Listeners notified after mutations made through this class's methods
+        self._change_callbacks: List[Callable[[ReasoningTrace], None]] = []
+    
+    def on_change(self, callback: Callable[[ReasoningTrace], None]) -> None:
+        """Register a callback invoked after add_step/add_annotation/complete/confidence updates."""
+        self._change_callbacks.append(callback)
+    
+    def remove_change_callback(self, callback: Callable[[ReasoningTrace], None]) -> None:
+        """Unregister a change callback."""
+        if callback in self._change_callbacks:
+            self._change_callbacks.remove(callback)
+    
+    def _emit(self) -> None:
+        for callback in list(self._change_callbacks):
+            callback(self)
+    
     def add_step(
         self,
         step_type: TraceStepType,
@@ -245,11 +274,13 @@ class ReasoningTrace:
         if step.formula_id:
             self.total_formulas_used += 1
         
+        self._emit()
         return step
     
     def add_annotation(self, annotation: CriticAnnotation):
         """Add a critic annotation."""
         self.annotations.append(annotation)
+        self._emit()
     
     def get_steps_by_type(self, step_type: TraceStepType) -> List[TraceStep]:
         """Get all steps of a specific type."""
@@ -298,8 +329,18 @@ class ReasoningTrace:
     
     def compute_overall_confidence(self) -> float:
         """Compute overall confidence from step confidences."""
-        if not self.steps:
+        previous = self.overall_confidence
+        confidence = self._compute_confidence()
+        if confidence is None:
             return 0.0
+        self.overall_confidence = confidence
+        if confidence != previous:
+            self._emit()
+        return self.overall_confidence
+    
+    def _compute_confidence(self) -> Optional[float]:
+        if not self.steps:
+            return None
         
         # Product of confidences (chain is as strong as weakest link)
         confidence = 1.0
@@ -321,15 +362,17 @@ class ReasoningTrace:
         confidence *= (0.8 ** issue_counts["error"])
         confidence *= (0.5 ** issue_counts["critical"])
         
-        self.overall_confidence = max(0.0, min(1.0, confidence))
-        return self.overall_confidence
+        return max(0.0, min(1.0, confidence))
     
     def complete(self, result: Optional[Dict[str, Any]] = None, success: bool = True):
         """Mark the trace as complete."""
         self.result = result
         self.success = success
         self.completed_at = datetime.now()
-        self.compute_overall_confidence()
+        confidence = self._compute_confidence()
+        if confidence is not None:
+            self.overall_confidence = confidence
+        self._emit()
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -358,8 +401,7 @@ class ReasoningTrace:
         d["steps"] = [TraceStep.from_dict(s) for s in d.get("steps", [])]
         d["created_at"] = datetime.fromisoformat(d["created_at"]) if d.get("created_at") else datetime.now()
         d["completed_at"] = datetime.fromisoformat(d["completed_at"]) if d.get("completed_at") else None
-        # Note: annotations would need their own from_dict if we load them
-        d["annotations"] = []
+        d["annotations"] = [CriticAnnotation.from_dict(a) for a in d.get("annotations", [])]
         return cls(**d)
     
     def to_json(self, indent: int = 2) -> str:
@@ -397,6 +439,10 @@ class ReasoningTrace:
         return "\n".join(lines)
 
 
+# Annotation severities that count as issues (see ReasoningTrace.get_issues)
+_ISSUE_SEVERITIES = frozenset({"warning", "error", "critical"})
+
+
 class TraceStore:
     """
     Storage for reasoning traces.
@@ -404,28 +450,151 @@ class TraceStore:
     Maintains a buffer of recent traces for analysis,
     and can distill important traces into reusable patterns
     that serve as "cold" memory snippets.
+    
+    Failed traces, traces with issues and a confidence-sorted list are
+    indexed, and the aggregates behind statistics() are kept as running
+    totals. Both are updated on store and eviction, and through the
+    traces' change callbacks when critics annotate a stored trace.
+    Fields assigned directly on a stored trace need reindex(trace_id).
+    
+    With log_path, every stored trace is also appended to a TraceLog
+    (and re-appended on eviction if it changed), so history beyond the
+    buffer can be queried with query_history().
     """
     
-    def __init__(self, max_buffer_size: int = 1000, max_patterns: int = 200):
+    def __init__(
+        self,
+        max_buffer_size: int = 1000,
+        max_patterns: int = 200,
+        log_path: Optional[str] = None,
+        log_compact_every: int = 1000,
+    ):
         self._traces: Dict[str, ReasoningTrace] = {}
-        self._buffer: List[str] = []  # Order by recency
+        self._buffer: Deque[str] = deque()  # Order by recency
+        self._buffer_refs: Dict[str, int] = {}  # Buffer entries per id
         self._max_buffer_size = max_buffer_size
         self._patterns: List[Dict[str, Any]] = []
         self._max_patterns = max_patterns
+        
+        # Secondary indexes: id -> (failed, confidence, has_issues) as indexed
+        self._indexed: Dict[str, Tuple[bool, float, bool]] = {}
+        self._order: Dict[str, int] = {}  # id -> store sequence
+        self._sequence = 0
+        self._failed: Dict[str, None] = {}  # ordered sets
+        self._with_issues: Dict[str, None] = {}
+        self._by_confidence: List[Tuple[float, int, str]] = []
+        
+        # Running aggregates
+        self._success_count = 0
+        self._confidence_sum = 0.0
+        
+        # Critics may annotate stored traces from worker threads
+        self._lock = threading.RLock()
+        
+        self._log = TraceLog(log_path, compact_every=log_compact_every) if log_path else None
+        self._unlogged: Set[str] = set()
     
     def store(self, trace: ReasoningTrace):
         """Store a trace."""
-        self._traces[trace.id] = trace
-        self._buffer.append(trace.id)
+        with self._lock:
+            previous = self._traces.get(trace.id)
+            if previous is not None and previous is not trace:
+                previous.remove_change_callback(self._on_trace_change)
+            if previous is not trace:
+                trace.on_change(self._on_trace_change)
+            if previous is None:
+                self._sequence += 1
+                self._order[trace.id] = self._sequence
+        
+            self._traces[trace.id] = trace
+            self._buffer.append(trace.id)
+            self._buffer_refs[trace.id] = self._buffer_refs.get(trace.id, 0) + 1
+            self._index(trace)
         
-        # Evict old traces if buffer full
-        while len(self._buffer) > self._max_buffer_size:
-            old_id = self._buffer.pop(0)
-            if old_id in self._traces:
-                del self._traces[old_id]
+            if self._log is not None:
+                self._log.append(trace)
+                self._unlogged.discard(trace.id)
+        
+            # Evict old traces if buffer full
+            while len(self._buffer) > self._max_buffer_size:
+                self._evict(self._buffer.popleft())
 
-        # Distill/promote high-quality traces into patterns (cold-ish memory)
-        self._maybe_distill(trace)
+            # Distill/promote high-quality traces into patterns (cold-ish memory)
+            self._maybe_distill(trace)
+    
+    def _evict(self, trace_id: str):
+        refs = self._buffer_refs.get(trace_id, 0) - 1
+        if refs > 0:
+            self._buffer_refs[trace_id] = refs
+            return
+        self._buffer_refs.pop(trace_id, None)
+        trace = self._traces.pop(trace_id, None)
+        if trace is None:
+            return
+        trace.remove_change_callback(self._on_trace_change)
+        self._unindex(trace_id)
+        self._order.pop(trace_id, None)
+        if trace_id in self._unlogged:
+            self._unlogged.discard(trace_id)
+            self._log.append(trace)
+    
+    def _on_trace_change(self, trace: ReasoningTrace):
+        with self._lock:
+            if self._traces.get(trace.id) is not trace:
+                return
+            self._index(trace)
+            if self._log is not None:
+                self._unlogged.add(trace.id)
+    
+    def reindex(self, trace_id: str):
+        """Refresh indexes after fields of a stored trace were assigned directly."""
+        trace = self._traces.get(trace_id)
+        if trace is not None:
+            self._on_trace_change(trace)
+    
+    @staticmethod
+    def _has_issues(trace: ReasoningTrace) -> bool:
+        """Same as bool(trace.get_issues()), without building the issue dicts."""
+        return (
+            any(ann.severity in _ISSUE_SEVERITIES for ann in trace.annotations)
+            or bool(trace.get_errors())
+        )
+    
+    def _index(self, trace: ReasoningTrace):
+        key = (not trace.success, trace.overall_confidence, self._has_issues(trace))
+        old = self._indexed.get(trace.id)
+        if old == key:
+            return
+        if old is not None:
+            self._unindex(trace.id)
+        
+        failed, confidence, has_issues = key
+        self._indexed[trace.id] = key
+        if failed:
+            self._failed[trace.id] = None
+        else:
+            self._success_count += 1
+        if has_issues:
+            self._with_issues[trace.id] = None
+        bisect.insort(self._by_confidence, (confidence, self._order[trace.id], trace.id))
+        self._confidence_sum += confidence
+    
+    def _unindex(self, trace_id: str):
+        key = self._indexed.pop(trace_id, None)
+        if key is None:
+            return
+        failed, confidence, has_issues = key
+        if failed:
+            self._failed.pop(trace_id, None)
+        else:
+            self._success_count -= 1
+        if has_issues:
+            self._with_issues.pop(trace_id, None)
+        entry = (confidence, self._order[trace_id], trace_id)
+        i = bisect.bisect_left(self._by_confidence, entry)
+        if i < len(self._by_confidence) and self._by_confidence[i] == entry:
+            del self._by_confidence[i]
+        self._confidence_sum -= confidence
     
     def get(self, trace_id: str) -> Optional[ReasoningTrace]:
         """Get a trace by ID."""
@@ -433,44 +602,79 @@ class TraceStore:
     
     def get_recent(self, n: int = 10) -> List[ReasoningTrace]:
         """Get the n most recent traces."""
-        recent_ids = self._buffer[-n:]
-        return [self._traces[tid] for tid in reversed(recent_ids) if tid in self._traces]
+        with self._lock:
+            recent: List[ReasoningTrace] = []
+            seen: Set[str] = set()
+            for tid in reversed(self._buffer):
+                if len(recent) >= n:
+                    break
+                if tid not in seen and tid in self._traces:
+                    seen.add(tid)
+                    recent.append(self._traces[tid])
+            return recent
     
     def get_failed(self) -> List[ReasoningTrace]:
         """Get all failed traces in buffer."""
-        return [t for t in self._traces.values() if not t.success]
+        with self._lock:
+            return [self._traces[tid] for tid in self._failed]
     
     def get_low_confidence(self, threshold: float = 0.5) -> List[ReasoningTrace]:
-        """Get traces with confidence below threshold."""
-        return [t for t in self._traces.values() if t.overall_confidence < threshold]
+        """Get traces with confidence below threshold (in store order)."""
+        with self._lock:
+            end = bisect.bisect_left(self._by_confidence, (threshold,))
+            matches = sorted(self._by_confidence[:end], key=lambda entry: entry[1])
+            return [self._traces[tid] for _, _, tid in matches]
     
     def get_with_issues(self) -> List[ReasoningTrace]:
         """Get traces that have critic issues."""
-        return [t for t in self._traces.values() if t.get_issues()]
+        with self._lock:
+            return [self._traces[tid] for tid in self._with_issues]
     
     def get_patterns(self, limit: int = 20) -> List[Dict[str, Any]]:
         """Get distilled patterns (hot→cold promotions)."""
         return self._patterns[:limit]
+    
+    def query_history(self, **filters) -> List[ReasoningTrace]:
+        """
+        Query the on-disk log, including evicted traces.
+        
+        Accepts TraceLog.query filters (formula_id, since, until, domain,
+        success, max_confidence, limit). Traces still in the buffer that
+        changed since they were logged are logged first.
+        """
+        if self._log is None:
+            return []
+        self.flush()
+        return self._log.query(**filters)
+    
+    def flush(self):
+        """Append buffered traces that changed since they were last logged."""
+        with self._lock:
+            if self._log is None:
+                return
+            for tid in list(self._unlogged):
+                trace = self._traces.get(tid)
+                if trace is not None:
+                    self._log.append(trace)
+            self._unlogged.clear()
 
     def statistics(self) -> Dict[str, Any]:
         """Get statistics about stored traces."""
-        traces = list(self._traces.values())
-        if not traces:
-            return {"count": 0}
-        
-        successes = sum(1 for t in traces if t.success)
-        confidences = [t.overall_confidence for t in traces]
+        with self._lock:
+            count = len(self._traces)
+            if not count:
+                return {"count": 0}
         
-        return {
-            "count": len(traces),
-            "success_rate": successes / len(traces),
-            "avg_confidence": sum(confidences) / len(confidences),
-            "min_confidence": min(confidences),
-            "max_confidence": max(confidences),
-            "traces_with_issues": len(self.get_with_issues()),
-            "failed_traces": len(self.get_failed()),
-            "patterns": len(self._patterns),
-        }
+            return {
+                "count": count,
+                "success_rate": self._success_count / count,
+                "avg_confidence": self._confidence_sum / count,
+                "min_confidence": self._by_confidence[0][0],
+                "max_confidence": self._by_confidence[-1][0],
+                "traces_with_issues": len(self._with_issues),
+                "failed_traces": len(self._failed),
+                "patterns": len(self._patterns),
+            }
 
     # ------------------------------------------------------------------
     # Distillation / promotion
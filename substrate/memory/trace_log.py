@@ -0,0 +1,329 @@
+# PATH: substrate/memory/trace_log.py
+# PURPOSE:
+#   - Append-only on-disk history of reasoning traces
+#   - Lets traces that have left TraceStore's buffer be queried offline
+#
+# ROLE IN ARCHITECTURE:
+#   - Storage backend behind TraceStore(log_path=...)
+#   - Read directly by offline analysis ("all traces using formula X last week")
+#
+# MAIN EXPORTS:
+#   - TraceLog: JSON-lines trace log with a slim sidecar index
+#
+# NON-RESPONSIBILITIES:
+#   - Does NOT decide which traces are kept in memory (that's TraceStore)
+#   - Does NOT analyze traces (that's the critics)
+#
+# NOTES FOR FUTURE AI:
+#   - Layout of a log directory:
+#       CURRENT              generation number of the live files
+#       traces-<gen>.jsonl   one full trace dict per line
+#       index-<gen>.jsonl    one entry per trace line: id, byte offset/length,
+#                            created_at, logged_at, domain, success,
+#                            confidence, formulas
+#   - Queries scan only the index, then seek to the matching trace lines,
+#     so trace bodies are parsed only for hits
+#   - A trace may be logged more than once (e.g. re-logged after critics
+#     annotated it); the latest line wins
+#   - Compaction writes generation gen+1 (latest line per id, minus lines
+#     past retention), then atomically replaces CURRENT; a crash leaves
+#     either the old or the new generation live
+#   - Data is written before its index entry, so a torn write at worst
+#     leaves an unindexed (invisible) trace line or an unparsable index
+#     line, which readers skip; the next writer cuts a torn index tail
+#     before appending
+
+from __future__ import annotations
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, TYPE_CHECKING
+import json
+import os
+import tempfile
+import threading
+
+if TYPE_CHECKING:
+    from substrate.memory.reasoning_trace import ReasoningTrace
+
+
+class TraceLog:
+    """
+    JSON-lines trace history with an index for selective reads.
+
+    Example:
+        log = TraceLog("data/traces.log")
+        log.append(trace)
+        week_ago = datetime.now() - timedelta(days=7)
+        hits = log.query(formula_id="newton_second_law", since=week_ago)
+    """
+
+    CURRENT_FILE = "CURRENT"
+
+    def __init__(
+        self,
+        path: str,
+        compact_every: int = 1000,
+        retention_days: Optional[float] = None,
+    ):
+        """
+        Args:
+            path: Log directory
+            compact_every: Compact after this many appended traces (0 = never)
+            retention_days: Drop traces created longer ago than this on
+                compaction (None = keep forever)
+        """
+        self.path = path
+        self.compact_every = compact_every
+        self.retention_days = retention_days
+
+        self._lock = threading.RLock()
+        self._data = None
+        self._index = None
+        self._appends_since_compaction = 0
+        self._generation = self._read_generation()
+
+    def _read_generation(self) -> int:
+        current = os.path.join(self.path, self.CURRENT_FILE)
+        if not os.path.exists(current):
+            return 0
+        with open(current, "r", encoding="utf-8") as f:
+            return int(f.read().strip() or 0)
+
+    def _data_path(self, generation: Optional[int] = None) -> str:
+        gen = self._generation if generation is None else generation
+        return os.path.join(self.path, f"traces-{gen}.jsonl")
+
+    def _index_path(self, generation: Optional[int] = None) -> str:
+        gen = self._generation if generation is None else generation
+        return os.path.join(self.path, f"index-{gen}.jsonl")
+
+    # =========================================================================
+    # Append
+    # =========================================================================
+
+    def append(self, trace: ReasoningTrace):
+        """Append a trace (or a newer version of an already logged trace)."""
+        line = (json.dumps(trace.to_dict(), separators=(",", ":"), default=str) + "\n").encode("utf-8")
+        entry = {
+            "id": trace.id,
+            "created_at": trace.created_at.isoformat(),
+            "logged_at": datetime.now().isoformat(),
+            "domain": trace.domain,
+            "success": trace.success,
+            "confidence": trace.overall_confidence,
+            "formulas": list(dict.fromkeys(trace.get_formulas_used())),
+        }
+
+        with self._lock:
+            self._open()
+            entry["offset"] = self._data.tell()
+            entry["length"] = len(line)
+            self._data.write(line)
+            self._data.flush()
+            self._index.write((json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8"))
+            self._index.flush()
+
+            self._appends_since_compaction += 1
+            should_compact = (
+                self.compact_every > 0
+                and self._appends_since_compaction >= self.compact_every
+            )
+
+        if should_compact:
+            self.compact()
+
+    def _open(self):
+        if self._data is None:
+            os.makedirs(self.path, exist_ok=True)
+            self._drop_torn_tail(self._index_path())
+            self._data = open(self._data_path(), "ab")
+            self._index = open(self._index_path(), "ab")
+
+    @staticmethod
+    def _drop_torn_tail(path: str):
+        """Cut a partial last line so the next entry starts on a line of its own."""
+        if not os.path.exists(path):
+            return
+        with open(path, "r+b") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b"\n":
+                return
+            # Scan back to the last complete line
+            end = size
+            while end > 0:
+                start = max(0, end - 4096)
+                f.seek(start)
+                cut = f.read(end - start).rfind(b"\n")
+                if cut >= 0:
+                    f.truncate(start + cut + 1)
+                    return
+                end = start
+            f.truncate(0)
+
+    def close(self):
+        """Close the open log files."""
+        with self._lock:
+            for f in (self._data, self._index):
+                if f is not None:
+                    f.close()
+            self._data = None
+            self._index = None
+
+    # =========================================================================
+    # Query
+    # =========================================================================
+
+    def _latest_entries(self, generation: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """Index entries by trace id, latest line winning."""
+        latest: Dict[str, Dict[str, Any]] = {}
+        path = self._index_path(generation)
+        if not os.path.exists(path):
+            return latest
+        with open(path, "rb") as f:
+            for raw in f:
+                try:
+                    entry = json.loads(raw)
+                except ValueError:
+                    continue  # torn tail line
+                latest[entry["id"]] = entry
+        return latest
+
+    def query(
+        self,
+        formula_id: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        domain: Optional[str] = None,
+        success: Optional[bool] = None,
+        max_confidence: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[ReasoningTrace]:
+        """
+        Logged traces matching every given filter, oldest first.
+
+        Args:
+            formula_id: Trace used this formula
+            since / until: created_at bounds (inclusive / exclusive)
+            domain: Trace domain
+            success: Trace outcome
+            max_confidence: overall_confidence strictly below this
+            limit: Return at most this many (the most recent ones)
+        """
+        with self._lock:
+            if self._data is not None:
+                self._data.flush()
+            entries = self._latest_entries()
+            data_path = self._data_path()
+
+            since_s = since.isoformat() if since else None
+            until_s = until.isoformat() if until else None
+            hits = [
+                e for e in entries.values()
+                if (formula_id is None or formula_id in e["formulas"])
+                and (since_s is None or e["created_at"] >= since_s)
+                and (until_s is None or e["created_at"] < until_s)
+                and (domain is None or e["domain"] == domain)
+                and (success is None or e["success"] == success)
+                and (max_confidence is None or e["confidence"] < max_confidence)
+            ]
+            hits.sort(key=lambda e: (e["created_at"], e["offset"]))
+            if limit is not None:
+                hits = hits[-limit:] if limit > 0 else []
+            return list(self._read(data_path, hits))
+
+    @staticmethod
+    def _read(data_path: str, entries: List[Dict[str, Any]]) -> Iterator[ReasoningTrace]:
+        from substrate.memory.reasoning_trace import ReasoningTrace
+
+        if not entries:
+            return
+        with open(data_path, "rb") as f:
+            for entry in entries:
+                f.seek(entry["offset"])
+                yield ReasoningTrace.from_dict(json.loads(f.read(entry["length"])))
+
+    # =========================================================================
+    # Compaction
+    # =========================================================================
+
+    def compact(self) -> Dict[str, int]:
+        """
+        Rewrite the log with the latest line per trace, minus expired traces.
+
+        Returns:
+            Stats dict: kept, dropped
+        """
+        with self._lock:
+            self.close()
+            old_gen = self._generation
+            new_gen = old_gen + 1
+            entries = self._latest_entries(old_gen)
+            total_lines = 0
+            if os.path.exists(self._index_path(old_gen)):
+                with open(self._index_path(old_gen), "rb") as f:
+                    total_lines = sum(1 for _ in f)
+
+            cutoff = None
+            if self.retention_days is not None:
+                cutoff = (datetime.now() - timedelta(days=self.retention_days)).isoformat()
+            kept = sorted(
+                (e for e in entries.values() if cutoff is None or e["created_at"] >= cutoff),
+                key=lambda e: e["offset"],
+            )
+
+            os.makedirs(self.path, exist_ok=True)
+            old_data = self._data_path(old_gen)
+            with open(self._data_path(new_gen), "wb") as data_out, \
+                    open(self._index_path(new_gen), "wb") as index_out:
+                if kept:
+                    with open(old_data, "rb") as data_in:
+                        for entry in kept:
+                            data_in.seek(entry["offset"])
+                            line = data_in.read(entry["length"])
+                            entry = dict(entry, offset=data_out.tell())
+                            data_out.write(line)
+                            index_out.write(
+                                (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+                            )
+                for f in (data_out, index_out):
+                    f.flush()
+                    os.fsync(f.fileno())
+
+            self._write_current(new_gen)
+            self._generation = new_gen
+            for path in (old_data, self._index_path(old_gen)):
+                if os.path.exists(path):
+                    os.unlink(path)
+            self._appends_since_compaction = 0
+            return {"kept": len(kept), "dropped": total_lines - len(kept)}
+
+    def _write_current(self, generation: int):
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", dir=self.path)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(str(generation))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, os.path.join(self.path, self.CURRENT_FILE))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """Sizes of the live files."""
+        def size(p: str) -> int:
+            return os.path.getsize(p) if os.path.exists(p) else 0
+
+        with self._lock:
+            if self._data is not None:
+                self._data.flush()
+                self._index.flush()
+            return {
+                "generation": self._generation,
+                "data_bytes": size(self._data_path()),
+                "index_bytes": size(self._index_path()),
+                "appends_since_compaction": self._appends_since_compaction,
+            }
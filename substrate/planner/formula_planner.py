@@ -25,8 +25,11 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Set, Any, Tuple
+from collections import OrderedDict, defaultdict
 from datetime import datetime
 import heapq
+import itertools
+import math
 from enum import Enum, auto
 
 from substrate.graph.formula import Formula, FormulaStatus
@@ -151,7 +154,8 @@ class FormulaPlanner:
     sequences of formula applications that derive the outputs from inputs.
     
     Uses:
-    - A* search for optimal paths
+    - A* search over known-symbol sets, driven by an input-symbol index
+    - Plan cache keyed by (knowns, targets, context, graph version)
     - Regime checking for validity
     - Cost estimation for efficiency and regime/physics alignment
     """
@@ -174,6 +178,19 @@ class FormulaPlanner:
         self._plan_counter = 0
         self._regime_penalty = regime_penalty
         self._conservation_bonus = conservation_bonus
+        
+        # Symbol indexes over the graph, rebuilt when graph.version changes
+        self._index_version = -1
+        self._consumers: Dict[str, Set[str]] = defaultdict(set)  # input symbol -> formula ids
+        self._producers: Dict[str, Set[str]] = defaultdict(set)  # output symbol -> formula ids
+        self._formula_inputs: Dict[str, frozenset] = {}
+        self._formula_outputs: Dict[str, frozenset] = {}
+        self._sourceless: Set[str] = set()  # formulas with no inputs
+        
+        # LRU of search results keyed by (knowns, targets, context, options)
+        self._plan_cache: OrderedDict = OrderedDict()
+        self._plan_cache_version = -1
+        self._plan_cache_size = 128
     
     def plan(
         self,
@@ -241,69 +258,314 @@ class FormulaPlanner:
         """
         Search for formula sequences using A*.
         
+        States are the frozenset of known symbols. Expansion only considers
+        formulas enabled by the symbols known so far (via the input-symbol
+        index) that are relevant to the targets. Each state may be expanded
+        up to max_plans times so that alternative plans survive.
+        
         Returns list of (formula_id_sequence, total_cost).
         """
-        plans = []
+        cache_key = self._plan_cache_key(
+            input_vars, output_vars, context, max_plans, max_steps, prefer_fundamental
+        )
+        if cache_key is not None:
+            cached = self._plan_cache_get(cache_key)
+            if cached is not None:
+                return [(list(seq), cost) for seq, cost in cached]
+        
+        self._ensure_index()
+        relevant = self._relevant_formulas(output_vars)
+        
+        # Applicability and step cost depend only on (formula, context):
+        # evaluate once per search instead of once per expansion
+        step_costs: Dict[str, float] = {}
+        for fid in relevant:
+            formula = self.graph.get_formula(fid)
+            if formula is None:
+                continue
+            applicable, _ = formula.is_applicable(context)
+            if applicable:
+                step_costs[fid] = self._compute_step_cost(formula, prefer_fundamental, context)
+        
+        plans: List[Tuple[List[str], float]] = []
+        
+        # Relaxed reachability: if the targets cannot be reached even when
+        # every applicable formula is allowed, there is nothing to search
+        if not output_vars.issubset(self._reachable(input_vars, step_costs)):
+            if cache_key is not None:
+                self._plan_cache_put(cache_key, [])
+            return plans
+        
+        heuristic = self._make_heuristic(output_vars, step_costs)
         
-        # State: (available_vars, formulas_used)
-        # Priority queue: (cost, state, formula_sequence)
-        initial_state = (frozenset(input_vars), frozenset())
-        pq = [(0.0, initial_state, [])]
-        visited = set()
+        seen_plans: Set[frozenset] = set()
+        expansions: Dict[frozenset, int] = {}
+        counter = itertools.count()
+        
+        initial_known = frozenset(input_vars)
+        initial_enabled = self._newly_enabled(initial_known, initial_known, step_costs, initial=True)
+        # Priority queue: (f = g + h, tiebreak, g, known, enabled, sequence)
+        pq = [(heuristic(initial_known)[0], next(counter), 0.0, initial_known,
+               initial_enabled, [])]
         
         while pq and len(plans) < max_plans:
-            cost, state, sequence = heapq.heappop(pq)
-            available_vars, used_formulas = state
+            _, _, cost, known, enabled, sequence = heapq.heappop(pq)
             
             # Check if we have all outputs
-            if output_vars.issubset(available_vars):
-                plans.append((sequence.copy(), cost))
+            if output_vars.issubset(known):
+                # Orderings of the same formula set are the same plan
+                signature = frozenset(sequence)
+                if signature not in seen_plans:
+                    seen_plans.add(signature)
+                    plans.append((sequence, cost))
                 continue
             
-            # Skip if visited
-            state_key = (available_vars, used_formulas)
-            if state_key in visited:
+            # Deduplicate by known symbols, keeping up to max_plans expansions
+            count = expansions.get(known, 0)
+            if count >= max_plans:
                 continue
-            visited.add(state_key)
+            expansions[known] = count + 1
             
             # Skip if too many steps
             if len(sequence) >= max_steps:
                 continue
             
-            # Find applicable formulas
-            for formula in self.graph.get_all_formulas():
-                if formula.id in used_formulas:
+            used = set(sequence)
+            for fid in enabled:
+                if fid in used:
                     continue
-                
-                # Check applicability
-                applicable, reasons = formula.is_applicable(context)
-                if not applicable:
+                new_outputs = self._formula_outputs[fid] - known
+                if not new_outputs:
                     continue
                 
-                # Check if we have the required inputs
-                formula_inputs = {v.symbol for v in formula.inputs}
-                if not formula_inputs.issubset(available_vars):
+                new_known = known | new_outputs
+                estimate, steps_left = heuristic(new_known)
+                if len(sequence) + 1 + steps_left > max_steps:
                     continue
-                
-                # Check if this formula provides something new
-                formula_outputs = {v.symbol for v in formula.outputs}
-                new_outputs = formula_outputs - available_vars
-                if not new_outputs and not formula_outputs.intersection(output_vars):
+                new_cost = cost + step_costs[fid]
+                new_enabled = enabled | self._newly_enabled(new_known, new_outputs, step_costs)
+                heapq.heappush(pq, (
+                    new_cost + estimate, next(counter), new_cost,
+                    new_known, new_enabled, sequence + [fid],
+                ))
+        
+        if cache_key is not None:
+            self._plan_cache_put(cache_key, [(tuple(seq), cost) for seq, cost in plans])
+        return plans
+    
+    # =========================================================================
+    # Search Indexes
+    # =========================================================================
+    
+    def _ensure_index(self):
+        """(Re)build the symbol indexes if the graph changed since the last build."""
+        if self._index_version == self.graph.version:
+            return
+        
+        self._consumers = defaultdict(set)
+        self._producers = defaultdict(set)
+        self._formula_inputs = {}
+        self._formula_outputs = {}
+        self._sourceless = set()
+        
+        for formula in self.graph.get_all_formulas():
+            inputs = frozenset(v.symbol for v in formula.inputs)
+            outputs = frozenset(v.symbol for v in formula.outputs)
+            self._formula_inputs[formula.id] = inputs
+            self._formula_outputs[formula.id] = outputs
+            if not inputs:
+                self._sourceless.add(formula.id)
+            for symbol in inputs:
+                self._consumers[symbol].add(formula.id)
+            for symbol in outputs:
+                self._producers[symbol].add(formula.id)
+        
+        self._index_version = self.graph.version
+    
+    def _relevant_formulas(self, output_vars: Set[str]) -> Set[str]:
+        """Formulas that can contribute to the targets (backward closure over producers)."""
+        relevant: Set[str] = set()
+        needed = list(output_vars)
+        seen_symbols = set(output_vars)
+        while needed:
+            symbol = needed.pop()
+            for fid in self._producers.get(symbol, ()):
+                if fid in relevant:
                     continue
-                
-                # Compute cost
-                step_cost = self._compute_step_cost(formula, prefer_fundamental, context)
-                new_cost = cost + step_cost
-                
-                # Add to queue
-                new_available = available_vars | formula_outputs
-                new_used = used_formulas | {formula.id}
-                new_state = (frozenset(new_available), frozenset(new_used))
-                new_sequence = sequence + [formula.id]
-                
-                heapq.heappush(pq, (new_cost, new_state, new_sequence))
+                relevant.add(fid)
+                for inp in self._formula_inputs[fid]:
+                    if inp not in seen_symbols:
+                        seen_symbols.add(inp)
+                        needed.append(inp)
+        return relevant
+    
+    def _reachable(self, input_vars: Set[str], candidates: Dict[str, float]) -> Set[str]:
+        """Symbols derivable from the inputs using the candidate formulas, ignoring order."""
+        known = set(input_vars)
+        frontier = list(known)
+        fired: Set[str] = set()
+        pending = [fid for fid in self._sourceless if fid in candidates]
+        while pending or frontier:
+            for fid in pending:
+                fired.add(fid)
+                for symbol in self._formula_outputs[fid]:
+                    if symbol not in known:
+                        known.add(symbol)
+                        frontier.append(symbol)
+            pending = []
+            while frontier:
+                symbol = frontier.pop()
+                for fid in self._consumers.get(symbol, ()):
+                    if (fid in candidates and fid not in fired
+                            and self._formula_inputs[fid] <= known):
+                        fired.add(fid)
+                        pending.append(fid)
+        return known
+    
+    def _newly_enabled(
+        self,
+        known: frozenset,
+        new_symbols: frozenset,
+        candidates: Dict[str, float],
+        initial: bool = False,
+    ) -> frozenset:
+        """Candidate formulas whose inputs became satisfied by new_symbols."""
+        enabled = set()
+        if initial:
+            enabled.update(fid for fid in self._sourceless if fid in candidates)
+        for symbol in new_symbols:
+            for fid in self._consumers.get(symbol, ()):
+                if fid in candidates and self._formula_inputs[fid] <= known:
+                    enabled.add(fid)
+        return frozenset(enabled)
+    
+    def _relaxed_cost(
+        self,
+        known: frozenset,
+        missing: Set[str],
+        step_costs: Dict[str, float],
+    ) -> float:
+        """
+        h_max relaxed-plan cost of deriving the missing symbols from known.
         
-        return plans
+        Ignoring that formulas are used once, a symbol costs its cheapest
+        producer plus that producer's most expensive input; the result is
+        the most expensive missing symbol (math.inf if unreachable). This
+        never exceeds the cost of a real plan, so it is admissible.
+        """
+        symbol_cost: Dict[str, float] = {}
+        waiting: Dict[str, int] = {}
+        input_cost: Dict[str, float] = {}
+        counter = itertools.count()
+        heap = [(0.0, next(counter), symbol) for symbol in known]
+        for fid in self._sourceless:
+            if fid in step_costs:
+                for symbol in self._formula_outputs[fid]:
+                    heap.append((step_costs[fid], next(counter), symbol))
+        heapq.heapify(heap)
+        
+        remaining = len(missing)
+        while heap:
+            cost, _, symbol = heapq.heappop(heap)
+            if symbol in symbol_cost:
+                continue
+            symbol_cost[symbol] = cost
+            if symbol in missing:
+                remaining -= 1
+                if remaining == 0:
+                    return cost  # popped in cost order, so this is the max
+            for fid in self._consumers.get(symbol, ()):
+                if fid not in step_costs:
+                    continue
+                left = waiting.get(fid, len(self._formula_inputs[fid])) - 1
+                waiting[fid] = left
+                input_cost[fid] = max(input_cost.get(fid, 0.0), cost)
+                if left == 0:
+                    out_cost = input_cost[fid] + step_costs[fid]
+                    for out in self._formula_outputs[fid]:
+                        if out not in symbol_cost:
+                            heapq.heappush(heap, (out_cost, next(counter), out))
+        return math.inf
+    
+    def _make_heuristic(
+        self,
+        output_vars: Set[str],
+        step_costs: Dict[str, float],
+    ):
+        """
+        Admissible estimates of the remaining (cost, steps) from known symbols.
+        
+        Cost is the relaxed-plan estimate, bounded below by (missing / most
+        outputs per formula) steps of the cheapest formula. Steps is the same
+        estimate with unit costs and lets the search prune branches that
+        cannot finish within max_steps. Memoized per known-symbol set.
+        """
+        unit_costs = dict.fromkeys(step_costs, 1.0)
+        min_cost = min(step_costs.values(), default=0.0)
+        max_outputs = max((len(self._formula_outputs[fid]) for fid in step_costs), default=1) or 1
+        memo: Dict[frozenset, Tuple[float, float]] = {}
+        
+        def heuristic(known: frozenset) -> Tuple[float, float]:
+            estimate = memo.get(known)
+            if estimate is not None:
+                return estimate
+            
+            missing = output_vars - known
+            if not missing:
+                estimate = (0.0, 0.0)
+            else:
+                by_count = math.ceil(len(missing) / max_outputs)
+                steps = max(self._relaxed_cost(known, missing, unit_costs), by_count)
+                if steps == math.inf:
+                    estimate = (math.inf, math.inf)
+                else:
+                    cost = max(self._relaxed_cost(known, missing, step_costs), by_count * min_cost)
+                    estimate = (cost, steps)
+            memo[known] = estimate
+            return estimate
+        
+        return heuristic
+    
+    # =========================================================================
+    # Plan Cache
+    # =========================================================================
+    
+    def _plan_cache_key(
+        self,
+        input_vars: Set[str],
+        output_vars: Set[str],
+        context: Dict[str, Any],
+        *options: Any,
+    ) -> Optional[Tuple]:
+        """Cache key for a search, or None if the context is not hashable."""
+        try:
+            context_key = frozenset(
+                (k, tuple(v) if isinstance(v, list) else v) for k, v in context.items()
+            )
+            key = (frozenset(input_vars), frozenset(output_vars), context_key, options)
+            hash(key)
+        except TypeError:
+            return None
+        return key
+    
+    def _plan_cache_get(self, key: Tuple) -> Optional[List[Tuple[Tuple[str, ...], float]]]:
+        """Cached search result for key, or None; drops the cache if the graph changed."""
+        if self._plan_cache_version != self.graph.version:
+            self._plan_cache.clear()
+            self._plan_cache_version = self.graph.version
+            return None
+        result = self._plan_cache.get(key)
+        if result is not None:
+            self._plan_cache.move_to_end(key)
+        return result
+    
+    def _plan_cache_put(self, key: Tuple, result: List[Tuple[Tuple[str, ...], float]]):
+        if self._plan_cache_version != self.graph.version:
+            self._plan_cache.clear()
+            self._plan_cache_version = self.graph.version
+        self._plan_cache[key] = result
+        if len(self._plan_cache) > self._plan_cache_size:
+            self._plan_cache.popitem(last=False)
     
     def _compute_step_cost(
         self,
@@ -0,0 +1,100 @@
+"""Unit tests for single-pass, memoized code validation."""
+
+from __future__ import annotations
+
+import ast
+import unittest
+
+from validators.code_validator import DEFAULT_RULES, CodeValidator, ValidationRule, analyze_code
+
+_SOURCE = '''
+import os
+from math import sqrt
+
+
+class Solver:
+    def run(self, values):
+        for value in values:
+            if value > 0 and value < 10:
+                eval("value")
+        return getattr(self, "__globals__")
+'''
+
+
+class _NameCounter(ValidationRule):
+    name = "names"
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def visit_Name(self, node: ast.Name) -> None:
+        self.count += 1
+
+    def result(self) -> int:
+        return self.count
+
+
+class TestCodeValidator(unittest.TestCase):
+    """Test the shared traversal, the analysis cache and batch validation."""
+
+    def test_one_traversal_serves_all_checks(self) -> None:
+        """Test violations, metrics and extra rules from one analysis."""
+        validator = CodeValidator()
+        is_valid, results = validator.validate_all(_SOURCE)
+
+        self.assertFalse(is_valid)
+        self.assertTrue(results["syntax_valid"])
+        self.assertFalse(results["safety_valid"])
+        self.assertEqual(results["complexity_metrics"]["cyclomatic_complexity"], 4)
+        self.assertEqual(results["complexity_metrics"]["max_nesting_depth"], 3)
+        self.assertEqual(
+            [(v["type"], v["line"]) for v in validator.get_violations(_SOURCE)],
+            [("dangerous_import", 2), ("dangerous_builtin", 10), ("dangerous_getattr", 11)],
+        )
+        self.assertEqual(validator.cache_misses, 1)
+
+        # Line endings do not change the analysis, so they share an entry
+        validator.validate_all(_SOURCE.replace("\n", "\r\n"))
+        self.assertEqual(validator.cache_misses, 1)
+
+        analysis = analyze_code(_SOURCE, rules=(_NameCounter,))
+        self.assertEqual(analysis["rules"], {"names": 7})
+
+    def test_validate_many_applies_time_budget(self) -> None:
+        """Test batch results, deduplication and snippets over budget."""
+        validator = CodeValidator()
+        large = "\n".join(f"x{i} = {i}" for i in range(5000))
+        codes = ["x = 1\n", "def f(:\n", "x = 1\n", large]
+
+        outcomes = validator.validate_many(codes, max_workers=1)
+        self.assertEqual([valid for valid, _ in outcomes], [True, False, True, True])
+        self.assertEqual(validator.cache_misses, 3)
+
+        validator.clear_cache()
+        valid, results = validator.validate_many([large], time_budget=0.0, max_workers=1)[0]
+        self.assertFalse(valid)
+        self.assertTrue(results["timed_out"])
+
+    def test_validate_many_large_batch(self) -> None:
+        """Test unpicklable rules and a batch larger than the cache."""
+        class LocalRule(ValidationRule):
+            name = "local"
+
+        validator = CodeValidator(rules=DEFAULT_RULES + (LocalRule,), cache_size=4)
+        codes = [f"x = {i}\n" for i in range(CodeValidator.PARALLEL_THRESHOLD + 8)]
+
+        outcomes = validator.validate_many(codes)
+        self.assertTrue(all(valid for valid, _ in outcomes))
+        # One analysis per snippet, none redone after LRU eviction
+        self.assertEqual(validator.cache_misses, len(codes))
+        self.assertEqual(len(validator._cache), 4)
+
+        # Pickling failures inside the pool also fall back to inline analysis
+        validator.clear_cache()
+        validator._rules_picklable = lambda: True
+        outcomes = validator.validate_many(codes + ["eval('1')\n"])
+        self.assertEqual([valid for valid, _ in outcomes], [True] * len(codes) + [False])
+
+
+if __name__ == "__main__":
+    unittest.main()
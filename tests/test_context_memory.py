@@ -62,6 +62,33 @@ class TestContextBubble(unittest.TestCase):
         self.assertEqual(result["bubble_id"], "test")
         self.assertIn("pathways", result)
 
+    def test_matching_agents_uses_constraints(self) -> None:
+        """Test that matching_only invokes only agents whose constraints hold."""
+        bubble = ContextBubble(bubble_id="test", content={})
+        for agent_id, constraints in (
+            ("free", []),
+            ("needs_a", ["has_a"]),
+            ("needs_ab", ["has_a", "has_b"]),
+        ):
+            bubble.add_micro_agent(
+                MicroAgent(agent_id=agent_id, blueprint={"constraints": constraints})
+            )
+
+        self.assertEqual(
+            [agent.agent_id for agent in bubble.matching_agents({"a": 1})],
+            ["free", "needs_a"],
+        )
+        bubble.process_with_agents({"a": 1}, matching_only=True)
+        self.assertEqual(
+            [agent.execution_count for agent in bubble.micro_agents], [1, 1, 0]
+        )
+
+        bubble.remove_micro_agent("needs_a")
+        self.assertEqual(
+            [agent.agent_id for agent in bubble.matching_agents({"a": 1, "b": 2})],
+            ["free", "needs_ab"],
+        )
+
 
 class TestMicroAgent(unittest.TestCase):
     """Test MicroAgent class."""
@@ -135,6 +162,31 @@ class TestContextTree(unittest.TestCase):
         self.assertIn("root", bubble_ids)
         self.assertIn("child", bubble_ids)
 
+    def test_subtree_queries_on_deep_tree(self) -> None:
+        """Test Euler-tour subtree queries past the recursion limit."""
+        tree = ContextTree()
+        length = 3000
+        parent = None
+        for i in range(length):
+            tree.add_bubble(ContextBubble(bubble_id=f"n{i}", content={}), parent_id=parent)
+            parent = f"n{i}"
+        tree.add_bubble(ContextBubble(bubble_id="side", content={}), parent_id="n1")
+
+        self.assertEqual(len(tree.get_subtree("n0")), length + 1)
+        self.assertEqual(tree.traverse_depth_first("n1")[:3], ["n1", "n2", "n3"])
+        self.assertTrue(tree.is_in_subtree("side", "n1"))
+        self.assertFalse(tree.is_in_subtree("side", "n2"))
+        self.assertEqual(tree.get_statistics()["max_depth"], length - 1)
+
+        tree.get_bubble("side").set_traffic_signal("n0", 0.5)
+        tree.get_bubble("side").add_micro_agent(MicroAgent(agent_id="agent", blueprint={}))
+        stats = tree.get_subtree_statistics("n0")
+        self.assertEqual(stats["num_bubbles"], length + 1)
+        self.assertEqual(stats["num_micro_agents"], 1)
+        self.assertEqual(stats["traffic_total"], 0.5)
+        self.assertEqual(stats["height"], length - 1)
+        self.assertEqual(tree.get_subtree_statistics("n2")["num_micro_agents"], 0)
+
 
 class TestTrafficAgent(unittest.TestCase):
     """Test TrafficAgent class."""
@@ -156,6 +208,25 @@ class TestTrafficAgent(unittest.TestCase):
 
         self.assertEqual(len(agent.pathways), 1)
 
+    def test_find_path_honors_max_depth(self) -> None:
+        """Test weighted shortest path, hop limit and signal-change invalidation."""
+        tree = ContextTree()
+        for bubble_id, parent in (("a", None), ("b", "a"), ("c", "b"), ("d", "c")):
+            tree.add_bubble(ContextBubble(bubble_id=bubble_id, content={}), parent_id=parent)
+        tree.get_bubble("a").set_traffic_signal("b", 1.0)
+        tree.get_bubble("b").set_traffic_signal("c", 1.0)
+        tree.get_bubble("c").set_traffic_signal("d", 1.0)
+        tree.get_bubble("a").set_traffic_signal("d", 0.0)
+        agent = TrafficAgent(tree)
+
+        # Three strong hops (cost ~2.7) beat one weak direct hop (cost 10)
+        self.assertEqual(agent.find_path("a", "d"), ["a", "b", "c", "d"])
+        self.assertEqual(agent.find_path("a", "d", max_depth=2), ["a", "d"])
+        self.assertIsNone(agent.find_path("b", "d", max_depth=1))
+
+        tree.get_bubble("a").set_traffic_signal("d", 1.0)
+        self.assertEqual(agent.find_path("a", "d"), ["a", "d"])
+
 
 class TestPathOptimizer(unittest.TestCase):
     """Test PathOptimizer class."""
@@ -199,6 +270,29 @@ class TestUsageTracker(unittest.TestCase):
 
         self.assertEqual(stats["total_usage"], 2)
 
+    def test_retention_and_hot_cold(self) -> None:
+        """Test bucket retention, inter-arrival stats and hot/cold ordering."""
+        now = [1_700_000_000.0]
+        tracker = UsageTracker(retention_days=1, clock=lambda: now[0])
+
+        for _ in range(60):
+            tracker.record_usage("old")
+            now[0] += 1800.0
+        for _ in range(3):
+            tracker.record_usage("new")
+            now[0] += 10.0
+        tracker.record_usage("rare")
+
+        old = tracker.get_pathway_statistics("old")
+        # 30 hours of half-hourly uses; expiry drops whole hours past one day
+        self.assertLessEqual(old["total_usage"], 50)
+        self.assertGreaterEqual(old["total_usage"], 48)
+        self.assertAlmostEqual(old["avg_time_between_usage"], 1800.0)
+        self.assertEqual(tracker.get_pathway_statistics("new")["recent_usage"], 3)
+
+        self.assertEqual([p["pathway"] for p in tracker.get_hot_pathways(2)], ["old", "new"])
+        self.assertEqual([p["pathway"] for p in tracker.get_cold_pathways(1)], ["rare"])
+
 
 if __name__ == "__main__":
     unittest.main()
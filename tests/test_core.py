@@ -14,6 +14,10 @@ Tests cover:
 import unittest
 import sys
 import os
+import json
+import subprocess
+import tempfile
+import numpy as np
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.engine import NeurosymboticEngine, NeuralComponent, SymbolicComponent, ProcessingMode
@@ -81,6 +85,44 @@ class TestNeuralComponent(unittest.TestCase):
         
         self.assertIsNotNone(result)
         self.assertGreater(result.confidence, 0.5)
+    
+    def test_embedding_stable_across_processes(self):
+        """Test that embeddings do not depend on the per-process hash seed."""
+        script = (
+            "import json, sys; sys.path.insert(0, %r); "
+            "from core.engine import NeuralComponent; "
+            "print(json.dumps(NeuralComponent(64).embed({'x': 1}).tolist()))"
+        ) % os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        outputs = set()
+        for seed in ("1", "2"):
+            env = dict(os.environ, PYTHONHASHSEED=seed)
+            completed = subprocess.run(
+                [sys.executable, "-c", script], env=env, capture_output=True, text=True
+            )
+            outputs.add(completed.stdout.strip().splitlines()[-1])
+        
+        self.assertEqual(len(outputs), 1)
+        np.testing.assert_allclose(json.loads(outputs.pop()), self.neural.embed({'x': 1}))
+    
+    def test_batch_embedding_and_pattern_persistence(self):
+        """Test batch embedding and saving/loading pattern memory."""
+        items = [{"a": i, "b": str(i)} for i in range(5)]
+        np.testing.assert_allclose(
+            self.neural.embed_batch(items), [self.neural.embed(item) for item in items]
+        )
+        
+        for i, item in enumerate(items):
+            self.neural.learn_pattern(f"p{i}", item, {"index": i})
+        
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "patterns.npz")
+            self.neural.save_patterns(path)
+            restored = NeuralComponent(embedding_dim=64)
+            self.assertEqual(restored.load_patterns(path), 5)
+        
+        result = restored.process(items[3])
+        self.assertEqual(result.metadata["matched_pattern"], "p3")
+        self.assertEqual(result.output, {"index": 3})
 
 
 class TestSymbolicComponent(unittest.TestCase):
@@ -268,6 +310,37 @@ class TestDeductiveReasoner(unittest.TestCase):
         
         self.assertTrue(result.confidence > 0)
         self.assertEqual(result.reasoning_type, ReasoningType.DEDUCTIVE)
+        # Two derivation rounds plus the one that finds nothing new
+        self.assertEqual(result.metadata['iterations'], 3)
+        self.assertEqual(result.metadata['literals_expanded'], 3)
+    
+    def test_confidence_propagation(self):
+        """Test that chains combine confidences with the t-norm, keeping the best."""
+        reasoner = DeductiveReasoner(t_norm="minimum")
+        reasoner.add_implication("P", "Q", 0.9)
+        reasoner.add_implication("Q", "R", 0.8)
+        reasoner.add_implication("P", "R", 0.5)
+        
+        result = reasoner.reason(["P"])
+        
+        self.assertAlmostEqual(reasoner.fact_confidence["R"], 0.8)
+        self.assertAlmostEqual(reasoner.implies("P", "R"), 0.8)
+        self.assertEqual(result.metadata["derivations"]["R"]["from"][0], "Q")
+    
+    def test_backward_query(self):
+        """Test goal-directed proof, including modus tollens."""
+        self.reasoner.add_implication("A", "B")
+        self.reasoner.add_implication("B", "C")
+        self.reasoner.add_implication("X", "Y")
+        self.reasoner.add_fact("A", True)
+        self.reasoner.add_fact("Y", False)
+        
+        result = self.reasoner.query("C")
+        self.assertEqual(result.conclusion, "C")
+        self.assertEqual(len(result.proof_steps), 3)
+        self.assertEqual(self.reasoner.query("¬X").conclusion, "¬X")
+        self.assertIsNone(self.reasoner.query("Y").conclusion)
+        self.assertNotIn("C", self.reasoner.facts)
 
 
 class TestInductiveReasoner(unittest.TestCase):
@@ -329,6 +402,36 @@ class TestInductiveReasoner(unittest.TestCase):
         
         self.assertEqual(result.reasoning_type, ReasoningType.INDUCTIVE)
         self.assertTrue(result.confidence > 0)
+    
+    def test_find_patterns_functional_and_periodic(self):
+        """Test log-space fits, FFT periodicity and pairwise correlation."""
+        observations = [
+            {"t": i, "growth": 2.0 * 1.1 ** i, "wave": float(np.sin(i * np.pi / 4)), "double": 2 * i}
+            for i in range(64)
+        ]
+        
+        patterns = self.reasoner.find_patterns(observations)
+        
+        forms = {p['key']: p for p in patterns if p['type'] == 'functional_form'}
+        self.assertEqual(forms['growth']['model'], 'exponential')
+        self.assertAlmostEqual(forms['growth']['params']['b'], np.log(1.1))
+        periodic = [p for p in patterns if p['type'] == 'periodic']
+        self.assertEqual([p['key'] for p in periodic], ['wave'])
+        self.assertAlmostEqual(periodic[0]['period'], 8.0)
+        self.assertTrue(any(p['type'] == 'correlation' and p['keys'] == ['t', 'double'] for p in patterns))
+    
+    def test_streaming_matches_batch(self):
+        """Test that streamed statistics give the same patterns as a batch."""
+        observations = [{"x": i, "y": 3 * i + 1, "label": "a" if i % 5 else "b"} for i in range(50)]
+        reasoner = InductiveReasoner(batch_size=7)
+        for observation in observations:
+            reasoner.add_observation(observation)
+        
+        streamed = reasoner.stream_patterns()
+        batch = self.reasoner.find_patterns(observations)
+        
+        self.assertEqual([(p['type'], p['key']) for p in streamed],
+                         [(p['type'], p['key']) for p in batch])
 
 
 class TestAbductiveReasoner(unittest.TestCase):
@@ -375,6 +478,31 @@ class TestAbductiveReasoner(unittest.TestCase):
         self.assertEqual(result.reasoning_type, ReasoningType.ABDUCTIVE)
         # Theory1 should be preferred (explains more, simpler, higher prior)
         self.assertIn("best_explanation", result.conclusion)
+    
+    def test_explanation_sets(self):
+        """Test that the cheapest joint explanation is found, greedy and exact."""
+        self.reasoner.add_hypothesis("Flu", ["fever", "cough"], 1, 0.6)
+        self.reasoner.add_hypothesis("Allergy", ["rash", "sneeze"], 1, 0.6)
+        self.reasoner.add_hypothesis("Rare", ["fever", "cough", "rash", "sneeze"], 3, 0.05)
+        self.reasoner.add_hypothesis("Cold", ["cough"], 1, 0.9)
+        observations = ["fever", "cough", "rash", "sneeze"]
+        
+        for exact in (False, True):
+            self.reasoner.exact = exact
+            result = self.reasoner.search.explain(observations, exact=exact)
+            best = result.sets[0]
+            self.assertEqual(sorted(best.hypotheses), ["Allergy", "Flu"])
+            self.assertEqual(sorted(best.explains), sorted(observations))
+            self.assertAlmostEqual(sum(e.score for e in result.sets), 1.0)
+        self.assertTrue(result.optimal)
+        
+        # reason() passes its generated hypotheses on to explain()
+        calls = []
+        generate = self.reasoner.generate_hypotheses
+        self.reasoner.generate_hypotheses = lambda obs: calls.append(obs) or generate(obs)
+        result = self.reasoner.reason(observations)
+        self.assertIn("explanation_sets", result.conclusion)
+        self.assertEqual(len(calls), 1)
 
 
 class TestAnalogicalReasoner(unittest.TestCase):
@@ -421,6 +549,23 @@ class TestAnalogicalReasoner(unittest.TestCase):
         
         self.assertEqual(result.reasoning_type, ReasoningType.ANALOGICAL)
         self.assertIn("transferred_knowledge", result.conclusion)
+    
+    def test_retrieve_and_map_analogue(self):
+        """Test library retrieval by fingerprint and optimal key mapping."""
+        self.reasoner.add_domain("solar", {
+            "sun": {"mass": 2e30}, "planet": {"mass": 6e24, "orbit": 1.5e11}, "force": "gravity"
+        })
+        self.reasoner.add_domain("gas", {"pressure": 1.0, "volume": 2.0, "temperature": 300})
+        self.reasoner.add_domain("circuit", {"voltage": 5, "current": 0.1, "label": "rc"})
+        target = {"nucleus": {"mass": 1.7e-27}, "electron": {"mass": 9.1e-31, "orbit": 5.3e-11}}
+        
+        best = self.reasoner.retrieve(target, k=1)[0]
+        
+        self.assertEqual(best["name"], "solar")
+        self.assertEqual(best["mapping"], {"sun": "nucleus", "planet": "electron"})
+        
+        result = self.reasoner.reason([{"target": target}])
+        self.assertEqual(result.metadata["retrieved_source"], "solar")
 
 
 class TestReasoningEngineImpl(unittest.TestCase):
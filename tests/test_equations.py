@@ -14,6 +14,8 @@ from __future__ import annotations
 
 import unittest
 
+import numpy as np
+
 from physics.equations import EquationParser, EquationSolver, SolveMethod
 
 
@@ -41,6 +43,15 @@ class TestEquationParser(unittest.TestCase):
         except RuntimeError:
             self.skipTest("SymPy not available")
 
+    def test_parse_cache(self) -> None:
+        """Test that equations differing only in whitespace share a parse."""
+        try:
+            first, _ = self.parser.parse("F = m * a")
+            second, _ = self.parser.parse("F=m*a")
+            self.assertIs(first, second)
+        except RuntimeError:
+            self.skipTest("SymPy not available")
+
     def test_get_physics_equation(self) -> None:
         """Test retrieving physics equations."""
         ke_eq = self.parser.get_physics_equation("kinetic_energy")
@@ -169,6 +180,15 @@ class TestEquationSolver(unittest.TestCase):
                 self.skipTest("SymPy not available")
             raise
 
+    def test_cached_solutions_are_checked(self) -> None:
+        """Test that cached general solutions are verified after substitution."""
+        # Warm the general-solution cache with a valid parameter first
+        self.assertEqual(self.solver.solve("sqrt(x) = a", {"a": 3.0}, solve_for="x").solutions, [9.0])
+        self.assertEqual(self.solver.solve("sqrt(x) = a", {"a": -1.0}, solve_for="x").solutions, [])
+
+        self.assertEqual(self.solver.solve("exp(x) = a", {"a": 1.0}, solve_for="x").solutions, [0.0])
+        self.assertEqual(self.solver.solve("exp(x) = a", {"a": -1.0}, solve_for="x").solutions, [])
+
 
 class TestPhysicsEquations(unittest.TestCase):
     """Tests for specific physics equations."""
@@ -203,5 +223,42 @@ class TestPhysicsEquations(unittest.TestCase):
             raise
 
 
+class TestBatchSolving(unittest.TestCase):
+    """Tests for vectorized solving over arrays of inputs."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures."""
+        self.solver = EquationSolver()
+
+    def test_closed_form_batch(self) -> None:
+        """Test closed-form solutions evaluated over arrays."""
+        result = self.solver.solve_batch(
+            "F = m * a", {"F": np.array([10.0, 20.0, 30.0]), "m": 2.0}, "a"
+        )
+        if result.method_used == "sympy_unavailable":
+            self.skipTest("SymPy not available")
+        self.assertEqual(result.method_used, "symbolic_vectorized")
+        np.testing.assert_allclose(result.solutions[0], [5.0, 10.0, 15.0])
+
+    def test_complex_branches_are_nan(self) -> None:
+        """Test that branches without a real root are NaN per element."""
+        result = self.solver.solve_batch("x**2 = y", {"y": np.array([4.0, -1.0])}, "x")
+        if result.method_used == "sympy_unavailable":
+            self.skipTest("SymPy not available")
+        roots = np.sort(np.array(result.solutions), axis=0)
+        np.testing.assert_allclose(roots[:, 0], [-2.0, 2.0])
+        self.assertTrue(np.all(np.isnan(roots[:, 1])))
+
+    def test_implicit_batch(self) -> None:
+        """Test implicit equations solved with the vectorized bracketing solver."""
+        a = np.array([0.5, 1.0, 2.0])
+        result = self.solver.solve_batch("x = cos(a*x)", {"a": a}, "x", bracket=(-2.0, 2.0))
+        if result.method_used == "sympy_unavailable":
+            self.skipTest("SymPy not available")
+        self.assertEqual(result.method_used, "numerical_vectorized")
+        x = result.solutions[0]
+        np.testing.assert_allclose(x, np.cos(a * x), atol=1e-9)
+
+
 if __name__ == "__main__":
     unittest.main()
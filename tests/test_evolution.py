@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import os
+import shutil
+import tempfile
 import unittest
 
 from evolution.code_generator import CodeGenerator
+from evolution.self_evolution import SelfEvolutionEngine
+from evolution.self_modification import SelfModifier
 
 
 class TestCodeGenerator(unittest.TestCase):
@@ -29,6 +34,52 @@ class TestCodeGenerator(unittest.TestCase):
         self.assertIn("def test_function", code)
         self.assertIn("x, y", code)
 
+    def test_generate_functions_validates_batch(self) -> None:
+        """Test batch generation and rejection of an unsafe function."""
+        specs = [{"name": f"f{i}", "parameters": ["x"], "body": "return x"} for i in range(3)]
+        codes = self.generator.generate_functions(specs)
+        self.assertEqual([c.split("(")[0] for c in codes], ["def f0", "def f1", "def f2"])
+
+        specs.append({"name": "bad", "body": "return eval('1')"})
+        with self.assertRaises(ValueError):
+            self.generator.generate_functions(specs)
+
+
+class TestBatchedCandidateValidation(unittest.TestCase):
+    """Tests for candidate batches validated through validate_many."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures."""
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_evolve_function_variants(self) -> None:
+        """Test that identical candidates are analysed once and all recorded."""
+        path = os.path.join(self.directory, "module.py")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("def f(x):\n    return x\n")
+
+        engine = SelfEvolutionEngine()
+        specs = [{"type": "optimize"}, {"type": "refactor"}, {"type": "optimize"}]
+        candidates = engine.evolve_function_variants(path, "f", specs)
+
+        self.assertEqual(len(candidates), 3)
+        self.assertEqual(engine.code_validator.cache_misses, 2)
+        self.assertEqual([c.version for c in engine.evolution_history], ["1.0.1", "1.0.2", "1.0.3"])
+
+    def test_modify_many_rejects_invalid_code(self) -> None:
+        """Test that only modifications with valid code are applied."""
+        modifier = SelfModifier()
+        applied = modifier.modify_many([
+            ("a.py", {"code": "x = 1\n"}),
+            ("b.py", {"code": "eval('1')\n"}),
+            ("c.py", {"description": "no new code"}),
+        ])
+        self.assertEqual(applied, [True, False, True])
+        self.assertFalse(modifier.modify_code("d.py", {"code": "def f(:\n"}))
+
 
 if __name__ == "__main__":
     unittest.main()
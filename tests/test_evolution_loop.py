@@ -0,0 +1,273 @@
+"""Unit tests for the staged EvolutionLoop cycle and incremental consistency."""
+
+from __future__ import annotations
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from substrate.critics.code_critic import CodePatch
+from substrate.critics.local_llm import LLMConfig, MockLLMBackend
+from substrate.critics.logic_critic import LogicCritic
+from substrate.evolution.evolution_loop import (
+    EvolutionAction,
+    EvolutionConfig,
+    EvolutionLoop,
+    EvolutionResult,
+    EvolutionType,
+    _CycleStage,
+)
+from substrate.graph.consistency import ConsistencyMonitor
+from substrate.graph.formula import Formula, FormulaLayer, FormulaStatus
+from substrate.graph.formula_graph import EdgeType, FormulaGraph
+from substrate.memory.reasoning_trace import ReasoningTrace, TraceStepType, TraceStore
+
+
+DERIVATION_TYPES = {
+    EdgeType.DERIVES_FROM, EdgeType.SPECIAL_CASE_OF,
+    EdgeType.GENERALIZES, EdgeType.DEPENDS_ON,
+}
+
+
+def _keyed(issues):
+    """Non-cycle issues as a comparable set."""
+    return {
+        (issue["type"], tuple(issue["formula_ids"]))
+        for issue in issues if issue["type"] != "derivation_cycle"
+    }
+
+
+class SlowLogicCritic(LogicCritic):
+    """Logic critic whose analysis blocks until released."""
+
+    def __init__(self, llm, graph):
+        super().__init__(llm, graph)
+        self.release = threading.Event()
+
+    def analyze(self, trace, **kwargs):
+        self.release.wait(5.0)
+        return []
+
+
+class TestConsistencyMonitor(unittest.TestCase):
+    """Test the incremental monitor against a full check_consistency()."""
+
+    def test_matches_full_check_under_random_changes(self) -> None:
+        """Test issues after every change against the full scan."""
+        rng = random.Random(3)
+        graph = FormulaGraph()
+        monitor = ConsistencyMonitor(graph)
+        ids = [f"f{i}" for i in range(8)]
+        edge_types = [EdgeType.DERIVES_FROM, EdgeType.DEPENDS_ON,
+                      EdgeType.CONTRADICTS, EdgeType.EQUIVALENT_TO]
+
+        for step in range(300):
+            op = rng.random()
+            fid, other = rng.sample(ids, 2)
+            if op < 0.25:
+                graph.add_formula(Formula(
+                    id=fid, name=fid, symbolic_form=f"{fid} = x",
+                    layer=rng.choice([FormulaLayer.FUNDAMENTAL, FormulaLayer.EFFECTIVE]),
+                    confidence=rng.choice([0.3, 0.9]),
+                    status=rng.choice([FormulaStatus.ACCEPTED, FormulaStatus.CANDIDATE]),
+                ), overwrite=True)
+            elif op < 0.35:
+                graph.remove_formula(fid)
+            elif op < 0.5:
+                graph.set_status(fid, rng.choice([FormulaStatus.ACCEPTED, FormulaStatus.CANDIDATE]))
+            elif op < 0.8:
+                if fid in graph and other in graph:
+                    graph.add_edge(fid, other, rng.choice(edge_types))
+            else:
+                edges = graph.get_edges_from(fid)
+                if edges:
+                    edge = rng.choice(edges)
+                    graph.remove_edge(edge.source_id, edge.target_id, edge.edge_type)
+
+            incremental = monitor.check()
+            full = graph.check_consistency()
+            with self.subTest(step=step):
+                self.assertEqual(_keyed(incremental), _keyed(full))
+                cycles = [i["formula_ids"] for i in incremental if i["type"] == "derivation_cycle"]
+                has_cycle = any(i["type"] == "derivation_cycle" for i in full)
+                self.assertEqual(bool(cycles), has_cycle)
+                for cycle in cycles:
+                    self.assertEqual(cycle[0], cycle[-1])
+                    for source, target in zip(cycle, cycle[1:]):
+                        self.assertTrue(any(
+                            e.target_id == target and e.edge_type in DERIVATION_TYPES
+                            for e in graph.get_edges_from(source)
+                        ))
+
+        self.assertEqual(monitor.last_checked_version, graph.version)
+        monitor.close()
+
+
+class TestEvolutionLoop(unittest.TestCase):
+    """Test the stage DAG, critic time budget, patch batching and test scoping."""
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.root = os.path.join(self.directory, "code base")
+        os.makedirs(os.path.join(self.root, "pkg"))
+        os.makedirs(os.path.join(self.root, "tests"))
+        self.graph = FormulaGraph()
+        self.store = TraceStore()
+        self.llm = MockLLMBackend(LLMConfig())
+        self.config = EvolutionConfig(
+            codebase_root=self.root,
+            backup_dir=os.path.join(self.directory, "backups"),
+            log_dir=os.path.join(self.directory, "logs"),
+            create_backups=False,
+            verbose=False,
+        )
+        self.loop = EvolutionLoop(self.config, self.graph, self.llm, self.store)
+
+    def tearDown(self) -> None:
+        self.loop.stop()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _write(self, rel_path: str, content: str) -> None:
+        with open(os.path.join(self.root, rel_path), "w") as f:
+            f.write(content)
+
+    def _read(self, rel_path: str) -> str:
+        with open(os.path.join(self.root, rel_path)) as f:
+            return f.read()
+
+    def test_stages_run_after_their_dependencies(self) -> None:
+        """Test DAG ordering, output passing and unsatisfiable dependencies."""
+        finished = []
+        lock = threading.Lock()
+
+        def stage(name, value):
+            def run(outputs):
+                time.sleep(0.01)
+                with lock:
+                    finished.append(name)
+                return value(outputs)
+            return run
+
+        stages = [
+            _CycleStage("c", stage("c", lambda out: out["a"] + out["b"]), deps=("a", "b")),
+            _CycleStage("a", stage("a", lambda out: 1)),
+            _CycleStage("b", stage("b", lambda out: 2)),
+            _CycleStage("d", stage("d", lambda out: out["c"] * 10), deps=("c",)),
+        ]
+        result = EvolutionResult(cycle_id="test", started_at=None)
+        outputs = self.loop._run_stages(stages, result)
+
+        self.assertEqual(outputs, {"a": 1, "b": 2, "c": 3, "d": 30})
+        self.assertEqual(finished[2:], ["c", "d"])
+        self.assertEqual(set(result.stage_timings_ms), {"a", "b", "c", "d"})
+
+        with self.assertRaises(RuntimeError):
+            self.loop._run_stages([_CycleStage("x", lambda out: None, deps=("missing",))], result)
+
+        cycle = self.loop.run_cycle()
+        self.assertEqual(
+            set(cycle.stage_timings_ms),
+            {"gather", "consistency", "critique", "trace_actions", "propose", "apply", "tests", "total"},
+        )
+
+    def test_critic_time_budget_drops_late_analyses(self) -> None:
+        """Test that late analyses are reported and retried in a later cycle."""
+        critic = SlowLogicCritic(self.llm, self.graph)
+        self.config.critic_time_budget_seconds = 0.05
+        loop = EvolutionLoop(self.config, self.graph, self.llm, self.store, logic_critic=critic)
+        trace = ReasoningTrace()
+        trace.add_step(TraceStepType.STEP_EXECUTED, "apply f", formula_id="f")
+        self.store.store(trace)
+        gathered = loop._stage_gather()
+
+        result = EvolutionResult(cycle_id="late", started_at=None)
+        self.assertEqual(loop._stage_critique(gathered, result), [])
+        self.assertEqual(result.timed_out, [f"{critic.critic_id}:{trace.id}"])
+
+        # Still in flight: not resubmitted until it finishes
+        result = EvolutionResult(cycle_id="busy", started_at=None)
+        loop._stage_critique(gathered, result)
+        self.assertEqual(result.timed_out, [])
+
+        critic.release.set()
+        deadline = time.time() + 5.0
+        while loop._critiques_in_flight and time.time() < deadline:
+            time.sleep(0.01)
+        result = EvolutionResult(cycle_id="done", started_at=None)
+        loop._stage_critique(gathered, result)
+        self.assertEqual(result.timed_out, [])
+        self.assertEqual(loop._critiqued[trace.id], 1)
+        loop.stop()
+
+    def test_failed_batch_is_reverted_and_retried_individually(self) -> None:
+        """Test that a failing batch reverts every patch and keeps the good ones."""
+        self._write("pkg/a.py", "A = 1\n")
+        self._write("pkg/b.py", "B = 1\n")
+        tested = []
+
+        def fake_tests(patched_files):
+            tested.append(sorted(patched_files))
+            return "Tests failed" if "BAD" in self._read("pkg/b.py") else None
+
+        self.loop._test_patches = fake_tests
+        actions = [
+            EvolutionAction(action_type=EvolutionType.PATCH_CODE, confidence=0.9,
+                            patch=CodePatch(file_path="pkg/a.py", old_code="A = 1", new_code="A = 2")),
+            EvolutionAction(action_type=EvolutionType.PATCH_CODE, confidence=0.9,
+                            patch=CodePatch(file_path="pkg/b.py", old_code="B = 1", new_code="B = 'BAD'")),
+        ]
+        result = EvolutionResult(cycle_id="batch", started_at=None)
+        untested = self.loop._stage_apply(actions, result)
+        self.assertEqual(len(untested), 2)
+        self.assertEqual(result.actions_applied, 0)
+
+        self.loop._stage_tests(untested, result)
+        self.assertEqual(tested, [["pkg/a.py", "pkg/b.py"], ["pkg/a.py"], ["pkg/b.py"]])
+        self.assertEqual(self._read("pkg/a.py"), "A = 2\n")
+        self.assertEqual(self._read("pkg/b.py"), "B = 1\n")
+        self.assertEqual([a.success for a in actions], [True, False])
+        self.assertEqual(actions[1].error_message, "Tests failed, reverted")
+        self.assertEqual((result.actions_applied, result.actions_succeeded), (2, 1))
+
+    def test_scoped_tests_follow_package_imports(self) -> None:
+        """Test selection through transitive and package imports, with spaces in paths."""
+        self._write("pkg/__init__.py", "from pkg.core import solve\n")
+        self._write("pkg/core.py", "def solve():\n    return 1\n")
+        self._write("pkg/core_extra.py", "X = 1\n")
+        self._write("pkg/other.py", "X = 1\n")
+        self._write("pkg/user.py", "from .core_extra import X\n")
+        self._write("tests/test_via_package.py", "from pkg import solve\n")
+        self._write("tests/test_via_user.py", "import pkg.user\n")
+        self._write("tests/test_mentions.py", "# pkg.core_extra is not imported\nimport json\n")
+        full = ["python", "-m", "pytest", "tests/", "-x"]
+
+        # Importing pkg.user runs pkg/__init__.py, which imports pkg.core
+        self.assertEqual(self.loop._scoped_test_command(["pkg/core.py"]), [
+            "python", "-m", "pytest", "-x",
+            os.path.join("tests", "test_via_package.py"),
+            os.path.join("tests", "test_via_user.py"),
+        ])
+        # Reached only through pkg.user's relative import; mentions don't count
+        self.assertEqual(self.loop._scoped_test_command(["pkg/core_extra.py"]),
+                         ["python", "-m", "pytest", "-x", os.path.join("tests", "test_via_user.py")])
+        self.assertEqual(self.loop._scoped_test_command(["pkg/other.py"]), full)
+
+        # Unknown imports or non-module files run everything
+        self.assertEqual(self.loop._scoped_test_command(["pkg/data.json"]), full)
+        self._write("pkg/broken.py", "def broken(:\n")
+        self.assertEqual(self.loop._scoped_test_command(["pkg/core.py"]), full)
+        os.remove(os.path.join(self.root, "pkg", "broken.py"))
+
+        # The working directory contains a space; the argv is passed through intact
+        self._write("tests/test_ok.py", "")
+        self.assertTrue(self.loop._run_tests([sys.executable, "-c", "import pkg.core"]))
+        self.assertFalse(self.loop._run_tests(f'"{sys.executable}" -c "import pkg.missing"'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""Unit tests for FormulaGraph path and derivation-chain search."""
+
+from __future__ import annotations
+
+import unittest
+
+from substrate.graph.formula import Formula, Variable
+from substrate.graph.formula_graph import EdgeType, FormulaGraph
+
+
+def _formula(formula_id: str, inputs, outputs) -> Formula:
+    return Formula(
+        id=formula_id,
+        name=formula_id,
+        symbolic_form=f"{formula_id}",
+        inputs=[Variable(name=s, symbol=s) for s in inputs],
+        outputs=[Variable(name=s, symbol=s) for s in outputs],
+    )
+
+
+class TestFormulaGraphSearch(unittest.TestCase):
+    """Test derivation chains and ranked path search."""
+
+    def test_derivation_chain_keeps_alternatives(self) -> None:
+        """Test that alternative providers reaching the same state all yield chains."""
+        graph = FormulaGraph()
+        for formula_id, output in (("P1", "x"), ("P2", "x"), ("Q1", "y"), ("Q2", "y")):
+            graph.add_formula(_formula(formula_id, ["m"], [output]))
+
+        chains = graph.find_derivation_chain({"m"}, {"x", "y"}, {})
+
+        self.assertEqual(len(chains), 4)
+        self.assertEqual(
+            {frozenset(chain) for chain in chains},
+            {frozenset(pair) for pair in (("P1", "Q1"), ("P1", "Q2"), ("P2", "Q1"), ("P2", "Q2"))},
+        )
+        self.assertEqual(len(graph.find_derivation_chain({"m"}, {"x", "y"}, {}, max_chains=3)), 3)
+        self.assertEqual(graph.find_derivation_chain({"m"}, {"x", "y"}, {}, max_chain_length=1), [])
+
+    def test_paths_are_ranked_shortest_first(self) -> None:
+        """Test that find_paths returns the shortest paths first."""
+        graph = FormulaGraph()
+        for formula_id in "abcd":
+            graph.add_formula(_formula(formula_id, [], []))
+        graph.add_edge("a", "b", EdgeType.DERIVES_FROM)
+        graph.add_edge("b", "c", EdgeType.DERIVES_FROM)
+        graph.add_edge("c", "d", EdgeType.DERIVES_FROM)
+        graph.add_edge("a", "d", EdgeType.DERIVES_FROM)
+
+        paths = graph.find_paths("a", "d")
+        self.assertEqual([[node for node, _ in path] for path in paths], [["a", "d"], ["a", "b", "c", "d"]])
+        self.assertEqual(len(graph.find_paths("a", "d", max_depth=1)), 1)
+
+    def test_weighted_paths_respect_hop_limit(self) -> None:
+        """Test that a cheaper but longer route does not hide one within max_depth."""
+        graph = FormulaGraph()
+        for formula_id in ("S", "A", "B", "T"):
+            graph.add_formula(_formula(formula_id, [], []))
+        graph.add_edge("S", "A", EdgeType.DERIVES_FROM, confidence=1.0)
+        graph.add_edge("A", "B", EdgeType.DERIVES_FROM, confidence=1.0)
+        graph.add_edge("S", "B", EdgeType.DERIVES_FROM, confidence=0.5)
+        graph.add_edge("B", "T", EdgeType.DERIVES_FROM, confidence=1.0)
+
+        paths = graph.k_shortest_paths("S", "T", weight="confidence", max_depth=2)
+        self.assertEqual([p.node_ids for p in paths], [["S", "B", "T"]])
+        paths = graph.k_shortest_paths("S", "T", weight="confidence", max_depth=3)
+        self.assertEqual([p.node_ids for p in paths], [["S", "A", "B", "T"], ["S", "B", "T"]])
+
+        # Spur searches get the hop limit minus the root length
+        graph.add_edge("S", "T", EdgeType.DERIVES_FROM, confidence=0.1)
+        paths = graph.k_shortest_paths("S", "T", weight="confidence", max_depth=2)
+        self.assertEqual([p.node_ids for p in paths], [["S", "B", "T"], ["S", "T"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""Unit tests for the index-driven A* FormulaPlanner."""
+
+from __future__ import annotations
+
+import heapq
+import random
+import unittest
+
+from substrate.graph.formula import Formula, FormulaLayer, Variable
+from substrate.graph.formula_graph import FormulaGraph
+from substrate.planner.formula_planner import FormulaPlanner
+
+
+def _formula(formula_id: str, inputs, outputs, layer=FormulaLayer.FUNDAMENTAL,
+             confidence: float = 1.0) -> Formula:
+    return Formula(
+        id=formula_id,
+        name=formula_id,
+        symbolic_form=formula_id,
+        inputs=[Variable(name=s, symbol=s) for s in inputs],
+        outputs=[Variable(name=s, symbol=s) for s in outputs],
+        layer=layer,
+        confidence=confidence,
+    )
+
+
+def _uniform_cost_search(planner, input_vars, output_vars, context, max_steps):
+    """Cheapest plan cost found by the original exhaustive uniform-cost search."""
+    pq = [(0.0, frozenset(input_vars), frozenset(), 0)]
+    visited = set()
+    while pq:
+        cost, available, used, steps = heapq.heappop(pq)
+        if output_vars <= available:
+            return cost
+        if (available, used) in visited or steps >= max_steps:
+            continue
+        visited.add((available, used))
+        for formula in planner.graph.get_all_formulas():
+            if formula.id in used or not formula.is_applicable(context)[0]:
+                continue
+            if not {v.symbol for v in formula.inputs} <= available:
+                continue
+            outputs = {v.symbol for v in formula.outputs}
+            if not outputs - available and not outputs & output_vars:
+                continue
+            step = planner._compute_step_cost(formula, True, context)
+            heapq.heappush(pq, (cost + step, available | outputs, used | {formula.id}, steps + 1))
+    return None
+
+
+class TestFormulaPlanner(unittest.TestCase):
+    """Test plan optimality against exhaustive search and plan caching."""
+
+    def test_best_plan_cost_matches_exhaustive_search(self) -> None:
+        """Test that A* finds the same cheapest plan cost on random graphs."""
+        rng = random.Random(7)
+        symbols = "abcdefgh"
+        layers = list(FormulaLayer)
+        for trial in range(40):
+            graph = FormulaGraph()
+            for i in range(rng.randint(4, 12)):
+                inputs = rng.sample(symbols, rng.randint(0, 2))
+                outputs = rng.sample([s for s in symbols if s not in inputs], rng.randint(1, 2))
+                graph.add_formula(_formula(
+                    f"f{i}", inputs, outputs,
+                    layer=rng.choice(layers), confidence=rng.choice([0.5, 0.8, 1.0]),
+                ))
+            planner = FormulaPlanner(graph)
+            knowns = set(rng.sample(symbols, 2))
+            targets = set(rng.sample([s for s in symbols if s not in knowns], rng.randint(1, 2)))
+
+            found = planner._search_plans(knowns, targets, {}, max_plans=3, max_steps=4,
+                                          prefer_fundamental=True)
+            expected = _uniform_cost_search(planner, knowns, targets, {}, max_steps=4)
+            with self.subTest(trial=trial):
+                if expected is None:
+                    self.assertEqual(found, [])
+                else:
+                    self.assertAlmostEqual(min(cost for _, cost in found), expected)
+
+    def test_plan_cache_invalidated_by_graph_changes(self) -> None:
+        """Test that cached plans are reused until the graph changes."""
+        graph = FormulaGraph()
+        graph.add_formula(_formula("slow_1", ["m"], ["p"], layer=FormulaLayer.APPROXIMATION))
+        graph.add_formula(_formula("slow_2", ["p"], ["E"], layer=FormulaLayer.APPROXIMATION))
+        planner = FormulaPlanner(graph)
+
+        first = planner.plan({"m": 1.0}, ["E"])
+        self.assertEqual(first[0].get_formula_sequence(), ["slow_1", "slow_2"])
+        self.assertEqual(len(planner._plan_cache), 1)
+        again = planner.plan({"m": 1.0}, ["E"])
+        self.assertEqual(again[0].get_formula_sequence(), ["slow_1", "slow_2"])
+        self.assertEqual(len(planner._plan_cache), 1)
+
+        graph.add_formula(_formula("direct", ["m"], ["E"], layer=FormulaLayer.AXIOM))
+        self.assertEqual(planner.plan({"m": 1.0}, ["E"])[0].get_formula_sequence(), ["direct"])
+
+        graph.remove_formula("direct")
+        graph.remove_formula("slow_2")
+        self.assertEqual(planner.plan({"m": 1.0}, ["E"]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+"""Unit tests for incremental dependency graph maintenance."""
+
+from __future__ import annotations
+
+import unittest
+
+from ai.nodal_vectorization.code_node import CodeNode
+from ai.nodal_vectorization.dependency_index import DependencyIndex
+from ai.nodal_vectorization.graph_builder import GraphBuilder
+
+
+def _node(name: str, *deps: str) -> CodeNode:
+    return CodeNode(file_path=f"{name}.py", node_id=name, dependencies=set(deps))
+
+
+class TestGraphBuilder(unittest.TestCase):
+    """Test order, cycles, components and closures across edits."""
+
+    def test_deep_chain_is_ordered_without_recursion(self) -> None:
+        """Test a chain longer than the recursion limit, added dependents first."""
+        index = DependencyIndex()
+        length = 5000
+        for i in range(length - 1):
+            index.add_edge(f"m{i}", f"m{i + 1}")
+
+        self.assertEqual(index.order(), [f"m{i}" for i in reversed(range(length))])
+        self.assertEqual(len(index.dependencies_of("m0")), length - 1)
+        self.assertEqual(len(index.dependents_of(f"m{length - 1}")), length - 1)
+        self.assertEqual(index.cycles(), [])
+
+        index.add_edge(f"m{length - 1}", "m0")
+        self.assertEqual(len(index.cycles()), 1)
+        self.assertIn("m0", index.dependencies_of("m0"))
+
+    def test_edits_update_cycles_components_and_impact(self) -> None:
+        """Test that queries reflect added, replaced and removed nodes."""
+        graph = GraphBuilder()
+        graph.add_node(_node("app", "db", "http"))
+        graph.add_node(_node("db", "util"))
+        graph.add_node(_node("http"))
+        graph.add_node(_node("util"))
+        graph.add_node(_node("tool"))
+
+        self.assertEqual(graph.get_all_dependencies("app"), {"db", "http", "util"})
+        self.assertEqual(graph.get_impact(["util"]), {"util", "db", "app"})
+        self.assertEqual(len(graph.get_connected_components()), 2)
+
+        graph.add_node(_node("util", "app"))
+        self.assertEqual(graph.detect_cycles(), [["app", "db", "util", "app"]])
+        self.assertIn("util", graph.get_all_dependencies("util"))
+
+        graph.add_node(_node("util", "tool"))
+        self.assertEqual(graph.detect_cycles(), [])
+        self.assertEqual(graph.get_impact(["tool"]), {"tool", "util", "db", "app"})
+        self.assertEqual(len(graph.get_connected_components()), 1)
+        order = graph.topological_sort()
+        self.assertLess(order.index("tool"), order.index("util"))
+        self.assertLess(order.index("db"), order.index("app"))
+
+        graph.remove_node("db")
+        self.assertEqual(graph.get_all_dependencies("app"), {"http"})
+        self.assertEqual(graph.get_dependents("util"), set())
+        graph.add_node(_node("db", "util"))
+        self.assertEqual(graph.get_all_dependencies("app"), {"db", "http", "util", "tool"})
+
+
+if __name__ == "__main__":
+    unittest.main()
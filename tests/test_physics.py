@@ -6,9 +6,11 @@ Tests for physics module.
 import unittest
 import sys
 import os
+import tempfile
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from physics.models import PhysicsModel
+from physics.knowledge.base import KnowledgeSnapshot
 
 
 class TestPhysicsModel(unittest.TestCase):
@@ -24,6 +26,47 @@ class TestPhysicsModel(unittest.TestCase):
         self.assertEqual(self.model.model_type, "test_model")
 
 
+class TestKnowledgeSnapshot(unittest.TestCase):
+    """Tests for the precompiled knowledge graph snapshot."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'knowledge.snap')
+        self.snapshot = KnowledgeSnapshot(self.path)
+    
+    def tearDown(self):
+        """Clean up temporary files."""
+        self.tmpdir.cleanup()
+    
+    def test_build_and_load_roundtrip(self):
+        """Test that a built snapshot loads back the same graph."""
+        built = self.snapshot.build()
+        loaded = self.snapshot.load()
+        self.assertIsNotNone(loaded)
+        self.assertEqual(loaded['graph']['statistics'], built['graph']['statistics'])
+        self.assertEqual(set(loaded['graph']['nodes']), set(built['graph']['nodes']))
+        self.assertEqual(loaded['graph']['outgoing'], built['graph']['outgoing'])
+        
+        loader = self.snapshot.restore_loader(loaded)
+        self.assertEqual(len(loader.nodes), built['graph']['statistics']['total_nodes'])
+    
+    def test_stale_snapshot_is_rejected(self):
+        """Test that a snapshot built from other sources is not loaded."""
+        self.snapshot.build()
+        self.assertTrue(self.snapshot.is_fresh())
+        self.assertIsNone(self.snapshot.load(source_hash='0' * 64))
+    
+    def test_corrupt_snapshot_is_rejected(self):
+        """Test that a foreign or truncated file is treated as a miss."""
+        with open(self.path, 'wb') as f:
+            f.write(b'not a snapshot')
+        self.assertIsNone(self.snapshot.load())
+        payload = self.snapshot.load_or_build()
+        self.assertIn('graph', payload)
+        self.assertIsNotNone(self.snapshot.load())
+
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,95 @@
+"""Unit tests for fused derivation-plan compilation."""
+
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+
+from substrate.critics.local_llm import LLMConfig, MockLLMBackend
+from substrate.execution.executor import FormulaExecutor
+from substrate.execution.plan_compiler import PlanCompiler
+from substrate.graph.formula import Formula, Variable
+from substrate.graph.formula_graph import FormulaGraph
+from substrate.interface.chatbot import ChatbotInterface
+from substrate.memory.reasoning_trace import ReasoningTrace, TraceStepType, TraceStore
+from substrate.planner.formula_planner import FormulaPlanner
+
+
+def _formula(formula_id: str, expr: str, inputs, output: str) -> Formula:
+    return Formula(
+        id=formula_id,
+        name=formula_id,
+        symbolic_form=expr,
+        inputs=[Variable(name=s, symbol=s) for s in inputs],
+        outputs=[Variable(name=output, symbol=output)],
+    )
+
+
+class TestPlanCompiler(unittest.TestCase):
+    """Test fused evaluation against per-step execution."""
+
+    def setUp(self) -> None:
+        self.graph = FormulaGraph()
+        self.graph.add_formula(_formula("speed", "Eq(v, d / t)", ["d", "t"], "v"))
+        self.graph.add_formula(_formula("momentum", "Eq(p, m * v)", ["m", "v"], "p"))
+        self.graph.add_formula(_formula("kinetic", "Eq(K, p**2 / (2 * m))", ["p", "m"], "K"))
+        self.executor = FormulaExecutor()
+        self.executor.bind_graph(self.graph)
+        self.compiler = PlanCompiler(self.graph, self.executor)
+        self.planner = FormulaPlanner(self.graph)
+
+    def _plan(self, inputs):
+        return self.planner.plan(inputs, ["K"], max_plans=1)[0]
+
+    def test_fused_grid_matches_per_step_execution(self) -> None:
+        """Test a grid evaluation against step-by-step scalar execution."""
+        rng = np.random.default_rng(1)
+        grid = {"d": rng.uniform(1, 10, 200), "t": rng.uniform(1, 5, 200), "m": 2.0}
+        plan = self._plan({"d": 1.0, "t": 1.0, "m": 1.0})
+        self.assertEqual(plan.get_formula_sequence(), ["speed", "momentum", "kinetic"])
+
+        fused = self.compiler.evaluate(plan, grid)["K"]
+        expected = []
+        for d, t in zip(grid["d"], grid["t"]):
+            variables = {"d": d, "t": t, "m": 2.0}
+            for formula_id in plan.get_formula_sequence():
+                variables.update(self.executor.evaluate_formula(self.graph.get_formula(formula_id), variables))
+            expected.append(variables["K"])
+        np.testing.assert_allclose(fused, expected, rtol=1e-12)
+
+        steps = self.compiler.evaluate(plan, {"d": 6.0, "t": 2.0, "m": 2.0}, include_steps=True)
+        self.assertEqual({k: float(v) for k, v in steps.items()}, {"K": 9.0, "v": 3.0, "p": 6.0})
+
+        # Cached per signature; an edited formula changes the signature
+        self.assertIs(self.compiler.compile(plan), self.compiler.compile(plan))
+        self.graph.add_formula(_formula("momentum", "Eq(p, 2 * m * v)", ["m", "v"], "p"), overwrite=True)
+        self.assertEqual(float(self.compiler.evaluate(plan, {"d": 6.0, "t": 2.0, "m": 2.0})["K"]), 36.0)
+
+    def test_chatbot_executes_plans_fused_with_fallback(self) -> None:
+        """Test that the chatbot path runs fused and falls back per step."""
+        chatbot = ChatbotInterface(
+            self.graph, MockLLMBackend(LLMConfig()), TraceStore(),
+            planner=self.planner, executor=self.executor, plan_compiler=self.compiler,
+        )
+        problem = {"inputs": {"d": 6.0, "t": 2.0, "m": 2.0}, "outputs": ["K"]}
+        plan = self._plan(problem["inputs"])
+
+        trace = ReasoningTrace()
+        result = chatbot._execute_plan(plan, problem, trace)
+        self.assertEqual(result["K"], 9.0)
+        self.assertEqual(result["all_variables"]["v"], 3.0)
+        executed = trace.get_steps_by_type(TraceStepType.STEP_EXECUTED)
+        self.assertEqual([s.formula_id for s in executed], ["speed", "momentum", "kinetic"])
+
+        # A step that cannot be compiled: the fused path bails out, other steps still run
+        self.graph.add_formula(_formula("kinetic", "Eq(K, )", ["p", "m"], "K"), overwrite=True)
+        trace = ReasoningTrace()
+        result = chatbot._execute_plan(plan, problem, trace)
+        self.assertIsNone(result["K"])
+        self.assertEqual(result["all_variables"]["p"], 6.0)
+        self.assertEqual(len(trace.get_steps_by_type(TraceStepType.STEP_FAILED)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""Unit tests for compiled rubric scoring and batch gating."""
+
+from __future__ import annotations
+
+import re
+import unittest
+
+import numpy as np
+
+from ai.rubric.definitions import CODE_RUBRIC
+from ai.rubric.quality_gate import QualityGate
+from ai.rubric import scoring_plan
+from ai.rubric.scoring_plan import KeywordPattern, ScannedText
+
+_RESPONSES = [
+    "",
+    "Short answer.",
+    (
+        "## Derivation\n\nWe assume a frictionless plane. Starting from Newton's second law, "
+        "F = ma, and conservation of energy, the speed is $v = \\sqrt{2 g h}$ [art_3f2a].\n\n"
+        "1. Energy is conserved.\n2. Therefore $m g h = \\frac{1}{2} m v^2$.\n"
+        "3. Thus $v = \\sqrt{2gh}$ = 9.9 m/s for h = 5 m.\n\n"
+        "**Check**: in the limiting case h -> 0 we recover v = 0, consistent with intuition."
+    ),
+    "```python\nimport os\nos.system('rm -rf /')\n```\nThis code is eval-free.",
+    "Die Schrödinger-Gleichung: NEWTON'S SECOND LAW gilt hier nicht (ſ, K).",
+]
+
+
+class TestRubricScoring(unittest.TestCase):
+    """Test that batch scoring reproduces per-response evaluation."""
+
+    def test_batch_matches_single_evaluation(self) -> None:
+        """Test matrix, dimension scores and verdicts against evaluate()."""
+        for gate in (QualityGate(), QualityGate(rubric=CODE_RUBRIC)):
+            matrix, verdicts = gate.evaluate_batch(_RESPONSES, max_workers=1)
+            self.assertEqual(matrix.scores.shape, (len(_RESPONSES), len(gate.rubric.questions)))
+
+            for i, content in enumerate(_RESPONSES):
+                decision = gate.evaluate(content)
+                report = decision.report
+                self.assertEqual(verdicts[i], decision.verdict)
+                self.assertEqual(matrix.overall[i], report.overall_score)
+                self.assertEqual(bool(matrix.all_gates_passed[i]), report.all_gates_passed)
+                for question in (q for d in report.dimensions.values() for q in d.question_scores):
+                    self.assertEqual(matrix.column(question.question_id)[i], question.score)
+                for name in matrix.dimensions:
+                    if name in report.dimensions:
+                        self.assertEqual(matrix.dimension(name)[i], report.dimensions[name].score)
+                    else:
+                        self.assertTrue(np.isnan(matrix.dimension(name)[i]))
+
+    def test_keywords_never_skip_a_match(self) -> None:
+        """Test keyword gating against plain regex scans, including case folding."""
+        cases = [
+            (r"conserv\w+\s+of\s+energy", re.IGNORECASE, ["CONSERVATION OF ENERGY", "conſervation of energy"]),
+            (r"\b(?:eV|MeV|GeV)\b", re.IGNORECASE, ["5 mev", "no units"]),
+            (r"(?:as|when)\s+\w+\s*(?:->|approaches)", re.IGNORECASE, ["As x -> 0", "x"]),
+            (r"\bos\.", 0, ["os.path", "OS.path"]),
+        ]
+        for pattern, flags, texts in cases:
+            gated = KeywordPattern(pattern, flags)
+            self.assertTrue(gated.keywords)
+            for text in texts:
+                self.assertEqual(
+                    ScannedText(text).findall(gated), re.findall(pattern, text, flags), (pattern, text)
+                )
+
+    def test_parser_failures_disable_the_prefilter(self) -> None:
+        """Test that patterns fall back to plain scans when literal extraction fails."""
+        class BrokenParser:
+            @staticmethod
+            def parse(pattern, flags):
+                raise AttributeError("parser internals changed")
+
+        class ForeignParser:
+            @staticmethod
+            def parse(pattern, flags):
+                return [(object(), 42)]
+
+        pattern, text = r"conserv\w+\s+of\s+energy", "Conservation of energy holds"
+        original = scoring_plan._sre_parse
+        self.addCleanup(setattr, scoring_plan, "_sre_parse", original)
+        for parser in (BrokenParser, ForeignParser, None):
+            scoring_plan._sre_parse = parser
+            gated = KeywordPattern(pattern, re.IGNORECASE)
+            self.assertIsNone(gated.keywords)
+            self.assertTrue(gated.may_match(ScannedText("unrelated")))
+            self.assertEqual(ScannedText(text).findall(gated), re.findall(pattern, text, re.IGNORECASE))
+
+
+if __name__ == "__main__":
+    unittest.main()
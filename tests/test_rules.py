@@ -19,6 +19,8 @@ from rules.rule_engine import (
     RuleEngine, Rule, RuleMatch, PatternMatcher, ActionExecutor,
     ConflictResolutionStrategy, ExecutionResult
 )
+from rules.action_compiler import ExpressionError
+from rules.rete_network import MISSING, refresh_snapshot
 
 
 class TestPatternMatcher(unittest.TestCase):
@@ -199,6 +201,23 @@ class TestActionExecutor(unittest.TestCase):
         result, _ = self.executor.execute(action, context, bindings)
         
         self.assertEqual(result['call_result'], 30)
+    
+    def test_expression_sandbox(self):
+        """Test that attribute access and unknown calls are rejected."""
+        for expression in ["().__class__", "x.real", "open('f')", "__import__('os')"]:
+            action = {'$compute': {'expression': expression, 'target': 'result'}}
+            with self.assertRaises(ExpressionError):
+                self.executor.prepare(action)
+            _, new_context = self.executor.execute(action, {'x': 1}, {})
+            self.assertIsNone(new_context['result'])
+    
+    def test_expression_dependencies(self):
+        """Test that prepare reports the names an action reads."""
+        action = {
+            '$compute': {'expression': 'max(x, y) * 2', 'target': 'result'},
+            '$set': {'label': 'value ${z}', 'copy': '$w'}
+        }
+        self.assertEqual(self.executor.prepare(action), frozenset({'x', 'y', 'z', 'w'}))
 
 
 class TestRule(unittest.TestCase):
@@ -469,5 +488,111 @@ class TestVariableBindingPropagation(unittest.TestCase):
         self.assertEqual(results[0].output.get('result'), 50)
 
 
+
+class TestIncrementalMatching(unittest.TestCase):
+    """Tests for matching across successive contexts."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.engine = RuleEngine(strategy=ConflictResolutionStrategy.ALL)
+        self.engine.add_rule({
+            'name': 'hot',
+            'condition': {'temp': {'$gt': 30}, 'unit': '$u'},
+            'action': {'set': {'state': 'hot'}}
+        })
+        self.engine.add_rule({
+            'name': 'joined',
+            'condition': {'a': '$x', 'b': '$x'},
+            'action': {'set': {'same': True}}
+        })
+    
+    def _names(self, context):
+        return [r.rule_name for r in self.engine.execute(context)]
+    
+    def test_matches_follow_context_changes(self):
+        """Test that changed and removed keys are re-evaluated."""
+        context = {'temp': 35, 'unit': 'C', 'a': 1, 'b': 2}
+        self.assertEqual(self._names(context), ['hot'])
+        
+        context['temp'] = 10
+        context['b'] = 1
+        self.assertEqual(self._names(context), ['joined'])
+        
+        del context['a']
+        context['temp'] = 40
+        results = self.engine.execute(context)
+        self.assertEqual([r.rule_name for r in results], ['hot'])
+        self.assertEqual(results[0].bindings, {'u': 'C'})
+    
+    def test_network_rebuilt_on_rule_changes(self):
+        """Test that enabling, disabling and adding rules take effect."""
+        context = {'temp': 35, 'unit': 'C', 'a': 1, 'b': 1}
+        self.assertEqual(self._names(context), ['hot', 'joined'])
+        
+        self.engine.disable_rule('hot')
+        self.assertEqual(self._names(context), ['joined'])
+        
+        self.engine.add_rule({
+            'name': 'always',
+            'condition': {},
+            'action': {'set': {'seen': True}}
+        })
+        self.assertEqual(self._names(context), ['joined', 'always'])
+    
+    def test_skip_unchanged(self):
+        """Test that rules are not re-fired while their inputs are unchanged."""
+        engine = RuleEngine(skip_unchanged=True)
+        engine.add_rule({
+            'name': 'scale',
+            'condition': {'temp': '$t'},
+            'action': {'$compute': {'expression': 't * factor', 'target': 'scaled'}}
+        })
+        context = {'temp': 2, 'factor': 3, 'other': 0}
+        self.assertEqual(len(engine.execute(context)), 1)
+        
+        context['other'] = 1
+        self.assertEqual(engine.execute(context), [])
+        
+        context['factor'] = 4
+        results = engine.execute(context)
+        self.assertEqual(results[0].output['scaled'], 8)
+        self.assertEqual(engine.rules[0].fire_count, 2)
+    
+    def test_invalid_expression_rejected(self):
+        """Test that rules with disallowed expressions are not added."""
+        added = self.engine.add_rule({
+            'name': 'bad',
+            'condition': {'x': 1},
+            'action': {'$compute': {'expression': 'x.__class__', 'target': 'y'}}
+        })
+        self.assertFalse(added)
+        self.assertEqual(len(self.engine.rules), 2)
+    
+    def test_nested_mutation_copies_changed_items_only(self):
+        """Test that an in-place change re-snapshots only the changed items."""
+        state = {'readings': [1, 2, 3], 'mode': {'name': 'idle'}}
+        _, snapshot = refresh_snapshot(MISSING, state)
+        
+        changed, same = refresh_snapshot(snapshot, state)
+        self.assertFalse(changed)
+        self.assertIs(same, snapshot)
+        
+        state['mode']['name'] = 'busy'
+        changed, updated = refresh_snapshot(snapshot, state)
+        self.assertTrue(changed)
+        self.assertIs(updated.items['readings'], snapshot.items['readings'])
+        self.assertIsNot(updated.items['mode'], snapshot.items['mode'])
+        
+        self.engine.add_rule({
+            'name': 'busy',
+            'condition': {'state': {'mode': {'name': 'busy'}}},
+            'action': {'set': {'working': True}}
+        })
+        context = {'state': state}
+        self.assertEqual(self._names(context), ['busy'])
+        state['mode']['name'] = 'idle'
+        self.assertEqual(self._names(context), [])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,85 @@
+"""Unit tests for the shared source analysis cache."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+
+from utilities.source_analysis import SourceAnalysisCache, analyze_source
+
+_SOURCE = '''
+import os
+from collections import deque
+
+
+class Queue:
+    def push(self, item, seen=[]):
+        if item == None:
+            return
+        try:
+            seen.append(item)
+        except:
+            pass
+
+
+def join(parts):
+    out = ""
+    for part in parts:
+        out += part
+    return out
+'''
+
+
+class TestSourceAnalysis(unittest.TestCase):
+    """Test single-pass facts and content-hash caching."""
+
+    def test_facts_from_one_pass(self) -> None:
+        """Test structure, metrics and findings of a small module."""
+        facts = analyze_source(_SOURCE)
+
+        self.assertIsNone(facts["syntax_error"])
+        self.assertEqual(facts["functions"], ["join", "push"])  # ast.walk order
+        self.assertEqual(facts["classes"], ["Queue"])
+        self.assertEqual(facts["imports"], ["collections", "os"])
+        self.assertEqual(facts["complexity"], 4)
+        self.assertEqual(
+            {(f["check"], f["issue_type"]) for f in facts["findings"]},
+            {
+                ("bugs", "mutable_default"),
+                ("bugs", "none_comparison"),
+                ("bugs", "bare_except"),
+                ("performance", "string_concat_loop"),
+            },
+        )
+
+        broken = analyze_source("def f(:\n    pass\n")
+        self.assertEqual(broken["syntax_error"]["lineno"], 1)
+
+    def test_cache_reanalyses_only_changed_files(self) -> None:
+        """Test that a reloaded cache parses only the edited file."""
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for i in range(3):
+                path = os.path.join(directory, f"module_{i}.py")
+                with open(path, "w") as f:
+                    f.write(f"def f{i}():\n    return {i}\n")
+                paths.append(path)
+            cache_path = os.path.join(directory, "cache.json")
+
+            cache = SourceAnalysisCache(cache_path)
+            cache.analyze_many(paths)
+            cache.save()
+            self.assertEqual(cache.misses, 3)
+
+            with open(paths[1], "a") as f:
+                f.write("\ndef extra():\n    pass\n")
+
+            reloaded = SourceAnalysisCache(cache_path)
+            facts = reloaded.analyze_many(paths)
+            self.assertEqual((reloaded.hits, reloaded.misses), (2, 1))
+            self.assertEqual(facts[os.path.abspath(paths[1])]["functions"], ["f1", "extra"])
+
+
+if __name__ == "__main__":
+    unittest.main()
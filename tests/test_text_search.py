@@ -0,0 +1,116 @@
+"""Unit tests for the shared inverted-index text search."""
+
+from __future__ import annotations
+
+import unittest
+
+from physics.knowledge.reasoning.reasoner import PhysicsReasoner
+from physics.knowledge.reasoning.tree_index import NodeType, PhysicsTreeIndex
+from substrate.graph.formula import Formula, Variable
+from substrate.graph.formula_graph import FormulaGraph
+from utilities.text_search import TextIndex, tokenize
+
+
+def _formula(formula_id: str, name: str, form: str, domain: str, *symbols: str) -> Formula:
+    return Formula(
+        id=formula_id,
+        name=name,
+        symbolic_form=form,
+        domain=domain,
+        inputs=[Variable(name=s, symbol=s) for s in symbols],
+    )
+
+
+class TestTokenizer(unittest.TestCase):
+    """Test physics-aware tokenization."""
+
+    def test_notation_is_normalized(self) -> None:
+        """Test greek letters, LaTeX, subscripts, accents and stopwords."""
+        self.assertEqual(tokenize("E_{kin}"), ["e_kin", "e", "kin"])
+        self.assertEqual(tokenize(r"\omega_0 \cdot t"), ["omega_0", "omega", "t"])
+        self.assertEqual(tokenize("ω₀"), ["omega_0", "omega"])
+        self.assertEqual(tokenize("Schrödinger equation"), ["schrodinger", "equation"])
+        self.assertEqual(tokenize("the energy of a mass"), ["energy", "mass"])
+        self.assertEqual(tokenize(r"\frac{1}{2} m v^{2}"), ["m", "v"])
+        self.assertEqual(tokenize(""), [])
+
+
+class TestTextIndex(unittest.TestCase):
+    """Test BM25 ranking, expansion and incremental updates."""
+
+    def setUp(self) -> None:
+        self.index = TextIndex({"title": 3.0, "body": 1.0})
+        self.index.add("kinetic", {"title": "Kinetic energy", "body": "energy of motion"})
+        self.index.add("potential", {"title": "Potential energy", "body": "stored energy"})
+        self.index.add("momentum", {"title": "Momentum", "body": ["mass", "velocity"]})
+
+    def test_ranking_and_field_weights(self) -> None:
+        """Test that title matches outrank body matches."""
+        hits = self.index.search("kinetic energy")
+        self.assertEqual(hits[0][0], "kinetic")
+        self.assertEqual({doc for doc, _ in hits}, {"kinetic", "potential"})
+
+        title_hit = self.index.score("velocity")["momentum"]
+        self.index.add("velocity", {"title": "Velocity"})
+        self.assertGreater(self.index.score("velocity")["velocity"], title_hit)
+
+    def test_prefix_and_fuzzy_expansion(self) -> None:
+        """Test prefix completion and edit-distance-1 matching."""
+        self.assertEqual(self.index.search("moment")[0][0], "momentum")
+        self.assertEqual(self.index.search("kinetik")[0][0], "kinetic")
+        self.assertEqual(self.index.search("kinetik", fuzzy=False), [])
+        self.assertEqual(self.index.search("mo", prefix=True), [])  # below min length
+
+    def test_update_and_remove(self) -> None:
+        """Test that replaced and removed documents leave no postings behind."""
+        vocabulary = self.index.vocabulary_size
+        self.index.add("kinetic", {"title": "Kinetic energy", "body": "energy of motion"})
+        self.assertEqual(self.index.vocabulary_size, vocabulary)
+
+        self.assertTrue(self.index.remove("momentum"))
+        self.assertFalse(self.index.remove("momentum"))
+        self.assertEqual(self.index.search("momentum", fuzzy=False), [])
+        self.assertNotIn("velocity", self.index.score("velocity"))
+        self.assertEqual(len(self.index), 2)
+
+        candidates = self.index.search("energy", candidates={"potential"})
+        self.assertEqual([doc for doc, _ in candidates], ["potential"])
+
+
+class TestFormulaSearch(unittest.TestCase):
+    """Test FormulaGraph.search and tree-node relevance."""
+
+    def test_formula_search_tracks_graph(self) -> None:
+        """Test domain filtering and index maintenance on add/remove."""
+        graph = FormulaGraph()
+        graph.add_formula(_formula("newton2", "Newton's second law", "F = m * a", "classical", "m", "a"))
+        graph.add_formula(_formula("mass_energy", "Mass-energy equivalence", "E = m * c**2", "relativity", "m", "c"))
+
+        self.assertEqual([f.id for f, _ in graph.search("newton")], ["newton2"])
+        self.assertEqual([f.id for f, _ in graph.search("mass", domain="classical")], [])
+        self.assertEqual([f.id for f, _ in graph.search("mass", domain="relativity")], ["mass_energy"])
+
+        graph.remove_formula("newton2")
+        self.assertEqual(graph.search("newton"), [])
+        graph.add_formula(_formula("hooke", "Hooke's law", "F = -k * x", "classical", "k", "x"))
+        self.assertEqual([f.id for f, _ in graph.search("hooke")], ["hooke"])
+
+    def test_relevance_is_absolute(self) -> None:
+        """Test that node relevance does not depend on the query's top hit."""
+        tree = PhysicsTreeIndex()
+        tree.add_domain("mechanics", "Mechanics", "Motion of bodies", ["force"])
+        tree.add_node("newton", "Newton's second law", NodeType.EQUATION, "mechanics",
+                      summary="Force equals mass times acceleration", keywords=["force"])
+        tree.add_node("friction", "Friction", NodeType.CONCEPT, "mechanics",
+                      summary="Resisting force between surfaces")
+        reasoner = PhysicsReasoner(tree)
+
+        strong = reasoner._relevance_score(tree.get_node("newton"), "newton second law")
+        weak = reasoner._relevance_score(tree.get_node("friction"), "surfaces")
+        self.assertGreater(strong, 0.3)
+        self.assertLess(weak, 0.3)  # the only hit, yet below the floor
+        self.assertEqual(tree.search_scores("surfaces").keys(), {"friction"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+"""Unit tests for TraceStore indexes and the on-disk TraceLog."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from substrate.memory.reasoning_trace import (
+    CriticAnnotation,
+    ReasoningTrace,
+    TraceStepType,
+    TraceStore,
+)
+from substrate.memory.trace_log import TraceLog
+
+
+def _trace(formula_id: str, success: bool = True, confidence: float = 1.0,
+           domain: str = "mechanics") -> ReasoningTrace:
+    trace = ReasoningTrace(domain=domain)
+    trace.add_step(TraceStepType.STEP_EXECUTED, f"apply {formula_id}",
+                   formula_id=formula_id, confidence=confidence)
+    trace.complete({"ok": success}, success=success)
+    return trace
+
+
+def _annotation(severity: str = "error") -> CriticAnnotation:
+    return CriticAnnotation(
+        critic_id="logic_critic",
+        critic_type="logic",
+        step_ids=["s1"],
+        issue_type="inconsistency",
+        severity=severity,
+        message="units do not match",
+    )
+
+
+class TestTraceStoreIndexes(unittest.TestCase):
+    """Test that the secondary indexes follow stores, changes and evictions."""
+
+    def test_indexes_follow_changes_and_eviction(self) -> None:
+        """Test failed, low-confidence and issue indexes against a scan."""
+        store = TraceStore(max_buffer_size=3)
+        good = _trace("f_good", confidence=0.9)
+        weak = _trace("f_weak", confidence=0.2)
+        failed = _trace("f_failed", success=False, confidence=0.6)
+        for trace in (good, weak, failed):
+            store.store(trace)
+
+        self.assertEqual(store.get_failed(), [failed])
+        self.assertEqual(store.get_low_confidence(0.5), [weak])
+        self.assertEqual(store.get_with_issues(), [])
+
+        # Annotating a stored trace updates the issue index via its callback
+        good.add_annotation(_annotation())
+        self.assertEqual(store.get_with_issues(), [good])
+        good.add_annotation(_annotation(severity="info"))
+        self.assertEqual(len(store.get_with_issues()), 1)
+
+        # Directly assigned fields need reindex()
+        good.overall_confidence = 0.1
+        store.reindex(good.id)
+        self.assertEqual(store.get_low_confidence(0.5), [good, weak])
+
+        stats = store.statistics()
+        self.assertEqual(stats["count"], 3)
+        self.assertEqual(stats["failed_traces"], 1)
+        self.assertAlmostEqual(stats["success_rate"], 2 / 3)
+        self.assertAlmostEqual(stats["min_confidence"], 0.1)
+
+        # Evicting the oldest trace drops it from every index
+        store.store(_trace("f_new", confidence=0.95))
+        self.assertIsNone(store.get(good.id))
+        self.assertEqual(store.get_with_issues(), [])
+        self.assertEqual(store.get_low_confidence(0.5), [weak])
+        self.assertEqual(store.statistics()["traces_with_issues"], 0)
+
+
+class TestTraceLog(unittest.TestCase):
+    """Test log queries, compaction and recovery from torn writes."""
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "traces.log")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_round_trip_keeps_annotations(self) -> None:
+        """Test that traces read back from the log keep critic annotations."""
+        trace = _trace("newton")
+        trace.add_annotation(_annotation())
+        restored = ReasoningTrace.from_dict(trace.to_dict())
+        self.assertEqual([a.to_dict() for a in restored.annotations],
+                         [a.to_dict() for a in trace.annotations])
+
+        log = TraceLog(self.path, compact_every=0)
+        log.append(trace)
+        [logged] = log.query(formula_id="newton")
+        log.close()
+        self.assertEqual(logged.annotations[0].message, "units do not match")
+        self.assertEqual(logged.get_issues(), trace.get_issues())
+
+    def test_query_filters_and_latest_line_wins(self) -> None:
+        """Test index filters, limit, and re-logged traces."""
+        log = TraceLog(self.path, compact_every=0)
+        old = _trace("newton", confidence=0.4)
+        old.created_at = datetime.now() - timedelta(days=10)
+        recent = _trace("newton", success=False)
+        other = _trace("coulomb", domain="electromagnetism")
+        for trace in (old, recent, other):
+            log.append(trace)
+
+        week_ago = datetime.now() - timedelta(days=7)
+        self.assertEqual([t.id for t in log.query(formula_id="newton")], [old.id, recent.id])
+        self.assertEqual([t.id for t in log.query(formula_id="newton", since=week_ago)], [recent.id])
+        self.assertEqual([t.id for t in log.query(until=week_ago)], [old.id])
+        self.assertEqual([t.id for t in log.query(domain="electromagnetism")], [other.id])
+        self.assertEqual([t.id for t in log.query(success=False)], [recent.id])
+        self.assertEqual([t.id for t in log.query(max_confidence=0.5)], [old.id])
+        self.assertEqual([t.id for t in log.query(limit=1)], [other.id])
+
+        # A re-logged trace replaces its earlier line
+        recent.add_annotation(_annotation())
+        log.append(recent)
+        hits = log.query(success=False)
+        self.assertEqual(len(hits), 1)
+        self.assertEqual(len(hits[0].annotations), 1)
+        log.close()
+
+    def test_compaction_keeps_latest_and_applies_retention(self) -> None:
+        """Test that compaction keeps the latest line per trace within retention."""
+        log = TraceLog(self.path, compact_every=0, retention_days=7)
+        expired = _trace("newton")
+        expired.created_at = datetime.now() - timedelta(days=30)
+        kept = _trace("hooke")
+        for trace in (expired, kept):
+            log.append(trace)
+        kept.add_annotation(_annotation())
+        log.append(kept)
+
+        self.assertEqual(log.compact(), {"kept": 1, "dropped": 2})
+        self.assertEqual(log.stats()["generation"], 1)
+        reopened = TraceLog(self.path, compact_every=0)
+        [trace] = reopened.query()
+        self.assertEqual(trace.id, kept.id)
+        self.assertEqual(len(trace.annotations), 1)
+
+        # Automatic compaction after compact_every appends
+        auto = TraceLog(self.path, compact_every=2)
+        auto.append(kept)
+        auto.append(kept)
+        self.assertEqual(auto.stats()["generation"], 2)
+        self.assertEqual(len(auto.query()), 1)
+        auto.close()
+
+    def test_torn_index_tail_is_cut_before_appending(self) -> None:
+        """Test that a half-written index entry does not swallow the next one."""
+        log = TraceLog(self.path, compact_every=0)
+        first = _trace("newton")
+        log.append(first)
+        log.append(_trace("hooke"))
+        log.close()
+
+        # Simulate a crash while writing the second index entry
+        index_path = log._index_path()
+        size = os.path.getsize(index_path)
+        with open(index_path, "r+b") as f:
+            f.truncate(size - 10)
+        self.assertEqual([t.id for t in TraceLog(self.path).query()], [first.id])
+
+        log = TraceLog(self.path, compact_every=0)
+        third = _trace("coulomb")
+        log.append(third)
+        self.assertEqual([t.id for t in log.query()], [first.id, third.id])
+        log.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""Unit tests for the nodal vector store."""
+
+from __future__ import annotations
+
+import tempfile
+import unittest
+
+import numpy as np
+
+from ai.nodal_vectorization.code_node import CodeNode
+from ai.nodal_vectorization.vector_store import VectorStore
+
+
+class TestVectorStore(unittest.TestCase):
+    """Test VectorStore search and persistence."""
+
+    def setUp(self) -> None:
+        rng = np.random.default_rng(0)
+        self.embeddings = rng.normal(size=(50, 8))
+        self.store = VectorStore(embedding_dim=8)
+        self.nodes = [CodeNode(file_path=f"module_{i}.py") for i in range(50)]
+        for node, embedding in zip(self.nodes, self.embeddings):
+            self.store.add_node(node, list(embedding))
+
+    def _brute_force(self, query: np.ndarray, top_k: int) -> list:
+        unit = self.embeddings / np.linalg.norm(self.embeddings, axis=1, keepdims=True)
+        scores = unit @ (query / np.linalg.norm(query))
+        order = np.argsort(-scores)[:top_k]
+        return [self.nodes[i].node_id for i in order]
+
+    def test_find_similar_matches_brute_force(self) -> None:
+        """Test top-k search against an exhaustive cosine ranking."""
+        query = self.embeddings[7] + 0.1
+        results = self.store.find_similar(query, top_k=5)
+
+        self.assertEqual([node_id for node_id, _ in results], self._brute_force(query, 5))
+        self.assertEqual(
+            self.store.find_similar_to_node(self.nodes[7].node_id, top_k=1)[0][0],
+            self._brute_force(self.embeddings[7], 2)[1],
+        )
+
+    def test_batch_and_index_search(self) -> None:
+        """Test batched queries and the approximate index on the same data."""
+        queries = self.embeddings[:3]
+        batch = self.store.find_similar_batch(queries, top_k=3)
+
+        self.assertEqual(len(batch), 3)
+        for i, results in enumerate(batch):
+            self.assertEqual(results[0][0], self.nodes[i].node_id)
+            self.assertAlmostEqual(results[0][1], 1.0, places=5)
+
+        # Probing every list makes the index exact
+        self.store.build_index(n_lists=4, n_probe=4)
+        indexed = self.store.find_similar_batch(queries, top_k=3)
+        for exact, approximate in zip(batch, indexed):
+            self.assertEqual([n for n, _ in approximate], [n for n, _ in exact])
+            np.testing.assert_allclose(
+                [s for _, s in approximate], [s for _, s in exact], rtol=1e-6
+            )
+
+    def test_save_and_load_mmap(self) -> None:
+        """Test that a memory-mapped reload searches identically and stays writable."""
+        query = self.embeddings[3]
+        expected = self.store.find_similar(query, top_k=5)
+
+        with tempfile.TemporaryDirectory() as directory:
+            self.store.save(directory)
+            loaded = VectorStore.load(directory, mmap=True)
+
+            self.assertEqual(loaded.size(), 50)
+            self.assertEqual(loaded.find_similar(query, top_k=5), expected)
+            np.testing.assert_allclose(
+                loaded.get_embedding(self.nodes[3].node_id), query, rtol=1e-5
+            )
+
+            loaded.add_node(CodeNode(file_path="extra.py"), list(query))
+            self.assertEqual(loaded.size(), 51)
+            del loaded
+
+    def test_save_without_index_drops_stale_index(self) -> None:
+        """Test that saving an unindexed store removes an earlier save's index."""
+        with tempfile.TemporaryDirectory() as directory:
+            self.store.build_index(n_lists=4, n_probe=4)
+            self.store.save(directory)
+            self.assertIsNotNone(VectorStore.load(directory, mmap=False)._index)
+
+            self.store.clear()
+            for node, embedding in zip(self.nodes[:10], self.embeddings[:10]):
+                self.store.add_node(node, list(embedding))
+            self.store.save(directory)
+            loaded = VectorStore.load(directory, mmap=False)
+
+            self.assertIsNone(loaded._index)
+            self.assertEqual(loaded.find_similar(self.embeddings[2], top_k=1)[0][0],
+                             self.nodes[2].node_id)
+
+
+if __name__ == "__main__":
+    unittest.main()
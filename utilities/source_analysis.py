@@ -0,0 +1,446 @@
+"""
+PATH: utilities/source_analysis.py
+PURPOSE: Shared, content-hash-cached static analysis of Python source files
+
+WHY: CodeCritic re-parsed a file once per check and NodeAnalyzer re-parsed
+     every file of a directory on every run. This module parses each file
+     once per content hash, collects everything both consumers need in a
+     single AST visitor pass, and caches the JSON-serialisable result on disk
+     so unchanged files are never read again.
+
+FLOW:
+┌───────────┐    ┌──────────────┐  miss  ┌───────────────┐    ┌────────────┐
+│ paths     │───>│ stat / sha256│───────>│ parse + one   │───>│ disk cache │
+│           │    │ cache lookup │        │ visitor pass  │    │ (JSON)     │
+└───────────┘    └──────────────┘        │ (process pool)│    └────────────┘
+                        │ hit            └───────────────┘
+                        └──────────────> facts dict
+
+CACHE KEY:
+    (absolute path, sha256 of content, ANALYSIS_VERSION)
+    A file whose size and mtime are unchanged is not even re-hashed.
+    Bump ANALYSIS_VERSION whenever the facts produced here change.
+
+DEPENDENCIES:
+- None (standard library only)
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+ANALYSIS_VERSION = 1
+
+# Thresholds matching CodeCritic's historical checks
+MAX_CYCLOMATIC = 15
+MAX_NESTING = 5
+MAX_LINE_LENGTH = 120
+
+# Fewer misses than this are analysed in-process (pool startup costs more)
+PARALLEL_THRESHOLD = 16
+
+# Nodes adding a decision point, per consumer
+_CRITIC_DECISIONS = (ast.If, ast.While, ast.For, ast.ExceptHandler)
+_MODULE_DECISIONS = (ast.If, ast.While, ast.For, ast.AsyncFor, ast.Try, ast.With, ast.AsyncWith)
+_NESTING = (ast.If, ast.While, ast.For, ast.With, ast.Try)
+
+
+class _FactsVisitor(ast.NodeVisitor):
+    """Single pass collecting structure, metrics and findings of a module."""
+
+    def __init__(self) -> None:
+        self.definitions: List[Tuple[int, int, str, str]] = []  # (depth, seq, kind, name)
+        self.imports: set = set()
+        self.module_complexity = 1
+        self.findings: List[Dict[str, Any]] = []
+
+        self._depth = 0       # AST depth (for breadth-first definition order)
+        self._seq = 0
+        self._nesting = 0     # Control-flow nesting (CodeCritic's depth measure)
+        self._loops = 0
+        # Enclosing FunctionDefs: [node, cyclomatic, nesting at entry, max nesting]
+        self._functions: List[List[Any]] = []
+
+    def generic_visit(self, node: ast.AST) -> None:
+        self._depth += 1
+        super().generic_visit(node)
+        self._depth -= 1
+
+    def visit(self, node: ast.AST) -> None:
+        self._seq += 1
+
+        if isinstance(node, _MODULE_DECISIONS):
+            self.module_complexity += 1
+        if self._functions:
+            if isinstance(node, _CRITIC_DECISIONS):
+                for frame in self._functions:
+                    frame[1] += 1
+            elif isinstance(node, ast.BoolOp):
+                for frame in self._functions:
+                    frame[1] += len(node.values) - 1
+
+        method = getattr(self, 'visit_' + node.__class__.__name__, None)
+        if method is not None:
+            method(node)
+            return
+
+        nesting = isinstance(node, _NESTING)
+        loop = isinstance(node, (ast.For, ast.While))
+        if nesting:
+            self._nesting += 1
+            for frame in self._functions:
+                frame[3] = max(frame[3], self._nesting - frame[2])
+        self._loops += loop
+        self.generic_visit(node)
+        self._loops -= loop
+        if nesting:
+            self._nesting -= 1
+
+    # Definitions -----------------------------------------------------------
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self.definitions.append((self._depth, self._seq, 'function', node.name))
+        for default in node.args.defaults + node.args.kw_defaults:
+            if default and isinstance(default, (ast.List, ast.Dict, ast.Set)):
+                self._find(
+                    'bugs', 'mutable_default', 'warning',
+                    f"Function {node.name} has mutable default argument",
+                    node.lineno, function_name=node.name,
+                    suggestion="Use None as default and initialize in function body",
+                )
+        self._functions.append([node, 1, self._nesting, 0])
+        self.generic_visit(node)
+        _, complexity, _, max_depth = self._functions.pop()
+
+        if complexity > MAX_CYCLOMATIC:
+            self._find(
+                'complexity', 'high_complexity', 'warning',
+                f"Function {node.name} has high cyclomatic complexity ({complexity})",
+                node.lineno, function_name=node.name,
+                suggestion="Consider breaking into smaller functions",
+            )
+        if max_depth > MAX_NESTING:
+            self._find(
+                'complexity', 'deep_nesting', 'warning',
+                f"Function {node.name} has deep nesting ({max_depth} levels)",
+                node.lineno, function_name=node.name,
+                suggestion="Consider early returns or extracting nested logic",
+            )
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        self.definitions.append((self._depth, self._seq, 'function', node.name))
+        self.generic_visit(node)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self.definitions.append((self._depth, self._seq, 'class', node.name))
+        self.generic_visit(node)
+
+    # Imports ---------------------------------------------------------------
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self.imports.add(alias.name)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if node.module:
+            self.imports.add(node.module)
+
+    # Findings --------------------------------------------------------------
+
+    def visit_ExceptHandler(self, node: ast.ExceptHandler) -> None:
+        if node.type is None:
+            self._find(
+                'bugs', 'bare_except', 'warning',
+                "Bare except clause catches all exceptions including SystemExit",
+                node.lineno, suggestion="Catch specific exceptions or at least Exception",
+            )
+        self.generic_visit(node)
+
+    def visit_Compare(self, node: ast.Compare) -> None:
+        for op, comp in zip(node.ops, node.comparators):
+            if isinstance(op, (ast.Eq, ast.NotEq)) and isinstance(comp, ast.Constant) and comp.value is None:
+                self._find(
+                    'bugs', 'none_comparison', 'info',
+                    "Use 'is None' or 'is not None' for None comparisons",
+                    node.lineno,
+                )
+        self.generic_visit(node)
+
+    def visit_AugAssign(self, node: ast.AugAssign) -> None:
+        if self._loops and isinstance(node.op, ast.Add) and isinstance(node.target, ast.Name):
+            self._find(
+                'performance', 'string_concat_loop', 'info',
+                "Possible string concatenation in loop - consider using list.join()",
+                node.lineno, confidence=0.6,
+            )
+        self.generic_visit(node)
+
+    def _find(
+        self,
+        check: str,
+        issue_type: str,
+        severity: str,
+        message: str,
+        line_number: int,
+        function_name: Optional[str] = None,
+        suggestion: Optional[str] = None,
+        confidence: float = 1.0,
+    ) -> None:
+        self.findings.append({
+            "check": check,
+            "issue_type": issue_type,
+            "severity": severity,
+            "message": message,
+            "line_number": line_number,
+            "function_name": function_name,
+            "suggestion": suggestion,
+            "confidence": confidence,
+        })
+
+
+def _style_findings(lines: List[str]) -> List[Dict[str, Any]]:
+    findings = []
+    for i, line in enumerate(lines, 1):
+        if len(line) > MAX_LINE_LENGTH:
+            findings.append({
+                "check": "style",
+                "issue_type": "line_too_long",
+                "severity": "info",
+                "message": f"Line exceeds {MAX_LINE_LENGTH} characters ({len(line)})",
+                "line_number": i,
+                "code_snippet": line[:80] + "...",
+            })
+        if line.rstrip() != line and line.strip():
+            findings.append({
+                "check": "style",
+                "issue_type": "trailing_whitespace",
+                "severity": "info",
+                "message": "Line has trailing whitespace",
+                "line_number": i,
+            })
+    return findings
+
+
+def analyze_source(code: str, filename: str = "<unknown>") -> Dict[str, Any]:
+    """
+    Parse code once and collect every fact the code analysers use.
+
+    Args:
+        code: Python source
+        filename: Used in syntax error messages
+
+    Returns:
+        JSON-serialisable dict:
+            syntax_error: None, or {msg, lineno, offset, text, message}
+            functions / classes: names in breadth-first (ast.walk) order
+            imports: sorted module names
+            complexity: module-level decision-point count
+            line_count: number of lines
+            findings: issue dicts tagged with their "check"
+                (style, complexity, bugs, performance)
+    """
+    facts: Dict[str, Any] = {
+        "syntax_error": None,
+        "functions": [],
+        "classes": [],
+        "imports": [],
+        "complexity": 1,
+        "line_count": len(code.splitlines()),
+        "findings": _style_findings(code.split("\n")),
+    }
+
+    try:
+        tree = ast.parse(code, filename=filename)
+    except SyntaxError as e:
+        facts["syntax_error"] = {
+            "msg": e.msg,
+            "lineno": e.lineno,
+            "offset": e.offset,
+            "text": e.text,
+            "message": str(e),
+        }
+        return facts
+
+    visitor = _FactsVisitor()
+    visitor.visit(tree)
+    definitions = sorted(visitor.definitions)
+    facts["functions"] = [name for _, _, kind, name in definitions if kind == 'function']
+    facts["classes"] = [name for _, _, kind, name in definitions if kind == 'class']
+    facts["imports"] = sorted(visitor.imports)
+    facts["complexity"] = visitor.module_complexity
+    facts["findings"].extend(sorted(visitor.findings, key=lambda f: f["line_number"]))
+    return facts
+
+
+def syntax_error_from_facts(facts: Dict[str, Any], filename: str) -> Optional[SyntaxError]:
+    """Rebuild the SyntaxError recorded in facts (None if the file parsed)."""
+    error = facts.get("syntax_error")
+    if not error:
+        return None
+    return SyntaxError(error["msg"], (filename, error["lineno"], error["offset"], error["text"]))
+
+
+def _analyze_path(path: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """Read, hash and analyse one file (process-pool worker)."""
+    try:
+        stat = os.stat(path)
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return path, None
+    code = data.decode("utf-8", errors="replace")
+    return path, {
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "version": ANALYSIS_VERSION,
+        "facts": analyze_source(code, filename=path),
+    }
+
+
+class SourceAnalysisCache:
+    """
+    Facts per source file, keyed by (path, sha256, ANALYSIS_VERSION).
+
+    Example:
+        cache = SourceAnalysisCache(".analysis_cache/source_facts.json")
+        facts = cache.analyze_many(paths)   # only changed files are parsed
+        cache.save()
+    """
+
+    def __init__(
+        self,
+        cache_path: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        parallel_threshold: int = PARALLEL_THRESHOLD,
+    ):
+        """
+        Args:
+            cache_path: JSON file persisting the cache (None = memory only)
+            max_workers: Process pool size for cache misses (None = CPU count)
+            parallel_threshold: Minimum misses before using the process pool
+        """
+        self.cache_path = cache_path
+        self.max_workers = max_workers
+        self.parallel_threshold = parallel_threshold
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        if cache_path and os.path.exists(cache_path):
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return  # Unreadable cache: start empty
+        if data.get("version") == ANALYSIS_VERSION:
+            self._entries = data.get("entries", {})
+
+    def save(self) -> None:
+        """Write the cache to cache_path atomically (no-op if unchanged)."""
+        if not self.cache_path or not self._dirty:
+            return
+        directory = os.path.dirname(os.path.abspath(self.cache_path))
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            payload = {"version": ANALYSIS_VERSION, "entries": self._entries}
+            fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", dir=directory)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(payload, f, separators=(",", ":"))
+                os.replace(tmp_path, self.cache_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+            self._dirty = False
+
+    def _lookup(self, path: str) -> Optional[Dict[str, Any]]:
+        """Cached facts if the file is unchanged; re-hashes only when stat differs."""
+        entry = self._entries.get(path)
+        if entry is None or entry.get("version") != ANALYSIS_VERSION:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime_ns"]:
+            return entry["facts"]
+        if stat.st_size != entry["size"]:
+            return None
+        with open(path, "rb") as f:
+            sha = hashlib.sha256(f.read()).hexdigest()
+        if sha != entry["sha256"]:
+            return None
+        entry["mtime_ns"] = stat.st_mtime_ns  # Touched but unchanged
+        self._dirty = True
+        return entry["facts"]
+
+    def get(self, path: str) -> Dict[str, Any]:
+        """
+        Facts for one file.
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        path = os.path.abspath(path)
+        facts = self.analyze_many([path]).get(path)
+        if facts is None:
+            with open(path, "rb"):
+                pass  # Surfaces the underlying error
+            raise OSError(f"Could not read {path}")
+        return facts
+
+    def analyze_many(self, paths: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Facts for many files, analysing cache misses in parallel.
+
+        Returns:
+            Dict of absolute path -> facts (unreadable files are omitted)
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        misses: List[str] = []
+        with self._lock:
+            for path in dict.fromkeys(os.path.abspath(p) for p in paths):
+                facts = self._lookup(path)
+                if facts is None:
+                    misses.append(path)
+                else:
+                    results[path] = facts
+            self.hits += len(results)
+            self.misses += len(misses)
+
+        for path, entry in self._run(misses):
+            if entry is None:
+                continue
+            results[path] = entry["facts"]
+            with self._lock:
+                self._entries[path] = entry
+                self._dirty = True
+        return results
+
+    def _run(self, paths: List[str]) -> List[Tuple[str, Optional[Dict[str, Any]]]]:
+        if len(paths) >= self.parallel_threshold and self.max_workers != 1:
+            try:
+                with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                    return list(pool.map(_analyze_path, paths, chunksize=8))
+            except (OSError, NotImplementedError, RuntimeError):
+                pass  # No process support here (e.g. sandboxed); analyse inline
+        return [_analyze_path(path) for path in paths]
+
+    def forget(self, path: str) -> None:
+        """Drop a file's cached facts."""
+        with self._lock:
+            if self._entries.pop(os.path.abspath(path), None) is not None:
+                self._dirty = True
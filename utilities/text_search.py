@@ -0,0 +1,359 @@
+"""
+PATH: utilities/text_search.py
+PURPOSE: Shared inverted-index text search with BM25 ranking for physics content
+
+WHY: Formula search, knowledge-node search and tree-node relevance scoring
+     all used linear substring scans. This module gives them one incremental
+     index whose query cost scales with the matching postings, not the corpus.
+
+FLOW:
+┌─────────────┐     ┌──────────────┐     ┌─────────────────┐
+│ Tokenizer   │────>│ Inverted     │────>│ BM25 + prefix / │
+│ (greek, TeX,│     │ index        │     │ fuzzy expansion │
+│ subscripts) │     │ (per field)  │     │ → top-k         │
+└─────────────┘     └──────────────┘     └─────────────────┘
+
+ALGORITHM:
+    score(d, q) = Σ_t idf(t) · tf'(t,d)·(k1+1) / (tf'(t,d) + k1·(1-b+b·|d|/avgdl))
+    where tf' is the field-boosted term frequency (BM25F-style).
+    Unknown query terms expand to indexed terms sharing the prefix, then to
+    terms within edit distance 1 (deletion neighbourhood), at reduced weight.
+
+DEPENDENCIES:
+- None (pure Python)
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple, Union
+
+# ---------------------------------------------------------------------------
+# Tokenizer
+# ---------------------------------------------------------------------------
+
+GREEK_LETTERS: Dict[str, str] = {
+    'α': 'alpha', 'β': 'beta', 'γ': 'gamma', 'δ': 'delta', 'ε': 'epsilon',
+    'ϵ': 'epsilon', 'ζ': 'zeta', 'η': 'eta', 'θ': 'theta', 'ϑ': 'theta',
+    'ι': 'iota', 'κ': 'kappa', 'λ': 'lambda', 'μ': 'mu', 'ν': 'nu',
+    'ξ': 'xi', 'ο': 'omicron', 'π': 'pi', 'ρ': 'rho', 'σ': 'sigma',
+    'ς': 'sigma', 'τ': 'tau', 'υ': 'upsilon', 'φ': 'phi', 'ϕ': 'phi',
+    'χ': 'chi', 'ψ': 'psi', 'ω': 'omega',
+    'Γ': 'gamma', 'Δ': 'delta', 'Θ': 'theta', 'Λ': 'lambda', 'Ξ': 'xi',
+    'Π': 'pi', 'Σ': 'sigma', 'Φ': 'phi', 'Ψ': 'psi', 'Ω': 'omega',
+    'ℏ': 'hbar', 'ħ': 'hbar', '∇': 'nabla', '∂': 'partial',
+}
+
+_SUBSCRIPT_DIGITS = str.maketrans({ch: f'_{i}' for i, ch in enumerate('₀₁₂₃₄₅₆₇₈₉')})
+_SUPERSCRIPT_DIGITS = str.maketrans('⁰¹²³⁴⁵⁶⁷⁸⁹', '0123456789')
+
+# \alpha, \hbar, \nabla ... → "alpha", "hbar", "nabla"
+_LATEX_COMMAND = re.compile(r'\\([A-Za-z]+)')
+# E_{kin} → E_kin ; m^{2} → m^2
+_LATEX_GROUP = re.compile(r'([_^])\{([^{}]*)\}')
+_DETACHED_SUBSCRIPT = re.compile(r' +([_^])')
+_WORD = re.compile(r'[a-z0-9]+(?:_[a-z0-9]+)*')
+
+# LaTeX commands that carry no searchable meaning on their own
+_LATEX_NOISE = frozenset({
+    'frac', 'left', 'right', 'cdot', 'times', 'mathrm', 'mathbf', 'text',
+    'sqrt', 'quad', 'qquad', 'begin', 'end', 'displaystyle', 'operatorname',
+})
+
+STOPWORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in',
+    'is', 'it', 'of', 'on', 'or', 'the', 'to', 'with', 'what', 'how',
+})
+
+
+def _normalize(text: str) -> str:
+    """Map physics notation to plain searchable words."""
+    text = text.translate(_SUBSCRIPT_DIGITS).translate(_SUPERSCRIPT_DIGITS)
+    text = ''.join(f' {GREEK_LETTERS[ch]} ' if ch in GREEK_LETTERS else ch for ch in text)
+    # Strip accents (Schrödinger → Schrodinger)
+    text = ''.join(
+        ch for ch in unicodedata.normalize('NFKD', text) if not unicodedata.combining(ch)
+    )
+    text = _LATEX_GROUP.sub(lambda m: m.group(1) + m.group(2).replace(' ', ''), text)
+    text = _LATEX_COMMAND.sub(
+        lambda m: ' ' if m.group(1) in _LATEX_NOISE else f' {m.group(1)} ', text
+    )
+    text = _DETACHED_SUBSCRIPT.sub(r'\1', text)
+    return text.lower()
+
+
+def tokenize(text: str, keep_stopwords: bool = False) -> List[str]:
+    """
+    Split text into search terms.
+
+    Subscripted symbols are kept whole and also split into their parts, so
+    ``E_{kin}`` yields ``e_kin``, ``e`` and ``kin``, and ``\\omega_0`` yields
+    ``omega_0`` and ``omega`` (bare numbers are dropped).
+
+    Args:
+        text: Free text, LaTeX, or a SymPy expression string
+        keep_stopwords: Keep common English stopwords
+
+    Returns:
+        List of lower-case terms (with repeats, for term frequency)
+    """
+    if not text:
+        return []
+    tokens: List[str] = []
+    for word in _WORD.findall(_normalize(text)):
+        if '_' in word:
+            tokens.append(word)
+            tokens.extend(part for part in word.split('_') if not part.isdigit())
+        elif word.isdigit():
+            continue
+        elif keep_stopwords or word not in STOPWORDS:
+            tokens.append(word)
+    return tokens
+
+
+def _deletions(term: str) -> Set[str]:
+    """All strings at deletion distance 1 from term (plus term itself)."""
+    return {term} | {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+# ---------------------------------------------------------------------------
+# Inverted index
+# ---------------------------------------------------------------------------
+
+FieldValue = Union[str, Iterable[str], None]
+
+
+class TextIndex:
+    """
+    Incremental inverted index with BM25F ranking.
+
+    Documents are added as a mapping of field name to text (or iterable of
+    texts). Field weights boost term frequency per field, e.g. a name match
+    counts more than a description match.
+
+    Features:
+    - O(postings) query cost with heap top-k
+    - Incremental add / update / remove
+    - Prefix expansion via a sorted term list
+    - Edit-distance-1 fuzzy matching via a deletion-neighbourhood index
+    """
+
+    def __init__(
+        self,
+        field_weights: Optional[Mapping[str, float]] = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+        prefix_weight: float = 0.6,
+        fuzzy_weight: float = 0.4,
+        min_affix_length: int = 3,
+    ) -> None:
+        """
+        Initialize text index.
+
+        Args:
+            field_weights: Term-frequency boost per field (missing fields: 1.0)
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalization
+            prefix_weight: Score multiplier for prefix-expanded terms
+            fuzzy_weight: Score multiplier for fuzzy-matched terms
+            min_affix_length: Minimum query term length for prefix/fuzzy expansion
+        """
+        self.field_weights = dict(field_weights or {})
+        self.k1 = k1
+        self.b = b
+        self.prefix_weight = prefix_weight
+        self.fuzzy_weight = fuzzy_weight
+        self.min_affix_length = min_affix_length
+
+        self._postings: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self._doc_terms: Dict[str, Dict[str, float]] = {}
+        self._doc_length: Dict[str, float] = {}
+        self._total_length = 0.0
+        self._sorted_terms: List[str] = []
+        self._deletion_index: Dict[str, Set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_terms
+
+    @property
+    def vocabulary_size(self) -> int:
+        """Number of distinct indexed terms."""
+        return len(self._postings)
+
+    def add(self, doc_id: str, fields: Mapping[str, FieldValue]) -> None:
+        """
+        Index a document, replacing any previous version with the same ID.
+
+        Args:
+            doc_id: Document identifier
+            fields: Field name → text or iterable of texts
+        """
+        if doc_id in self._doc_terms:
+            self.remove(doc_id)
+
+        term_freqs: Dict[str, float] = defaultdict(float)
+        for field_name, value in fields.items():
+            if value is None:
+                continue
+            weight = self.field_weights.get(field_name, 1.0)
+            texts = [value] if isinstance(value, str) else value
+            for text in texts:
+                for term in tokenize(str(text)):
+                    term_freqs[term] += weight
+
+        length = sum(term_freqs.values())
+        self._doc_terms[doc_id] = dict(term_freqs)
+        self._doc_length[doc_id] = length
+        self._total_length += length
+
+        for term, tf in term_freqs.items():
+            postings = self._postings[term]
+            if not postings:
+                self._add_term(term)
+            postings[doc_id] = tf
+
+    def remove(self, doc_id: str) -> bool:
+        """Remove a document. Returns False if it was not indexed."""
+        term_freqs = self._doc_terms.pop(doc_id, None)
+        if term_freqs is None:
+            return False
+        self._total_length -= self._doc_length.pop(doc_id, 0.0)
+        for term in term_freqs:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+                self._remove_term(term)
+        return True
+
+    def clear(self) -> None:
+        """Remove all documents."""
+        self._postings.clear()
+        self._doc_terms.clear()
+        self._doc_length.clear()
+        self._total_length = 0.0
+        self._sorted_terms.clear()
+        self._deletion_index.clear()
+
+    def _add_term(self, term: str) -> None:
+        insort(self._sorted_terms, term)
+        for variant in _deletions(term):
+            self._deletion_index[variant].add(term)
+
+    def _remove_term(self, term: str) -> None:
+        i = bisect_left(self._sorted_terms, term)
+        if i < len(self._sorted_terms) and self._sorted_terms[i] == term:
+            self._sorted_terms.pop(i)
+        for variant in _deletions(term):
+            bucket = self._deletion_index.get(variant)
+            if bucket is not None:
+                bucket.discard(term)
+                if not bucket:
+                    del self._deletion_index[variant]
+
+    def _expand(self, term: str, prefix: bool, fuzzy: bool) -> List[Tuple[str, float]]:
+        """Resolve a query term to (indexed term, weight) pairs."""
+        if term in self._postings:
+            expansions = [(term, 1.0)]
+        else:
+            expansions = []
+
+        if len(term) < self.min_affix_length:
+            return expansions
+
+        if prefix:
+            i = bisect_left(self._sorted_terms, term)
+            while i < len(self._sorted_terms) and self._sorted_terms[i].startswith(term):
+                candidate = self._sorted_terms[i]
+                if candidate != term:
+                    expansions.append((candidate, self.prefix_weight))
+                i += 1
+
+        if fuzzy and not expansions:
+            candidates: Set[str] = set()
+            for variant in _deletions(term):
+                candidates |= self._deletion_index.get(variant, set())
+            expansions.extend((c, self.fuzzy_weight) for c in candidates if c != term)
+
+        return expansions
+
+    def _idf(self, term: str) -> float:
+        n = len(self._doc_terms)
+        df = len(self._postings.get(term, ()))
+        return math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+
+    def score(
+        self,
+        query: str,
+        prefix: bool = True,
+        fuzzy: bool = True,
+        candidates: Optional[Set[str]] = None,
+    ) -> Dict[str, float]:
+        """
+        Compute BM25 scores for every document matching the query.
+
+        Args:
+            query: Query text (tokenized like documents)
+            prefix: Expand terms to indexed terms with that prefix
+            fuzzy: Fall back to edit-distance-1 matches for unknown terms
+            candidates: Restrict scoring to these document IDs
+
+        Returns:
+            Document ID → score (only documents with score > 0)
+        """
+        if not self._doc_terms:
+            return {}
+
+        avgdl = self._total_length / len(self._doc_terms) or 1.0
+        k1, b = self.k1, self.b
+        scores: Dict[str, float] = defaultdict(float)
+
+        for term in set(tokenize(query)):
+            for indexed_term, weight in self._expand(term, prefix, fuzzy):
+                idf = self._idf(indexed_term) * weight
+                for doc_id, tf in self._postings[indexed_term].items():
+                    if candidates is not None and doc_id not in candidates:
+                        continue
+                    norm = k1 * (1.0 - b + b * self._doc_length[doc_id] / avgdl)
+                    scores[doc_id] += idf * tf * (k1 + 1.0) / (tf + norm)
+
+        return dict(scores)
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        prefix: bool = True,
+        fuzzy: bool = True,
+        candidates: Optional[Set[str]] = None,
+        doc_filter: Optional[Callable[[str], bool]] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Rank documents for a query.
+
+        Args:
+            query: Query text
+            limit: Maximum number of results
+            prefix: Enable prefix expansion
+            fuzzy: Enable fuzzy matching
+            candidates: Restrict to these document IDs (e.g. a domain index)
+            doc_filter: Additional predicate on document IDs
+
+        Returns:
+            List of (doc_id, score), best first
+        """
+        scores = self.score(query, prefix=prefix, fuzzy=fuzzy, candidates=candidates)
+        items: Iterable[Tuple[str, float]] = scores.items()
+        if doc_filter is not None:
+            items = ((d, s) for d, s in items if doc_filter(d))
+        return heapq.nlargest(limit, items, key=lambda item: (item[1], item[0]))
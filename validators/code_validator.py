@@ -1,13 +1,13 @@
-# validators/
 """
 PATH: validators/code_validator.py
 PURPOSE: Validates generated code for syntax, safety, and correctness using AST analysis.
 
 FLOW:
-┌─────────────┐    ┌──────────────┐    ┌─────────────┐
-│ Parse Code  │───▶│ AST Analysis │───▶│ Safety      │
-│             │    │              │    │ Validation  │
-└─────────────┘    └──────────────┘    └─────────────┘
+┌─────────────┐    ┌──────────────────────┐    ┌─────────────┐
+│ Parse Code  │───▶│ One traversal;       │───▶│ Safety /    │
+│ (cached by  │    │ every rule's node    │    │ Complexity  │
+│ source hash)│    │ handlers dispatched  │    │ Validation  │
+└─────────────┘    └──────────────────────┘    └─────────────┘
 
 DEPENDENCIES:
 - ast: Python Abstract Syntax Tree
@@ -17,24 +17,122 @@ WHY: AST-based validation is more robust than string matching because it:
 - Cannot be bypassed by string obfuscation
 - Understands code structure, not just text patterns
 - Can detect dangerous patterns regardless of formatting
+
+Checks are ValidationRules: classes with visit_<NodeType> / leave_<NodeType>
+handlers. RuleTraversal walks a tree once (iteratively) and dispatches each
+node to every rule handling its type, so adding a rule never adds a pass.
+The analysis of a snippet is memoized by a hash of its newline-normalized
+source, so re-validating identical generated code skips parsing entirely.
 """
 
 import ast
-from typing import Any, Dict, List, Optional, Set, Tuple
-import sys
+import hashlib
 import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, Type
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from loggers.system_logger import SystemLogger
 
 
-class DangerousNodeVisitor(ast.NodeVisitor):
+class ValidationTimeout(Exception):
+    """Raised when analysing a snippet exceeds its time budget."""
+
+
+class ValidationRule:
+    """
+    A check run during the shared AST traversal.
+    
+    Subclasses define visit_<NodeType>(node) (called before the node's
+    children) and/or leave_<NodeType>(node) (called after them), plus
+    result(). A fresh instance is used per analysed tree.
+    """
+    
+    # Key of this rule's result in an analysis
+    name: str = "rule"
+    
+    def result(self) -> Any:
+        """Result of the rule after a traversal."""
+        return None
+    
+    def visit(self, tree: ast.AST) -> None:
+        """Run this rule alone over a tree."""
+        RuleTraversal([self]).run(tree)
+
+
+class RuleTraversal:
+    """
+    Walks an AST once, dispatching every node to all rules handling its type.
+    
+    Nodes are visited in the same order as ast.NodeVisitor (pre-order,
+    fields in definition order), without recursion.
+    """
+    
+    # Check the deadline every this many nodes
+    DEADLINE_CHECK_INTERVAL = 512
+    
+    def __init__(self, rules: Sequence[ValidationRule]):
+        self.rules = list(rules)
+        self._enter: Dict[str, List[Callable[[ast.AST], None]]] = {}
+        self._leave: Dict[str, List[Callable[[ast.AST], None]]] = {}
+        for rule in self.rules:
+            for attr in dir(rule):
+                if attr.startswith('visit_') and attr != 'visit_':
+                    self._enter.setdefault(attr[6:], []).append(getattr(rule, attr))
+                elif attr.startswith('leave_') and attr != 'leave_':
+                    self._leave.setdefault(attr[6:], []).append(getattr(rule, attr))
+    
+    def run(self, tree: ast.AST, deadline: Optional[float] = None) -> None:
+        """
+        Traverse the tree.
+        
+        Args:
+            tree: Root node
+            deadline: time.monotonic() value after which to give up
+        
+        Raises:
+            ValidationTimeout: If the deadline passes mid-traversal
+        """
+        enter, leave = self._enter, self._leave
+        # (node, leaving) pairs; children are pushed reversed to pop in order
+        stack: List[Tuple[ast.AST, bool]] = [(tree, False)]
+        visited = 0
+        while stack:
+            node, leaving = stack.pop()
+            name = type(node).__name__
+            if leaving:
+                for handler in leave[name]:
+                    handler(node)
+                continue
+            
+            visited += 1
+            if deadline is not None and visited % self.DEADLINE_CHECK_INTERVAL == 0:
+                if time.monotonic() > deadline:
+                    raise ValidationTimeout(f"Traversal exceeded budget after {visited} nodes")
+            
+            for handler in enter.get(name, ()):
+                handler(node)
+            if name in leave:
+                stack.append((node, True))
+            children = list(ast.iter_child_nodes(node))
+            children.reverse()
+            stack.extend((child, False) for child in children)
+
+
+class DangerousNodeVisitor(ValidationRule):
     """
-    AST visitor that detects dangerous code patterns.
+    Rule that detects dangerous code patterns.
     
     This is more secure than string matching because it analyzes
     the actual code structure, not text patterns.
     """
     
+    name = "safety"
+    
     # Dangerous built-in functions that should not be allowed
     DANGEROUS_BUILTINS: Set[str] = {
         'eval', 'exec', 'compile', '__import__',
@@ -61,7 +159,9 @@ class DangerousNodeVisitor(ast.NodeVisitor):
     
     def __init__(self):
         self.violations: List[Dict[str, Any]] = []
-        self.logger = SystemLogger()
+    
+    def result(self) -> List[Dict[str, Any]]:
+        return self.violations
     
     def visit_Call(self, node: ast.Call) -> None:
         """Check for dangerous function calls."""
@@ -101,8 +201,6 @@ class DangerousNodeVisitor(ast.NodeVisitor):
                                 'col': node.col_offset,
                                 'severity': 'critical'
                             })
-        
-        self.generic_visit(node)
     
     def visit_Import(self, node: ast.Import) -> None:
         """Check for dangerous module imports."""
@@ -116,7 +214,6 @@ class DangerousNodeVisitor(ast.NodeVisitor):
                     'col': node.col_offset,
                     'severity': 'high'
                 })
-        self.generic_visit(node)
     
     def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
         """Check for dangerous from-imports."""
@@ -130,7 +227,6 @@ class DangerousNodeVisitor(ast.NodeVisitor):
                     'col': node.col_offset,
                     'severity': 'high'
                 })
-        self.generic_visit(node)
     
     def visit_Attribute(self, node: ast.Attribute) -> None:
         """Check for dangerous attribute access."""
@@ -142,7 +238,6 @@ class DangerousNodeVisitor(ast.NodeVisitor):
                 'col': node.col_offset,
                 'severity': 'high'
             })
-        self.generic_visit(node)
     
     def visit_Global(self, node: ast.Global) -> None:
         """Flag global statements as potential issues."""
@@ -153,14 +248,15 @@ class DangerousNodeVisitor(ast.NodeVisitor):
             'col': node.col_offset,
             'severity': 'medium'
         })
-        self.generic_visit(node)
 
 
-class CodeComplexityVisitor(ast.NodeVisitor):
+class CodeComplexityVisitor(ValidationRule):
     """
-    AST visitor that calculates code complexity metrics.
+    Rule that calculates code complexity metrics.
     """
     
+    name = "complexity"
+    
     def __init__(self):
         self.complexity = 1  # Base complexity
         self.function_count = 0
@@ -170,58 +266,54 @@ class CodeComplexityVisitor(ast.NodeVisitor):
         self.max_depth = 0
         self._current_depth = 0
     
-    def _increase_depth(self):
+    def result(self) -> Dict[str, Any]:
+        return self.get_metrics()
+    
+    def _increase_depth(self, node: Optional[ast.AST] = None):
         self._current_depth += 1
         self.max_depth = max(self.max_depth, self._current_depth)
     
-    def _decrease_depth(self):
+    def _decrease_depth(self, node: Optional[ast.AST] = None):
         self._current_depth -= 1
     
     def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
         self.function_count += 1
         self._increase_depth()
-        self.generic_visit(node)
-        self._decrease_depth()
     
     def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
         self.function_count += 1
         self._increase_depth()
-        self.generic_visit(node)
-        self._decrease_depth()
     
     def visit_ClassDef(self, node: ast.ClassDef) -> None:
         self.class_count += 1
         self._increase_depth()
-        self.generic_visit(node)
-        self._decrease_depth()
     
     def visit_If(self, node: ast.If) -> None:
         self.complexity += 1
         self.branch_count += 1
-        self.generic_visit(node)
     
     def visit_For(self, node: ast.For) -> None:
         self.complexity += 1
         self.loop_count += 1
         self._increase_depth()
-        self.generic_visit(node)
-        self._decrease_depth()
     
     def visit_While(self, node: ast.While) -> None:
         self.complexity += 1
         self.loop_count += 1
         self._increase_depth()
-        self.generic_visit(node)
-        self._decrease_depth()
+    
+    leave_FunctionDef = _decrease_depth
+    leave_AsyncFunctionDef = _decrease_depth
+    leave_ClassDef = _decrease_depth
+    leave_For = _decrease_depth
+    leave_While = _decrease_depth
     
     def visit_Try(self, node: ast.Try) -> None:
         self.complexity += len(node.handlers)
-        self.generic_visit(node)
     
     def visit_BoolOp(self, node: ast.BoolOp) -> None:
         # Each 'and' or 'or' adds to complexity
         self.complexity += len(node.values) - 1
-        self.generic_visit(node)
     
     def get_metrics(self) -> Dict[str, Any]:
         return {
@@ -234,6 +326,69 @@ class CodeComplexityVisitor(ast.NodeVisitor):
         }
 
 
+DEFAULT_RULES: Tuple[Type[ValidationRule], ...] = (DangerousNodeVisitor, CodeComplexityVisitor)
+
+
+def normalize_source(code: str) -> str:
+    """Source with line endings normalized (same AST and positions)."""
+    return code.replace('\r\n', '\n').replace('\r', '\n')
+
+
+def source_hash(code: str) -> str:
+    """Cache key of a snippet: sha256 of its normalized source."""
+    return hashlib.sha256(normalize_source(code).encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+def analyze_code(
+    code: str,
+    rules: Sequence[Type[ValidationRule]] = DEFAULT_RULES,
+    time_budget: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Parse a snippet once and run every rule in a single traversal.
+    
+    Args:
+        code: Source code
+        rules: Rule classes to run
+        time_budget: Seconds allowed for the traversal (None = unlimited)
+    
+    Returns:
+        Dict with 'syntax_error' (None or {'lineno', 'msg'}), 'timed_out'
+        and 'rules' (rule name -> result; empty on syntax error or timeout)
+    
+    Raises:
+        Anything ast.parse raises besides SyntaxError (e.g. ValueError)
+    """
+    start = time.monotonic()
+    analysis: Dict[str, Any] = {'syntax_error': None, 'timed_out': False, 'rules': {}}
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        analysis['syntax_error'] = {'lineno': e.lineno, 'msg': e.msg}
+        return analysis
+    
+    instances = [rule() for rule in rules]
+    deadline = start + time_budget if time_budget is not None else None
+    try:
+        RuleTraversal(instances).run(tree, deadline=deadline)
+    except ValidationTimeout:
+        analysis['timed_out'] = True
+        return analysis
+    analysis['rules'] = {rule.name: rule.result() for rule in instances}
+    return analysis
+
+
+def _analyze_for_pool(
+    args: Tuple[str, Sequence[Type[ValidationRule]], Optional[float]],
+) -> Dict[str, Any]:
+    """Process-pool worker: analyze_code, with errors reported in the result."""
+    code, rules, time_budget = args
+    try:
+        return analyze_code(code, rules, time_budget)
+    except Exception as e:
+        return {'syntax_error': None, 'timed_out': False, 'rules': {}, 'error': str(e)}
+
+
 class CodeValidator:
     """
     Validates generated code using AST-based analysis.
@@ -243,6 +398,10 @@ class CodeValidator:
     - Safety validation via AST visitor pattern
     - Complexity analysis
     - Physics constraint validation (placeholder)
+    
+    Every check reads one memoized analysis of the snippet (one parse, one
+    traversal running all rules), so validate_all costs a single pass and
+    repeated candidates cost a hash lookup.
     """
     
     # Complexity thresholds
@@ -250,17 +409,77 @@ class CodeValidator:
     MAX_NESTING_DEPTH = 10
     MAX_FUNCTION_COUNT = 100
     
-    def __init__(self, strict_mode: bool = True):
+    # Analyses kept, least recently used evicted first
+    CACHE_SIZE = 1024
+    
+    # Default seconds allowed per snippet in validate_many
+    SNIPPET_TIME_BUDGET = 5.0
+    
+    # Uncached snippets needed before validate_many uses worker processes
+    PARALLEL_THRESHOLD = 32
+    
+    def __init__(
+        self,
+        strict_mode: bool = True,
+        rules: Optional[Sequence[Type[ValidationRule]]] = None,
+        cache_size: Optional[int] = None,
+    ):
         """
         Initialize code validator.
         
         Args:
             strict_mode: If True, any violation fails validation
+            rules: Rule classes to run (default: safety and complexity);
+                   extra rules' results appear in analyze()['rules']
+            cache_size: Maximum memoized analyses (default CACHE_SIZE)
         """
         self.logger = SystemLogger()
         self.strict_mode = strict_mode
+        self.rules: Tuple[Type[ValidationRule], ...] = tuple(rules) if rules is not None else DEFAULT_RULES
+        self.cache_size = cache_size if cache_size is not None else self.CACHE_SIZE
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
         self.logger.log("CodeValidator initialized (AST-based)", level="INFO")
     
+    def analyze(self, code: str) -> Dict[str, Any]:
+        """
+        Memoized analyze_code for this validator's rules.
+        
+        Args:
+            code: Code string to analyze
+            
+        Returns:
+            Analysis dict (shared with the cache; do not mutate)
+        """
+        key = source_hash(code)
+        with self._lock:
+            analysis = self._cache.get(key)
+            if analysis is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return analysis
+        
+        analysis = analyze_code(code, self.rules)
+        self._store(key, analysis)
+        return analysis
+    
+    def _store(self, key: str, analysis: Dict[str, Any]) -> None:
+        with self._lock:
+            self.cache_misses += 1
+            if analysis['timed_out'] or 'error' in analysis:
+                return  # Budget- or environment-dependent: don't memoize
+            self._cache[key] = analysis
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+    
+    def clear_cache(self) -> None:
+        """Drop all memoized analyses."""
+        with self._lock:
+            self._cache.clear()
+    
     def validate_syntax(self, code: str) -> bool:
         """
         Validate Python code syntax using AST parsing.
@@ -271,6 +490,12 @@ class CodeValidator:
         Returns:
             True if valid, False otherwise
         """
+        if not self._is_source(code):
+            return False
+        return self._syntax_ok(self.analyze(code))
+    
+    def _is_source(self, code: Any) -> bool:
+        """Whether code is a non-empty string (logs why not)."""
         if not isinstance(code, str):
             self.logger.log("Code is not a string", level="WARNING")
             return False
@@ -278,14 +503,15 @@ class CodeValidator:
         if not code.strip():
             self.logger.log("Code is empty", level="WARNING")
             return False
-        
-        try:
-            ast.parse(code)
-            self.logger.log("Syntax validation passed", level="DEBUG")
-            return True
-        except SyntaxError as e:
-            self.logger.log(f"Syntax error at line {e.lineno}: {e.msg}", level="WARNING")
+        return True
+    
+    def _syntax_ok(self, analysis: Dict[str, Any]) -> bool:
+        error = analysis['syntax_error']
+        if error is not None:
+            self.logger.log(f"Syntax error at line {error['lineno']}: {error['msg']}", level="WARNING")
             return False
+        self.logger.log("Syntax validation passed", level="DEBUG")
+        return True
     
     def validate_safety(self, code: str) -> bool:
         """
@@ -304,15 +530,15 @@ class CodeValidator:
         """
         if not self.validate_syntax(code):
             return False
-        
+        return self._safety_ok(self.analyze(code))
+    
+    def _safety_ok(self, analysis: Dict[str, Any]) -> bool:
         try:
-            tree = ast.parse(code)
-            visitor = DangerousNodeVisitor()
-            visitor.visit(tree)
+            violations = analysis['rules'][DangerousNodeVisitor.name]
             
-            if visitor.violations:
+            if violations:
                 # Log all violations
-                for v in visitor.violations:
+                for v in violations:
                     self.logger.log(
                         f"Safety violation ({v['severity']}): {v['type']} - "
                         f"'{v['name']}' at line {v['line']}",
@@ -321,7 +547,7 @@ class CodeValidator:
                 
                 # In strict mode, any violation fails
                 if self.strict_mode:
-                    critical_violations = [v for v in visitor.violations if v['severity'] == 'critical']
+                    critical_violations = [v for v in violations if v['severity'] == 'critical']
                     if critical_violations:
                         self.logger.log(
                             f"Safety validation failed: {len(critical_violations)} critical violations",
@@ -330,7 +556,7 @@ class CodeValidator:
                         return False
                 
                 # In non-strict mode, only critical violations fail
-                critical = [v for v in visitor.violations if v['severity'] == 'critical']
+                critical = [v for v in violations if v['severity'] == 'critical']
                 if critical:
                     return False
             
@@ -354,15 +580,14 @@ class CodeValidator:
         """
         if not self.validate_syntax(code):
             return False, {}
-        
+        return self._complexity_ok(self.analyze(code), max_complexity)
+    
+    def _complexity_ok(self, analysis: Dict[str, Any],
+                       max_complexity: Optional[int] = None) -> Tuple[bool, Dict[str, Any]]:
         max_complexity = max_complexity or self.MAX_COMPLEXITY
         
         try:
-            tree = ast.parse(code)
-            visitor = CodeComplexityVisitor()
-            visitor.visit(tree)
-            
-            metrics = visitor.get_metrics()
+            metrics = dict(analysis['rules'][CodeComplexityVisitor.name])
             
             is_valid = (
                 metrics['cyclomatic_complexity'] <= max_complexity and
@@ -394,6 +619,10 @@ class CodeValidator:
         Returns:
             Tuple of (is_valid, results_dict)
         """
+        return self._results(self.analyze(code) if self._is_source(code) else None)
+    
+    def _results(self, analysis: Optional[Dict[str, Any]]) -> Tuple[bool, Dict[str, Any]]:
+        """validate_all results from an analysis (None: not a usable snippet)."""
         results = {
             'syntax_valid': False,
             'safety_valid': False,
@@ -403,15 +632,17 @@ class CodeValidator:
         }
         
         # Syntax check
-        results['syntax_valid'] = self.validate_syntax(code)
+        if analysis is None:
+            return False, results
+        results['syntax_valid'] = self._syntax_ok(analysis)
         if not results['syntax_valid']:
             return False, results
         
         # Safety check
-        results['safety_valid'] = self.validate_safety(code)
+        results['safety_valid'] = self._safety_ok(analysis)
         
         # Complexity check
-        results['complexity_valid'], results['complexity_metrics'] = self.validate_complexity(code)
+        results['complexity_valid'], results['complexity_metrics'] = self._complexity_ok(analysis)
         
         # Overall result
         results['overall_valid'] = all([
@@ -422,6 +653,104 @@ class CodeValidator:
         
         return results['overall_valid'], results
     
+    def validate_many(
+        self,
+        codes: Sequence[str],
+        time_budget: Optional[float] = None,
+        max_workers: Optional[int] = None,
+    ) -> List[Tuple[bool, Dict[str, Any]]]:
+        """
+        validate_all for several candidate snippets.
+        
+        Distinct uncached snippets are analysed once each, in worker
+        processes when there are at least PARALLEL_THRESHOLD of them.
+        A snippet whose traversal exceeds the budget fails with
+        results['timed_out'] set instead of holding up the batch.
+        
+        Args:
+            codes: Code strings to validate
+            time_budget: Seconds per snippet (default SNIPPET_TIME_BUDGET)
+            max_workers: Worker processes (1 = inline)
+            
+        Returns:
+            One (is_valid, results_dict) per snippet, in input order
+        """
+        budget = self.SNIPPET_TIME_BUDGET if time_budget is None else time_budget
+        
+        # Analyses for this batch, by source hash: cached ones are taken now
+        # so that storing the misses below cannot evict them mid-batch
+        found: Dict[str, Dict[str, Any]] = {}
+        misses: Dict[str, str] = {}
+        with self._lock:
+            for code in codes:
+                if isinstance(code, str) and code.strip():
+                    key = source_hash(code)
+                    if key in found or key in misses:
+                        continue
+                    analysis = self._cache.get(key)
+                    if analysis is None:
+                        misses[key] = code
+                    else:
+                        self._cache.move_to_end(key)
+                        self.cache_hits += 1
+                        found[key] = analysis
+        
+        keys = list(misses)
+        jobs = [(misses[key], self.rules, budget) for key in keys]
+        analyses = None
+        if len(jobs) >= self.PARALLEL_THRESHOLD and max_workers != 1 and self._rules_picklable():
+            try:
+                with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                    analyses = list(pool.map(_analyze_for_pool, jobs, chunksize=8))
+            except (OSError, NotImplementedError, RuntimeError,
+                    pickle.PicklingError, AttributeError, TypeError):
+                pass  # No process support (e.g. sandboxed) or unpicklable rules; analyse inline
+        if analyses is None:
+            analyses = [_analyze_for_pool(job) for job in jobs]
+        
+        for key, analysis in zip(keys, analyses):
+            self._store(key, analysis)
+            found[key] = analysis
+        
+        outcomes = []
+        for code in codes:
+            if not self._is_source(code):
+                is_valid, results = self._results(None)
+                results['timed_out'] = False
+                outcomes.append((is_valid, results))
+                continue
+            
+            analysis = found[source_hash(code)]
+            if not (analysis['timed_out'] or 'error' in analysis):
+                is_valid, results = self._results(analysis)
+                results['timed_out'] = False
+            else:
+                is_valid = False
+                results = {
+                    'syntax_valid': False,
+                    'safety_valid': False,
+                    'complexity_valid': False,
+                    'complexity_metrics': {},
+                    'overall_valid': False,
+                    'timed_out': analysis['timed_out'],
+                }
+                if 'error' in analysis:
+                    results['error'] = analysis['error']
+                self.logger.log(
+                    "Validation timed out" if analysis['timed_out'] else f"Validation error: {analysis['error']}",
+                    level="WARNING"
+                )
+            outcomes.append((is_valid, results))
+        return outcomes
+    
+    def _rules_picklable(self) -> bool:
+        """Whether the rule classes can be sent to worker processes."""
+        try:
+            pickle.dumps(self.rules)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            return False
+        return True
+    
     def get_violations(self, code: str) -> List[Dict[str, Any]]:
         """
         Get all safety violations in code without failing.
@@ -436,10 +765,7 @@ class CodeValidator:
             return [{'type': 'syntax_error', 'severity': 'critical'}]
         
         try:
-            tree = ast.parse(code)
-            visitor = DangerousNodeVisitor()
-            visitor.visit(tree)
-            return visitor.violations
+            return [dict(v) for v in self.analyze(code)['rules'][DangerousNodeVisitor.name]]
         except Exception as e:
             return [{'type': 'analysis_error', 'message': str(e), 'severity': 'critical'}]
     